@@ -62,9 +62,9 @@ class AnnotatedBibMixin:
                     VALUES (?, ?, ?, ?, ?, ?)
                 """, (reading_id, citation, desc, analysis, applicability, status))
 
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error saving annotated bib entry: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
\ No newline at end of file
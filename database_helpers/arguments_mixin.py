@@ -149,10 +149,10 @@ class ArgumentsMixin:
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, evidence_to_insert)
 
-            self.conn.commit()
+            self._commit()
             return argument_id
         except Exception as e:
-            self.conn.rollback()
+            self._rollback()
             print(f"Error in _save_argument_and_evidence: {e}")
             raise
 
@@ -186,24 +186,7 @@ class ArgumentsMixin:
             ORDER BY ra.display_order, ra.id
         """, (reading_id,))
 
-        results = self._map_rows(self.cursor.fetchall())
-        for item in results:
-            self.cursor.execute("SELECT sa.id FROM synthesis_anchors sa WHERE sa.item_link_id = ?", (item['id'],))
-            anchor_row = self.cursor.fetchone()
-
-            if anchor_row:
-                anchor_id = anchor_row['id']
-                self.cursor.execute("""
-                    SELECT t.name 
-                    FROM anchor_tag_links atl
-                    JOIN synthesis_tags t ON atl.tag_id = t.id
-                    WHERE atl.anchor_id = ?
-                """, (anchor_id,))
-                tag_names = [row['name'] for row in self.cursor.fetchall()]
-                item['synthesis_tags'] = ", ".join(tag_names)
-            else:
-                item['synthesis_tags'] = ""
-        return results
+        return self._attach_synthesis_tags(self._map_rows(self.cursor.fetchall()))
 
     def get_argument_details(self, argument_id):
         """Gets full details for one argument and all its evidence."""
@@ -241,16 +224,11 @@ class ArgumentsMixin:
             "DELETE FROM reading_arguments WHERE id = ?",
             (argument_id,)
         )
-        self.conn.commit()
+        self._commit()
 
     def update_argument_order(self, ordered_ids):
         """Updates the display_order for reading-level arguments."""
-        for order, arg_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE reading_arguments SET display_order = ? WHERE id = ?",
-                (order, arg_id)
-            )
-        self.conn.commit()
+        self._bulk_update_order("reading_arguments", ordered_ids)
 
     def update_argument_insight_status(self, argument_id, is_insight):
         """Updates the 'is_insight' flag for an argument."""
@@ -258,4 +236,4 @@ class ArgumentsMixin:
             "UPDATE reading_arguments SET is_insight = ? WHERE id = ?",
             (1 if is_insight else 0, argument_id)
         )
-        self.conn.commit()
\ No newline at end of file
+        self._commit()
\ No newline at end of file
@@ -0,0 +1,227 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+
+from database_helpers.project_files import project_file_paths
+
+# Attachment files are stored once per content under
+# Attachments/store/<first two hex digits>/<sha256><ext>. file_path in
+# reading_attachments stays relative to the Attachments folder, so these
+# paths resolve exactly like the older <reading_id>/<file name> ones.
+STORE_DIR_NAME = "store"
+INCOMING_DIR_NAME = "incoming"  # partial copies, inside the store folder
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class ImportCancelled(Exception):
+    """Raised inside copy_into_store when should_cancel() returns True."""
+
+
+def hash_file(path, chunk_bytes=HASH_CHUNK_BYTES):
+    """Returns (sha256 hex digest, size in bytes), reading the file in chunks."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def blob_relative_path(digest, file_name):
+    """Store path for a digest, keeping the original extension so viewers recognise the type."""
+    ext = os.path.splitext(file_name)[1].lower()
+    return f"{STORE_DIR_NAME}/{digest[:2]}/{digest}{ext}"
+
+
+def is_blob_path(relative_path):
+    return relative_path.replace("\\", "/").startswith(STORE_DIR_NAME + "/")
+
+
+def place_blob(source_path, target_path, link=False):
+    """
+    Puts a copy of source_path at target_path unless it is already there.
+    link=True hard-links instead (for files already inside the Attachments
+    folder), falling back to a copy. The copy goes to a temporary name
+    first, so target_path is never left half-written. Returns True if a
+    file was written.
+    """
+    if os.path.exists(target_path):
+        return False
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    if link:
+        try:
+            os.link(source_path, target_path)
+            return True
+        except OSError:
+            pass
+    tmp_path = target_path + ".tmp"
+    shutil.copyfile(source_path, tmp_path)
+    os.replace(tmp_path, target_path)
+    return True
+
+
+def copy_into_store(source_path, attachments_dir, chunk_bytes=HASH_CHUNK_BYTES, progress=None,
+                    should_cancel=None):
+    """
+    Copies a file into the store, hashing it in the same pass.
+
+    The data goes to a .partial file under store/incoming/ and is renamed
+    to its blob path once complete (or dropped, if that content is
+    already stored). progress(bytes_copied) is called after every chunk;
+    should_cancel() is polled after every chunk and aborts with
+    ImportCancelled. Returns (relative blob path, sha256, size).
+    """
+    incoming_dir = os.path.join(attachments_dir, STORE_DIR_NAME, INCOMING_DIR_NAME)
+    os.makedirs(incoming_dir, exist_ok=True)
+    tmp_path = os.path.join(incoming_dir, uuid.uuid4().hex + ".partial")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(source_path, "rb") as src, open(tmp_path, "wb") as dest:
+            while True:
+                chunk = src.read(chunk_bytes)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                dest.write(chunk)
+                size += len(chunk)
+                if progress:
+                    progress(size)
+                if should_cancel and should_cancel():
+                    raise ImportCancelled()
+        relative_path = blob_relative_path(digest.hexdigest(), source_path)
+        target_path = os.path.join(attachments_dir, relative_path)
+        if os.path.exists(target_path):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            os.replace(tmp_path, target_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return relative_path, digest.hexdigest(), size
+
+
+def attachment_paths_in_database(db_path):
+    """
+    The reading_attachments file_paths in a database file, such as a backup
+    snapshot, and in the per-project files it lists.
+    """
+    paths = set()
+    for path in [db_path] + [path for path in project_file_paths(db_path) if os.path.exists(path)]:
+        conn = sqlite3.connect(path)
+        try:
+            paths.update(row[0] for row in conn.execute("SELECT file_path FROM reading_attachments"))
+        except sqlite3.OperationalError:
+            pass  # No attachments table
+        finally:
+            conn.close()
+    return paths
+
+
+def expand_import_sources(paths):
+    """
+    The files to import for a list of dropped or chosen paths: files as
+    given, folders walked recursively (hidden entries skipped, sorted by
+    path). Duplicates are dropped.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                files.extend(os.path.join(root, name) for name in sorted(names) if not name.startswith("."))
+        elif os.path.isfile(path):
+            files.append(path)
+    return list(dict.fromkeys(os.path.abspath(path) for path in files))
+
+
+class AttachmentImportJob(threading.Thread):
+    """
+    Copies files into the attachment store on a daemon thread.
+
+    Only files are touched here; the caller inserts the
+    reading_attachments rows (AttachmentsMixin.finish_attachment_import)
+    on its own thread once done() reports success, so a cancelled or
+    failed import adds nothing. Blobs it already placed are left for
+    AttachmentsMixin.dedupe_attachment_files.
+
+    A file that cannot be read is skipped and recorded in `failures` as
+    (source_path, message); the other files are still copied and
+    reported.
+
+    progress(bytes_done, bytes_total, file_name) and done(results, error)
+    are called from the import thread; Qt callers should forward them
+    through a signal. results is a list of dicts (source_path,
+    display_name, file_path, sha256, size_bytes); error is None on
+    success and an ImportCancelled after cancel().
+    """
+
+    def __init__(self, source_paths, attachments_dir, chunk_bytes=HASH_CHUNK_BYTES, progress=None, done=None):
+        super().__init__(name="attachment-import", daemon=True)
+        self.source_paths = list(source_paths)
+        self.attachments_dir = attachments_dir
+        self.chunk_bytes = chunk_bytes
+        self.progress = progress
+        self.done = done
+        self.results = []
+        self.failures = []
+        self.error = None
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @staticmethod
+    def _size(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0  # Reported when the copy fails
+
+    def run(self):
+        try:
+            sizes = {path: self._size(path) for path in self.source_paths}
+            total = sum(sizes.values())
+            finished_bytes = 0
+            for source_path in self.source_paths:
+                name = os.path.basename(source_path)
+
+                def on_chunk(copied, name=name, base=finished_bytes):
+                    if self.progress:
+                        self.progress(base + copied, total, name)
+
+                try:
+                    relative_path, digest, size = copy_into_store(
+                        source_path, self.attachments_dir, chunk_bytes=self.chunk_bytes,
+                        progress=on_chunk, should_cancel=self._cancel_event.is_set
+                    )
+                except OSError as e:
+                    print(f"Error importing attachment {source_path}: {e}")
+                    self.failures.append((source_path, e.strerror or str(e)))
+                    finished_bytes += sizes[source_path]
+                    continue
+                finished_bytes += size
+                self.results.append({
+                    "source_path": source_path,
+                    "display_name": name,
+                    "file_path": relative_path,
+                    "sha256": digest,
+                    "size_bytes": size,
+                })
+                if self._cancel_event.is_set():
+                    raise ImportCancelled()
+        except Exception as e:
+            self.error = e
+            if not isinstance(e, ImportCancelled):
+                print(f"Error importing attachments: {e}")
+        if self.done:
+            self.done(self.results, self.error)
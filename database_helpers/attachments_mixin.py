@@ -1,4 +1,31 @@
+import os
+
+from datetime import datetime, timezone
+
+from database_helpers.attachment_store import (
+    STORE_DIR_NAME, AttachmentImportJob, attachment_paths_in_database, blob_relative_path,
+    copy_into_store, expand_import_sources, hash_file, is_blob_path, place_blob
+)
+
+
 class AttachmentsMixin:
+    """
+    Reading attachments. Files are kept in a content-addressed store
+    (attachment_store.py): identical files attached to several readings
+    or projects share one blob. attachment_blobs counts the
+    reading_attachments rows that point at each blob (maintained by
+    triggers, so cascades and project clones are counted too).
+
+    A file nothing in this database uses may still be needed by a backup
+    snapshot, so neither clean-up deletes those:
+    gc_attachment_store (run on close) only drops unused blobs older than
+    the newest snapshot; dedupe_attachment_files (run on request) also
+    clears out old per-reading files and strays.
+    """
+
+    # Attachment file_path values are relative to this folder
+    ATTACHMENTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Attachments")
+
     # ----------------------- reading attachments -----------------------
 
     def get_attachments(self, reading_id):
@@ -29,7 +56,7 @@ class AttachmentsMixin:
             INSERT INTO reading_attachments (reading_id, display_name, file_path, display_order)
             VALUES (?, ?, ?, ?)
         """, (reading_id, display_name, file_path, new_order))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def rename_attachment(self, attachment_id, new_display_name):
@@ -38,18 +65,270 @@ class AttachmentsMixin:
             "UPDATE reading_attachments SET display_name = ? WHERE id = ?",
             (new_display_name, attachment_id)
         )
-        self.conn.commit()
+        self._commit()
 
     def delete_attachment(self, attachment_id):
-        """Deletes an attachment record from the database."""
+        """
+        Deletes an attachment record. Its file is left for
+        gc_attachment_store, which removes it once no attachment or backup
+        snapshot uses it.
+        """
         self.cursor.execute("DELETE FROM reading_attachments WHERE id = ?", (attachment_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_attachment_order(self, ordered_ids):
         """Reorders attachments based on a list of IDs."""
-        for order, att_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE reading_attachments SET display_order = ? WHERE id = ?",
-                (order, att_id)
-            )
-        self.conn.commit()
\ No newline at end of file
+        self._bulk_update_order("reading_attachments", ordered_ids)
+
+    # ----------------------- content-addressed store -----------------------
+
+    def get_attachments_dir(self):
+        return self.ATTACHMENTS_DIR
+
+    def resolve_attachment_path(self, file_path):
+        """Absolute path of a reading_attachments.file_path value."""
+        return os.path.join(self.get_attachments_dir(), file_path)
+
+    def add_attachment_file(self, reading_id, source_path, display_name=None):
+        """
+        Attaches a file to a reading, copying it on the calling thread.
+        The file is stored once per content. Returns the new attachment's
+        id. Use start_attachment_import for large files or many files.
+        """
+        relative_path, digest, size = copy_into_store(source_path, self.get_attachments_dir())
+        ids = self.finish_attachment_import(reading_id, [{
+            "source_path": source_path,
+            "display_name": display_name or os.path.basename(source_path),
+            "file_path": relative_path,
+            "sha256": digest,
+            "size_bytes": size,
+        }])
+        return ids[0] if ids else None
+
+    _attachment_import_jobs = ()
+
+    def start_attachment_import(self, paths, progress=None, done=None):
+        """
+        Copies files (and the files inside any folders in `paths`) into
+        the store on a background thread and returns the running
+        AttachmentImportJob (call .cancel() to abort). progress and done
+        run on the import thread (see AttachmentImportJob). When done
+        reports success, pass its results to finish_attachment_import on
+        this connection's thread; job.failures lists files that could not
+        be read.
+        """
+        job = AttachmentImportJob(expand_import_sources(paths), self.get_attachments_dir(),
+                                  progress=progress, done=done)
+        self._attachment_import_jobs = [j for j in self._attachment_import_jobs if j.is_alive()] + [job]
+        job.start()
+        return job
+
+    def cancel_attachment_imports(self, timeout=5.0):
+        """Cancels running imports and waits for them to delete their partial files."""
+        for job in self._attachment_import_jobs:
+            job.cancel()
+        for job in self._attachment_import_jobs:
+            job.join(timeout)
+        self._attachment_import_jobs = ()
+
+    def finish_attachment_import(self, reading_id, results):
+        """
+        Inserts the reading_attachments rows for copied files in one
+        transaction. Returns the new attachment ids, or None on error.
+        """
+        new_ids = []
+        try:
+            with self.transaction():
+                for result in results:
+                    # A GC pass may have removed a blob that was unused
+                    # while the copy ran; put it back from the source
+                    full_path = self.resolve_attachment_path(result['file_path'])
+                    if not os.path.exists(full_path):
+                        place_blob(result['source_path'], full_path)
+                    self._register_blob(result['file_path'], result['sha256'], result['size_bytes'])
+                    new_ids.append(self.add_attachment(reading_id, result['display_name'], result['file_path']))
+        except Exception as e:
+            print(f"Error adding attachments: {e}")
+            return None
+        return new_ids
+
+    def _register_blob(self, relative_path, digest, size):
+        self.cursor.execute("""
+            INSERT OR IGNORE INTO attachment_blobs (file_path, sha256, size_bytes)
+            VALUES (?, ?, ?)
+        """, (relative_path, digest, size))
+
+    def _dedupe_attachment_rows(self, placed):
+        """
+        Moves every attachment still using a per-reading path into the
+        store (hard-linking the file where possible). The old files are
+        only deleted after the transaction commits (dedupe_attachment_files),
+        so a rollback never points at a missing file. The blob paths it
+        writes are appended to `placed`. Returns (rows moved, duplicate
+        bytes).
+        """
+        self.cursor.execute("SELECT id, file_path FROM reading_attachments")
+        rows = [(row['id'], row['file_path']) for row in self.cursor.fetchall()
+                if not is_blob_path(row['file_path'])]
+        hashed = {}  # legacy path -> (blob path, size)
+        updates = []
+        for attachment_id, file_path in rows:
+            if file_path not in hashed:
+                full_path = self.resolve_attachment_path(file_path)
+                if not os.path.exists(full_path):
+                    print(f"Warning: Attachment file not found, left as is: {full_path}")
+                    hashed[file_path] = None
+                    continue
+                digest, size = hash_file(full_path)
+                relative_path = blob_relative_path(digest, file_path)
+                if place_blob(full_path, self.resolve_attachment_path(relative_path), link=True):
+                    placed.append(relative_path)
+                self._register_blob(relative_path, digest, size)
+                hashed[file_path] = (relative_path, size)
+            if hashed[file_path]:
+                updates.append((hashed[file_path][0], attachment_id))
+        self.cursor.executemany("UPDATE reading_attachments SET file_path = ? WHERE id = ?", updates)
+
+        found = [entry for entry in hashed.values() if entry]
+        duplicate_bytes = sum(size for _path, size in found) - sum(dict(found).values())
+        return len(updates), duplicate_bytes
+
+    def dedupe_attachment_files(self):
+        """
+        Moves per-reading attachment files into the store, then deletes
+        every attachment file nothing uses: old per-reading copies, unused
+        blobs and strays. Files used by backup snapshots are kept. Returns
+        (rows moved, bytes reclaimed), or None on error.
+        """
+        if self.in_transaction_block():
+            raise RuntimeError("Attachment files cannot be cleaned up inside a transaction.")
+        placed = []
+        try:
+            if self.is_project_files_enabled():
+                # One transaction per project file; earlier files stay moved
+                moved = 0
+                for _project_id in self.each_project_file():
+                    placed = []
+                    with self.transaction():
+                        moved += self._dedupe_attachment_rows(placed)[0]
+            else:
+                with self.transaction():
+                    moved, _duplicate_bytes = self._dedupe_attachment_rows(placed)
+        except Exception as e:
+            print(f"Error deduplicating attachments: {e}")
+            # Nothing points at the blobs written for the rolled-back rows
+            for relative_path in placed:
+                self._remove_store_file(self.resolve_attachment_path(relative_path))
+            return None
+
+        attachments_dir = self.get_attachments_dir()
+        self.cursor.execute("SELECT file_path FROM attachment_blobs WHERE ref_count <= 0")
+        candidates = [row['file_path'] for row in self.cursor.fetchall()]
+
+        # A running import has files in the store that have no rows yet
+        importing = any(job.is_alive() for job in self._attachment_import_jobs)
+        swept = [folder for folder in (os.listdir(attachments_dir) if os.path.isdir(attachments_dir) else [])
+                 if folder.isdigit() or (folder == STORE_DIR_NAME and not importing)]
+
+        referenced = self._attachment_file_paths()
+        self.cursor.execute("SELECT file_path FROM attachment_blobs")
+        referenced.update(row['file_path'] for row in self.cursor.fetchall())
+        for folder in swept:  # only folders this application creates
+            for root, _dirs, files in os.walk(os.path.join(attachments_dir, folder)):
+                for name in files:
+                    relative_path = os.path.relpath(os.path.join(root, name), attachments_dir).replace("\\", "/")
+                    if relative_path not in referenced:
+                        candidates.append(relative_path)
+
+        reclaimed = self._remove_attachment_files(candidates)
+
+        for folder in swept:
+            for root, _dirs, _files in os.walk(os.path.join(attachments_dir, folder), topdown=False):
+                if not os.listdir(root):
+                    try:
+                        os.rmdir(root)
+                    except OSError:
+                        pass
+        return moved, reclaimed
+
+    def _attachment_file_paths(self):
+        """Every reading_attachments file_path, in every project file when there are some."""
+        self.cursor.execute("SELECT file_path FROM reading_attachments")
+        paths = {row['file_path'] for row in self.cursor.fetchall()}
+        for _project_id in self.each_project_file():
+            self.cursor.execute("SELECT file_path FROM reading_attachments")
+            paths.update(row['file_path'] for row in self.cursor.fetchall())
+        return paths
+
+    def _backup_attachment_paths(self):
+        """Attachment file_paths used by the backup snapshots; restoring one needs those files."""
+        paths = set()
+        for _when, path in self.list_backups():
+            try:
+                paths.update(attachment_paths_in_database(path))
+            except Exception as e:
+                print(f"Warning: Could not read attachments of snapshot {path}. {e}")
+        return paths
+
+    def _remove_store_file(self, full_path):
+        """Deletes a file; returns the bytes freed (0 while other hard links remain)."""
+        try:
+            stat = os.stat(full_path)
+            os.remove(full_path)
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            print(f"Warning: Could not remove attachment file {full_path}. {e}")
+            return 0
+        return stat.st_size if stat.st_nlink <= 1 else 0
+
+    def _remove_attachment_files(self, candidates):
+        """
+        Deletes the candidate files (and their unused blob rows), except
+        those a backup snapshot uses or a blob row still counts. The files
+        are only deleted once the row deletions have committed, so a
+        rollback never leaves a row pointing at a missing file. Returns
+        the bytes reclaimed.
+        """
+        if not candidates:
+            return 0
+        kept = self._backup_attachment_paths()
+        attachments_dir = self.get_attachments_dir()
+        removable = []
+        try:
+            with self.transaction():
+                for relative_path in candidates:
+                    if relative_path in kept:
+                        continue
+                    self.cursor.execute(
+                        "DELETE FROM attachment_blobs WHERE file_path = ? AND ref_count <= 0", (relative_path,))
+                    self.cursor.execute("SELECT 1 FROM attachment_blobs WHERE file_path = ?", (relative_path,))
+                    if self.cursor.fetchone() is None:
+                        removable.append(relative_path)
+        except Exception as e:
+            print(f"Error removing attachment files: {e}")
+            return 0
+        reclaimed = sum(self._remove_store_file(os.path.join(attachments_dir, relative_path))
+                        for relative_path in removable)
+        if removable:
+            print(f"Attachment store: removed {len(removable)} unused file(s), {reclaimed:,} bytes reclaimed.")
+        return reclaimed
+
+    def gc_attachment_store(self):
+        """
+        Deletes unused blobs (ref_count <= 0) added before the newest backup
+        snapshot that no snapshot refers to. Blobs added since could still
+        be picked up by the next snapshot, and without snapshots nothing is
+        deleted; dedupe_attachment_files cleans up the rest on request.
+        Returns the bytes reclaimed.
+        """
+        if self.in_transaction_block():
+            return 0
+        snapshots = self.list_backups()
+        if not snapshots:
+            return 0
+        # created_at is CURRENT_TIMESTAMP (UTC); snapshot names use local time
+        newest = datetime.fromtimestamp(snapshots[0][0].timestamp(), timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        self.cursor.execute(
+            "SELECT file_path FROM attachment_blobs WHERE ref_count <= 0 AND created_at < ?", (newest,))
+        return self._remove_attachment_files([row['file_path'] for row in self.cursor.fetchall()])
@@ -0,0 +1,145 @@
+import time
+from collections import OrderedDict
+
+
+class AutosaveFlushError(Exception):
+    """
+    A flush did not write everything; the failed writes are still pending.
+    `committed` is the number of other writes that did commit.
+    """
+
+    def __init__(self, message, committed=0):
+        super().__init__(message)
+        self.committed = committed
+
+
+class AutosaveQueue:
+    """
+    Write-behind buffer for field edits.
+
+    put() records the latest value for one (table, row_id, column); later
+    puts for the same field replace it, so a burst of keystrokes becomes a
+    single UPDATE. flush() runs every pending write inside one
+    db.transaction().
+
+    Crash safety: a write is only dropped from the queue once the
+    transaction holding it has committed. If any write fails the whole
+    flush is rolled back and every write stays queued (behind any newer
+    value put since), so the next flush retries it. What a crash can lose
+    is what was put since the last successful flush.
+
+    Once ISOLATE_AFTER flushes in a row have failed, or when flush() is
+    called with isolate=True, each write gets its own savepoint instead:
+    a write that keeps failing stays queued on its own (see failed_writes)
+    and no longer holds back the rest.
+    """
+
+    ISOLATE_AFTER = 2
+
+    def __init__(self, db):
+        self.db = db
+        self._pending = OrderedDict()  # (table, row_id, column) -> (writer, value)
+        self.last_put = None  # time.monotonic() of the latest put
+        self.writes_coalesced = 0
+        self._failed_flushes = 0  # whole-batch failures in a row
+        self._errors = {}  # (table, row_id, column) -> error of its last isolated attempt
+
+    def put(self, table, row_id, column, value, writer):
+        """
+        Queues writer(row_id, column, value), a mixin update method such
+        as db.update_research_node_field, replacing any pending value for
+        the same field.
+        """
+        key = (table, row_id, column)
+        if key in self._pending:
+            self.writes_coalesced += 1
+            self._pending.move_to_end(key)
+        self._pending[key] = (writer, value)
+        self.last_put = time.monotonic()
+
+    def pending_value(self, table, row_id, column, default=None):
+        """The queued value for a field, or default if none is pending."""
+        entry = self._pending.get((table, row_id, column))
+        return entry[1] if entry else default
+
+    def has_pending(self, table=None, row_id=None):
+        if table is None:
+            return bool(self._pending)
+        return any(key[0] == table and (row_id is None or key[1] == row_id) for key in self._pending)
+
+    def discard(self, table, row_id):
+        """Drops pending writes for a row, e.g. one that is being deleted."""
+        for key in [key for key in self._pending if key[0] == table and key[1] == row_id]:
+            del self._pending[key]
+            self._errors.pop(key, None)
+
+    def failed_writes(self):
+        """[(table, row_id, column, error)] for pending writes that failed on their own."""
+        return [key + (error,) for key, error in self._errors.items() if key in self._pending]
+
+    def __len__(self):
+        return len(self._pending)
+
+    def flush(self, isolate=False):
+        """
+        Writes everything pending in one transaction. Returns the number of
+        writes committed. Raises AutosaveFlushError if any write failed;
+        in a whole-batch flush that means nothing was written.
+        """
+        if not self._pending:
+            return 0
+        if isolate or self._failed_flushes >= self.ISOLATE_AFTER:
+            return self._flush_isolated()
+        batch, self._pending = self._pending, OrderedDict()
+        try:
+            with self.db.transaction():
+                for (table, row_id, column), (writer, value) in batch.items():
+                    writer(row_id, column, value)
+                if self.db.transaction_failed():
+                    # The mixin printed the error; raise so the block rolls back
+                    raise AutosaveFlushError("An autosave write failed.")
+        except Exception as e:
+            self._failed_flushes += 1
+            self._requeue(batch)
+            if isinstance(e, AutosaveFlushError):
+                raise
+            raise AutosaveFlushError(str(e)) from e
+        self._failed_flushes = 0
+        return len(batch)
+
+    def _flush_isolated(self):
+        """flush() with a savepoint per write; only the writes that fail stay queued."""
+        batch, self._pending = self._pending, OrderedDict()
+        failed = OrderedDict()
+        errors = {}
+        try:
+            with self.db.transaction():
+                for key, (writer, value) in batch.items():
+                    try:
+                        with self.db.transaction():
+                            writer(key[1], key[2], value)
+                            if self.db.transaction_failed():
+                                raise AutosaveFlushError("The write was rolled back.")
+                    except Exception as e:
+                        failed[key] = (writer, value)
+                        errors[key] = str(e)
+        except Exception as e:
+            # The commit itself failed: nothing was written
+            self._failed_flushes += 1
+            self._requeue(batch)
+            raise AutosaveFlushError(str(e)) from e
+
+        self._requeue(failed)
+        for key in batch:
+            self._errors.pop(key, None)
+        self._errors.update(errors)
+        committed = len(batch) - len(failed)
+        if failed:
+            raise AutosaveFlushError(f"{len(failed)} autosave write(s) failed.", committed)
+        self._failed_flushes = 0
+        return committed
+
+    def _requeue(self, writes):
+        """Puts writes back, behind anything put since they were taken out."""
+        writes.update(self._pending)
+        self._pending = writes
@@ -0,0 +1,288 @@
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from database_helpers.project_files import PROJECT_FILE_PATTERN, project_files_dir, registered_project_files
+
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.005
+BACKUP_MAX_RESTARTS = 3
+
+SNAPSHOT_TIME_FORMAT = "%Y%m%d-%H%M%S"
+
+
+class BackupCancelled(Exception):
+    """Raised inside the backup progress callback to abort a running backup."""
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def backup_database_file(src_path, dest_path, pages=BACKUP_PAGES_PER_STEP, progress=None,
+                         should_cancel=None, sleep=BACKUP_STEP_SLEEP):
+    """
+    Copies a live database with the sqlite3 online backup API.
+
+    The copy is made from a private connection, `pages` pages per step,
+    so other connections can keep writing between steps, and is written
+    to a temporary file that replaces dest_path only once it is complete.
+
+    progress(copied_pages, total_pages) is called after every step.
+    should_cancel() is polled after every step; returning True aborts the
+    backup with BackupCancelled.
+
+    SQLite restarts an incremental backup whenever another connection
+    writes to the source. If that happens more than BACKUP_MAX_RESTARTS
+    times, the copy is redone in a single step from one read snapshot.
+    """
+    tmp_path = dest_path + ".partial"
+    dest_dir = os.path.dirname(os.path.abspath(dest_path))
+    os.makedirs(dest_dir, exist_ok=True)
+
+    state = {"remaining": None, "restarts": 0}
+
+    def on_step(status, remaining, total):
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] > BACKUP_MAX_RESTARTS:
+                raise _TooManyRestarts()
+        state["remaining"] = remaining
+        if progress:
+            progress(total - remaining, total)
+        if should_cancel and should_cancel():
+            raise BackupCancelled()
+
+    src = sqlite3.connect(src_path)
+    try:
+        src.execute("PRAGMA busy_timeout = 10000")
+        for step_pages in (pages, -1):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            dest = sqlite3.connect(tmp_path)
+            try:
+                src.backup(dest, pages=step_pages, progress=on_step, sleep=sleep)
+                break
+            except _TooManyRestarts:
+                print("Warning: Database changed too often during backup; copying in one step.")
+            finally:
+                dest.close()
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        src.close()
+    return dest_path
+
+
+def backup_with_project_files(src_path, dest_path, pages=BACKUP_PAGES_PER_STEP, progress=None,
+                              should_cancel=None, sleep=BACKUP_STEP_SLEEP):
+    """
+    Copies a database with backup_database_file, then every per-project
+    file the copy lists in project_files into <dest name>_projects/, each
+    through the backup API as well. progress() restarts for each file.
+
+    The main file goes first, so each project it lists has its file by
+    then. If one disappears before it is copied because the project was
+    deleted in the meantime, the whole backup is taken again. Each file
+    is a consistent copy on its own; edits made while the backup runs
+    may be in some of the files and not in others.
+    """
+    src_dir = project_files_dir(src_path)
+    dest_dir = project_files_dir(dest_path)
+    for _attempt in range(BACKUP_MAX_RESTARTS + 1):
+        backup_database_file(src_path, dest_path, pages=pages, progress=progress,
+                             should_cancel=should_cancel, sleep=sleep)
+        copied = set()
+        complete = True
+        for project_id, file_name in registered_project_files(dest_path).items():
+            src_file = os.path.join(src_dir, file_name)
+            if not os.path.exists(src_file):
+                if project_id not in registered_project_files(src_path):
+                    complete = False
+                    break
+                print(f"Warning: Project file {src_file} is missing; it is not in the backup.")
+                continue
+            backup_database_file(src_file, os.path.join(dest_dir, file_name), pages=pages, progress=progress,
+                                 should_cancel=should_cancel, sleep=sleep)
+            copied.add(file_name)
+        if complete:
+            # Project files left from an earlier backup to the same path
+            if os.path.isdir(dest_dir):
+                for name in os.listdir(dest_dir):
+                    if PROJECT_FILE_PATTERN.match(name) and name not in copied:
+                        os.remove(os.path.join(dest_dir, name))
+            return dest_path
+        print("Warning: A project was deleted during the backup; copying again.")
+    raise RuntimeError(f"Projects of {src_path} kept changing during the backup.")
+
+
+class BackupJob(threading.Thread):
+    """
+    Runs backup_with_project_files on a daemon thread.
+
+    progress(copied, total) and done(dest_path, error) are called from the
+    backup thread; Qt callers should forward them through a signal.
+    `error` is None on success and a BackupCancelled after cancel().
+    """
+
+    def __init__(self, src_path, dest_path, pages=BACKUP_PAGES_PER_STEP, progress=None, done=None):
+        super().__init__(name="database-backup", daemon=True)
+        self.src_path = src_path
+        self.dest_path = dest_path
+        self.pages = pages
+        self.progress = progress
+        self.done = done
+        self.error = None
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            backup_with_project_files(self.src_path, self.dest_path, pages=self.pages, progress=self.progress,
+                                      should_cancel=self._cancel_event.is_set)
+        except Exception as e:
+            self.error = e
+            if not isinstance(e, BackupCancelled):
+                print(f"Error backing up database to {self.dest_path}: {e}")
+        if self.done:
+            self.done(self.dest_path, self.error)
+
+
+# --- Rotating snapshots ---
+
+def snapshot_name(db_path, when):
+    base = os.path.splitext(os.path.basename(db_path))[0]
+    return f"{base}_{when.strftime(SNAPSHOT_TIME_FORMAT)}.db"
+
+
+def list_snapshots(db_path, backup_dir):
+    """Returns [(datetime, path)] of the snapshots of db_path, newest first."""
+    base = os.path.splitext(os.path.basename(db_path))[0]
+    pattern = re.compile(re.escape(base) + r"_(\d{8}-\d{6})\.db$")
+    snapshots = []
+    try:
+        names = os.listdir(backup_dir)
+    except OSError:
+        return []
+    for name in names:
+        match = pattern.match(name)
+        if not match:
+            continue
+        try:
+            when = datetime.strptime(match.group(1), SNAPSHOT_TIME_FORMAT)
+        except ValueError:
+            continue
+        snapshots.append((when, os.path.join(backup_dir, name)))
+    snapshots.sort(reverse=True)
+    return snapshots
+
+
+def snapshots_to_keep(snapshots, hourly, daily, weekly):
+    """
+    Grandfather-father-son retention: keeps the newest snapshot of each of
+    the last `hourly` hours, `daily` days and `weekly` ISO weeks that have
+    one. `snapshots` is newest first, as returned by list_snapshots.
+    """
+    keep = {snapshots[0][1]} if snapshots else set()
+    buckets = (
+        (hourly, lambda when: when.strftime("%Y%m%d%H")),
+        (daily, lambda when: when.strftime("%Y%m%d")),
+        (weekly, lambda when: "%d-%02d" % when.isocalendar()[:2]),
+    )
+    for limit, bucket_of in buckets:
+        seen = set()
+        for when, path in snapshots:
+            if len(seen) >= limit:
+                break
+            bucket = bucket_of(when)
+            if bucket not in seen:
+                seen.add(bucket)
+                keep.add(path)
+    return keep
+
+
+class BackupScheduler(threading.Thread):
+    """
+    Takes a snapshot of the database into backup_dir once an hour (when
+    the newest one is older than `interval` seconds) and prunes old
+    snapshots with snapshots_to_keep. Runs on a daemon thread and copies
+    incrementally, so edits are never blocked for the whole copy. Each
+    snapshot's project files go in <snapshot name>_projects/.
+    """
+
+    CHECK_INTERVAL = 300  # seconds between "is a snapshot due?" checks
+
+    def __init__(self, db_path, backup_dir, hourly=24, daily=7, weekly=4, interval=3600):
+        super().__init__(name="database-backup-scheduler", daemon=True)
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.hourly = hourly
+        self.daily = daily
+        self.weekly = weekly
+        self.interval = interval
+        self.last_error = None
+        self._stop_event = threading.Event()
+
+    def stop(self, timeout=None):
+        """Stops the scheduler, aborting a snapshot that is in progress."""
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+                self.last_error = None
+            except BackupCancelled:
+                break
+            except Exception as e:
+                self.last_error = e
+                print(f"Error in scheduled database backup: {e}")
+            self._stop_event.wait(self.CHECK_INTERVAL)
+
+    def snapshot_due(self, now=None):
+        snapshots = list_snapshots(self.db_path, self.backup_dir)
+        if not snapshots:
+            return True
+        now = now or datetime.now()
+        return (now - snapshots[0][0]).total_seconds() >= self.interval
+
+    def run_once(self, now=None):
+        """Takes a snapshot if one is due, then prunes. Returns the new snapshot path or None."""
+        new_path = None
+        if self.snapshot_due(now):
+            now = now or datetime.now()
+            new_path = os.path.join(self.backup_dir, snapshot_name(self.db_path, now))
+            started = time.perf_counter()
+            backup_with_project_files(self.db_path, new_path, should_cancel=self._stop_event.is_set)
+            print(f"Database snapshot saved to {new_path} ({time.perf_counter() - started:.1f} s)")
+        self.prune()
+        return new_path
+
+    def prune(self):
+        """Deletes the snapshots the retention policy no longer keeps."""
+        snapshots = list_snapshots(self.db_path, self.backup_dir)
+        keep = snapshots_to_keep(snapshots, self.hourly, self.daily, self.weekly)
+        removed = []
+        for _when, path in snapshots:
+            if path in keep:
+                continue
+            try:
+                os.remove(path)
+                removed.append(path)
+            except OSError as e:
+                print(f"Warning: Could not remove old snapshot {path}. {e}")
+                continue
+            if os.path.isdir(project_files_dir(path)):
+                shutil.rmtree(project_files_dir(path), ignore_errors=True)
+        return removed
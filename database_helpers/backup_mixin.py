@@ -0,0 +1,133 @@
+import os
+import sqlite3
+
+from database_helpers.backup import (
+    BACKUP_PAGES_PER_STEP, BackupJob, BackupScheduler, backup_with_project_files, list_snapshots
+)
+
+
+class BackupMixin:
+    """
+    Mixin for online backups (see backup.py). Copies are taken with the
+    sqlite3 backup API from a separate connection, so they are consistent
+    in WAL mode and only contain committed data. Per-project files
+    (ProjectFilesMixin) are copied next to the backup.
+    """
+
+    BACKUP_SETTING_COLUMNS = [
+        'backup_enabled', 'backup_dir', 'backup_keep_hourly', 'backup_keep_daily', 'backup_keep_weekly'
+    ]
+    DEFAULT_BACKUP_SETTINGS = {
+        'backup_enabled': 0,  # Off until switched on in Database Diagnostics
+        'backup_dir': None,  # None = a "backups" folder next to the database
+        'backup_keep_hourly': 24,
+        'backup_keep_daily': 7,
+        'backup_keep_weekly': 4,
+    }
+
+    _backup_scheduler = None
+
+    def backup_database(self, dest_path, pages=BACKUP_PAGES_PER_STEP, progress=None):
+        """
+        Copies the database to dest_path, `pages` pages per step.
+        Blocks the caller; use start_backup to copy in the background.
+        """
+        src = self._get_db_file_path()
+        if not src:
+            # In-memory databases cannot be opened a second time
+            dest = sqlite3.connect(dest_path)
+            try:
+                self.conn.backup(dest, pages=pages)
+            finally:
+                dest.close()
+            return dest_path
+        return backup_with_project_files(src, dest_path, pages=pages, progress=progress)
+
+    def start_backup(self, dest_path, pages=BACKUP_PAGES_PER_STEP, progress=None, done=None):
+        """
+        Copies the database to dest_path on a background thread and returns
+        the running BackupJob (call .cancel() to abort). progress(copied,
+        total) and done(dest_path, error) run on the backup thread.
+        """
+        src = self._get_db_file_path()
+        if not src:
+            raise ValueError("In-memory databases can only be backed up with backup_database.")
+        job = BackupJob(src, dest_path, pages=pages, progress=progress, done=done)
+        job.start()
+        return job
+
+    # --- Scheduled snapshots ---
+
+    def get_backup_settings(self):
+        """Returns the scheduled snapshot settings, filled from the defaults."""
+        settings = dict(self.DEFAULT_BACKUP_SETTINGS)
+        try:
+            cols = ", ".join(self.BACKUP_SETTING_COLUMNS)
+            row = self.conn.execute(f"SELECT {cols} FROM user_settings WHERE id = 1").fetchone()
+            if row:
+                for col in self.BACKUP_SETTING_COLUMNS:
+                    if row[col] is not None:
+                        settings[col] = row[col]
+        except Exception as e:
+            print(f"Error fetching backup settings: {e}")
+        return settings
+
+    def save_backup_settings(self, settings):
+        """
+        Stores the scheduled snapshot settings and restarts the scheduler,
+        which only runs while backup_enabled is set.
+        """
+        clean = self.get_backup_settings()
+        clean.update({col: settings[col] for col in self.BACKUP_SETTING_COLUMNS if col in settings})
+        set_clause = ", ".join([f"{col} = ?" for col in self.BACKUP_SETTING_COLUMNS])
+        params = [clean[col] for col in self.BACKUP_SETTING_COLUMNS]
+        try:
+            self.cursor.execute("INSERT OR IGNORE INTO user_settings (id) VALUES (1)")
+            self.cursor.execute(f"UPDATE user_settings SET {set_clause} WHERE id = 1", tuple(params))
+            self._commit()
+        except Exception as e:
+            print(f"Error saving backup settings: {e}")
+            self._rollback()
+            return
+        self.stop_backup_scheduler()
+        self.start_backup_scheduler()
+
+    def get_backup_dir(self):
+        """Folder the scheduled snapshots are written to."""
+        settings = self.get_backup_settings()
+        if settings['backup_dir']:
+            return settings['backup_dir']
+        db_path = self._get_db_file_path()
+        return os.path.join(os.path.dirname(os.path.abspath(db_path)), "backups")
+
+    def list_backups(self):
+        """Returns [(datetime, path)] of the scheduled snapshots, newest first."""
+        db_path = self._get_db_file_path()
+        if not db_path:
+            return []
+        return list_snapshots(db_path, self.get_backup_dir())
+
+    def start_backup_scheduler(self):
+        """
+        Starts taking hourly snapshots with hourly/daily/weekly rotation,
+        if enabled. Returns the BackupScheduler, or None.
+        """
+        db_path = self._get_db_file_path()
+        settings = self.get_backup_settings()
+        if not db_path or not settings['backup_enabled']:
+            return None
+        if self._backup_scheduler is None:
+            self._backup_scheduler = BackupScheduler(
+                db_path, self.get_backup_dir(),
+                hourly=int(settings['backup_keep_hourly']),
+                daily=int(settings['backup_keep_daily']),
+                weekly=int(settings['backup_keep_weekly'])
+            )
+            self._backup_scheduler.start()
+        return self._backup_scheduler
+
+    def stop_backup_scheduler(self, timeout=5.0):
+        """Stops the scheduler, aborting a snapshot that is in progress."""
+        if self._backup_scheduler is not None:
+            self._backup_scheduler.stop(timeout)
+            self._backup_scheduler = None
@@ -0,0 +1,185 @@
+import os
+import sys
+
+
+class ConnectionProfileMixin:
+    """
+    Mixin for tuning the SQLite connection (journal mode, sync level, caches).
+    The active values are stored in user_settings; blank columns fall back
+    to the default profile.
+    """
+
+    CONNECTION_SETTING_COLUMNS = [
+        'db_journal_mode', 'db_synchronous', 'db_mmap_size',
+        'db_cache_size', 'db_temp_store', 'db_busy_timeout'
+    ]
+
+    CONNECTION_PROFILES = {
+        # WAL lets autosave commits append to the log instead of rewriting
+        # the rollback journal, and NORMAL only fsyncs at checkpoints.
+        'performance': {
+            'db_journal_mode': 'WAL',
+            'db_synchronous': 'NORMAL',
+            'db_mmap_size': 268435456,  # 256 MB
+            'db_cache_size': -65536,  # negative = KiB, so 64 MB
+            'db_temp_store': 'MEMORY',
+            'db_busy_timeout': 5000,
+        },
+        # Used for read-only files and network mounts, where WAL's shared
+        # memory file is either impossible to create or unsafe.
+        'safe': {
+            'db_journal_mode': 'DELETE',
+            'db_synchronous': 'FULL',
+            'db_mmap_size': 0,
+            'db_cache_size': -16384,
+            'db_temp_store': 'DEFAULT',
+            'db_busy_timeout': 10000,
+        },
+    }
+    DEFAULT_CONNECTION_PROFILE = 'performance'
+    FALLBACK_CONNECTION_PROFILE = 'safe'
+
+    _ALLOWED_PRAGMA_VALUES = {
+        'db_journal_mode': {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'},
+        'db_synchronous': {'OFF', 'NORMAL', 'FULL', 'EXTRA'},
+        'db_temp_store': {'DEFAULT', 'FILE', 'MEMORY'},
+    }
+
+    NETWORK_FILESYSTEMS = {
+        'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'afs', 'ncpfs', '9p', 'fuse.sshfs'
+    }
+
+    def _get_db_file_path(self):
+        """Returns the path of the main database file ('' for in-memory)."""
+        row = self.conn.execute("PRAGMA database_list").fetchone()
+        return row[2] if row else ""
+
+    def _is_network_path(self, path):
+        """Best-effort check for a database file on a network share."""
+        if path.startswith("\\\\") or path.startswith("//"):
+            return True
+
+        if sys.platform == "win32":
+            try:
+                import ctypes
+                drive = os.path.splitdrive(os.path.abspath(path))[0]
+                if drive:
+                    DRIVE_REMOTE = 4
+                    return ctypes.windll.kernel32.GetDriveTypeW(drive + "\\") == DRIVE_REMOTE
+            except Exception:
+                return False
+            return False
+
+        try:
+            real_path = os.path.realpath(path)
+            best_mount, best_type = "", ""
+            with open("/proc/mounts", encoding="utf-8") as mounts:
+                for line in mounts:
+                    parts = line.split()
+                    if len(parts) < 3:
+                        continue
+                    mount_point, fs_type = parts[1], parts[2]
+                    # Match whole path components: /mnt/nas must not claim /mnt/nas2
+                    on_mount = real_path == mount_point or real_path.startswith(mount_point.rstrip("/") + "/")
+                    if on_mount and len(mount_point) > len(best_mount):
+                        best_mount, best_type = mount_point, fs_type
+            return best_type in self.NETWORK_FILESYSTEMS
+        except OSError:
+            return False
+
+    def _needs_safe_connection_profile(self, path):
+        """True when WAL and mmap should not be used for this database file."""
+        if not path:
+            return True  # In-memory databases cannot use WAL
+        if not os.access(path, os.W_OK):
+            return True
+        # WAL creates -wal/-shm files next to the database
+        if not os.access(os.path.dirname(os.path.abspath(path)), os.W_OK):
+            return True
+        return self._is_network_path(path)
+
+    def _normalize_connection_settings(self, settings):
+        """Validates settings against the allowed PRAGMA values, using defaults for anything invalid."""
+        defaults = self.CONNECTION_PROFILES[self.DEFAULT_CONNECTION_PROFILE]
+        clean = {}
+        for col in self.CONNECTION_SETTING_COLUMNS:
+            value = settings.get(col)
+            if col in self._ALLOWED_PRAGMA_VALUES:
+                value = str(value).upper() if value is not None else None
+                if value not in self._ALLOWED_PRAGMA_VALUES[col]:
+                    value = defaults[col]
+            else:
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    value = defaults[col]
+            clean[col] = value
+        return clean
+
+    def get_connection_settings(self):
+        """Returns the stored connection settings, filled from the default profile."""
+        stored = {}
+        try:
+            cols = ", ".join(self.CONNECTION_SETTING_COLUMNS)
+            row = self.conn.execute(f"SELECT {cols} FROM user_settings WHERE id = 1").fetchone()
+            if row:
+                stored = {col: row[col] for col in self.CONNECTION_SETTING_COLUMNS}
+        except Exception as e:
+            print(f"Error fetching connection settings: {e}")
+        return self._normalize_connection_settings(stored)
+
+    def save_connection_settings(self, settings):
+        """Stores connection settings in user_settings and applies them."""
+        clean = self._normalize_connection_settings(settings)
+        set_clause = ", ".join([f"{col} = ?" for col in self.CONNECTION_SETTING_COLUMNS])
+        params = [clean[col] for col in self.CONNECTION_SETTING_COLUMNS]
+        try:
+            self.cursor.execute("INSERT OR IGNORE INTO user_settings (id) VALUES (1)")
+            self.cursor.execute(f"UPDATE user_settings SET {set_clause} WHERE id = 1", tuple(params))
+            self._commit()
+        except Exception as e:
+            print(f"Error saving connection settings: {e}")
+            self._rollback()
+            return
+        self.apply_connection_profile()
+
+    def save_connection_profile(self, profile_name):
+        """Stores one of the named CONNECTION_PROFILES as the active settings."""
+        if profile_name not in self.CONNECTION_PROFILES:
+            print(f"Error: Unknown connection profile '{profile_name}'")
+            return
+        self.save_connection_settings(self.CONNECTION_PROFILES[profile_name])
+
+    def apply_connection_profile(self):
+        """
+        Applies the stored connection settings to the open connection.
+        Falls back to the 'safe' profile for read-only, in-memory or
+        network-mounted files, and whenever SQLite refuses WAL.
+        Returns the settings that are actually in effect.
+        """
+        settings = self.get_connection_settings()
+        path = self._get_db_file_path()
+        if self._needs_safe_connection_profile(path):
+            settings = dict(self.CONNECTION_PROFILES[self.FALLBACK_CONNECTION_PROFILE])
+            if not path:
+                # In-memory databases only have MEMORY (or OFF) journals
+                settings['db_journal_mode'] = 'MEMORY'
+
+        try:
+            mode = self.conn.execute(f"PRAGMA journal_mode = {settings['db_journal_mode']}").fetchone()[0]
+            if str(mode).upper() != settings['db_journal_mode']:
+                print(f"Warning: journal_mode {settings['db_journal_mode']} not available, using {mode}.")
+                settings = dict(self.CONNECTION_PROFILES[self.FALLBACK_CONNECTION_PROFILE])
+                mode = self.conn.execute(f"PRAGMA journal_mode = {settings['db_journal_mode']}").fetchone()[0]
+            settings['db_journal_mode'] = str(mode).upper()
+
+            self.conn.execute(f"PRAGMA synchronous = {settings['db_synchronous']}")
+            self.conn.execute(f"PRAGMA mmap_size = {int(settings['db_mmap_size'])}")
+            self.conn.execute(f"PRAGMA cache_size = {int(settings['db_cache_size'])}")
+            self.conn.execute(f"PRAGMA temp_store = {settings['db_temp_store']}")
+            self.conn.execute(f"PRAGMA busy_timeout = {int(settings['db_busy_timeout'])}")
+        except Exception as e:
+            print(f"Warning: Could not apply connection profile. {e}")
+
+        self.active_connection_settings = settings
+        return settings
@@ -0,0 +1,60 @@
+from contextlib import nullcontext
+
+
+class DiagnosticsMixin:
+    """
+    Mixin exposing the optional SQL profiler (see query_profiler.py).
+    Profiling is chosen when the connection is opened, so the setting
+    stored here takes effect on the next start.
+    """
+
+    def get_query_profiler(self):
+        """Returns the active QueryProfiler, or None when profiling is off."""
+        return getattr(self.conn, "profiler", None)
+
+    def get_query_stats(self):
+        """Returns the collected query statistics, or None when profiling is off."""
+        profiler = self.get_query_profiler()
+        return profiler.get_stats() if profiler else None
+
+    def profile_action(self, name):
+        """
+        Context manager naming a UI action for N+1 detection. Does nothing
+        when profiling is off.
+        """
+        profiler = self.get_query_profiler()
+        return profiler.action(name) if profiler else nullcontext()
+
+    def reset_query_stats(self):
+        profiler = self.get_query_profiler()
+        if profiler:
+            profiler.reset()
+
+    def dump_query_stats(self, path):
+        """Writes the query statistics to a JSON file. Returns False when profiling is off."""
+        profiler = self.get_query_profiler()
+        if not profiler:
+            return False
+        profiler.dump_json(path)
+        return True
+
+    def is_query_profiling_saved(self):
+        """True if profiling is switched on in user_settings."""
+        try:
+            self.cursor.execute("SELECT db_profile_queries FROM user_settings WHERE id = 1")
+            row = self.cursor.fetchone()
+            return bool(row and row[0])
+        except Exception as e:
+            print(f"Error reading query profiling setting: {e}")
+            return False
+
+    def save_query_profiling(self, enabled):
+        """Stores whether to profile queries from the next start on."""
+        try:
+            self.cursor.execute("INSERT OR IGNORE INTO user_settings (id) VALUES (1)")
+            self.cursor.execute("UPDATE user_settings SET db_profile_queries = ? WHERE id = 1",
+                                (1 if enabled else 0,))
+            self._commit()
+        except Exception as e:
+            print(f"Error saving query profiling setting: {e}")
+            self._rollback()
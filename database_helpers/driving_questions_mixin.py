@@ -52,6 +52,91 @@ class DrivingQuestionsMixin:
 
         return [r for r in all_rows if r['parent_id'] == parent_id]
 
+    def get_driving_question_forest(self, reading_id):
+        """
+        Gets every driving question for a reading in one query and links
+        them into a forest through a parent_id index.
+
+        Returns (roots, cycle_ids):
+        - roots: root questions, each with a 'children' list (recursively).
+        - cycle_ids: ids of questions whose parent chain loops back on
+          itself. These can never be reached from a root.
+        """
+        return self._link_driving_question_forest(self.get_driving_questions(reading_id, parent_id=True))
+
+    def _link_driving_question_forest(self, all_rows):
+        """Adds 'children' to every row; returns (roots, cycle_ids) as get_driving_question_forest."""
+        by_id = {}
+        children_of = {}
+        for row in all_rows:
+            by_id[row['id']] = row
+            children_of.setdefault(row['parent_id'], []).append(row)
+        for row in all_rows:
+            row['children'] = children_of.get(row['id'], [])
+        roots = children_of.get(None, [])
+
+        reached = set()
+        stack = list(roots)
+        while stack:
+            node = stack.pop()
+            if node['id'] in reached:
+                continue
+            reached.add(node['id'])
+            stack.extend(node['children'])
+
+        # Anything unreached either has a missing parent or sits on/under a
+        # cycle. Walk each parent chain once to find the cycle members.
+        cycle_ids = []
+        walked = {}  # id -> True while on the current walk, False when done
+        for row in all_rows:
+            if row['id'] in reached or row['id'] in walked:
+                continue
+            path = []
+            node = row
+            while node is not None and node['id'] not in walked:
+                walked[node['id']] = True
+                path.append(node['id'])
+                node = by_id.get(node['parent_id'])
+            if node is not None and walked[node['id']]:
+                cycle_ids.extend(path[path.index(node['id']):])
+            for node_id in path:
+                walked[node_id] = False
+
+        return roots, cycle_ids
+
+    def get_driving_questions_tree_order(self, reading_id):
+        """
+        Gets every driving question as a flat list in tree (pre-order)
+        order, each with a 'depth' key (0 for roots).
+
+        Questions no root leads to are not dropped: one whose parent is
+        missing (or filtered out) follows the tree with its own subtree,
+        from depth 0; questions on or under a parent cycle come last, at
+        depth 0.
+        """
+        all_rows = self.get_driving_questions(reading_id, parent_id=True)
+        roots, _cycle_ids = self._link_driving_question_forest(all_rows)
+        row_ids = {row['id'] for row in all_rows}
+        orphans = [row for row in all_rows if row['parent_id'] is not None and row['parent_id'] not in row_ids]
+
+        ordered = []
+        seen = set()
+        stack = [(q, 0) for q in reversed(roots + orphans)]
+        while stack:
+            q_data, depth = stack.pop()
+            if q_data['id'] in seen:
+                continue
+            seen.add(q_data['id'])
+            q_data['depth'] = depth
+            ordered.append(q_data)
+            stack.extend((child, depth + 1) for child in reversed(q_data['children']))
+
+        for row in all_rows:
+            if row['id'] not in seen:
+                row['depth'] = 0
+                ordered.append(row)
+        return ordered
+
     def get_driving_question_details(self, question_id):
         """ MODIFIED TO LOAD TAGS FROM VIRTUAL ANCHOR """
         self.cursor.execute(
@@ -179,11 +264,11 @@ class DrivingQuestionsMixin:
             # Now, handle the tags by creating/linking the virtual anchor
             self._handle_virtual_anchor_tags(project_id, reading_id, new_question_id, 'dq', data, 'question_text')
 
-            self.conn.commit()
+            self._commit()
             return new_question_id
         except Exception as e:
             print(f"Error in add_driving_question: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     def update_driving_question(self, question_id, data):
@@ -225,10 +310,10 @@ class DrivingQuestionsMixin:
             # Update the virtual anchor
             self._handle_virtual_anchor_tags(project_id, reading_id, question_id, 'dq', data, 'question_text')
 
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error in update_driving_question: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     def delete_driving_question(self, question_id):
@@ -237,15 +322,13 @@ class DrivingQuestionsMixin:
             "DELETE FROM reading_driving_questions WHERE id = ? AND (type IS NULL OR type NOT IN ('proposition', 'term', 'theory', 'argument'))",
             (question_id,)
         )
-        self.conn.commit()
+        self._commit()
 
     def update_driving_question_order(self, ordered_ids):
-        for order, q_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE reading_driving_questions SET display_order = ? WHERE id = ? AND (type IS NULL OR type NOT IN ('proposition', 'term', 'theory', 'argument'))",
-                (order, q_id)
-            )
-        self.conn.commit()
+        self._bulk_update_order(
+            "reading_driving_questions", ordered_ids,
+            "(type IS NULL OR type NOT IN ('proposition', 'term', 'theory', 'argument'))"
+        )
 
     def find_current_working_question(self, reading_id):
         self.cursor.execute(
@@ -261,4 +344,4 @@ class DrivingQuestionsMixin:
             "UPDATE reading_driving_questions SET is_working_question = 0 WHERE reading_id = ? AND (type IS NULL OR type NOT IN ('proposition', 'term', 'theory', 'argument'))",
             (reading_id,)
         )
-        self.conn.commit()
\ No newline at end of file
+        self._commit()
\ No newline at end of file
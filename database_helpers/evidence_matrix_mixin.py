@@ -24,7 +24,7 @@ class EvidenceMatrixMixin:
             INSERT INTO evidence_matrix_themes (project_id, title, display_order)
             VALUES (?, ?, ?)
         """, (project_id, title, new_order))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def update_evidence_matrix_theme_field(self, theme_id, field, value):
@@ -35,18 +35,16 @@ class EvidenceMatrixMixin:
             return
 
         self.cursor.execute(f"UPDATE evidence_matrix_themes SET {field} = ? WHERE id = ?", (value, theme_id))
-        self.conn.commit()
+        self._commit()
 
     def delete_evidence_matrix_theme(self, theme_id):
         """Deletes a theme."""
         self.cursor.execute("DELETE FROM evidence_matrix_themes WHERE id = ?", (theme_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_evidence_matrix_theme_order(self, ordered_ids):
         """Updates display_order for a list of theme IDs."""
-        for i, theme_id in enumerate(ordered_ids):
-            self.cursor.execute("UPDATE evidence_matrix_themes SET display_order = ? WHERE id = ?", (i, theme_id))
-        self.conn.commit()
+        self._bulk_update_order("evidence_matrix_themes", ordered_ids)
 
     # --- PDF Linking ---
 
@@ -63,7 +61,7 @@ class EvidenceMatrixMixin:
                 "INSERT INTO evidence_matrix_pdf_links (theme_id, pdf_node_id, link_type) VALUES (?, ?, ?)",
                 (theme_id, pdf_node_id, link_type)
             )
-            self.conn.commit()
+            self._commit()
         except sqlite3.IntegrityError:
             pass  # Already exists
 
@@ -73,7 +71,7 @@ class EvidenceMatrixMixin:
             "DELETE FROM evidence_matrix_pdf_links WHERE theme_id = ? AND pdf_node_id = ? AND link_type = ?",
             (theme_id, pdf_node_id, link_type)
         )
-        self.conn.commit()
+        self._commit()
 
     def get_evidence_matrix_pdf_links(self, theme_id, link_type):
         """Gets all linked PDF nodes for a theme and type."""
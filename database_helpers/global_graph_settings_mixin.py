@@ -70,7 +70,7 @@ class GlobalGraphSettingsMixin:
                 ON CONFLICT(item_type, item_id) DO UPDATE SET
                 color_hex = excluded.color_hex
             """, (item_type, item_id, color_hex))
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error saving global graph setting: {e}")
-            self.conn.rollback()
\ No newline at end of file
+            self._rollback()
\ No newline at end of file
@@ -14,7 +14,7 @@ class GraphMixin:
             WHERE project_id = ?
         """
         self.cursor.execute(readings_sql, (project_id,))
-        readings = self._map_rows(self.cursor.fetchall())
+        readings = self._fetch_compact()
 
         tags_sql = """
             SELECT DISTINCT t.id, t.name 
@@ -25,7 +25,7 @@ class GraphMixin:
             GROUP BY t.id, t.name
         """
         self.cursor.execute(tags_sql, (project_id, project_id))
-        tags = self._map_rows(self.cursor.fetchall())
+        tags = self._fetch_compact()
 
         # --- FIX: Join on anchor_tag_links to get all text anchor links ---
         edges_sql = """
@@ -36,7 +36,7 @@ class GraphMixin:
         """
         # --- END FIX ---
         self.cursor.execute(edges_sql, (project_id,))
-        edges = self._map_rows(self.cursor.fetchall())
+        edges = self._fetch_compact()
 
         return {"readings": readings, "tags": tags, "edges": edges}
 
@@ -53,7 +53,7 @@ class GraphMixin:
             WHERE project_id = ?
         """
         self.cursor.execute(readings_sql, (project_id,))
-        readings = self._map_rows(self.cursor.fetchall())
+        readings = self._fetch_compact()
 
         # 2. Get Tags
         tags_sql = """
@@ -67,7 +67,7 @@ class GraphMixin:
         # --- THIS IS THE FIX: Removed the extra project_id ---
         self.cursor.execute(tags_sql, (project_id, project_id))
         # --- END FIX ---
-        tags = self._map_rows(self.cursor.fetchall())
+        tags = self._fetch_compact()
 
         # 3. Get text-based anchor edges (Reading <-> Tag)
         edges_sql = """
@@ -77,7 +77,7 @@ class GraphMixin:
             WHERE a.project_id = ? AND a.item_link_id IS NULL
         """
         self.cursor.execute(edges_sql, (project_id,))
-        edges = self._map_rows(self.cursor.fetchall())
+        edges = self._fetch_compact()
 
         # 4. Get "Virtual Anchors" (DQs, Terms, etc.)
         # This query gets all virtual anchors and their linked tags
@@ -94,7 +94,7 @@ class GraphMixin:
             WHERE a.project_id = ? AND a.item_link_id IS NOT NULL
         """
         self.cursor.execute(virtual_anchors_sql, (project_id,))
-        virtual_anchors = self._map_rows(self.cursor.fetchall())
+        virtual_anchors = self._fetch_compact()
 
         return {
             "readings": readings,
@@ -106,36 +106,32 @@ class GraphMixin:
     def get_global_graph_data(self):
         """
         Gets all tags, projects, and the links between them for the
-        global connections graph.
+        global connections graph. Reads the tag_usage view, so with
+        per-project files no project file is opened.
         """
-        # 1. Get all tags
-        self.cursor.execute("SELECT id, name FROM synthesis_tags")
-        tags = self._map_rows(self.cursor.fetchall())
-
-        # Get project counts for tags (for scaling)
+        # 1. Get all tags, with project counts for tags (for scaling)
         self.cursor.execute("""
-            SELECT atl.tag_id, COUNT(DISTINCT a.project_id) as project_count
-            FROM synthesis_anchors a
-            JOIN anchor_tag_links atl ON a.id = atl.anchor_id
-            GROUP BY atl.tag_id
+            SELECT t.id, t.name, COALESCE(c.project_count, 0) as project_count
+            FROM synthesis_tags t
+            LEFT JOIN (
+                SELECT tag_id, COUNT(DISTINCT project_id) as project_count
+                FROM tag_usage
+                GROUP BY tag_id
+            ) c ON c.tag_id = t.id
         """)
-        counts = {row['tag_id']: row['project_count'] for row in self.cursor.fetchall()}
-
-        for tag in tags:
-            tag['project_count'] = counts.get(tag['id'], 0)
+        tags = self._fetch_compact()
 
         # 2. Get all projects
         self.cursor.execute("SELECT id, name FROM items WHERE type = 'project' ORDER BY name")
-        projects = self._map_rows(self.cursor.fetchall())
+        projects = self._fetch_compact()
 
         # 3. Get all edges
         self.cursor.execute("""
-            SELECT DISTINCT a.project_id, atl.tag_id 
-            FROM synthesis_anchors a
-            JOIN anchor_tag_links atl ON a.id = atl.anchor_id
-            WHERE atl.tag_id IS NOT NULL
+            SELECT DISTINCT project_id, tag_id
+            FROM tag_usage
+            WHERE tag_id IS NOT NULL
         """)
-        edges = self._map_rows(self.cursor.fetchall())
+        edges = self._fetch_compact()
 
         return {"tags": tags, "projects": projects, "edges": edges}
 
@@ -143,7 +139,9 @@ class GraphMixin:
     def get_global_anchors_for_tag_name(self, tag_name):
         """
         Gets all anchors matching a tag name from all projects,
-        joining with reading and project info for context.
+        joining with reading and project info for context. With
+        per-project files, only the files of projects using the tag
+        are opened, one at a time.
         """
         sql = """
             SELECT 
@@ -168,5 +166,19 @@ class GraphMixin:
             WHERE t.name = ?
             ORDER BY i.name, r.display_order, o.display_order, a.id
         """
-        self.cursor.execute(sql, (tag_name,))
-        return self._map_rows(self.cursor.fetchall())
\ No newline at end of file
+        if not self.is_project_files_enabled():
+            self.cursor.execute(sql, (tag_name,))
+            return self._fetch_compact()
+
+        self.cursor.execute("""
+            SELECT i.id FROM items i
+            WHERE i.id IN (SELECT u.project_id FROM tag_usage u
+                           JOIN synthesis_tags t ON t.id = u.tag_id
+                           WHERE t.name = ?)
+            ORDER BY i.name, i.id
+        """, (tag_name,))
+        anchors = []
+        for _project_id in self.each_project_file([row[0] for row in self.cursor.fetchall()]):
+            self.cursor.execute(sql, (tag_name,))
+            anchors.extend(self._fetch_compact())
+        return anchors
\ No newline at end of file
@@ -1,6 +1,7 @@
 # prospectcreek/3rdeditionreadingtracker/database_helpers/graph_settings_mixin.py
 import sqlite3
 import json
+from database_helpers.read_cache_mixin import cached_read
 
 
 class GraphSettingsMixin:
@@ -42,6 +43,7 @@ class GraphSettingsMixin:
         )
         """)
 
+    @cached_read("graph_settings")
     def get_graph_settings(self, project_id):
         """
         Gets all graph settings for a project and returns a dictionary
@@ -75,7 +77,7 @@ class GraphSettingsMixin:
                 ON CONFLICT(project_id, node_type) DO UPDATE SET
                 color_hex = excluded.color_hex
             """, (project_id, node_type, color_hex))
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error saving graph setting: {e}")
-            self.conn.rollback()
\ No newline at end of file
+            self._rollback()
\ No newline at end of file
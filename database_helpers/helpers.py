@@ -1,10 +1,196 @@
+import functools
+from collections.abc import Mapping
+
+from database_helpers.rich_text_mixin import RichTextMixin
+from database_helpers.text_compression import decompress_row, decompress_text
+
+# Column names RichTextMixin._encode_rich_text may store compressed
+_COMPRESSIBLE_COLUMNS = frozenset(
+    column for _, columns in RichTextMixin.RICH_TEXT_COLUMNS for column in columns)
+
+
+@functools.lru_cache(maxsize=512)
+def compressible_columns(columns):
+    """The names in a tuple of result columns that may hold compressed text."""
+    return tuple(column for column in columns if column in _COMPRESSIBLE_COLUMNS)
+
+
+class CompactRow(tuple):
+    """
+    Read-only, tuple-backed result row with dict-style access.
+
+    Supports row['col'], row.get('col'), keys()/values()/items(), 'col' in
+    row, iteration over column names and dict(row), so code written against
+    the dicts from _map_rows keeps working. Rows of one query share a
+    per-column-set subclass holding the name -> position map, so each row
+    costs one tuple instead of a dict. Assigning to a key raises TypeError;
+    use dict(row) when a mutable copy is needed.
+    """
+
+    __slots__ = ()
+    _index = {}
+    _columns = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return tuple.__getitem__(self, self._index[key])
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        position = self._index.get(key)
+        return default if position is None else tuple.__getitem__(self, position)
+
+    def keys(self):
+        return self._columns
+
+    def values(self):
+        return tuple(tuple.__iter__(self))
+
+    def items(self):
+        return tuple(zip(self._columns, tuple.__iter__(self)))
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self):
+        return f"CompactRow({dict(self.items())!r})"
+
+
+Mapping.register(CompactRow)
+
+_compact_row_classes = {}
+
+
+def compact_row_class(columns):
+    """Returns the shared CompactRow subclass for a tuple of column names."""
+    row_class = _compact_row_classes.get(columns)
+    if row_class is None:
+        row_class = type("CompactRow", (CompactRow,), {
+            "__slots__": (),
+            "_columns": columns,
+            "_index": {name: position for position, name in enumerate(columns)},
+        })
+        _compact_row_classes[columns] = row_class
+    return row_class
+
+
+def _decompress_positions(row, positions):
+    """The row's values with compressed text at `positions` expanded."""
+    values = None
+    for position in positions:
+        value = row[position]
+        if value.__class__ is bytes:
+            if values is None:
+                values = list(row)
+            values[position] = decompress_text(value)
+    return row if values is None else values
+
+
 class DbHelpers:
     @staticmethod
     def _rowdict(row):
-        """Coerce a sqlite3.Row (or None) to a plain dict (or None)."""
-        return dict(row) if row is not None else None
+        """
+        Coerce a sqlite3.Row (or None) to a plain dict (or None).
+        Compressed text columns (see text_compression.py) come back as str.
+        """
+        if row is None:
+            return None
+        columns = compressible_columns(tuple(row.keys()))
+        return decompress_row(row, columns) if columns else dict(row)
 
     @staticmethod
     def _map_rows(rows):
-        """Coerce an iterable of sqlite3.Row to list[dict]."""
-        return [dict(r) for r in rows] if rows else []
\ No newline at end of file
+        """
+        Coerce a list of sqlite3.Row to list[dict], expanding compressed
+        text. Only rich-text columns are checked, so queries on other
+        tables pay nothing for it.
+        """
+        if not rows:
+            return []
+        columns = compressible_columns(tuple(rows[0].keys()))
+        if not columns:
+            return [dict(r) for r in rows]
+        return [decompress_row(r, columns) for r in rows]
+
+    def _fetch_compact(self, cursor=None):
+        """
+        Fetches the remaining rows of an executed query as CompactRows.
+        Meant for bulk reads whose callers only read the rows. Compressed
+        rich-text columns are expanded as in _map_rows.
+        """
+        cursor = cursor or self.cursor
+        if cursor.description is None:
+            return []
+        columns = tuple(column[0] for column in cursor.description)
+        row_class = compact_row_class(columns)
+        make_row = tuple.__new__
+        rows = cursor.fetchall()
+        compressible = compressible_columns(columns)
+        if compressible:
+            positions = [columns.index(column) for column in compressible]
+            rows = [_decompress_positions(row, positions) for row in rows]
+        return [make_row(row_class, row) for row in rows]
+
+    def _bulk_update_order(self, table_name, ordered_ids, extra_where=""):
+        """
+        Sets display_order to each id's position in ordered_ids using a
+        single executemany, skipping rows that already hold that position.
+        extra_where is a trusted SQL fragment ANDed onto the WHERE clause.
+        """
+        sql = f"UPDATE {table_name} SET display_order = ? WHERE id = ? AND display_order IS NOT ?"
+        if extra_where:
+            sql += f" AND {extra_where}"
+        self.cursor.executemany(sql, [(order, row_id, order) for order, row_id in enumerate(ordered_ids)])
+        self._commit()
+
+    # Keep IN (...) lists well under SQLite's bound-parameter limit
+    _IN_CHUNK_SIZE = 900
+
+    def _attach_synthesis_tags(self, rows, id_key='id'):
+        """
+        Sets rows[i]['synthesis_tags'] to the comma-joined tag names of the
+        virtual anchor linked to each row (via item_link_id), resolving
+        every row in one query per chunk of ids. Rows without an anchor
+        get "". Returns rows.
+        """
+        tag_names = {}
+        ids = [row[id_key] for row in rows]
+        for start in range(0, len(ids), self._IN_CHUNK_SIZE):
+            chunk = ids[start:start + self._IN_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            # MIN(id) matches the old per-row lookup, which took the first anchor
+            self.cursor.execute(f"""
+                WITH first_anchor AS (
+                    SELECT item_link_id, MIN(id) AS anchor_id
+                    FROM synthesis_anchors
+                    WHERE item_link_id IN ({placeholders})
+                    GROUP BY item_link_id
+                )
+                SELECT fa.item_link_id, t.name
+                FROM first_anchor fa
+                JOIN anchor_tag_links atl ON atl.anchor_id = fa.anchor_id
+                JOIN synthesis_tags t ON atl.tag_id = t.id
+                ORDER BY fa.item_link_id, atl.tag_id
+            """, tuple(chunk))
+            for link_id, name in self.cursor.fetchall():
+                tag_names.setdefault(link_id, []).append(name)
+
+        for row in rows:
+            row['synthesis_tags'] = ", ".join(tag_names.get(row[id_key], []))
+        return rows
@@ -1,4 +1,5 @@
 import sqlite3
+from database_helpers.read_cache_mixin import cached_read
 
 
 class ItemsMixin:
@@ -18,7 +19,7 @@ class ItemsMixin:
             "INSERT INTO items (parent_id, type, name, display_order) VALUES (?, ?, ?, ?)",
             (parent_id, type_, name, new_order)
         )
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def create_item(self, name, item_type, parent_db_id=None, is_assignment=0, is_research=0, is_annotated_bib=0):
@@ -28,7 +29,7 @@ class ItemsMixin:
             INSERT INTO items (parent_id, type, name, display_order, is_assignment, is_research, is_annotated_bib)
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """, (parent_db_id, item_type, name, new_order, int(is_assignment), int(is_research), int(is_annotated_bib)))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def get_items(self, parent_id=None):
@@ -65,19 +66,14 @@ class ItemsMixin:
             SET parent_id = ?, display_order = ? 
             WHERE id = ?
         """, (new_parent_id, new_order, item_id))
-        self.conn.commit()
+        self._commit()
 
     def update_order(self, ordered_ids):
         """
         Updates the display_order for a list of sibling IDs.
         Assumes all items in the list have the same parent.
         """
-        for order, item_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE items SET display_order = ? WHERE id = ?",
-                (order, item_id)
-            )
-        self.conn.commit()
+        self._bulk_update_order("items", ordered_ids)
 
     def update_project_status(self, project_id, is_assignment, is_research, is_annotated_bib=0):
         """Updates the is_assignment, is_research, and is_annotated_bib flags."""
@@ -85,14 +81,16 @@ class ItemsMixin:
             "UPDATE items SET is_assignment = ?, is_research = ?, is_annotated_bib = ? WHERE id = ?",
             (int(bool(is_assignment)), int(bool(is_research)), int(bool(is_annotated_bib)), project_id)
         )
+        self._commit()
         # Clear assignment data if no longer an assignment
         if not is_assignment:
-            self.cursor.execute("DELETE FROM rubric_components WHERE project_id = ?", (project_id,))
-            self.cursor.execute(
-                "UPDATE items SET assignment_instructions_text = NULL, assignment_draft_text = NULL WHERE id = ?",
-                (project_id,)
-            )
-        self.conn.commit()
+            with self.project_attached(project_id):
+                self.cursor.execute("DELETE FROM rubric_components WHERE project_id = ?", (project_id,))
+                self.cursor.execute(
+                    "UPDATE items SET assignment_instructions_text = NULL, assignment_draft_text = NULL WHERE id = ?",
+                    (project_id,)
+                )
+                self._commit()
 
     def update_assignment_status(self, project_id, new_status_val):
         """Legacy alias for update_project_status, kept for safety if called elsewhere."""
@@ -103,76 +101,13 @@ class ItemsMixin:
         self.update_project_status(project_id, new_status_val, is_research, is_annotated_bib)
 
     def duplicate_item(self, item_id):
-        """Duplicates an item (project) and its children (readings, etc.)."""
-        original_project = self.get_item_details(item_id)
-        if not original_project:
-            return
-
-        new_name = f"{original_project['name']} (Copy)"
-
-        # Handle potential missing fields by defaulting to 0
-        is_research = original_project.get('is_research', 0)
-        is_annotated_bib = original_project.get('is_annotated_bib', 0)
-
-        new_project_id = self.create_item(
-            new_name,
-            original_project['type'],
-            original_project['parent_id'],
-            original_project['is_assignment'],
-            is_research,
-            is_annotated_bib
-        )
-
-        fields_to_copy = [
-            'project_purpose_text', 'project_goals_text', 'key_questions_text',
-            'thesis_text', 'insights_text', 'unresolved_text',
-            'assignment_instructions_text', 'assignment_draft_text'
-        ]
-        set_clause = ", ".join([f"{field} = ?" for field in fields_to_copy])
-        values = [original_project[field] for field in fields_to_copy]
-        values.append(new_project_id)
-
-        self.cursor.execute(f"UPDATE items SET {set_clause} WHERE id = ?", tuple(values))
-
-        original_readings = self.get_readings(item_id)
-        for reading in original_readings:
-            new_reading_id = self.add_reading(
-                new_project_id,
-                reading['title'],
-                reading['author'],
-                reading['nickname']
-            )
-            reading_details = {
-                'title': reading['title'], 'author': reading['author'], 'nickname': reading['nickname'],
-                'published': reading['published'], 'pages': reading['pages'], 'assignment': reading['assignment'],
-                'level': reading['level'], 'classification': reading['classification']
-            }
-            self.update_reading_details(new_reading_id, reading_details)
-
-            self._copy_reading_outline(reading['id'], new_reading_id, None, None)
-
-        original_rubric = self.get_rubric_components(item_id)
-        for comp in original_rubric:
-            self.add_rubric_component(new_project_id, comp['component_text'])
-
-        original_instr = self.get_or_create_instructions(item_id)
-        if original_instr:
-            self.update_instructions(new_project_id, original_instr)
-
-        self.conn.commit()
-
-    def _copy_reading_outline(self, old_reading_id, new_reading_id, old_parent_id, new_parent_id):
-        """Recursive helper to duplicate reading outline."""
-        original_items = self.get_reading_outline(old_reading_id, old_parent_id)
-        for item in original_items:
-            self.cursor.execute("""
-                INSERT INTO reading_outline (reading_id, parent_id, section_title, notes_html, display_order)
-                VALUES (?, ?, ?, ?, ?)
-            """, (new_reading_id, new_parent_id, item['section_title'], item['notes_html'], item['display_order']))
-
-            new_item_id = self.cursor.lastrowid
-            self._copy_reading_outline(old_reading_id, new_reading_id, item['id'], new_item_id)
+        """
+        Duplicates an item (project) and everything under it. See
+        ProjectCloneMixin.clone_project. Returns the new item's id.
+        """
+        return self.clone_project(item_id)
 
+    @cached_read("items")
     def get_item_details(self, item_id):
         """Return a single item as dict (safe for .get usage)."""
         self.cursor.execute("SELECT * FROM items WHERE id = ?", (item_id,))
@@ -180,15 +115,17 @@ class ItemsMixin:
 
     def rename_item(self, item_id, new_name):
         self.cursor.execute("UPDATE items SET name = ? WHERE id = ?", (new_name, item_id))
-        self.conn.commit()
+        self._commit()
 
     def delete_item(self, item_id):
+        self._delete_project_files_under(item_id)
         self.cursor.execute("DELETE FROM items WHERE id = ?", (item_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_project_text_field(self, project_id, field_name, html_text):
-        self.cursor.execute(f"UPDATE items SET {field_name} = ? WHERE id = ?", (html_text, project_id))
-        self.conn.commit()
+        self.cursor.execute(f"UPDATE items SET {field_name} = ? WHERE id = ?",
+                            (self._encode_rich_text(html_text), project_id))
+        self._commit()
 
     # List of all 18 instruction columns
     INSTRUCTION_COLUMNS = [
@@ -203,6 +140,7 @@ class ItemsMixin:
 
     # ------------------------- instructions -------------------------
 
+    @cached_read("instructions")
     def get_or_create_instructions(self, project_id):
         """
         Gets all instructions for a project.
@@ -228,7 +166,7 @@ class ItemsMixin:
                     INSERT INTO instructions (project_id, {all_cols})
                     VALUES (?, {all_placeholders})
                 """, (project_id,))
-                self.conn.commit()
+                self._commit()
             except sqlite3.IntegrityError:
                 pass
             except Exception as e:
@@ -258,7 +196,7 @@ class ItemsMixin:
                 SET {set_clause}
                 WHERE project_id = ?
             """, tuple(params))
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error updating instructions: {e}")
-            self.conn.rollback()
\ No newline at end of file
+            self._rollback()
\ No newline at end of file
@@ -104,11 +104,11 @@ class KeyTermsMixin:
             # Handle tags
             self._handle_virtual_anchor_tags(project_id, reading_id, new_item_id, 'term', data, 'term')
 
-            self.conn.commit()
+            self._commit()
             return new_item_id
         except Exception as e:
             print(f"Error in add_reading_key_term: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     def update_reading_key_term(self, term_id, data):
@@ -140,10 +140,10 @@ class KeyTermsMixin:
             # Handle tags
             self._handle_virtual_anchor_tags(project_id, reading_id, term_id, 'term', data, 'term')
 
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error in update_reading_key_term: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     def get_reading_key_terms(self, reading_id):
@@ -160,24 +160,7 @@ class KeyTermsMixin:
             ORDER BY display_order, id
         """, (reading_id,))
 
-        results = self._map_rows(self.cursor.fetchall())
-        for item in results:
-            self.cursor.execute("SELECT sa.id FROM synthesis_anchors sa WHERE sa.item_link_id = ?", (item['id'],))
-            anchor_row = self.cursor.fetchone()
-
-            if anchor_row:
-                anchor_id = anchor_row['id']
-                self.cursor.execute("""
-                    SELECT t.name 
-                    FROM anchor_tag_links atl
-                    JOIN synthesis_tags t ON atl.tag_id = t.id
-                    WHERE atl.anchor_id = ?
-                """, (anchor_id,))
-                tag_names = [row['name'] for row in self.cursor.fetchall()]
-                item['synthesis_tags'] = ", ".join(tag_names)
-            else:
-                item['synthesis_tags'] = ""
-        return results
+        return self._attach_synthesis_tags(self._map_rows(self.cursor.fetchall()))
 
     def get_reading_key_term_details(self, term_id):
         """Gets full details for a single reading-level key term."""
@@ -224,13 +207,8 @@ class KeyTermsMixin:
             "DELETE FROM reading_driving_questions WHERE id = ? AND type = 'term'",
             (term_id,)
         )
-        self.conn.commit()
+        self._commit()
 
     def update_reading_key_term_order(self, ordered_ids):
         """Updates the display_order for reading-level key terms."""
-        for order, term_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE reading_driving_questions SET display_order = ? WHERE id = ? AND type = 'term'",
-                (order, term_id)
-            )
-        self.conn.commit()
\ No newline at end of file
+        self._bulk_update_order("reading_driving_questions", ordered_ids, "type = 'term'")
\ No newline at end of file
@@ -33,16 +33,16 @@ class MindmapMixin:
             defaults.get('family'), defaults.get('size'),
             defaults.get('weight'), defaults.get('slant')
         ))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def rename_mindmap(self, mindmap_id, new_name):
         self.cursor.execute("UPDATE mindmaps SET name = ? WHERE id = ?", (new_name, mindmap_id))
-        self.conn.commit()
+        self._commit()
 
     def delete_mindmap(self, mindmap_id):
         self.cursor.execute("DELETE FROM mindmaps WHERE id = ?", (mindmap_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_mindmap_defaults(self, mindmap_id, font_details):
         self.cursor.execute("""
@@ -55,7 +55,7 @@ class MindmapMixin:
             font_details.get('weight'), font_details.get('slant'),
             mindmap_id
         ))
-        self.conn.commit()
+        self._commit()
 
     def get_mindmap_data(self, mindmap_id):
         """Fetches all nodes and edges for a given mindmap ID."""
@@ -153,9 +153,9 @@ class MindmapMixin:
                     )
                 """, edge_insert_params)
 
-            self.conn.commit()
+            self._commit()
 
         except Exception as e:
-            self.conn.rollback()
+            self._rollback()
             print(f"Error saving mindmap data: {e}")
             raise
\ No newline at end of file
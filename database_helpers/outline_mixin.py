@@ -1,3 +1,6 @@
+from database_helpers.text_compression import decompress_text
+
+
 class OutlineMixin:
     # ----------------------- reading outline -----------------------
 
@@ -17,6 +20,84 @@ class OutlineMixin:
             """, (reading_id, parent_id))
         return self._map_rows(self.cursor.fetchall())
 
+    # Pre-order walk of the outline. sort_key concatenates zero-padded
+    # (display_order, id) pairs down the path, so ordering by it yields
+    # parents before children with siblings in display order.
+    _OUTLINE_TREE_SQL = """
+        WITH RECURSIVE tree(id, depth, path, sort_key) AS (
+            SELECT id, 0, CAST(id AS TEXT),
+                   printf('%010d.%010d', COALESCE(display_order + 1, 0), id)
+            FROM reading_outline
+            WHERE parent_id IS NULL AND {root_filter}
+            UNION ALL
+            SELECT o.id, t.depth + 1, t.path || '/' || o.id,
+                   t.sort_key || '/' || printf('%010d.%010d', COALESCE(o.display_order + 1, 0), o.id)
+            FROM reading_outline o
+            JOIN tree t ON o.parent_id = t.id
+            WHERE t.depth < 100
+        )
+        SELECT {columns}, t.depth, t.path
+        FROM tree t
+        JOIN reading_outline o ON o.id = t.id
+        {extra_join}
+        ORDER BY {order_prefix}t.sort_key
+    """
+
+    _OUTLINE_TREE_COLUMNS_NO_NOTES = (
+        "o.id, o.reading_id, o.parent_id, o.section_title, o.display_order, "
+        "o.part_is_structural, o.part_dq_id"
+    )
+
+    def get_reading_outline_tree(self, reading_id, include_notes=True):
+        """
+        Gets a reading's whole outline in one query, in pre-order.
+        Each row also carries 'depth' (0 for top level) and 'path'
+        (slash-joined ancestor ids ending with the row's own id).
+        """
+        sql = self._OUTLINE_TREE_SQL.format(
+            root_filter="reading_id = ?",
+            columns="o.*" if include_notes else self._OUTLINE_TREE_COLUMNS_NO_NOTES,
+            extra_join="",
+            order_prefix=""
+        )
+        self.cursor.execute(sql, (reading_id,))
+        return self._map_rows(self.cursor.fetchall())
+
+    def get_project_outline_tree(self, project_id, include_notes=False):
+        """
+        Project-wide variant of get_reading_outline_tree: every reading's
+        outline, grouped by reading in reading display order.
+        """
+        sql = self._OUTLINE_TREE_SQL.format(
+            root_filter="reading_id IN (SELECT id FROM readings WHERE project_id = ?)",
+            columns="o.*" if include_notes else self._OUTLINE_TREE_COLUMNS_NO_NOTES,
+            extra_join="JOIN readings r ON r.id = o.reading_id",
+            order_prefix="r.display_order, r.id, "
+        )
+        self.cursor.execute(sql, (project_id,))
+        return self._map_rows(self.cursor.fetchall())
+
+    @staticmethod
+    def _nest_outline_rows(rows):
+        """
+        Turns pre-ordered tree rows into root items, each with a 'children'
+        list (only present when non-empty).
+        """
+        by_id = {}
+        roots = []
+        for row in rows:
+            by_id[row['id']] = row
+            parent = by_id.get(row['parent_id'])
+            if parent is None:
+                roots.append(row)
+            else:
+                parent.setdefault('children', []).append(row)
+        return roots
+
+    def get_reading_outline_nested(self, reading_id, include_notes=False):
+        """Gets the outline as nested dicts, as used by the outline pickers in dialogs."""
+        return self._nest_outline_rows(self.get_reading_outline_tree(reading_id, include_notes))
+
     def get_all_outline_items(self, reading_id):
         """Gets all outline items for a reading, ordered by display_order."""
         self.cursor.execute("""
@@ -44,33 +125,32 @@ class OutlineMixin:
             INSERT INTO reading_outline (reading_id, parent_id, section_title, notes_html, display_order)
             VALUES (?, ?, ?, ?, ?)
         """, (reading_id, parent_id, title, "", new_order))
-        self.conn.commit()
+        self._commit()
         # --- MODIFICATION: Return the new ID ---
         return self.cursor.lastrowid
         # --- END MODIFICATION ---
 
     def update_outline_section_title(self, section_id, new_title):
         self.cursor.execute("UPDATE reading_outline SET section_title = ? WHERE id = ?", (new_title, section_id))
-        self.conn.commit()
+        self._commit()
 
     def delete_outline_section(self, section_id):
         self.cursor.execute("DELETE FROM reading_outline WHERE id = ?", (section_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_outline_section_order(self, ordered_ids):
         """Updates the display_order for a list of sibling IDs."""
-        for order, sid in enumerate(ordered_ids):
-            self.cursor.execute("UPDATE reading_outline SET display_order = ? WHERE id = ?", (order, sid))
-        self.conn.commit()
+        self._bulk_update_order("reading_outline", ordered_ids)
 
     def get_outline_section_notes(self, section_id):
         self.cursor.execute("SELECT notes_html FROM reading_outline WHERE id = ?", (section_id,))
         row = self.cursor.fetchone()
-        return row["notes_html"] if row else ""
+        return decompress_text(row["notes_html"]) if row else ""
 
     def update_outline_section_notes(self, section_id, html):
-        self.cursor.execute("UPDATE reading_outline SET notes_html = ? WHERE id = ?", (html, section_id))
-        self.conn.commit()
+        self.cursor.execute("UPDATE reading_outline SET notes_html = ? WHERE id = ?",
+                            (self._encode_rich_text(html), section_id))
+        self._commit()
 
     # --- METHODS FOR PARTS TAB ---
 
@@ -131,4 +211,4 @@ class OutlineMixin:
             reading_id
         ))
         # --- END FIX (1) ---
-        self.conn.commit()
\ No newline at end of file
+        self._commit()
\ No newline at end of file
@@ -24,7 +24,7 @@ class PdfNodesMixin:
             INSERT INTO pdf_node_categories (project_id, name, color_hex)
             VALUES (?, ?, ?)
         """, (project_id, name, color_hex))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def update_pdf_node_category(self, category_id, name, color_hex):
@@ -34,12 +34,12 @@ class PdfNodesMixin:
             SET name = ?, color_hex = ?
             WHERE id = ?
         """, (name, color_hex, category_id))
-        self.conn.commit()
+        self._commit()
 
     def delete_pdf_node_category(self, category_id):
         """Deletes a category. Nodes with this category will have category_id set to NULL."""
         self.cursor.execute("DELETE FROM pdf_node_categories WHERE id = ?", (category_id,))
-        self.conn.commit()
+        self._commit()
 
     # --- Node Management ---
 
@@ -50,7 +50,7 @@ class PdfNodesMixin:
             INSERT INTO pdf_nodes (reading_id, attachment_id, page_number, x_pos, y_pos, node_type, color_hex, label, description, category_id)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (reading_id, attachment_id, page_number, x_pos, y_pos, node_type, color_hex, label, description, category_id))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def get_pdf_nodes_for_page(self, attachment_id, page_number):
@@ -136,9 +136,9 @@ class PdfNodesMixin:
         sql = f"UPDATE pdf_nodes SET {', '.join(updates)} WHERE id = ?"
 
         self.cursor.execute(sql, tuple(params))
-        self.conn.commit()
+        self._commit()
 
     def delete_pdf_node(self, node_id):
         """Deletes a PDF node."""
         self.cursor.execute("DELETE FROM pdf_nodes WHERE id = ?", (node_id,))
-        self.conn.commit()
\ No newline at end of file
+        self._commit()
\ No newline at end of file
@@ -0,0 +1,226 @@
+import re
+
+from database_helpers.text_compression import decompress_text
+
+_ANCHOR_HREF_RE = re.compile(r'anchor:(\d+)')
+
+
+class ProjectCloneMixin:
+    """
+    Deep copy of a project with set-based INSERT ... SELECT statements.
+
+    Every row that belongs to the project is first given its new id in the
+    temp table clone_id_map, (table, old_id) -> new_id, numbering past the
+    table's current maximum. Each table is then copied with one statement
+    that rewrites its own id, its owner and every other id column through
+    that map, so references between copied rows (parent rows, outline
+    sections, driving questions, PDF nodes, ...) point into the copy.
+    """
+
+    # Copied in this order. (table, owner column, owner table, {column: table
+    # whose ids it holds}). Rows are selected through the owner column; ids
+    # of the owner table must already be in the map. References to rows
+    # outside the copy become NULL. Tables without an id column are link
+    # tables and are copied without getting ids of their own.
+    PROJECT_CLONE_PLAN = [
+        ("instructions", "project_id", "items", {}),
+        ("rubric_components", "project_id", "items", {}),
+        ("graph_settings", "project_id", "items", {}),
+        ("project_tag_links", "project_id", "items", {}),
+        ("mindmaps", "project_id", "items", {}),
+        ("mindmap_nodes", "mindmap_id", "mindmaps", {}),
+        ("mindmap_edges", "mindmap_id", "mindmaps", {}),
+        ("project_terminology", "project_id", "items", {}),
+        ("project_propositions", "project_id", "items", {}),
+        ("project_todo_list", "project_id", "items", {}),
+        ("pdf_node_categories", "project_id", "items", {}),
+        ("readings", "project_id", "items", {
+            "unity_driving_question_id": "reading_driving_questions"}),
+        ("reading_attachments", "reading_id", "readings", {}),
+        ("pdf_nodes", "reading_id", "readings", {
+            "attachment_id": "reading_attachments", "category_id": "pdf_node_categories"}),
+        ("reading_driving_questions", "reading_id", "readings", {
+            "parent_id": "reading_driving_questions", "outline_id": "reading_outline",
+            "pdf_node_id": "pdf_nodes"}),
+        ("reading_outline", "reading_id", "readings", {
+            "parent_id": "reading_outline", "part_dq_id": "reading_driving_questions"}),
+        ("reading_arguments", "reading_id", "readings", {
+            "driving_question_id": "reading_driving_questions", "pdf_node_id": "pdf_nodes"}),
+        ("reading_argument_evidence", "argument_id", "reading_arguments", {
+            "outline_id": "reading_outline"}),
+        ("annotated_bib_entries", "reading_id", "readings", {}),
+        ("terminology_reading_links", "terminology_id", "project_terminology", {
+            "reading_id": "readings"}),
+        ("terminology_references", "terminology_id", "project_terminology", {
+            "reading_id": "readings", "outline_id": "reading_outline", "pdf_node_id": "pdf_nodes"}),
+        ("terminology_reference_pdf_links", "reference_id", "terminology_references", {
+            "pdf_node_id": "pdf_nodes"}),
+        ("proposition_reading_links", "proposition_id", "project_propositions", {
+            "reading_id": "readings"}),
+        ("proposition_references", "proposition_id", "project_propositions", {
+            "reading_id": "readings", "outline_id": "reading_outline"}),
+        ("proposition_reference_pdf_links", "reference_id", "proposition_references", {
+            "pdf_node_id": "pdf_nodes"}),
+        ("research_nodes", "project_id", "items", {
+            "parent_id": "research_nodes", "pdf_node_id": "pdf_nodes"}),
+        ("research_memos", "node_id", "research_nodes", {}),
+        ("research_node_pdf_links", "research_node_id", "research_nodes", {
+            "pdf_node_id": "pdf_nodes"}),
+        ("research_node_terms", "research_node_id", "research_nodes", {
+            "terminology_id": "project_terminology"}),
+        ("research_plans", "project_id", "items", {
+            "research_question_id": "research_nodes"}),
+        ("evidence_matrix_themes", "project_id", "items", {}),
+        ("evidence_matrix_pdf_links", "theme_id", "evidence_matrix_themes", {
+            "pdf_node_id": "pdf_nodes"}),
+        ("synthesis_anchors", "project_id", "items", {
+            "reading_id": "readings", "outline_id": "reading_outline",
+            "item_link_id": "reading_driving_questions", "pdf_node_id": "pdf_nodes"}),
+        ("anchor_tag_links", "anchor_id", "synthesis_anchors", {}),
+    ]
+
+    def _table_columns(self, table):
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        return [row['name'] for row in self.cursor.fetchall()]
+
+    def _next_free_id(self, table):
+        """Highest id the table has used, counting AUTOINCREMENT's sequence."""
+        self.cursor.execute(f"""
+            SELECT MAX(COALESCE((SELECT MAX(id) FROM {table}), 0),
+                       COALESCE((SELECT seq FROM {self._table_schema(table)}.sqlite_sequence WHERE name = ?), 0))
+        """, (table,))
+        return self.cursor.fetchone()[0]
+
+    def _allocate_clone_ids(self, table, owner_column, owner_table):
+        self.cursor.execute(f"""
+            INSERT INTO temp.clone_id_map (tbl, old_id, new_id)
+            SELECT ?, t.id, ? + ROW_NUMBER() OVER (ORDER BY t.id)
+            FROM {table} t
+            JOIN temp.clone_id_map owner ON owner.tbl = ? AND owner.old_id = t.{owner_column}
+        """, (table, self._next_free_id(table), owner_table))
+
+    def _copy_clone_rows(self, table, owner_column, owner_table, remap, columns):
+        select = []
+        for col in columns:
+            if col == "id":
+                select.append("own.new_id")
+            elif col == owner_column:
+                select.append("owner.new_id")
+            elif col in remap:
+                select.append(f"(SELECT new_id FROM temp.clone_id_map "
+                              f"WHERE tbl = '{remap[col]}' AND old_id = t.{col})")
+            else:
+                select.append(f"t.{col}")
+        own_join = ("JOIN temp.clone_id_map own ON own.tbl = ? AND own.old_id = t.id"
+                    if "id" in columns else "")
+        params = (owner_table, table) if own_join else (owner_table,)
+        self.cursor.execute(f"""
+            INSERT INTO {table} ({", ".join(columns)})
+            SELECT {", ".join(select)}
+            FROM {table} t
+            JOIN temp.clone_id_map owner ON owner.tbl = ? AND owner.old_id = t.{owner_column}
+            {own_join}
+            ORDER BY t.rowid
+        """, params)
+        return self.cursor.rowcount
+
+    def _remap_cloned_anchor_links(self):
+        """
+        Points `anchor:<id>` links in the copied rich text at the copied
+        anchors, so the editors don't strip them as orphans.
+        """
+        self.cursor.execute("SELECT old_id, new_id FROM temp.clone_id_map WHERE tbl = 'synthesis_anchors'")
+        anchor_ids = {str(old): str(new) for old, new in self.cursor.fetchall()}
+        if not anchor_ids:
+            return
+
+        def remap(match):
+            return "anchor:" + anchor_ids.get(match.group(1), match.group(1))
+
+        for table, columns in self._existing_rich_text_columns():
+            for col in columns:
+                self.cursor.execute(f"""
+                    SELECT t.id, t.{col} FROM {table} t
+                    JOIN temp.clone_id_map m ON m.tbl = ? AND m.new_id = t.id
+                    WHERE typeof(t.{col}) = 'blob' OR t.{col} LIKE '%anchor:%'
+                """, (table,))
+                updates = []
+                for row_id, stored in self.cursor.fetchall():
+                    html = decompress_text(stored)
+                    if isinstance(html, str) and "anchor:" in html:
+                        updates.append((self._encode_rich_text(_ANCHOR_HREF_RE.sub(remap, html)), row_id))
+                if updates:
+                    self.cursor.executemany(f"UPDATE {table} SET {col} = ? WHERE id = ?", updates)
+
+    def clone_project(self, project_id, new_name=None):
+        """
+        Copies a project and everything under it (readings, outlines, notes,
+        driving questions, arguments, attachments, PDF nodes, terminology,
+        propositions, research, mindmaps, anchors and their tags, ...) in one
+        transaction. Tags are shared, not copied; attachment rows point at
+        the same files. With per-project files the copy gets a file of its
+        own. Returns the new project's id, or None on error.
+        """
+        self.cursor.execute("SELECT * FROM items WHERE id = ?", (project_id,))
+        project = self.cursor.fetchone()
+        if not project:
+            return None
+        if new_name is None:
+            new_name = f"{project['name']} (Copy)"
+
+        try:
+            # Per-project files: copy inside the source's file, then move the copy out
+            with self.project_attached(project_id):
+                with self.transaction():
+                    self.cursor.execute("""
+                        CREATE TEMP TABLE IF NOT EXISTS clone_id_map (
+                            tbl TEXT NOT NULL,
+                            old_id INTEGER NOT NULL,
+                            new_id INTEGER NOT NULL,
+                            PRIMARY KEY (tbl, old_id)
+                        ) WITHOUT ROWID
+                    """)
+                    self.cursor.execute("CREATE INDEX IF NOT EXISTS temp.idx_clone_id_map_new ON clone_id_map (tbl, new_id)")
+                    self.cursor.execute("DELETE FROM temp.clone_id_map")
+
+                    # The project row itself
+                    item_columns = [col for col in self._table_columns("items") if col != "id"]
+                    values = [project[col] for col in item_columns]
+                    values[item_columns.index("name")] = new_name
+                    values[item_columns.index("display_order")] = self._next_item_order(project['parent_id'])
+                    self.cursor.execute(
+                        f"INSERT INTO items ({', '.join(item_columns)}) VALUES ({', '.join('?' * len(item_columns))})",
+                        tuple(values)
+                    )
+                    new_project_id = self.cursor.lastrowid
+                    self.cursor.execute("INSERT INTO temp.clone_id_map (tbl, old_id, new_id) VALUES ('items', ?, ?)",
+                                        (project_id, new_project_id))
+
+                    # 1. New ids for every row being copied, so any table can refer to any other
+                    plan = [(table, owner_column, owner_table, remap, self._table_columns(table))
+                            for table, owner_column, owner_table, remap in self.PROJECT_CLONE_PLAN]
+                    for table, owner_column, owner_table, remap, columns in plan:
+                        if "id" in columns:
+                            self._allocate_clone_ids(table, owner_column, owner_table)
+
+                    # 2. Copy the rows, parents before the rows that reference them
+                    for table, owner_column, owner_table, remap, columns in plan:
+                        self._copy_clone_rows(table, owner_column, owner_table, remap, columns)
+
+                    # Virtual anchors are keyed "<item_type>_<item id>"
+                    self.cursor.execute("""
+                        UPDATE synthesis_anchors
+                        SET unique_doc_id = item_type || '_' || item_link_id
+                        WHERE project_id = ? AND item_link_id IS NOT NULL
+                          AND unique_doc_id = item_type || '_' || (
+                              SELECT old_id FROM temp.clone_id_map
+                              WHERE tbl = 'reading_driving_questions' AND new_id = synthesis_anchors.item_link_id)
+                    """, (new_project_id,))
+                    self._remap_cloned_anchor_links()
+                    self.cursor.execute("DELETE FROM temp.clone_id_map")
+                self._move_clone_to_own_file(new_project_id)
+            self._index_project_file(new_project_id)
+        except Exception as e:
+            print(f"Error cloning project {project_id}: {e}")
+            return None
+        return new_project_id
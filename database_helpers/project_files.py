@@ -0,0 +1,35 @@
+import os
+import re
+import sqlite3
+
+# With per-project files on (ProjectFilesMixin), each project's rows live
+# in <db name>_projects/project_<id>.db next to the main database file.
+# Backups keep the same layout next to the copy.
+PROJECT_FILES_SUFFIX = "_projects"
+PROJECT_FILE_PATTERN = re.compile(r"project_(\d+)\.db$")
+
+
+def project_files_dir(db_path):
+    """Folder holding a database's per-project files."""
+    return os.path.splitext(os.path.abspath(db_path))[0] + PROJECT_FILES_SUFFIX
+
+
+def project_file_name(project_id):
+    return f"project_{int(project_id)}.db"
+
+
+def registered_project_files(db_path):
+    """{project_id: file_name} from a database's project_files table (empty in single-file mode)."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute("SELECT project_id, file_name FROM project_files"))
+    except sqlite3.OperationalError:
+        return {}  # Created before migration 10
+    finally:
+        conn.close()
+
+
+def project_file_paths(db_path):
+    """Paths of the project files a database lists, whether or not they exist yet."""
+    folder = project_files_dir(db_path)
+    return [os.path.join(folder, name) for name in registered_project_files(db_path).values()]
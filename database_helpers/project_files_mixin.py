@@ -0,0 +1,769 @@
+import contextlib
+import io
+import os
+import re
+import sqlite3
+
+from database_helpers.project_clone_mixin import ProjectCloneMixin
+from database_helpers.project_files import project_file_name, project_files_dir
+
+PROJECT_SCHEMA = "project"  # the open project's file
+COPY_SCHEMA = "project_copy"  # a second project file, attached while rows are copied into or out of it
+
+# Foreign keys from a per-project table to the catalogue tables of the main
+# database; SQLite cannot enforce them across files, so project files drop them.
+_CATALOGUE_FOREIGN_KEY_RE = re.compile(
+    r",\s*FOREIGN KEY\s*\(\s*\w+\s*\)\s*REFERENCES\s+(?:items|synthesis_tags)\s*\(\s*id\s*\)"
+    r"(?:\s+ON\s+(?:DELETE|UPDATE)\s+(?:SET\s+NULL|SET\s+DEFAULT|CASCADE|RESTRICT|NO\s+ACTION))*",
+    re.IGNORECASE)
+_CATALOGUE_REFERENCE_RE = re.compile(r"REFERENCES\s+(?:items|synthesis_tags)\b", re.IGNORECASE)
+_CREATE_RE = re.compile(r"^CREATE\s+(TABLE|UNIQUE\s+INDEX|INDEX|TRIGGER)\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)",
+                        re.IGNORECASE)
+_TRIGGER_TABLE_RE = re.compile(r"\sON\s+(\w+)", re.IGNORECASE)
+
+
+class ProjectFilesMixin:
+    """
+    Optional per-project database files, read in place.
+
+    With user_settings.db_project_files on, the main database keeps only
+    the catalogue: items, tags and project tag links, settings, attachment
+    blobs and the search index. Every other table (readings, outlines,
+    anchors, research, ...) lives in one SQLite file per project,
+    <db name>_projects/project_<id>.db, which attach_project ATTACHes as
+    the `project` schema when the project is opened. The mixins keep using
+    plain table names: the main database has no table by that name, so
+    SQLite finds it in the attached file. While no project is open an
+    empty in-memory copy of the schema stands in for it.
+
+    What the main database's schema did for these tables is done per
+    connection instead:
+    - TEMP triggers on project.<table> queue search index updates and keep
+      the attachment blob reference counts.
+    - Ids come from each file's AUTOINCREMENT sequence. On attach it is
+      raised to project_file_sequences, the highest id any file has used,
+      and on detach it is folded back in, so ids stay unique across files
+      (the search index and the Qt signals rely on that).
+    - Foreign keys to items and synthesis_tags cannot cross files: deleting
+      a project deletes its file, and delete_tags / merge_tags_bulk visit
+      each file that uses the tags.
+    - project_tag_usage keeps every project's anchor count per tag and is
+      refreshed on detach. The TEMP view tag_usage reads it for the closed
+      projects and counts the open project's anchors live, so the global
+      graph never opens a project file.
+
+    Writes in one file commit separately from the main database. A crash
+    while a project is attached leaves its project_files row marked
+    attached; the next start attaches and detaches it again to bring the
+    summary, sequences and search index up to date.
+
+    split_into_project_files and merge_project_files convert a database
+    (see utils/project_files_tool.py). In single-file mode the attach
+    methods do nothing and tag_usage counts the main tables.
+    """
+
+    PROJECT_FILE_TABLES = tuple(table for table, *_ in ProjectCloneMixin.PROJECT_CLONE_PLAN
+                                if table != "project_tag_links")
+
+    attached_project_id = None  # project whose file is attached as `project`
+    _project_files_enabled = None  # None = not read from user_settings yet
+    _project_file_templates = {}  # DatabaseManager class -> schema of the per-project tables
+
+    # --- Settings and paths ---
+
+    def is_project_files_enabled(self):
+        if self._project_files_enabled is None:
+            try:
+                row = self.conn.execute("SELECT db_project_files FROM user_settings WHERE id = 1").fetchone()
+            except sqlite3.OperationalError:
+                return False  # Column not there yet (migration 10 pending)
+            self._project_files_enabled = bool(row and row[0])
+        return self._project_files_enabled
+
+    def get_project_files_dir(self):
+        return project_files_dir(self._get_db_file_path())
+
+    def project_file_path(self, project_id):
+        return os.path.join(self.get_project_files_dir(), project_file_name(project_id))
+
+    def _project_file_ids(self):
+        """Projects that have a file, by name."""
+        self.cursor.execute("""
+            SELECT f.project_id FROM project_files f
+            JOIN items i ON i.id = f.project_id
+            ORDER BY i.name, i.id
+        """)
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def _table_schema(self, table):
+        """The schema a plain table name resolves to: 'project' for per-project tables in this mode."""
+        if table in self.PROJECT_FILE_TABLES and self.is_project_files_enabled():
+            return PROJECT_SCHEMA
+        return "main"
+
+    def _require_no_transaction(self, action):
+        if self.in_transaction_block() or self.conn.in_transaction:
+            raise RuntimeError(f"Cannot {action} inside a transaction.")
+
+    # --- Schema of a project file ---
+
+    def _project_file_template(self):
+        """
+        The per-project tables as this version creates them, read once per
+        class from a freshly migrated in-memory database:
+        {'tables': {table: sql}, 'columns': {table: [(name, type, default)]},
+        'indexes': [sql], 'triggers': [sql]}.
+        """
+        cls = type(self)
+        template = ProjectFilesMixin._project_file_templates.get(cls)
+        if template is not None:
+            return template
+        with contextlib.redirect_stdout(io.StringIO()):  # migration progress messages
+            fresh = cls(":memory:")
+        try:
+            template = {"tables": {}, "columns": {}, "indexes": [], "triggers": []}
+            placeholders = ", ".join("?" * len(self.PROJECT_FILE_TABLES))
+            rows = fresh.conn.execute(f"""
+                SELECT type, name, sql FROM sqlite_master
+                WHERE tbl_name IN ({placeholders}) AND sql IS NOT NULL
+                ORDER BY rowid
+            """, self.PROJECT_FILE_TABLES).fetchall()
+            for kind, name, sql in rows:
+                if kind == "table":
+                    template["tables"][name] = sql
+                elif kind == "index":
+                    template["indexes"].append(sql)
+                elif kind == "trigger":
+                    template["triggers"].append(sql)
+            for table in self.PROJECT_FILE_TABLES:
+                template["columns"][table] = [
+                    (row[1], row[2], row[4]) for row in fresh.conn.execute(f"PRAGMA table_info({table})")]
+        finally:
+            fresh.conn.close()
+        ProjectFilesMixin._project_file_templates[cls] = template
+        return template
+
+    @staticmethod
+    def _qualified_create_sql(sql, schema, temp=False):
+        """CREATE ... IF NOT EXISTS <schema>.<name>; TEMP triggers name their table's schema instead."""
+        match = _CREATE_RE.match(sql)
+        kind, name = match.group(1).upper(), match.group(2)
+        if temp:
+            body = _TRIGGER_TABLE_RE.sub(lambda m: f" ON {schema}.{m.group(1)}", sql[match.end():], count=1)
+            return f"CREATE TEMP {kind} IF NOT EXISTS {name}{body}"
+        return f"CREATE {kind} IF NOT EXISTS {schema}.{name}{sql[match.end():]}"
+
+    def _create_project_file_schema(self, schema, project_id=None, catalogue_keys=False):
+        """
+        Creates the per-project tables and indexes in `schema`, and any
+        column a file made by an older version lacks. Foreign keys to the
+        catalogue are dropped unless catalogue_keys is set (the main
+        database). project_id is recorded in the file's project_file_info.
+        """
+        template = self._project_file_template()
+        for table, sql in template["tables"].items():
+            if not catalogue_keys:
+                sql = _CATALOGUE_FOREIGN_KEY_RE.sub("", sql)
+                if _CATALOGUE_REFERENCE_RE.search(sql):
+                    raise RuntimeError(f"Cannot store {table} in a project file: {sql}")
+            self.cursor.execute(self._qualified_create_sql(sql, schema))
+            self.cursor.execute(f"PRAGMA {schema}.table_info({table})")
+            present = {row[1] for row in self.cursor.fetchall()}
+            for column, column_type, default in template["columns"][table]:
+                if column not in present:
+                    default_clause = f" DEFAULT {default}" if default is not None else ""
+                    self.cursor.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN {column} {column_type}{default_clause}")
+        for sql in template["indexes"]:
+            self.cursor.execute(self._qualified_create_sql(sql, schema))
+        if schema == "main":
+            return
+        self.cursor.execute(f"CREATE TABLE IF NOT EXISTS {schema}.project_file_info (project_id INTEGER PRIMARY KEY)")
+        if project_id is not None:
+            self.cursor.execute(f"SELECT project_id FROM {schema}.project_file_info")
+            owner = self.cursor.fetchone()
+            if owner is None:
+                self.cursor.execute(f"INSERT INTO {schema}.project_file_info (project_id) VALUES (?)", (project_id,))
+            elif owner[0] != project_id:
+                raise RuntimeError(f"This file belongs to project {owner[0]}, not {project_id}.")
+        self.cursor.execute(f"PRAGMA {schema}.user_version = {int(self.SCHEMA_VERSION)}")
+
+    def _create_project_triggers(self):
+        """The main database's search and attachment triggers, as TEMP triggers on the attached file."""
+        for sql in self._project_file_template()["triggers"]:
+            self.cursor.execute(self._qualified_create_sql(sql, PROJECT_SCHEMA, temp=True))
+
+    def _drop_project_triggers(self):
+        """Drops the TEMP triggers (search, attachments, read cache) on the per-project tables."""
+        placeholders = ", ".join("?" * len(self.PROJECT_FILE_TABLES))
+        names = [row[0] for row in self.conn.execute(
+            f"SELECT name FROM temp.sqlite_master WHERE type = 'trigger' AND tbl_name IN ({placeholders})",
+            self.PROJECT_FILE_TABLES)]
+        for name in names:
+            self.conn.execute(f"DROP TRIGGER IF EXISTS temp.{name}")
+
+    def _create_tag_usage_view(self):
+        """
+        (Re)creates the TEMP view tag_usage(project_id, tag_id, anchor_count):
+        the anchors per tag of every project. Closed projects' counts come
+        from project_tag_usage, the open project's are counted live.
+        """
+        self.conn.execute("DROP VIEW IF EXISTS temp.tag_usage")
+        if self.is_project_files_enabled():
+            live, stored = PROJECT_SCHEMA, f"""
+                SELECT project_id, tag_id, anchor_count FROM main.project_tag_usage
+                WHERE project_id NOT IN (SELECT project_id FROM {PROJECT_SCHEMA}.project_file_info)
+                UNION ALL"""
+        else:
+            live, stored = "main", ""
+        self.conn.execute(f"""
+            CREATE TEMP VIEW tag_usage AS {stored}
+            SELECT a.project_id, atl.tag_id, COUNT(*) AS anchor_count
+            FROM {live}.synthesis_anchors a
+            JOIN {live}.anchor_tag_links atl ON atl.anchor_id = a.id
+            GROUP BY a.project_id, atl.tag_id
+        """)
+
+    def _store_project_tag_usage(self, project_id, schema):
+        """Replaces project_id's rows in project_tag_usage with the counts of the file attached as `schema`."""
+        self.cursor.execute("DELETE FROM main.project_tag_usage WHERE project_id = ?", (project_id,))
+        self.cursor.execute(f"""
+            INSERT INTO main.project_tag_usage (project_id, tag_id, anchor_count)
+            SELECT ?, atl.tag_id, COUNT(*)
+            FROM {schema}.synthesis_anchors a
+            JOIN {schema}.anchor_tag_links atl ON atl.anchor_id = a.id
+            WHERE atl.tag_id IN (SELECT id FROM main.synthesis_tags)
+            GROUP BY atl.tag_id
+        """, (project_id,))
+
+    # --- Attaching ---
+
+    @contextlib.contextmanager
+    def _changing_schemas(self):
+        """A query_only connection (the executor's) lifts it while it builds its TEMP and in-memory schemas."""
+        if not self.conn.execute("PRAGMA query_only").fetchone()[0]:
+            yield
+            return
+        self.conn.execute("PRAGMA query_only = OFF")
+        try:
+            yield
+        finally:
+            self.conn.execute("PRAGMA query_only = ON")
+
+    def _project_schema_attached(self):
+        return any(row[1] == PROJECT_SCHEMA for row in self.conn.execute("PRAGMA database_list"))
+
+    def _open_project_files(self):
+        """
+        Sets up this connection's view of the project files (called from
+        __init__): the stand-in `project` schema and the tag_usage view.
+        Read-write connections also finish detaching projects a crash
+        left attached, and drop what an interrupted merge left behind.
+        """
+        if not self.is_project_files_enabled():
+            self._create_tag_usage_view()
+            return
+        if not self.read_only:
+            self._drop_main_project_tables()
+        self._attach_placeholder()
+        self._create_tag_usage_view()
+        if self.read_only:
+            return
+        self.cursor.execute("SELECT project_id FROM project_files WHERE attached = 1")
+        for project_id in [row[0] for row in self.cursor.fetchall()]:
+            print(f"Project {project_id} was still open when the application stopped; updating its summary.")
+            try:
+                self.attach_project(project_id)
+                self.detach_project()
+            except Exception as e:
+                print(f"Error: Could not reopen the file of project {project_id}. {e}")
+
+    def _attach_placeholder(self):
+        """Attaches an empty in-memory copy of the per-project tables as `project`."""
+        with self._changing_schemas():
+            self.conn.execute(f"ATTACH DATABASE ':memory:' AS {PROJECT_SCHEMA}")
+            with self.transaction():
+                self._create_project_file_schema(PROJECT_SCHEMA)
+
+    def attach_project(self, project_id):
+        """
+        Attaches project_id's file as the `project` schema, creating it the
+        first time, in place of the project attached before. Does nothing
+        in single-file mode. Raises RuntimeError inside a transaction, and
+        if the file cannot be opened (the stand-in is attached instead).
+        """
+        if not self.is_project_files_enabled() or project_id == self.attached_project_id:
+            return
+        self._require_no_transaction("attach a project file")
+        self._release_project_schema()
+        path = self.project_file_path(project_id)
+        try:
+            if self.read_only:
+                # The executor mirrors the GUI's project; a file not written yet has no rows
+                if os.path.exists(path):
+                    self.conn.execute(f"ATTACH DATABASE ? AS {PROJECT_SCHEMA}", (path,))
+                else:
+                    self._attach_placeholder()
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self.conn.execute(f"ATTACH DATABASE ? AS {PROJECT_SCHEMA}", (path,))
+                self._prepare_project_file(project_id)
+        except Exception as e:
+            if self._project_schema_attached():
+                self.conn.execute(f"DETACH DATABASE {PROJECT_SCHEMA}")
+            self._attach_placeholder()
+            raise RuntimeError(f"Could not open the file of project {project_id} ({path}). {e}") from e
+        finally:
+            self._reset_project_read_cache()
+        self.attached_project_id = project_id
+
+    def _prepare_project_file(self, project_id):
+        """Brings a newly attached file up to date, seeds its id sequences and adds its triggers."""
+        settings = getattr(self, "active_connection_settings", None)
+        if settings:
+            self.conn.execute(f"PRAGMA {PROJECT_SCHEMA}.journal_mode = {settings['db_journal_mode']}")
+            self.conn.execute(f"PRAGMA {PROJECT_SCHEMA}.synchronous = {settings['db_synchronous']}")
+        self.cursor.execute(f"PRAGMA {PROJECT_SCHEMA}.user_version")
+        up_to_date = self.cursor.fetchone()[0] == self.SCHEMA_VERSION
+        with self.transaction():
+            if not up_to_date:
+                self._create_project_file_schema(PROJECT_SCHEMA, project_id)
+            self.cursor.execute(f"SELECT project_id FROM {PROJECT_SCHEMA}.project_file_info")
+            owner = self.cursor.fetchone()
+            if owner is None or owner[0] != project_id:
+                raise RuntimeError(f"The file belongs to project {owner[0] if owner else None}.")
+            self.cursor.execute(f"""
+                UPDATE {PROJECT_SCHEMA}.sqlite_sequence
+                SET seq = MAX(seq, (SELECT w.seq FROM main.project_file_sequences w
+                                    WHERE w.name = sqlite_sequence.name))
+                WHERE name IN (SELECT name FROM main.project_file_sequences)
+            """)
+            self.cursor.execute(f"""
+                INSERT INTO {PROJECT_SCHEMA}.sqlite_sequence (name, seq)
+                SELECT w.name, w.seq FROM main.project_file_sequences w
+                WHERE NOT EXISTS (SELECT 1 FROM {PROJECT_SCHEMA}.sqlite_sequence s WHERE s.name = w.name)
+            """)
+            # Tags deleted while the file was not reachable
+            self.cursor.execute(f"""
+                DELETE FROM {PROJECT_SCHEMA}.anchor_tag_links
+                WHERE tag_id NOT IN (SELECT id FROM main.synthesis_tags)
+            """)
+            self.cursor.execute(f"""
+                UPDATE {PROJECT_SCHEMA}.synthesis_anchors SET tag_id = NULL
+                WHERE tag_id NOT IN (SELECT id FROM main.synthesis_tags)
+            """)
+            self.cursor.execute("""
+                INSERT INTO project_files (project_id, file_name, attached) VALUES (?, ?, 1)
+                ON CONFLICT (project_id) DO UPDATE SET attached = 1
+            """, (project_id, project_file_name(project_id)))
+            self._create_project_triggers()
+
+    def detach_project(self):
+        """
+        Closes the attached project file, leaving the empty stand-in. Its
+        queued search index updates, id sequences and tag counts are
+        written to the main database first. Does nothing in single-file mode.
+        """
+        if not self.is_project_files_enabled() or self.attached_project_id is None:
+            return
+        self._require_no_transaction("detach a project file")
+        try:
+            self._release_project_schema()
+        finally:
+            self._attach_placeholder()
+            self._reset_project_read_cache()
+
+    def _release_project_schema(self):
+        """Detaches whatever is attached as `project`, finishing with a project's file first."""
+        project_id = self.attached_project_id
+        if project_id is not None and not self.read_only:
+            self._finish_project_file(project_id)
+        with self._changing_schemas():
+            self._drop_project_triggers()
+            if self._project_schema_attached():
+                self.conn.execute(f"DETACH DATABASE {PROJECT_SCHEMA}")
+        self.attached_project_id = None
+
+    def _finish_project_file(self, project_id):
+        # Everything still queued belongs to this project; its rows are unreachable once detached
+        self.sync_search_index()
+        with self.transaction():
+            self._fold_project_sequences(PROJECT_SCHEMA)
+            self._store_project_tag_usage(project_id, PROJECT_SCHEMA)
+            self.cursor.execute("UPDATE project_files SET attached = 0 WHERE project_id = ?", (project_id,))
+
+    def _fold_project_sequences(self, schema):
+        """Raises project_file_sequences to the ids the file attached as `schema` has used."""
+        self.cursor.execute(f"""
+            INSERT INTO main.project_file_sequences (name, seq)
+            SELECT name, seq FROM {schema}.sqlite_sequence WHERE true
+            ON CONFLICT (name) DO UPDATE SET seq = MAX(seq, excluded.seq)
+        """)
+
+    def _reset_project_read_cache(self):
+        """Cached reads and the read cache's triggers belonged to the file that was attached."""
+        if self._read_cache_tables:
+            self._read_cache_tables.difference_update(self.PROJECT_FILE_TABLES)
+        self.clear_read_cache()
+        self._invalidate_anchor_index()
+
+    def project_attached(self, project_id):
+        """
+        Context manager running its block with project_id's file attached
+        (plain table names then refer to that project's rows), then
+        re-attaching the project that was open before. Does nothing in
+        single-file mode or when the project is already attached.
+        """
+        return self._visiting_projects([project_id], single=True)
+
+    def each_project_file(self, project_ids=None):
+        """
+        Attaches every project file in turn (or those of project_ids) and
+        yields its project id; the project open before is re-attached at
+        the end. Yields nothing in single-file mode.
+        """
+        if not self.is_project_files_enabled():
+            return
+        project_ids = self._project_file_ids() if project_ids is None else list(project_ids)
+        with self._visiting_projects(project_ids) as visit:
+            for project_id in visit:
+                yield project_id
+
+    @contextlib.contextmanager
+    def _visiting_projects(self, project_ids, single=False):
+        previous = self.attached_project_id
+        if not self.is_project_files_enabled() or (single and project_ids == [previous]):
+            yield None
+            return
+
+        def visit():
+            for project_id in project_ids:
+                self.attach_project(project_id)
+                yield project_id
+
+        try:
+            if single:
+                self.attach_project(project_ids[0])
+                yield None
+            else:
+                yield visit()
+        finally:
+            if self.attached_project_id != previous:
+                if previous is None:
+                    self.detach_project()
+                else:
+                    self.attach_project(previous)
+
+    # --- Moving rows between files ---
+
+    def _select_project_rows(self, project_id, schema):
+        """
+        Fills temp.project_file_rows (tbl, id) with the ids of project_id's
+        rows in `schema`, walking PROJECT_CLONE_PLAN from the project.
+        """
+        self.cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS project_file_rows (
+                tbl TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                PRIMARY KEY (tbl, id)
+            ) WITHOUT ROWID
+        """)
+        self.cursor.execute("DELETE FROM temp.project_file_rows")
+        self.cursor.execute("INSERT INTO temp.project_file_rows (tbl, id) VALUES ('items', ?)", (project_id,))
+        for table, owner_column, owner_table, _remap in self.PROJECT_CLONE_PLAN:
+            if table in self.PROJECT_FILE_TABLES and "id" in self._schema_columns(schema, table):
+                self.cursor.execute(f"""
+                    INSERT INTO temp.project_file_rows (tbl, id)
+                    SELECT ?, t.id FROM {schema}.{table} t
+                    JOIN temp.project_file_rows o ON o.tbl = ? AND o.id = t.{owner_column}
+                """, (table, owner_table))
+
+    def _schema_columns(self, schema, table):
+        self.cursor.execute(f"PRAGMA {schema}.table_info({table})")
+        return [row[1] for row in self.cursor.fetchall()]
+
+    def _project_plan_tables(self):
+        return [(table, owner_column, owner_table) for table, owner_column, owner_table, _remap
+                in self.PROJECT_CLONE_PLAN if table in self.PROJECT_FILE_TABLES]
+
+    def _copy_project_rows(self, source, dest):
+        """
+        Copies the rows selected by _select_project_rows from schema
+        `source` to schema `dest`, ids unchanged. Returns {table: rows}.
+        """
+        self.cursor.execute("PRAGMA defer_foreign_keys = ON")
+        copied = {}
+        for table, owner_column, owner_table in self._project_plan_tables():
+            dest_columns = set(self._schema_columns(dest, table))
+            columns = [col for col in self._schema_columns(source, table) if col in dest_columns]
+            self.cursor.execute(f"""
+                INSERT INTO {dest}.{table} ({", ".join(columns)})
+                SELECT {", ".join("t." + col for col in columns)}
+                FROM {source}.{table} t
+                JOIN temp.project_file_rows o ON o.tbl = ? AND o.id = t.{owner_column}
+                ORDER BY t.rowid
+            """, (owner_table,))
+            copied[table] = self.cursor.rowcount
+        return copied
+
+    def _delete_selected_project_rows(self, schema):
+        """Deletes the rows selected by _select_project_rows from `schema`, children first."""
+        self.cursor.execute("PRAGMA defer_foreign_keys = ON")
+        for table, owner_column, owner_table in reversed(self._project_plan_tables()):
+            self.cursor.execute(f"""
+                DELETE FROM {schema}.{table}
+                WHERE {owner_column} IN (SELECT id FROM temp.project_file_rows WHERE tbl = ?)
+            """, (owner_table,))
+
+    def _move_clone_to_own_file(self, new_project_id):
+        """
+        Called by clone_project with the source project attached: moves the
+        copy's rows out of the source's file into a file of its own. The
+        triggers are left out of the move, so the blob references the copy
+        added are kept; _index_project_file indexes the copy from its file.
+        """
+        if not self.is_project_files_enabled():
+            return
+        path = self.project_file_path(new_project_id)
+        for stale in (path, path + "-wal", path + "-shm", path + "-journal"):
+            if os.path.exists(stale):
+                os.remove(stale)
+        self.conn.execute(f"ATTACH DATABASE ? AS {COPY_SCHEMA}", (path,))
+        try:
+            with self.transaction():
+                self._create_project_file_schema(COPY_SCHEMA, new_project_id)
+                self._select_project_rows(new_project_id, PROJECT_SCHEMA)
+                self._fold_project_sequences(PROJECT_SCHEMA)
+                self._copy_project_rows(PROJECT_SCHEMA, COPY_SCHEMA)
+                self._store_project_tag_usage(new_project_id, COPY_SCHEMA)
+                self.cursor.execute("INSERT OR REPLACE INTO project_files (project_id, file_name, attached) "
+                                    "VALUES (?, ?, 0)", (new_project_id, project_file_name(new_project_id)))
+                self._drop_project_triggers()
+                self._delete_selected_project_rows(PROJECT_SCHEMA)
+                self._create_project_triggers()
+                for kind, source in self.SEARCH_SOURCES.items():
+                    self.cursor.execute("""
+                        DELETE FROM search_index_queue
+                        WHERE kind = ? AND ref_id IN (SELECT id FROM temp.project_file_rows WHERE tbl = ?)
+                    """, (kind, source['table']))
+        finally:
+            self.conn.execute(f"DETACH DATABASE {COPY_SCHEMA}")
+
+    def _index_project_file(self, project_id):
+        """Queues every row of a project's file for the search index; indexed before it is detached."""
+        if not self.is_project_files_enabled():
+            return
+        with self.project_attached(project_id):
+            with self.transaction():
+                self._queue_search_rows()
+
+    def _delete_project_files_under(self, item_id):
+        """
+        Deletes the rows and the files of every project in item_id's subtree.
+        The rows are deleted with the file attached, so the triggers drop
+        their search entries and blob references.
+        """
+        if not self.is_project_files_enabled():
+            return
+        self.cursor.execute("""
+            WITH RECURSIVE subtree (id) AS (
+                SELECT ?
+                UNION ALL
+                SELECT i.id FROM items i JOIN subtree s ON i.parent_id = s.id
+            )
+            SELECT project_id FROM project_files WHERE project_id IN (SELECT id FROM subtree)
+        """, (item_id,))
+        for project_id in [row[0] for row in self.cursor.fetchall()]:
+            if self.attached_project_id == project_id:
+                self.detach_project()
+            with self.project_attached(project_id):
+                with self.transaction():
+                    for table in reversed(self.PROJECT_FILE_TABLES):
+                        self.cursor.execute(f"DELETE FROM {PROJECT_SCHEMA}.{table}")
+            self._remove_project_file(self.project_file_path(project_id))
+
+    @staticmethod
+    def _remove_project_file(path):
+        for file_path in (path, path + "-wal", path + "-shm", path + "-journal"):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Warning: Could not remove project file {file_path}. {e}")
+
+    # --- Converting a database ---
+
+    def _main_project_tables(self):
+        self.cursor.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")
+        present = {row[0] for row in self.cursor.fetchall()}
+        return [table for table in self.PROJECT_FILE_TABLES if table in present]
+
+    def _drop_main_project_tables(self):
+        """Drops the per-project tables from the main database (their triggers and indexes go with them)."""
+        tables = self._main_project_tables()
+        if not tables:
+            return
+        self._drop_project_triggers()
+        self.conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            with self.transaction():
+                for table in reversed(tables):
+                    self.cursor.execute(f"DROP TABLE main.{table}")
+        finally:
+            self.conn.execute("PRAGMA foreign_keys = ON")
+        self._reset_project_read_cache()
+
+    def split_into_project_files(self, vacuum=True, progress=None):
+        """
+        Moves every project's rows out of the main database into a file of
+        its own and turns per-project files on. The files are written
+        first; the main database drops its copies and switches mode in a
+        single transaction at the end, so stopping part way leaves it as
+        it was. progress(done, total) is called after each project.
+        Returns the number of project files written. Raises RuntimeError
+        if some rows belong to no project (nothing is changed then).
+        """
+        if self.is_project_files_enabled():
+            raise RuntimeError("This database already stores its projects in their own files.")
+        if not self._get_db_file_path():
+            raise RuntimeError("In-memory databases cannot use per-project files.")
+        self._require_no_transaction("split the database")
+        self.sync_search_index()
+
+        self.cursor.execute("SELECT id FROM items WHERE type = 'project' ORDER BY id")
+        project_ids = [row[0] for row in self.cursor.fetchall()]
+        os.makedirs(self.get_project_files_dir(), exist_ok=True)
+        copied = dict.fromkeys(self.PROJECT_FILE_TABLES, 0)
+        written = []
+        try:
+            for done, project_id in enumerate(project_ids, 1):
+                partial_path = self.project_file_path(project_id) + ".partial"
+                self._remove_project_file(partial_path)
+                written.append(partial_path)
+                self.conn.execute(f"ATTACH DATABASE ? AS {COPY_SCHEMA}", (partial_path,))
+                try:
+                    with self.transaction():
+                        self._create_project_file_schema(COPY_SCHEMA, project_id)
+                        self._select_project_rows(project_id, "main")
+                        for table, rows in self._copy_project_rows("main", COPY_SCHEMA).items():
+                            copied[table] += rows
+                        self._store_project_tag_usage(project_id, COPY_SCHEMA)
+                finally:
+                    self.conn.execute(f"DETACH DATABASE {COPY_SCHEMA}")
+                if progress:
+                    progress(done, len(project_ids))
+
+            orphans = {}
+            for table in self.PROJECT_FILE_TABLES:
+                self.cursor.execute(f"SELECT COUNT(*) FROM main.{table}")
+                total = self.cursor.fetchone()[0]
+                if total != copied[table]:
+                    orphans[table] = total - copied[table]
+            if orphans:
+                raise RuntimeError(f"Rows that belong to no project would be lost: {orphans}")
+
+            for partial_path in written:
+                os.replace(partial_path, partial_path[:-len(".partial")])
+        except BaseException:
+            for partial_path in written:
+                self._remove_project_file(partial_path)
+            raise
+
+        sequences = [(table, self._next_free_id(table)) for table in self.PROJECT_FILE_TABLES
+                     if "id" in self._schema_columns("main", table)]
+        self._drop_project_triggers()
+        self.conn.execute("DROP VIEW IF EXISTS temp.tag_usage")
+        self.conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            with self.transaction():
+                self.cursor.executemany("INSERT OR REPLACE INTO project_file_sequences (name, seq) VALUES (?, ?)",
+                                        sequences)
+                self.cursor.executemany(
+                    "INSERT OR REPLACE INTO project_files (project_id, file_name, attached) VALUES (?, ?, 0)",
+                    [(project_id, project_file_name(project_id)) for project_id in project_ids])
+                for table in reversed(self.PROJECT_FILE_TABLES):
+                    self.cursor.execute(f"DROP TABLE main.{table}")
+                self.cursor.execute("INSERT OR IGNORE INTO user_settings (id) VALUES (1)")
+                self.cursor.execute("UPDATE user_settings SET db_project_files = 1 WHERE id = 1")
+        finally:
+            self.conn.execute("PRAGMA foreign_keys = ON")
+            self._project_files_enabled = None
+            self._reset_project_read_cache()
+
+        if self.is_project_files_enabled():
+            self._attach_placeholder()
+        self._create_tag_usage_view()
+        if vacuum:
+            self.vacuum_database()
+        return len(project_ids)
+
+    def merge_project_files(self, vacuum=True, progress=None):
+        """
+        Copies every project file back into the main database and turns
+        per-project files off. The mode only switches once every row is
+        copied; stopping before that leaves the project files in use (the
+        partial copy is dropped at the next start). The files are deleted
+        afterwards. progress(done, total) is called after each project.
+        Returns the number of project files merged.
+        """
+        if not self.is_project_files_enabled():
+            raise RuntimeError("This database does not store its projects in their own files.")
+        self._require_no_transaction("merge the project files")
+        self.detach_project()
+        project_ids = self._project_file_ids()
+        template = self._project_file_template()
+
+        # 1. The tables as a fresh database has them; triggers come last so
+        # the copied rows are neither queued again nor counted twice
+        self._drop_main_project_tables()
+        with self.transaction():
+            self._create_project_file_schema("main", catalogue_keys=True)
+
+        # 2. The rows, one project file at a time
+        for done, project_id in enumerate(project_ids, 1):
+            path = self.project_file_path(project_id)
+            if not os.path.exists(path):
+                print(f"Warning: The file of project {project_id} is missing ({path}); it has no rows to merge.")
+                continue
+            self.conn.execute(f"ATTACH DATABASE ? AS {COPY_SCHEMA}", (path,))
+            try:
+                with self.transaction():
+                    self._select_project_rows(project_id, COPY_SCHEMA)
+                    self._copy_project_rows(COPY_SCHEMA, "main")
+                    # The cascades a file could not run for tags deleted while it was closed
+                    self.cursor.execute("DELETE FROM main.anchor_tag_links "
+                                        "WHERE tag_id NOT IN (SELECT id FROM main.synthesis_tags)")
+                    self.cursor.execute("UPDATE main.synthesis_anchors SET tag_id = NULL "
+                                        "WHERE tag_id NOT IN (SELECT id FROM main.synthesis_tags)")
+            finally:
+                self.conn.execute(f"DETACH DATABASE {COPY_SCHEMA}")
+            if progress:
+                progress(done, len(project_ids))
+
+        # 3. Triggers, id sequences and the mode, together
+        with self.transaction():
+            for sql in template["triggers"]:
+                self.cursor.execute(self._qualified_create_sql(sql, "main"))
+            self.cursor.execute("SELECT name, seq FROM project_file_sequences")
+            for name, seq in self.cursor.fetchall():
+                self.cursor.execute("UPDATE main.sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (seq, name))
+                if self.cursor.rowcount == 0:
+                    self.cursor.execute("INSERT INTO main.sqlite_sequence (name, seq) VALUES (?, ?)", (name, seq))
+            self.cursor.execute("DELETE FROM project_files")
+            self.cursor.execute("DELETE FROM project_file_sequences")
+            self.cursor.execute("DELETE FROM project_tag_usage")
+            self.cursor.execute("UPDATE user_settings SET db_project_files = 0 WHERE id = 1")
+        self._project_files_enabled = False
+
+        self._release_project_schema()
+        self._reset_project_read_cache()
+        self._create_tag_usage_view()
+        for project_id in project_ids:
+            self._remove_project_file(self.project_file_path(project_id))
+        try:
+            os.rmdir(self.get_project_files_dir())
+        except OSError:
+            pass  # Not empty (files of other kinds) or already gone
+        if vacuum:
+            self.vacuum_database()
+        return len(project_ids)
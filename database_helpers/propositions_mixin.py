@@ -83,10 +83,10 @@ class PropositionsMixin:
                         """, pdf_data)
 
             # 5. Commit transaction
-            self.conn.commit()
+            self._commit()
 
         except Exception as e:
-            self.conn.rollback()
+            self._rollback()
             print(f"Error saving proposition entry: {e}")
             raise
 
@@ -150,18 +150,13 @@ class PropositionsMixin:
         Deletes a project-level proposition entry. Cascade delete handles references.
         """
         self.cursor.execute("DELETE FROM project_propositions WHERE id = ?", (proposition_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_proposition_order(self, ordered_ids):
         """
         Updates the display_order for a list of proposition IDs.
         """
-        for order, prop_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE project_propositions SET display_order = ? WHERE id = ?",
-                (order, prop_id)
-            )
-        self.conn.commit()
+        self._bulk_update_order("project_propositions", ordered_ids)
 
     # ----------------- READING Proposition Functions (Simple) -----------------
 
@@ -251,11 +246,11 @@ class PropositionsMixin:
             new_item_id = self.cursor.lastrowid
             self._handle_virtual_anchor_tags(project_id, reading_id, new_item_id, 'proposition', data,
                                              'proposition_text')
-            self.conn.commit()
+            self._commit()
             return new_item_id
         except Exception as e:
             print(f"Error in add_reading_proposition: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     def update_reading_proposition(self, proposition_id, data):
@@ -282,10 +277,10 @@ class PropositionsMixin:
 
             self._handle_virtual_anchor_tags(project_id, reading_id, proposition_id, 'proposition', data,
                                              'proposition_text')
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error in update_reading_proposition: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     def get_reading_propositions_simple(self, reading_id):
@@ -295,7 +290,7 @@ class PropositionsMixin:
             WHERE reading_id = ? AND type = 'proposition'
             ORDER BY display_order, id
         """, (reading_id,))
-        return self._map_rows(self.cursor.fetchall())
+        return self._attach_synthesis_tags(self._map_rows(self.cursor.fetchall()))
 
     get_reading_propositions = get_reading_propositions_simple
 
@@ -341,12 +336,7 @@ class PropositionsMixin:
             "DELETE FROM reading_driving_questions WHERE id = ? AND type = 'proposition'",
             (proposition_id,)
         )
-        self.conn.commit()
+        self._commit()
 
     def update_reading_proposition_order(self, ordered_ids):
-        for order, prop_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE reading_driving_questions SET display_order = ? WHERE id = ? AND type = 'proposition'",
-                (order, prop_id)
-            )
-        self.conn.commit()
\ No newline at end of file
+        self._bulk_update_order("reading_driving_questions", ordered_ids, "type = 'proposition'")
\ No newline at end of file
@@ -0,0 +1,301 @@
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+PROFILE_ENV_VAR = "READING_TRACKER_PROFILE_SQL"
+SLOW_MS_ENV_VAR = "READING_TRACKER_SLOW_QUERY_MS"
+
+
+class _Stat:
+    """Running count/total plus a bounded sample window for percentiles."""
+
+    __slots__ = ("count", "total", "max", "samples")
+
+    SAMPLE_SIZE = 2048
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=self.SAMPLE_SIZE)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+        if seconds > self.max:
+            self.max = seconds
+
+    def add_fetch(self, seconds):
+        """Adds row-fetch time to the most recent execution."""
+        self.total += seconds
+        if self.samples:
+            self.samples[-1] += seconds
+            if self.samples[-1] > self.max:
+                self.max = self.samples[-1]
+
+    def p95(self):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "avg_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "p95_ms": round(self.p95() * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class QueryProfiler:
+    """
+    Collects timing for every statement run through a ProfilingConnection.
+
+    Stats are kept per normalized SQL statement and per calling mixin
+    method. Statements that repeat N_PLUS_ONE_THRESHOLD times inside one UI
+    action are flagged as likely N+1 loops. An action is either an explicit
+    `with profiler.action("name"):` block or, by default, a burst of
+    statements with no idle gap longer than ACTION_IDLE_GAP seconds.
+    """
+
+    N_PLUS_ONE_THRESHOLD = 20
+    ACTION_IDLE_GAP = 0.25
+    SLOW_QUERY_MS = 50.0
+    MAX_SQL_LENGTH = 300
+
+    def __init__(self, slow_log_path=None, slow_query_ms=None):
+        self.slow_log_path = slow_log_path
+        if slow_query_ms is None:
+            try:
+                slow_query_ms = float(os.environ.get(SLOW_MS_ENV_VAR, self.SLOW_QUERY_MS))
+            except ValueError:
+                slow_query_ms = self.SLOW_QUERY_MS
+        self.slow_query_seconds = slow_query_ms / 1000.0
+        self._package_dir = os.path.dirname(os.path.abspath(__file__))
+        self._manager_file = os.path.join(os.path.dirname(self._package_dir), "database_manager.py")
+        self._caller_cache = {}
+        self.reset()
+
+    def reset(self):
+        """Clears all collected statistics."""
+        self.statements = {}
+        self.callers = {}
+        self.n_plus_one = {}
+        self.slow_query_count = 0
+        self.started_at = time.time()
+        self._action_name = None
+        self._action_counts = {}
+        self._last_statement_end = 0.0
+
+    # --- Recording ---
+
+    @staticmethod
+    def _normalize_sql(sql):
+        return " ".join(str(sql).split())
+
+    def _find_caller(self):
+        """Returns 'Mixin.method' for the nearest database mixin frame on the stack."""
+        frame = sys._getframe(3)
+        while frame is not None:
+            code = frame.f_code
+            cached = self._caller_cache.get(code)
+            if cached is None:
+                filename = os.path.abspath(code.co_filename)
+                in_db_layer = (filename.startswith(self._package_dir) or filename == self._manager_file)
+                if in_db_layer and not filename.endswith(("query_profiler.py", "transaction_mixin.py")):
+                    cached = getattr(code, "co_qualname", code.co_name)
+                else:
+                    cached = ""
+                self._caller_cache[code] = cached
+            if cached:
+                return cached
+            frame = frame.f_back
+        return "<outside DatabaseManager>"
+
+    def _record(self, sql, seconds, caller, many=False):
+        key = self._normalize_sql(sql)
+        if len(key) > self.MAX_SQL_LENGTH:
+            key = key[:self.MAX_SQL_LENGTH] + "…"
+        if many:
+            key = "[executemany] " + key
+
+        stat = self.statements.get(key)
+        if stat is None:
+            stat = self.statements[key] = _Stat()
+        stat.add(seconds)
+
+        caller_stat = self.callers.get(caller)
+        if caller_stat is None:
+            caller_stat = self.callers[caller] = _Stat()
+        caller_stat.add(seconds)
+
+        self._track_action(key, caller)
+
+        if seconds >= self.slow_query_seconds:
+            self.slow_query_count += 1
+            self._log_slow_query(key, seconds, caller)
+        return stat, caller_stat
+
+    def _track_action(self, key, caller):
+        now = time.perf_counter()
+        if self._action_name is None and now - self._last_statement_end > self.ACTION_IDLE_GAP:
+            self._action_counts = {}
+        self._last_statement_end = now
+
+        count = self._action_counts.get(key, 0) + 1
+        self._action_counts[key] = count
+        if count >= self.N_PLUS_ONE_THRESHOLD:
+            flagged = self.n_plus_one.get(key)
+            if flagged is None:
+                flagged = self.n_plus_one[key] = {
+                    "sql": key, "caller": caller, "action": self._action_name or "(burst)",
+                    "max_repeats": 0, "occurrences": 0
+                }
+            if count == self.N_PLUS_ONE_THRESHOLD:
+                flagged["occurrences"] += 1
+            flagged["max_repeats"] = max(flagged["max_repeats"], count)
+
+    def _log_slow_query(self, key, seconds, caller):
+        if not self.slow_log_path:
+            return
+        try:
+            with open(self.slow_log_path, "a", encoding="utf-8") as log:
+                stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                log.write(f"{stamp}\t{seconds * 1000:.1f} ms\t{caller}\t{key}\n")
+        except OSError as e:
+            print(f"Warning: Could not write slow query log. {e}")
+
+    @contextmanager
+    def action(self, name):
+        """Groups the statements run inside the block as one UI action for N+1 detection."""
+        previous_name, previous_counts = self._action_name, self._action_counts
+        self._action_name, self._action_counts = name, {}
+        try:
+            yield self
+        finally:
+            self._action_name, self._action_counts = previous_name, previous_counts
+
+    # --- Reporting ---
+
+    def get_stats(self):
+        """Returns all collected statistics as plain (JSON-safe) data."""
+
+        def table(stats, key_name):
+            rows = [dict({key_name: key}, **stat.as_dict()) for key, stat in stats.items()]
+            rows.sort(key=lambda row: row["total_ms"], reverse=True)
+            return rows
+
+        return {
+            "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+            "slow_query_ms": round(self.slow_query_seconds * 1000, 3),
+            "slow_query_count": self.slow_query_count,
+            "slow_query_log": self.slow_log_path,
+            "statements": table(self.statements, "sql"),
+            "callers": table(self.callers, "caller"),
+            "n_plus_one": sorted(self.n_plus_one.values(), key=lambda row: row["max_repeats"], reverse=True),
+        }
+
+    def dump_json(self, path):
+        """Writes get_stats() to a JSON file."""
+        with open(path, "w", encoding="utf-8") as out:
+            json.dump(self.get_stats(), out, indent=2)
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    """sqlite3 cursor that reports execute and fetch timings to the connection's profiler."""
+
+    _last_stats = None
+
+    def _timed(self, method, sql, args, many=False):
+        profiler = self.connection.profiler
+        start = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._last_stats = profiler._record(sql, elapsed, profiler._find_caller(), many)
+
+    def execute(self, sql, *args):
+        return self._timed(super().execute, sql, args)
+
+    def executemany(self, sql, *args):
+        return self._timed(super().executemany, sql, args, many=True)
+
+    def executescript(self, sql_script):
+        return self._timed(super().executescript, sql_script, ())
+
+    # SQLite does most of a SELECT's work while stepping through rows, so
+    # fetch time is added to the statement that produced the rows.
+    def _timed_fetch(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if self._last_stats:
+                elapsed = time.perf_counter() - start
+                for stat in self._last_stats:
+                    stat.add_fetch(elapsed)
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed_fetch(super().fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """
+    sqlite3 connection whose cursors are ProfilingCursors. Pass as
+    sqlite3.connect(factory=...).
+
+    The C implementations of Connection.execute/executemany/executescript
+    create their cursor without going through cursor(), so they are
+    overridden here to run on a ProfilingCursor as well.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profiler = QueryProfiler()
+
+    def cursor(self, factory=ProfilingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        return self.cursor().executemany(sql, *args)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def query_profiling_requested(db_file):
+    """
+    True if profiling is switched on by the environment variable or by
+    user_settings.db_profile_queries (read without a profiled connection).
+    """
+    env_value = os.environ.get(PROFILE_ENV_VAR, "").strip().lower()
+    if env_value:
+        return env_value not in ("0", "false", "no", "off")
+    if db_file == ":memory:" or not os.path.exists(db_file):
+        return False
+    try:
+        probe = sqlite3.connect(db_file)
+        try:
+            row = probe.execute("SELECT db_profile_queries FROM user_settings WHERE id = 1").fetchone()
+        finally:
+            probe.close()
+        return bool(row and row[0])
+    except sqlite3.Error:
+        return False
@@ -0,0 +1,165 @@
+import functools
+import sqlite3
+from collections import OrderedDict
+
+
+def cached_read(*tables):
+    """
+    Marks a mixin getter as cacheable by ReadCacheMixin, naming the tables
+    it reads, e.g. @cached_read("readings"). Results are keyed by (method
+    name, args) and dropped once this connection writes to one of those
+    tables.
+    """
+    def decorator(method):
+        name = method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self._cached_call(name, tables, method, args, kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class ReadCacheMixin:
+    """
+    Bounded LRU read-through cache for hot getters (see @cached_read).
+
+    Invalidation is per table. TEMP triggers on each table a cached getter
+    reads count the rows written to it in temp.read_cache_versions, so
+    every write path is seen: any mixin (or tab), ON DELETE CASCADE,
+    other triggers. An entry is stamped with the versions of its tables
+    and is stale once one of them moves; writes to other tables (outline
+    notes, research nodes, PDF nodes, ...) leave it alone. A rollback
+    undoes the version bump together with the data. Nothing is cached
+    while a transaction is open, since it could still be rolled back.
+
+    Where the triggers cannot be added (the read-only executor
+    connection), any change on the connection clears every entry, as
+    conn.total_changes moves. Writes made by other connections are not
+    seen.
+    """
+
+    READ_CACHE_SIZE = 512
+
+    _read_cache = None
+    _read_cache_changes = -1  # conn.total_changes when _read_cache_versions was read
+    _read_cache_versions = None  # {table: version} from temp.read_cache_versions
+    _read_cache_tables = None  # tables with version triggers
+    _read_cache_by_table = True  # False once the triggers could not be added
+    _read_cache_hits = 0
+    _read_cache_misses = 0
+    _read_cache_invalidations = 0
+
+    @staticmethod
+    def _copy_cached(value):
+        """Callers mutate the dicts they get back, so hand out copies."""
+        if isinstance(value, dict):
+            return dict(value)
+        if isinstance(value, list):
+            return [dict(v) if isinstance(v, dict) else v for v in value]
+        return value
+
+    def _track_read_cache_tables(self, tables):
+        """
+        Adds the version triggers for `tables`. Returns False if the
+        entries for them cannot be stamped right now.
+        """
+        if self._read_cache_tables is None:
+            self._read_cache_tables = set()
+        missing = [table for table in tables if table not in self._read_cache_tables]
+        if not missing or not self._read_cache_by_table:
+            return True
+        if self.conn.in_transaction:
+            return False  # A rollback would drop the triggers again
+        try:
+            self.conn.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS read_cache_versions (
+                    table_name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            for table in missing:
+                self.conn.execute("INSERT OR IGNORE INTO temp.read_cache_versions (table_name) VALUES (?)",
+                                  (table,))
+                for event in ("INSERT", "UPDATE", "DELETE"):
+                    self.conn.execute(f"""
+                        CREATE TEMP TRIGGER IF NOT EXISTS read_cache_{table}_{event.lower()}
+                        AFTER {event} ON {self._table_schema(table)}.{table}
+                        BEGIN
+                            UPDATE read_cache_versions SET version = version + 1 WHERE table_name = '{table}';
+                        END
+                    """)
+            self.conn.commit()
+        except sqlite3.Error:
+            # e.g. PRAGMA query_only on the executor's connection
+            self.conn.rollback()
+            self._read_cache_by_table = False
+            return True
+        self._read_cache_tables.update(missing)
+        self._read_cache_changes = -1
+        return True
+
+    def _read_cache_stamp(self, tables):
+        """The write counters an entry for `tables` is valid for."""
+        changes = self.conn.total_changes
+        if not self._read_cache_by_table:
+            return changes
+        if changes != self._read_cache_changes:
+            self._read_cache_versions = {
+                row[0]: row[1] for row in self.conn.execute("SELECT table_name, version FROM temp.read_cache_versions")
+            }
+            self._read_cache_changes = changes
+        return tuple(self._read_cache_versions.get(table, 0) for table in tables)
+
+    def _cached_call(self, name, tables, method, args, kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())) if kwargs else ())
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+
+        if self._read_cache is None:
+            self._read_cache = OrderedDict()
+        if not self._track_read_cache_tables(tables):
+            self._read_cache_misses += 1
+            return method(self, *args, **kwargs)
+
+        entry = self._read_cache.get(key)
+        if entry is not None:
+            if entry[1] == self._read_cache_stamp(tables):
+                self._read_cache.move_to_end(key)
+                self._read_cache_hits += 1
+                return self._copy_cached(entry[0])
+            del self._read_cache[key]
+            self._read_cache_invalidations += 1
+
+        self._read_cache_misses += 1
+        value = method(self, *args, **kwargs)
+
+        # get_or_create_* getters may have written; only cache a committed
+        # view, stamped after the call so such a write does not void it
+        if not self.conn.in_transaction:
+            self._read_cache[key] = (self._copy_cached(value), self._read_cache_stamp(tables))
+            if len(self._read_cache) > self.READ_CACHE_SIZE:
+                self._read_cache.popitem(last=False)
+        return value
+
+    def clear_read_cache(self):
+        """Drops every cached result (e.g. after another connection wrote)."""
+        if self._read_cache:
+            self._read_cache.clear()
+            self._read_cache_invalidations += 1
+
+    def get_read_cache_stats(self):
+        """Returns hit/miss/invalidation counters and the current size."""
+        lookups = self._read_cache_hits + self._read_cache_misses
+        return {
+            "hits": self._read_cache_hits,
+            "misses": self._read_cache_misses,
+            "hit_rate": round(self._read_cache_hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self._read_cache_invalidations,
+            "size": len(self._read_cache) if self._read_cache else 0,
+            "max_size": self.READ_CACHE_SIZE,
+        }
@@ -1,4 +1,7 @@
 # prospectcreek/3rdeditionreadingtracker/database_helpers/readings_mixin.py
+from database_helpers.read_cache_mixin import cached_read
+
+
 class ReadingsMixin:
     # --------------------------- readings ---------------------------
 
@@ -34,13 +37,14 @@ class ReadingsMixin:
                 :published, :pages, :level, :classification
             )
         """, payload)
-        self.conn.commit()
+        self._commit()
 
         new_id = self.cursor.lastrowid
         if self.get_reading_details(new_id) is None:
             raise RuntimeError("Insert verification failed: reading row not found after commit.")
         return new_id
 
+    @cached_read("readings")
     def get_readings(self, project_id):
         self.cursor.execute("""
             SELECT * FROM readings
@@ -49,6 +53,7 @@ class ReadingsMixin:
         """, (project_id,))
         return self._map_rows(self.cursor.fetchall())
 
+    @cached_read("readings")
     def get_reading_details(self, reading_id):
         self.cursor.execute("SELECT * FROM readings WHERE id = ?", (reading_id,))
         return self._rowdict(self.cursor.fetchone())
@@ -73,11 +78,11 @@ class ReadingsMixin:
             details_dict.get('zotero_item_key'), # <-- Added this
             reading_id
         ))
-        self.conn.commit()
+        self._commit()
 
     def update_reading_nickname(self, reading_id, new_name):
         self.cursor.execute("UPDATE readings SET nickname = ? WHERE id = ?", (new_name, reading_id))
-        self.conn.commit()
+        self._commit()
 
     def update_reading_field(self, reading_id, field_name, html):
         """Updates a single text field for a reading, using a whitelist."""
@@ -95,9 +100,9 @@ class ReadingsMixin:
 
         self.cursor.execute(
             f"UPDATE readings SET {field_name} = ? WHERE id = ?",
-            (html, reading_id)
+            (self._encode_rich_text(html), reading_id)
         )
-        self.conn.commit()
+        self._commit()
 
     # --- NEW METHOD FOR UNITY TAB ---
     def save_reading_unity_data(self, reading_id, html_content, kind_of_work, dq_id):
@@ -110,24 +115,19 @@ class ReadingsMixin:
                     unity_kind_of_work = ?, 
                     unity_driving_question_id = ?
                 WHERE id = ?
-            """, (html_content, kind_of_work, dq_id, reading_id))
-            self.conn.commit()
+            """, (self._encode_rich_text(html_content), kind_of_work, dq_id, reading_id))
+            self._commit()
         except Exception as e:
             print(f"Error in save_reading_unity_data: {e}")
-            self.conn.rollback()
+            self._rollback()
 
     # --- END NEW METHOD ---
 
     def delete_reading(self, reading_id):
         """Deletes a reading and all its related data (outline, attachments) via cascade."""
         self.cursor.execute("DELETE FROM readings WHERE id = ?", (reading_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_reading_order(self, ordered_ids):
         """Reorders readings based on a list of IDs."""
-        for order, reading_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE readings SET display_order = ? WHERE id = ?",
-                (order, reading_id)
-            )
-        self.conn.commit()
\ No newline at end of file
+        self._bulk_update_order("readings", ordered_ids)
\ No newline at end of file
@@ -41,7 +41,7 @@ class ResearchMixin:
             INSERT INTO research_nodes (project_id, parent_id, type, title, display_order)
             VALUES (?, ?, ?, ?, ?)
         """, (project_id, parent_id, node_type, title, new_order))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def update_research_node_field(self, node_id, field, value):
@@ -59,18 +59,16 @@ class ResearchMixin:
 
         query = f"UPDATE research_nodes SET {field} = ? WHERE id = ?"
         self.cursor.execute(query, (value, node_id))
-        self.conn.commit()
+        self._commit()
 
     def delete_research_node(self, node_id):
         """Deletes a node (and cascading children/memos)."""
         self.cursor.execute("DELETE FROM research_nodes WHERE id = ?", (node_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_research_node_order(self, ordered_ids):
         """Updates display_order for a list of sibling IDs."""
-        for i, node_id in enumerate(ordered_ids):
-            self.cursor.execute("UPDATE research_nodes SET display_order = ? WHERE id = ?", (i, node_id))
-        self.conn.commit()
+        self._bulk_update_order("research_nodes", ordered_ids)
 
     # --- PDF Linking (Many-to-Many) ---
     def add_research_pdf_link(self, research_node_id, pdf_node_id):
@@ -80,7 +78,7 @@ class ResearchMixin:
                 "INSERT INTO research_node_pdf_links (research_node_id, pdf_node_id) VALUES (?, ?)",
                 (research_node_id, pdf_node_id)
             )
-            self.conn.commit()
+            self._commit()
         except sqlite3.IntegrityError:
             pass  # Already exists
 
@@ -90,7 +88,7 @@ class ResearchMixin:
             "DELETE FROM research_node_pdf_links WHERE research_node_id = ? AND pdf_node_id = ?",
             (research_node_id, pdf_node_id)
         )
-        self.conn.commit()
+        self._commit()
 
     def get_research_pdf_links(self, research_node_id):
         """Gets all linked PDF nodes for a research node."""
@@ -110,7 +108,7 @@ class ResearchMixin:
                 "INSERT INTO research_node_terms (research_node_id, terminology_id) VALUES (?, ?)",
                 (research_node_id, terminology_id)
             )
-            self.conn.commit()
+            self._commit()
         except sqlite3.IntegrityError:
             pass
 
@@ -120,7 +118,7 @@ class ResearchMixin:
             "DELETE FROM research_node_terms WHERE research_node_id = ? AND terminology_id = ?",
             (research_node_id, terminology_id)
         )
-        self.conn.commit()
+        self._commit()
 
     def get_research_term_links(self, research_node_id):
         """Gets all linked terms for a research node."""
@@ -144,13 +142,18 @@ class ResearchMixin:
         """, (node_id,))
         return self._map_rows(self.cursor.fetchall())
 
+    def get_research_memo_details(self, memo_id):
+        """Gets a single memo, including the node it belongs to."""
+        self.cursor.execute("SELECT * FROM research_memos WHERE id = ?", (memo_id,))
+        return self._rowdict(self.cursor.fetchone())
+
     def add_research_memo(self, node_id, title, content=""):
         """Adds a new memo."""
         self.cursor.execute("""
             INSERT INTO research_memos (node_id, title, content)
             VALUES (?, ?, ?)
         """, (node_id, title, content))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def update_research_memo(self, memo_id, title, content):
@@ -160,12 +163,12 @@ class ResearchMixin:
             SET title = ?, content = ?
             WHERE id = ?
         """, (title, content, memo_id))
-        self.conn.commit()
+        self._commit()
 
     def delete_research_memo(self, memo_id):
         """Deletes a memo."""
         self.cursor.execute("DELETE FROM research_memos WHERE id = ?", (memo_id,))
-        self.conn.commit()
+        self._commit()
 
     # --- Research Plan CRUD ---
 
@@ -188,7 +191,7 @@ class ResearchMixin:
             INSERT INTO research_plans (project_id, title, display_order)
             VALUES (?, ?, ?)
         """, (project_id, title, new_order))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def update_research_plan_field(self, plan_id, field, value):
@@ -203,9 +206,13 @@ class ResearchMixin:
             return
 
         self.cursor.execute(f"UPDATE research_plans SET {field} = ? WHERE id = ?", (value, plan_id))
-        self.conn.commit()
+        self._commit()
+
+    def update_research_plan_order(self, ordered_ids):
+        """Updates display_order for a list of research plan IDs."""
+        self._bulk_update_order("research_plans", ordered_ids)
 
     def delete_research_plan(self, plan_id):
         """Deletes a research plan."""
         self.cursor.execute("DELETE FROM research_plans WHERE id = ?", (plan_id,))
-        self.conn.commit()
\ No newline at end of file
+        self._commit()
\ No newline at end of file
@@ -0,0 +1,110 @@
+import re
+
+# What QTextEdit.toHtml() (Qt 6) puts in front of every document.
+QT_HTML_HEAD = (
+    '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN" "http://www.w3.org/TR/REC-html40/strict.dtd">\n'
+    '<html><head><meta name="qrichtext" content="1" /><meta charset="utf-8" /><style type="text/css">\n'
+    'p, li { white-space: pre-wrap; }\n'
+    'hr { height: 1px; border-width: 0; }\n'
+    'li.unchecked::marker { content: "\\2610"; }\n'
+    'li.checked::marker { content: "\\2612"; }\n'
+    '</style></head>'
+)
+
+# The inline block style toHtml() writes on nearly every <p> and <li>.
+QT_DEFAULT_BLOCK_STYLE = (" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px;"
+                          " -qt-block-indent:0; text-indent:0px;")
+
+# Canonical head. It also marks a document as compacted, and its style
+# sheet gives bare <p>/<li> the same zero margins, so the compact form
+# renders the same in any QTextBrowser (or browser) that shows it as-is.
+COMPACT_HTML_HEAD = (
+    '<html><head><meta name="qrichtext" content="1" /><style>'
+    'p, li { white-space: pre-wrap; margin-top: 0px; margin-bottom: 0px; margin-left: 0px; '
+    'margin-right: 0px; -qt-block-indent: 0; text-indent: 0px; } '
+    'hr { height: 1px; border-width: 0; } '
+    'li.unchecked::marker { content: "\\2610"; } li.checked::marker { content: "\\2612"; }'
+    '</style></head>'
+)
+
+_QT_HEAD_RE = re.compile(
+    r'\A\s*<!DOCTYPE HTML PUBLIC[^>]*>\s*<html><head><meta name="qrichtext" content="1" />.*?'
+    r'p, li \{ white-space: pre-wrap; \}.*?</head>',
+    re.DOTALL
+)
+_BLOCK_TAG_RE = re.compile(r'<(p|li)(\s[^>]*)?>')
+_STYLE_ATTR_RE = re.compile(r'\sstyle="([^"]*)"')
+_EMPTY_PARAGRAPH = "-qt-paragraph-type:empty;"
+
+
+def is_qt_html(html):
+    """True for a full document as written by QTextEdit.toHtml()."""
+    return bool(html) and _QT_HEAD_RE.match(html) is not None
+
+
+def is_compact_html(html):
+    return bool(html) and html.startswith(COMPACT_HTML_HEAD)
+
+
+def _strip_default_style(match):
+    tag, attrs = match.group(1), match.group(2) or ""
+    style_match = _STYLE_ATTR_RE.search(attrs)
+    if not style_match or QT_DEFAULT_BLOCK_STYLE not in style_match.group(1):
+        return match.group(0)
+    style = style_match.group(1).replace(QT_DEFAULT_BLOCK_STYLE, "", 1).strip()
+    if style:
+        new_attr = f' style="{style}"'
+    else:
+        new_attr = ""
+    attrs = attrs[:style_match.start()] + new_attr + attrs[style_match.end():]
+    return f"<{tag}{attrs}>"
+
+
+def _restore_default_style(match):
+    tag, attrs = match.group(1), match.group(2) or ""
+    style_match = _STYLE_ATTR_RE.search(attrs)
+    if not style_match:
+        return f'<{tag}{attrs} style="{QT_DEFAULT_BLOCK_STYLE}">'
+    style = style_match.group(1)
+    if "margin-top:" in style:
+        return match.group(0)  # Non-default margins were kept as written
+    # toHtml() writes the empty-paragraph marker first, everything else after
+    if style.startswith(_EMPTY_PARAGRAPH):
+        style = _EMPTY_PARAGRAPH + QT_DEFAULT_BLOCK_STYLE + style[len(_EMPTY_PARAGRAPH):]
+    else:
+        style = QT_DEFAULT_BLOCK_STYLE + " " + style
+    attrs = attrs[:style_match.start()] + f' style="{style}"' + attrs[style_match.end():]
+    return f"<{tag}{attrs}>"
+
+
+def compact_qt_html(html):
+    """
+    Returns the canonical compact form of a QTextEdit.toHtml() document:
+    the DOCTYPE/meta/style boilerplate becomes COMPACT_HTML_HEAD, and the
+    default block style is dropped from <p> and <li>.
+
+    Only documents that expand_qt_html gives back byte for byte are
+    compacted. That rules out any head other than QT_HTML_HEAD (Qt 5, a
+    different style block) and block styles the expansion would reorder.
+    Everything else, including HTML that is not Qt rich text or is
+    already compact, is returned unchanged.
+    """
+    if not html or is_compact_html(html) or not html.startswith(QT_HTML_HEAD):
+        return html
+    body = html[len(QT_HTML_HEAD):]
+    compact = COMPACT_HTML_HEAD + _BLOCK_TAG_RE.sub(_strip_default_style, body)
+    if expand_qt_html(compact) != html:
+        return html
+    return compact
+
+
+def expand_qt_html(html):
+    """
+    Reverses compact_qt_html, giving back the document toHtml() wrote, so
+    the editor gets exactly the block formats it saved. Other HTML is
+    returned unchanged.
+    """
+    if not is_compact_html(html):
+        return html
+    body = html[len(COMPACT_HTML_HEAD):]
+    return QT_HTML_HEAD + _BLOCK_TAG_RE.sub(_restore_default_style, body)
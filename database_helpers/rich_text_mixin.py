@@ -0,0 +1,239 @@
+from database_helpers.rich_text import compact_qt_html, is_compact_html, is_qt_html
+from database_helpers.text_compression import compress_text, decompress_text, is_compressed
+from database_helpers.project_files_mixin import PROJECT_SCHEMA
+
+
+class RichTextMixin:
+    """
+    Mixin for the rich-text columns written by RichTextEditorTab. Editors
+    save the canonical compact form (see rich_text.py); this compacts rows
+    saved before that and reports how much space the HTML takes.
+
+    Large values can also be stored zlib-compressed (text_compression.py,
+    user_settings.db_compress_text, off by default). Setters pass values
+    in RICH_TEXT_COLUMNS through _encode_rich_text; _rowdict/_map_rows
+    expand them again on read.
+
+    With per-project files the rewrites and the report cover the main
+    database first, then each project file in a transaction of its own.
+    """
+
+    # (table, [columns]) holding QTextEdit.toHtml() documents
+    RICH_TEXT_COLUMNS = [
+        ("reading_outline", ["notes_html"]),
+        ("readings", [
+            "propositions_html", "unity_html", "key_terms_html", "arguments_html", "gaps_html",
+            "theories_html", "personal_dialogue_html", "elevator_abstract_html"
+        ]),
+        ("items", [
+            "project_purpose_text", "project_goals_text", "key_questions_text", "thesis_text",
+            "insights_text", "unresolved_text", "assignment_instructions_text",
+            "assignment_draft_text", "synthesis_notes_html"
+        ]),
+    ]
+
+    _text_compression_enabled = None  # None = not read from user_settings yet
+
+    def is_text_compression_enabled(self):
+        if self._text_compression_enabled is None:
+            try:
+                row = self.conn.execute("SELECT db_compress_text FROM user_settings WHERE id = 1").fetchone()
+                self._text_compression_enabled = bool(row[0]) if row and row[0] is not None else False
+            except Exception:
+                # Column not there yet (migration 8 pending)
+                return False
+        return self._text_compression_enabled
+
+    def _encode_rich_text(self, value):
+        """The value as it should be stored: compressed if enabled and worth it."""
+        if self.is_text_compression_enabled():
+            return compress_text(value)
+        return value
+
+    def set_text_compression(self, enabled, vacuum=False):
+        """
+        Turns compressed storage on or off and rewrites every rich-text
+        value to match. Returns the number of rows rewritten.
+        """
+        try:
+            with self.transaction():
+                self.cursor.execute("INSERT OR IGNORE INTO user_settings (id) VALUES (1)")
+                self.cursor.execute("UPDATE user_settings SET db_compress_text = ? WHERE id = 1",
+                                    (1 if enabled else 0,))
+                self._text_compression_enabled = bool(enabled)
+                rows = self._recode_rich_text_rows(self._main_rich_text_scope())
+        except Exception as e:
+            print(f"Error changing text compression: {e}")
+            self._text_compression_enabled = None
+            return 0
+        if vacuum and rows:
+            self.vacuum_database()
+        try:
+            for _project_id in self.each_project_file():
+                with self.transaction():
+                    file_rows = self._recode_rich_text_rows(PROJECT_SCHEMA)
+                if vacuum and file_rows:
+                    self.vacuum_database(PROJECT_SCHEMA)
+                rows += file_rows
+        except Exception as e:
+            print(f"Error changing text compression in the project files: {e}")
+        return rows
+
+    def _recode_rich_text_rows(self, scope=None):
+        """Re-stores every RICH_TEXT_COLUMNS value with _encode_rich_text. Returns rows changed."""
+        rows_changed = 0
+        for table, columns in self._existing_rich_text_columns(scope):
+            for col in columns:
+                self.cursor.execute(f"SELECT id, {col} FROM {table} WHERE {col} IS NOT NULL")
+                updates = []
+                for row in self.cursor.fetchall():
+                    stored = row[col]
+                    encoded = self._encode_rich_text(decompress_text(stored))
+                    if encoded != stored:
+                        updates.append((encoded, row['id']))
+                if updates:
+                    self.cursor.executemany(f"UPDATE {table} SET {col} = ? WHERE id = ?", updates)
+                    rows_changed += len(updates)
+        return rows_changed
+
+    def _main_rich_text_scope(self):
+        """The scope of the main database's own rich-text tables: all of them in single-file mode."""
+        return "main" if self.is_project_files_enabled() else None
+
+    def _existing_rich_text_columns(self, scope=None):
+        """
+        RICH_TEXT_COLUMNS limited to the columns this database actually has,
+        and to the tables in schema `scope` ('main' or 'project') if given.
+        """
+        existing = []
+        for table, columns in self.RICH_TEXT_COLUMNS:
+            if scope is not None and self._table_schema(table) != scope:
+                continue
+            self.cursor.execute(f"PRAGMA table_info({table})")
+            present = {row['name'] for row in self.cursor.fetchall()}
+            cols = [col for col in columns if col in present]
+            if cols:
+                existing.append((table, cols))
+        return existing
+
+    def _compact_rich_text_rows(self, scope=None):
+        """Rewrites verbose Qt HTML in RICH_TEXT_COLUMNS. Returns (rows, bytes_saved)."""
+        rows_changed = 0
+        bytes_saved = 0
+        for table, columns in self._existing_rich_text_columns(scope):
+            for col in columns:
+                self.cursor.execute(
+                    f"SELECT id, {col} FROM {table} WHERE {col} LIKE '%qrichtext%' OR typeof({col}) = 'blob'"
+                )
+                updates = []
+                for row in self.cursor.fetchall():
+                    html = decompress_text(row[col])
+                    if not isinstance(html, str):
+                        continue
+                    compact = compact_qt_html(html)
+                    if compact != html:
+                        updates.append((self._encode_rich_text(compact), row['id']))
+                        bytes_saved += len(html.encode("utf-8")) - len(compact.encode("utf-8"))
+                if updates:
+                    self.cursor.executemany(f"UPDATE {table} SET {col} = ? WHERE id = ?", updates)
+                    rows_changed += len(updates)
+        return rows_changed, bytes_saved
+
+    def compact_rich_text(self, vacuum=False):
+        """
+        Converts any stored rich text still in the verbose toHtml() form
+        to the compact form. With vacuum=True the freed pages are given
+        back to the file system. Returns (rows_changed, bytes_saved).
+        """
+        try:
+            with self.transaction():
+                rows, saved = self._compact_rich_text_rows(self._main_rich_text_scope())
+            if vacuum and rows:
+                self.vacuum_database()
+            for _project_id in self.each_project_file():
+                with self.transaction():
+                    file_rows, file_saved = self._compact_rich_text_rows(PROJECT_SCHEMA)
+                if vacuum and file_rows:
+                    self.vacuum_database(PROJECT_SCHEMA)
+                rows, saved = rows + file_rows, saved + file_saved
+        except Exception as e:
+            print(f"Error compacting rich text: {e}")
+            return 0, 0
+        return rows, saved
+
+    def vacuum_database(self, schema="main"):
+        """Rebuilds the database file (or an attached project file) so freed pages are released."""
+        try:
+            self._commit()
+            self.conn.execute(f"VACUUM {schema}")
+        except Exception as e:
+            print(f"Error vacuuming database: {e}")
+
+    def get_rich_text_size_report(self):
+        """
+        Returns {'columns': [...], 'totals': {...}, 'file': {...}} describing
+        how many bytes each rich-text column uses (as text, and as stored
+        after compression), how much of it is still verbose Qt HTML and how
+        much compacting it would save.
+        """
+        entries = {}
+        file_stats = {"bytes": 0, "page_count": 0, "free_bytes": 0}
+        self._add_rich_text_sizes(self._main_rich_text_scope(), entries)
+        self._add_file_sizes("main", file_stats)
+        for _project_id in self.each_project_file():
+            self._add_rich_text_sizes(PROJECT_SCHEMA, entries)
+            self._add_file_sizes(PROJECT_SCHEMA, file_stats)
+
+        totals = {"rows": 0, "bytes": 0, "stored_bytes": 0, "compressed_rows": 0,
+                  "verbose_rows": 0, "compact_rows": 0, "savable_bytes": 0}
+        columns_report = list(entries.values())
+        for entry in columns_report:
+            for key in totals:
+                totals[key] += entry[key]
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "columns": sorted(columns_report, key=lambda entry: entry["stored_bytes"], reverse=True),
+            "totals": totals,
+            "file": {
+                "bytes": file_stats["bytes"],
+                "page_size": page_size,
+                "page_count": file_stats["page_count"],
+                "free_bytes": file_stats["free_bytes"],
+            },
+        }
+
+    def _add_rich_text_sizes(self, scope, entries):
+        """Adds the sizes of the rich-text columns in `scope` to entries {(table, column): entry}."""
+        for table, columns in self._existing_rich_text_columns(scope):
+            for col in columns:
+                entry = entries.setdefault((table, col), {
+                    "table": table, "column": col, "rows": 0, "bytes": 0,
+                    "stored_bytes": 0, "compressed_rows": 0,
+                    "verbose_rows": 0, "compact_rows": 0, "savable_bytes": 0})
+                self.cursor.execute(f"SELECT {col} FROM {table} WHERE {col} IS NOT NULL AND {col} != ''")
+                for row in self.cursor.fetchall():
+                    stored = row[0]
+                    html = decompress_text(stored)
+                    if not isinstance(html, str):
+                        continue
+                    size = len(html.encode("utf-8"))
+                    entry["rows"] += 1
+                    entry["bytes"] += size
+                    if is_compressed(stored):
+                        entry["compressed_rows"] += 1
+                        entry["stored_bytes"] += len(stored)
+                    else:
+                        entry["stored_bytes"] += size
+                    if is_compact_html(html):
+                        entry["compact_rows"] += 1
+                    elif is_qt_html(html):
+                        entry["verbose_rows"] += 1
+                        entry["savable_bytes"] += size - len(compact_qt_html(html).encode("utf-8"))
+
+    def _add_file_sizes(self, schema, file_stats):
+        page_size = self.conn.execute(f"PRAGMA {schema}.page_size").fetchone()[0]
+        page_count = self.conn.execute(f"PRAGMA {schema}.page_count").fetchone()[0]
+        freelist_count = self.conn.execute(f"PRAGMA {schema}.freelist_count").fetchone()[0]
+        file_stats["bytes"] += page_size * page_count
+        file_stats["page_count"] += page_count
+        file_stats["free_bytes"] += page_size * freelist_count
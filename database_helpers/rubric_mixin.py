@@ -23,7 +23,7 @@ class RubricMixin:
             INSERT INTO rubric_components (project_id, component_text, is_checked, display_order)
             VALUES (?, ?, 0, ?)
         """, (project_id, text, new_order))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def update_rubric_component_text(self, component_id, text):
@@ -33,7 +33,7 @@ class RubricMixin:
             SET component_text = ?
             WHERE id = ?
         """, (text, component_id))
-        self.conn.commit()
+        self._commit()
 
     def update_rubric_component_checked(self, component_id, is_checked):
         """Set the checked flag (0/1) on a rubric component."""
@@ -42,19 +42,13 @@ class RubricMixin:
             SET is_checked = ?
             WHERE id = ?
         """, (int(bool(is_checked)), component_id))
-        self.conn.commit()
+        self._commit()
 
     def delete_rubric_component(self, component_id):
         """Delete a rubric component."""
         self.cursor.execute("DELETE FROM rubric_components WHERE id = ?", (component_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_rubric_component_order(self, ordered_ids):
         """Reorder rubric components by the given id sequence."""
-        for order, cid in enumerate(ordered_ids):
-            self.cursor.execute("""
-                UPDATE rubric_components
-                SET display_order = ?
-                WHERE id = ?
-            """, (order, cid))
-        self.conn.commit()
\ No newline at end of file
+        self._bulk_update_order("rubric_components", ordered_ids)
\ No newline at end of file
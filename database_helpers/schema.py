@@ -4,12 +4,100 @@ import sqlite3
 class SchemaSetup:
     """
     Handles the initial creation of all database tables for a fresh database.
-    Contains migration logic to add new columns safely.
+    Schema changes are numbered migrations tracked by PRAGMA user_version,
+    so each one runs exactly once per database file.
     """
 
+    # Ordered (version, method_name) pairs. Each step runs once; the
+    # database's PRAGMA user_version records the last step applied.
+    # Append new steps to the end and never renumber existing ones.
+    MIGRATIONS = [
+        (1, "_migration_001_base_schema"),
+        (2, "_migration_002_indexes"),
+        (3, "_migration_003_connection_settings"),
+        (4, "_migration_004_search_index"),
+        (5, "_migration_005_query_profiling_setting"),
+        (6, "_migration_006_backup_settings"),
+        (7, "_migration_007_compact_rich_text"),
+        (8, "_migration_008_text_compression"),
+        (9, "_migration_009_attachment_store"),
+        (10, "_migration_010_project_files"),
+    ]
+    SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+    # (index_name, table, columns) for every foreign-key and ordering lookup
+    # the mixins run. Composite indexes lead with the filter column and end
+    # with display_order so "WHERE x = ? ORDER BY display_order" needs no sort.
+    SCHEMA_INDEXES = [
+        ("idx_items_parent_order", "items", "parent_id, display_order"),
+        ("idx_items_type", "items", "type"),
+        ("idx_rubric_components_project", "rubric_components", "project_id, display_order"),
+        ("idx_mindmaps_project", "mindmaps", "project_id, display_order"),
+        ("idx_mindmap_edges_mindmap", "mindmap_edges", "mindmap_id"),
+        ("idx_project_terminology_project", "project_terminology", "project_id, display_order"),
+        ("idx_project_propositions_project", "project_propositions", "project_id, display_order"),
+        ("idx_project_todo_list_project", "project_todo_list", "project_id, display_order"),
+        ("idx_research_nodes_project", "research_nodes", "project_id, parent_id, display_order"),
+        ("idx_research_nodes_parent", "research_nodes", "parent_id"),
+        ("idx_research_node_pdf_links_pdf", "research_node_pdf_links", "pdf_node_id"),
+        ("idx_research_node_terms_term", "research_node_terms", "terminology_id"),
+        ("idx_research_memos_node", "research_memos", "node_id"),
+        ("idx_research_plans_project", "research_plans", "project_id, display_order"),
+        ("idx_evidence_matrix_themes_project", "evidence_matrix_themes", "project_id, display_order"),
+        ("idx_evidence_matrix_pdf_links_pdf", "evidence_matrix_pdf_links", "pdf_node_id"),
+        ("idx_readings_project_order", "readings", "project_id, display_order"),
+        ("idx_project_tag_links_tag", "project_tag_links", "tag_id"),
+        ("idx_rdq_reading_type_parent", "reading_driving_questions", "reading_id, type, parent_id"),
+        ("idx_rdq_parent", "reading_driving_questions", "parent_id"),
+        ("idx_rdq_outline", "reading_driving_questions", "outline_id"),
+        ("idx_reading_outline_tree", "reading_outline", "reading_id, parent_id, display_order"),
+        ("idx_reading_outline_parent", "reading_outline", "parent_id"),
+        ("idx_reading_outline_part_dq", "reading_outline", "part_dq_id"),
+        ("idx_reading_attachments_reading", "reading_attachments", "reading_id, display_order"),
+        ("idx_pdf_node_categories_project", "pdf_node_categories", "project_id"),
+        ("idx_pdf_nodes_attachment_page", "pdf_nodes", "attachment_id, page_number"),
+        ("idx_pdf_nodes_reading", "pdf_nodes", "reading_id"),
+        ("idx_pdf_nodes_category", "pdf_nodes", "category_id"),
+        ("idx_reading_arguments_reading", "reading_arguments", "reading_id, display_order"),
+        ("idx_reading_arguments_dq", "reading_arguments", "driving_question_id"),
+        ("idx_terminology_reading_links_reading", "terminology_reading_links", "reading_id"),
+        ("idx_proposition_reading_links_reading", "proposition_reading_links", "reading_id"),
+        ("idx_synthesis_anchors_project", "synthesis_anchors", "project_id"),
+        ("idx_synthesis_anchors_reading", "synthesis_anchors", "reading_id"),
+        ("idx_synthesis_anchors_item_link", "synthesis_anchors", "item_link_id"),
+        ("idx_synthesis_anchors_outline", "synthesis_anchors", "outline_id"),
+        ("idx_synthesis_anchors_pdf_node", "synthesis_anchors", "pdf_node_id"),
+        ("idx_synthesis_anchors_tag", "synthesis_anchors", "tag_id"),
+        ("idx_reading_argument_evidence_argument", "reading_argument_evidence", "argument_id"),
+        ("idx_reading_argument_evidence_outline", "reading_argument_evidence", "outline_id"),
+        ("idx_terminology_references_term", "terminology_references", "terminology_id"),
+        ("idx_terminology_references_reading", "terminology_references", "reading_id"),
+        ("idx_terminology_references_outline", "terminology_references", "outline_id"),
+        ("idx_terminology_reference_pdf_links_pdf", "terminology_reference_pdf_links", "pdf_node_id"),
+        ("idx_proposition_references_prop", "proposition_references", "proposition_id"),
+        ("idx_proposition_references_reading", "proposition_references", "reading_id"),
+        ("idx_proposition_references_outline", "proposition_references", "outline_id"),
+        ("idx_proposition_reference_pdf_links_pdf", "proposition_reference_pdf_links", "pdf_node_id"),
+        ("idx_anchor_tag_links_tag", "anchor_tag_links", "tag_id, anchor_id"),
+    ]
+
+    def _create_indexes(self):
+        """
+        Creates the lookup indexes in SCHEMA_INDEXES; existing indexes are
+        left untouched. Errors propagate so the migration rolls back.
+        """
+        for index_name, table_name, columns in self.SCHEMA_INDEXES:
+            try:
+                self.cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns})")
+            except Exception as e:
+                print(f"Error: Could not create index {index_name} on {table_name}. {e}")
+                raise
+
     def _add_column_if_not_exists(self, table_name, column_name, column_type="TEXT", default_value="''"):
         """
-        Safely adds a column to a table if it doesn't already exist.
+        Adds a column to a table if it doesn't already exist. Errors
+        propagate so the migration rolls back.
         """
         try:
             self.cursor.execute(f"PRAGMA table_info({table_name})")
@@ -19,14 +107,49 @@ class SchemaSetup:
                     f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type} DEFAULT {default_value}")
                 print(f"Added column: {column_name} to {table_name}")
         except Exception as e:
-            print(f"Warning: Could not add column {column_name} to {table_name}. {e}")
+            print(f"Error: Could not add column {column_name} to {table_name}. {e}")
+            raise
+
+    def _get_schema_version(self):
+        """Returns the schema version stamped in PRAGMA user_version."""
+        self.cursor.execute("PRAGMA user_version")
+        return self.cursor.fetchone()[0]
 
     def setup_database(self):
         """
-        Creates all tables for the application.
+        Brings the database up to SCHEMA_VERSION by applying every pending
+        step in MIGRATIONS inside a single transaction. An up-to-date
+        database does no work beyond reading PRAGMA user_version.
         """
-        print("--- Running SchemaSetup.setup_database() ---")
+        current_version = self._get_schema_version()
+        pending = [(version, method_name) for version, method_name in self.MIGRATIONS
+                   if version > current_version]
+        if not pending:
+            return
 
+        print(f"--- Migrating schema from version {current_version} to {self.SCHEMA_VERSION} ---")
+        try:
+            self.cursor.execute("BEGIN")
+            for version, method_name in pending:
+                getattr(self, method_name)()
+                print(f"Applied schema migration {version}: {method_name}")
+            # PRAGMA does not accept bound parameters; SCHEMA_VERSION is an int constant.
+            self.cursor.execute(f"PRAGMA user_version = {int(self.SCHEMA_VERSION)}")
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error: Schema migration failed, database left at version {current_version}. {e}")
+            raise
+        print("--- Schema setup complete. All tables created/updated. ---")
+
+    # ---------------------------- migrations ----------------------------
+
+    def _migration_001_base_schema(self):
+        """
+        Creates all tables for the application. Databases created before
+        versioning existed also go through this step, so it keeps the
+        legacy column probes that upgrade older table layouts.
+        """
         # --- Level 0: Core Tables ---
         self.cursor.execute("""
         CREATE TABLE IF NOT EXISTS items (
@@ -611,5 +734,125 @@ class SchemaSetup:
         )
         """)
 
-        self.conn.commit()
-        print("--- Schema setup complete. All tables created/updated. ---")
\ No newline at end of file
+    def _migration_002_indexes(self):
+        """Adds the lookup indexes declared in SCHEMA_INDEXES."""
+        self._create_indexes()
+
+    def _migration_003_connection_settings(self):
+        """Adds the connection tuning columns read by ConnectionProfileMixin."""
+        self._add_column_if_not_exists("user_settings", "db_journal_mode", "TEXT", "NULL")
+        self._add_column_if_not_exists("user_settings", "db_synchronous", "TEXT", "NULL")
+        self._add_column_if_not_exists("user_settings", "db_mmap_size", "INTEGER", "NULL")
+        self._add_column_if_not_exists("user_settings", "db_cache_size", "INTEGER", "NULL")
+        self._add_column_if_not_exists("user_settings", "db_temp_store", "TEXT", "NULL")
+        self._add_column_if_not_exists("user_settings", "db_busy_timeout", "INTEGER", "NULL")
+
+    def _migration_004_search_index(self):
+        """Adds the FTS5 search table and its sync triggers (SearchMixin)."""
+        self._create_search_index()
+
+    def _migration_005_query_profiling_setting(self):
+        """Adds the opt-in SQL profiling flag read by query_profiler.py."""
+        self._add_column_if_not_exists("user_settings", "db_profile_queries", "INTEGER", "0")
+
+    def _migration_006_backup_settings(self):
+        """Adds the scheduled snapshot settings read by BackupMixin."""
+        self._add_column_if_not_exists("user_settings", "backup_enabled", "INTEGER", "0")
+        self._add_column_if_not_exists("user_settings", "backup_dir", "TEXT", "NULL")
+        self._add_column_if_not_exists("user_settings", "backup_keep_hourly", "INTEGER", "24")
+        self._add_column_if_not_exists("user_settings", "backup_keep_daily", "INTEGER", "7")
+        self._add_column_if_not_exists("user_settings", "backup_keep_weekly", "INTEGER", "4")
+
+    def _migration_007_compact_rich_text(self):
+        """
+        Rewrites stored toHtml() documents in the compact form (RichTextMixin).
+        Documents compact_qt_html cannot restore byte for byte are left as they are.
+        """
+        rows, saved = self._compact_rich_text_rows()
+        print(f"Compacted {rows} rich-text field(s), {saved} bytes saved.")
+
+    def _migration_008_text_compression(self):
+        """
+        Adds the compressed-storage flag (RichTextMixin), off by default.
+        Existing rows are only recoded when set_text_compression turns it on.
+        """
+        self._add_column_if_not_exists("user_settings", "db_compress_text", "INTEGER", "0")
+        self._text_compression_enabled = None
+
+    def _migration_009_attachment_store(self):
+        """
+        Adds the content-addressed attachment store (AttachmentsMixin):
+        the blob table and the triggers that keep its reference counts.
+        Schema only: existing attachments keep their per-reading files
+        until AttachmentsMixin.dedupe_attachment_files moves them.
+        """
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS attachment_blobs (
+                file_path TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                ref_count INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            ) WITHOUT ROWID
+        """)
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_attachment_blobs_unused ON attachment_blobs (ref_count)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_reading_attachments_file ON reading_attachments (file_path)")
+        self.cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_attachment_blob_ins AFTER INSERT ON reading_attachments
+            BEGIN
+                UPDATE attachment_blobs SET ref_count = ref_count + 1 WHERE file_path = NEW.file_path;
+            END
+        """)
+        self.cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_attachment_blob_del AFTER DELETE ON reading_attachments
+            BEGIN
+                UPDATE attachment_blobs SET ref_count = ref_count - 1 WHERE file_path = OLD.file_path;
+            END
+        """)
+        self.cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_attachment_blob_upd AFTER UPDATE OF file_path ON reading_attachments
+            BEGIN
+                UPDATE attachment_blobs SET ref_count = ref_count - 1 WHERE file_path = OLD.file_path;
+                UPDATE attachment_blobs SET ref_count = ref_count + 1 WHERE file_path = NEW.file_path;
+            END
+        """)
+        self.cursor.execute("SELECT COUNT(*) FROM reading_attachments")
+        legacy = self.cursor.fetchone()[0]
+        if legacy:
+            print(f"{legacy} attachment(s) use per-reading files; "
+                  f"'Clean Up Attachments' moves them into the attachment store.")
+
+    def _migration_010_project_files(self):
+        """
+        Adds the catalogue tables of per-project database files
+        (ProjectFilesMixin), off by default: which projects have a file,
+        the highest id each per-project table has used across the files,
+        and every project's anchor count per tag. Existing databases keep
+        a single file until they are split.
+        """
+        self._add_column_if_not_exists("user_settings", "db_project_files", "INTEGER", "0")
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_files (
+                project_id INTEGER PRIMARY KEY,
+                file_name TEXT NOT NULL,
+                attached INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (project_id) REFERENCES items(id) ON DELETE CASCADE
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_file_sequences (
+                name TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_tag_usage (
+                project_id INTEGER NOT NULL,
+                tag_id INTEGER NOT NULL,
+                anchor_count INTEGER NOT NULL,
+                PRIMARY KEY (project_id, tag_id),
+                FOREIGN KEY (project_id) REFERENCES items(id) ON DELETE CASCADE,
+                FOREIGN KEY (tag_id) REFERENCES synthesis_tags(id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_tag_usage_tag ON project_tag_usage (tag_id)")
@@ -0,0 +1,406 @@
+import html
+import sqlite3
+from html.parser import HTMLParser
+
+from database_helpers.text_compression import decompress_text
+
+
+class _TextExtractor(HTMLParser):
+    """Collects the visible text of a (Qt rich text) HTML fragment."""
+
+    _SKIP_TAGS = {'head', 'style', 'script', 'title'}
+    _BREAK_TAGS = {'p', 'br', 'li', 'div', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self._BREAK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_search_text(value):
+    """Returns the plain text of an HTML (or plain text) value for indexing."""
+    if not value:
+        return ""
+    value = str(decompress_text(value))
+    if "<" not in value:
+        return value.strip()
+    parser = _TextExtractor()
+    try:
+        parser.feed(value)
+        parser.close()
+    except Exception:
+        return value
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class SearchMixin:
+    """
+    Full-text search over notes, reading fields, anchors, terminology,
+    propositions, research memos and PDF nodes, backed by an FTS5 table.
+
+    Triggers on the source tables only record (kind, ref_id) in
+    search_index_queue; the HTML is stripped and indexed in Python by
+    sync_search_index, which the main window runs in small batches while
+    the app is idle. That keeps saves and searches cheap and works for
+    writes made by any connection, without needing a SQL function.
+    """
+
+    SEARCH_SYNC_BATCH = 500  # queued rows indexed per idle-time sync
+
+    # kind -> source description.
+    #   code:    small integer used to build the FTS rowid (ref_id * 16 + code)
+    #   table:   source table; 'columns' are the ones the triggers watch
+    #   select:  returns id, project_id, reading_id, outline_id, title and the
+    #            body columns for the rows in {ids}
+    SEARCH_SOURCES = {
+        'outline': {
+            'code': 1,
+            'label': "Reading Notes",
+            'table': 'reading_outline',
+            'columns': ['section_title', 'notes_html', 'part_function_html',
+                        'part_relation_html', 'part_dependency_html'],
+            'select': """
+                SELECT o.id, r.project_id, o.reading_id, o.id AS outline_id,
+                       o.section_title AS title,
+                       o.notes_html, o.part_function_html, o.part_relation_html, o.part_dependency_html
+                FROM reading_outline o
+                JOIN readings r ON r.id = o.reading_id
+                WHERE o.id IN ({ids})
+            """,
+        },
+        'reading': {
+            'code': 2,
+            'label': "Reading",
+            'table': 'readings',
+            'columns': ['title', 'author', 'nickname', 'reading_notes_text', 'propositions_html',
+                        'unity_html', 'key_terms_html', 'arguments_html', 'gaps_html',
+                        'theories_html', 'personal_dialogue_html', 'elevator_abstract_html'],
+            'select': """
+                SELECT id, project_id, id AS reading_id, 0 AS outline_id,
+                       COALESCE(NULLIF(nickname, ''), title) AS title,
+                       title AS full_title, author, reading_notes_text, propositions_html,
+                       unity_html, key_terms_html, arguments_html, gaps_html, theories_html,
+                       personal_dialogue_html, elevator_abstract_html
+                FROM readings
+                WHERE id IN ({ids})
+            """,
+        },
+        'anchor': {
+            'code': 3,
+            'label': "Synthesis Anchor",
+            'table': 'synthesis_anchors',
+            'columns': ['selected_text', 'comment'],
+            'select': """
+                SELECT id, project_id, reading_id, COALESCE(outline_id, 0) AS outline_id,
+                       selected_text AS title, selected_text, comment
+                FROM synthesis_anchors
+                WHERE id IN ({ids})
+            """,
+        },
+        'term': {
+            'code': 4,
+            'label': "Terminology",
+            'table': 'project_terminology',
+            'columns': ['term', 'meaning'],
+            'select': """
+                SELECT id, project_id, 0 AS reading_id, 0 AS outline_id,
+                       term AS title, meaning
+                FROM project_terminology
+                WHERE id IN ({ids})
+            """,
+        },
+        'proposition': {
+            'code': 5,
+            'label': "Proposition",
+            'table': 'project_propositions',
+            'columns': ['display_name', 'proposition_html'],
+            'select': """
+                SELECT id, project_id, 0 AS reading_id, 0 AS outline_id,
+                       display_name AS title, proposition_html
+                FROM project_propositions
+                WHERE id IN ({ids})
+            """,
+        },
+        'memo': {
+            'code': 6,
+            'label': "Research Memo",
+            'table': 'research_memos',
+            'columns': ['title', 'content'],
+            'select': """
+                SELECT m.id, n.project_id, 0 AS reading_id, 0 AS outline_id,
+                       m.title AS title, m.content
+                FROM research_memos m
+                JOIN research_nodes n ON n.id = m.node_id
+                WHERE m.id IN ({ids})
+            """,
+        },
+        'pdf_node': {
+            'code': 7,
+            'label': "PDF Node",
+            'table': 'pdf_nodes',
+            'columns': ['label', 'description'],
+            'select': """
+                SELECT p.id, r.project_id, p.reading_id, 0 AS outline_id,
+                       p.label AS title, p.description
+                FROM pdf_nodes p
+                JOIN readings r ON r.id = p.reading_id
+                WHERE p.id IN ({ids})
+            """,
+        },
+    }
+
+    _SEARCH_ROWID_STRIDE = 16
+    _SEARCH_SNIPPET_START = "\x02"
+    _SEARCH_SNIPPET_END = "\x03"
+
+    # --- Schema (called from SchemaSetup migrations) ---
+
+    def _create_search_index(self):
+        """
+        Creates the FTS5 table, the sync queue and the queueing triggers,
+        then queues every existing row so the first search builds the index.
+        """
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS search_index_queue (
+                kind TEXT NOT NULL,
+                ref_id INTEGER NOT NULL,
+                PRIMARY KEY (kind, ref_id)
+            ) WITHOUT ROWID
+        """)
+        try:
+            self.cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                    kind UNINDEXED, ref_id UNINDEXED, project_id UNINDEXED,
+                    reading_id UNINDEXED, outline_id UNINDEXED,
+                    title, body,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5: keep the queue so a later build can catch up
+            print(f"Warning: Full-text search is unavailable ({e}).")
+
+        for kind, source in self.SEARCH_SOURCES.items():
+            table = source['table']
+            watched = ", ".join(source['columns'])
+            self.cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_search_{table}_ins AFTER INSERT ON {table}
+                BEGIN
+                    INSERT OR IGNORE INTO search_index_queue (kind, ref_id) VALUES ('{kind}', NEW.id);
+                END
+            """)
+            self.cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_search_{table}_upd AFTER UPDATE OF {watched} ON {table}
+                BEGIN
+                    INSERT OR IGNORE INTO search_index_queue (kind, ref_id) VALUES ('{kind}', NEW.id);
+                END
+            """)
+            self.cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_search_{table}_del AFTER DELETE ON {table}
+                BEGIN
+                    INSERT OR IGNORE INTO search_index_queue (kind, ref_id) VALUES ('{kind}', OLD.id);
+                END
+            """)
+            self.cursor.execute(f"""
+                INSERT OR IGNORE INTO search_index_queue (kind, ref_id)
+                SELECT '{kind}', id FROM {table}
+            """)
+
+    # --- Index maintenance ---
+
+    def is_search_available(self):
+        """True if the FTS5 search table exists in this database."""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'search_index'")
+        return self.cursor.fetchone() is not None
+
+    def _search_rowid(self, kind, ref_id):
+        return ref_id * self._SEARCH_ROWID_STRIDE + self.SEARCH_SOURCES[kind]['code']
+
+    def pending_search_index_count(self):
+        """Number of changed rows not yet in the search index."""
+        self.cursor.execute("SELECT COUNT(*) FROM search_index_queue")
+        return self.cursor.fetchone()[0]
+
+    def sync_search_index(self, limit=None):
+        """
+        Re-indexes the rows queued by the triggers, at most `limit` of them
+        (all when None). Rows that no longer exist are removed from the
+        index. Returns the number of rows processed.
+        """
+        if not self.is_search_available():
+            return 0
+        if self.is_project_files_enabled() and self.attached_project_id is None:
+            # Queued rows are in a project file; they are synced before it is detached
+            return 0
+
+        if limit is None:
+            self.cursor.execute("SELECT kind, ref_id FROM search_index_queue")
+        else:
+            self.cursor.execute("SELECT kind, ref_id FROM search_index_queue LIMIT ?", (limit,))
+        queued = {}
+        for row in self.cursor.fetchall():
+            queued.setdefault(row['kind'], []).append(row['ref_id'])
+        if not queued:
+            return 0
+
+        processed = 0
+        try:
+            with self.transaction():
+                for kind, ref_ids in queued.items():
+                    source = self.SEARCH_SOURCES.get(kind)
+                    for start in range(0, len(ref_ids), self._IN_CHUNK_SIZE):
+                        chunk = ref_ids[start:start + self._IN_CHUNK_SIZE]
+                        placeholders = ", ".join("?" * len(chunk))
+                        if source:
+                            self._reindex_search_rows(kind, source, chunk, placeholders)
+                        self.cursor.execute(
+                            f"DELETE FROM search_index_queue WHERE kind = ? AND ref_id IN ({placeholders})",
+                            (kind, *chunk)
+                        )
+                        processed += len(chunk)
+        except Exception as e:
+            print(f"Error in sync_search_index: {e}")
+            return 0
+        return processed
+
+    def _reindex_search_rows(self, kind, source, ref_ids, placeholders):
+        """Replaces the index entries for one chunk of source rows."""
+        self.cursor.executemany(
+            "DELETE FROM search_index WHERE rowid = ?",
+            [(self._search_rowid(kind, ref_id),) for ref_id in ref_ids]
+        )
+        self.cursor.execute(source['select'].format(ids=placeholders), tuple(ref_ids))
+        rows = self.cursor.fetchall()
+
+        entries = []
+        for row in rows:
+            body_parts = [html_to_search_text(row[key]) for key in row.keys()[5:]]
+            entries.append((
+                self._search_rowid(kind, row['id']), kind, row['id'],
+                row['project_id'], row['reading_id'], row['outline_id'],
+                html_to_search_text(row['title']),
+                "\n".join(part for part in body_parts if part)
+            ))
+        self.cursor.executemany("""
+            INSERT INTO search_index (rowid, kind, ref_id, project_id, reading_id, outline_id, title, body)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, entries)
+
+    def rebuild_search_index(self):
+        """
+        Drops every index entry and re-indexes all source rows. With
+        per-project files, each file is indexed in turn.
+        """
+        if not self.is_search_available():
+            return 0
+        try:
+            with self.transaction():
+                self.cursor.execute("DELETE FROM search_index")
+                if not self.is_project_files_enabled():
+                    self._queue_search_rows()
+            if self.is_project_files_enabled():
+                queued = 0
+                for _project_id in self.each_project_file():
+                    with self.transaction():
+                        queued += self._queue_search_rows()
+                    # Indexed when each_project_file moves on to the next file
+                return queued
+        except Exception as e:
+            print(f"Error in rebuild_search_index: {e}")
+            return 0
+        return self.sync_search_index()
+
+    def _queue_search_rows(self):
+        """Queues every source row for indexing. Returns the number of rows queued."""
+        queued = 0
+        for kind, source in self.SEARCH_SOURCES.items():
+            self.cursor.execute(f"""
+                INSERT OR IGNORE INTO search_index_queue (kind, ref_id)
+                SELECT '{kind}', id FROM {source['table']}
+            """)
+            queued += self.cursor.rowcount
+        return queued
+
+    # --- Querying ---
+
+    @staticmethod
+    def _build_fts_query(text):
+        """
+        Turns free text into an FTS5 query: every word must match, and the
+        last word also matches as a prefix (search-as-you-type).
+        """
+        words = [w.replace('"', '""') for w in text.split()]
+        if not words:
+            return ""
+        terms = [f'"{w}"' for w in words]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    def search(self, text, project_id=None, kinds=None, limit=100):
+        """
+        Ranked full-text search. Returns a list of dicts with kind, label,
+        ref_id, project_id, reading_id, outline_id, project_name,
+        reading_title, title and snippet_html (matches wrapped in <b>).
+
+        kind and ref_id name the matching item itself (a term, memo, PDF
+        node, ...). Rows changed since the last sync_search_index are not
+        searched yet. With per-project files, hits in closed projects take
+        their reading title from the index.
+        """
+        fts_query = self._build_fts_query(text or "")
+        if not fts_query or not self.is_search_available():
+            return []
+
+        sql = f"""
+            SELECT s.kind, s.ref_id, s.project_id, s.reading_id, s.outline_id, s.title,
+                   snippet(search_index, 6, '{self._SEARCH_SNIPPET_START}', '{self._SEARCH_SNIPPET_END}', '…', 16) AS snippet,
+                   i.name AS project_name,
+                   COALESCE(NULLIF(r.nickname, ''), r.title,
+                            (SELECT title FROM search_index WHERE rowid = s.reading_id * {self._SEARCH_ROWID_STRIDE} + {self.SEARCH_SOURCES['reading']['code']}))
+                       AS reading_title
+            FROM search_index s
+            LEFT JOIN items i ON i.id = s.project_id
+            LEFT JOIN readings r ON r.id = s.reading_id
+            WHERE search_index MATCH ?
+        """
+        params = [fts_query]
+        if project_id is not None:
+            sql += " AND s.project_id = ?"
+            params.append(project_id)
+        if kinds:
+            sql += f" AND s.kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        # Title hits weigh more than body hits; the UNINDEXED columns get 0
+        sql += " ORDER BY bm25(search_index, 0, 0, 0, 0, 0, 10.0, 1.0) LIMIT ?"
+        params.append(limit)
+
+        try:
+            self.cursor.execute(sql, tuple(params))
+            results = self._map_rows(self.cursor.fetchall())
+        except sqlite3.OperationalError as e:
+            print(f"Error in search: {e}")
+            return []
+
+        for result in results:
+            source = self.SEARCH_SOURCES.get(result['kind'], {})
+            result['label'] = source.get('label', result['kind'])
+            snippet = html.escape(result.pop('snippet') or "")
+            result['snippet_html'] = (snippet.replace(self._SEARCH_SNIPPET_START, "<b>")
+                                      .replace(self._SEARCH_SNIPPET_END, "</b>")
+                                      .replace("\n", " "))
+        return results
@@ -27,10 +27,10 @@ class SettingsMixin:
                 zotero_api_key = excluded.zotero_api_key,
                 zotero_library_type = excluded.zotero_library_type
             """, (library_id, api_key, library_type))
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error saving user settings: {e}")
-            self.conn.rollback()
+            self._rollback()
 
     def save_citation_style(self, style):
         """Saves the selected citation style preference."""
@@ -41,7 +41,7 @@ class SettingsMixin:
             self.cursor.execute("""
                 UPDATE user_settings SET citation_style = ? WHERE id = 1
             """, (style,))
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error saving citation style: {e}")
-            self.conn.rollback()
\ No newline at end of file
+            self._rollback()
\ No newline at end of file
@@ -1,5 +1,5 @@
 # prospectcreek/3rdeditionreadingtracker/database_helpers/synthesis_mixin.py
-import sqlite3
+from database_helpers.read_cache_mixin import cached_read
 
 
 class SynthesisMixin:
@@ -11,6 +11,7 @@ class SynthesisMixin:
         self.cursor.execute("SELECT id, name FROM synthesis_tags ORDER BY name")
         return self._map_rows(self.cursor.fetchall())
 
+    @cached_read("synthesis_tags", "project_tag_links")
     def get_project_tags(self, project_id):
         """Gets all tags that are linked to a specific project."""
         self.cursor.execute("""
@@ -66,10 +67,10 @@ class SynthesisMixin:
                 VALUES (?, ?)
             """, (project_id, tag['id']))
 
-            self.conn.commit()
+            self._commit()
             return tag
         except Exception as e:
-            self.conn.rollback()
+            self._rollback()
             print(f"Error in get_or_create_tag: {e}")
             raise
 
@@ -77,39 +78,39 @@ class SynthesisMixin:
         try:
             self.cursor.execute("INSERT OR IGNORE INTO project_tag_links (project_id, tag_id) VALUES (?, ?)",
                                 (project_id, tag_id))
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error in add_project_tag: {e}")
-            self.conn.rollback()
+            self._rollback()
 
     def remove_project_tag(self, project_id, tag_id):
         try:
             self.cursor.execute("DELETE FROM project_tag_links WHERE project_id = ? AND tag_id = ?",
                                 (project_id, tag_id))
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error in remove_project_tag: {e}")
-            self.conn.rollback()
+            self._rollback()
 
     def add_tag(self, name):
         """DEPRECATED - Use get_or_create_tag instead."""
         try:
             self.cursor.execute("INSERT INTO synthesis_tags (name) VALUES (?)", (name,))
-            self.conn.commit()
+            self._commit()
             return self.cursor.lastrowid
         except Exception as e:
             print(f"Error in add_tag: {e}")
-            self.conn.rollback()
+            self._rollback()
             return None
 
     def rename_tag(self, tag_id, name):
         """Renames a tag globally."""
         try:
             self.cursor.execute("UPDATE synthesis_tags SET name = ? WHERE id = ?", (name, tag_id))
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error in update_tag/rename_tag: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     # Alias for compatibility
@@ -120,80 +121,181 @@ class SynthesisMixin:
         Deletes a tag, all its links, and all text anchors (non-virtual)
         that are now orphaned as a result.
         """
+        return self.delete_tags([tag_id])
+
+    def delete_tags(self, tag_ids):
+        """
+        Deletes several tags in one transaction, with their links and every
+        text anchor (non-virtual) left without a tag. With per-project
+        files, each file using the tags is updated in a transaction of its
+        own first. Returns the number of anchors deleted, or None on error.
+        """
+        tag_ids = list(dict.fromkeys(tag_ids))
+        if not tag_ids:
+            return 0
+        anchors_deleted = 0
         try:
-            # 1. Find all anchors linked *only* to this tag
-            self.cursor.execute("""
-                SELECT a.id, a.item_link_id
-                FROM synthesis_anchors a
-                JOIN anchor_tag_links atl ON a.id = atl.anchor_id
-                WHERE atl.tag_id = ?
-            """, (tag_id,))
-            anchors_to_check = self._map_rows(self.cursor.fetchall())
-
-            # 2. Delete the tag. This will cascade-delete all links
-            # in anchor_tag_links and project_tag_links.
-            self.cursor.execute("DELETE FROM synthesis_tags WHERE id = ?", (tag_id,))
-
-            # 3. Re-check all affected anchors
-            for anchor in anchors_to_check:
-                anchor_id = anchor['id']
-                item_link_id = anchor['item_link_id']
-
-                # Check if this anchor has any *other* tags
-                self.cursor.execute("SELECT COUNT(*) FROM anchor_tag_links WHERE anchor_id = ?", (anchor_id,))
-                remaining_tag_count = self.cursor.fetchone()[0]
-
-                if remaining_tag_count == 0 and item_link_id is None:
-                    # This is a TEXT anchor (not virtual) and is now orphaned.
-                    # Delete the anchor row itself.
-                    self.cursor.execute("DELETE FROM synthesis_anchors WHERE id = ?", (anchor_id,))
-
-            self.conn.commit()
+            if self.is_project_files_enabled():
+                # The cascades from synthesis_tags cannot reach the project files
+                for _project_id in self.each_project_file(self._projects_using_tags(tag_ids)):
+                    with self.transaction():
+                        anchors_deleted += self._delete_tag_anchors(tag_ids, unlink=True)
+                with self.transaction():
+                    for chunk, placeholders in self._id_chunks(tag_ids):
+                        self.cursor.execute(f"DELETE FROM synthesis_tags WHERE id IN ({placeholders})", tuple(chunk))
+                return anchors_deleted
+
+            with self.transaction():
+                anchors_deleted = self._delete_tag_anchors(tag_ids)
         except Exception as e:
-            print(f"Error in delete_tag_and_anchors: {e}")
-            self.conn.rollback()
+            print(f"Error in delete_tags: {e}")
+            return None
+        return anchors_deleted
+
+    def _id_chunks(self, ids):
+        for start in range(0, len(ids), self._IN_CHUNK_SIZE):
+            chunk = ids[start:start + self._IN_CHUNK_SIZE]
+            yield chunk, ", ".join("?" * len(chunk))
+
+    def _delete_tag_anchors(self, tag_ids, unlink=False):
+        """
+        delete_tags' work on the anchors; deletes the tags too unless
+        unlink is set, which drops their anchor links instead (project
+        files). Returns the number of anchors deleted.
+        """
+        anchors_deleted = 0
+        # Chunks run in order, so an anchor tagged from two chunks is
+        # caught by the later one once the earlier tags are gone.
+        for chunk, placeholders in self._id_chunks(tag_ids):
+            # 1. Text anchors whose every tag is being deleted
+            self.cursor.execute(f"""
+                DELETE FROM synthesis_anchors
+                WHERE item_link_id IS NULL
+                  AND id IN (SELECT anchor_id FROM anchor_tag_links WHERE tag_id IN ({placeholders}))
+                  AND NOT EXISTS (
+                      SELECT 1 FROM anchor_tag_links other
+                      WHERE other.anchor_id = synthesis_anchors.id
+                        AND other.tag_id NOT IN ({placeholders})
+                  )
+            """, (*chunk, *chunk))
+            anchors_deleted += self.cursor.rowcount
+            if unlink:
+                self.cursor.execute(f"DELETE FROM anchor_tag_links WHERE tag_id IN ({placeholders})", tuple(chunk))
+                self.cursor.execute(f"UPDATE synthesis_anchors SET tag_id = NULL WHERE tag_id IN ({placeholders})",
+                                    tuple(chunk))
+            else:
+                # 2. The tags. This cascade-deletes their anchor_tag_links
+                # and project_tag_links.
+                self.cursor.execute(f"DELETE FROM synthesis_tags WHERE id IN ({placeholders})", tuple(chunk))
+        return anchors_deleted
+
+    def _projects_using_tags(self, tag_ids):
+        """Projects with anchors under any of tag_ids, from the tag_usage view."""
+        project_ids = set()
+        for chunk, placeholders in self._id_chunks(list(tag_ids)):
+            self.cursor.execute(f"SELECT DISTINCT project_id FROM tag_usage WHERE tag_id IN ({placeholders})",
+                                tuple(chunk))
+            project_ids.update(row[0] for row in self.cursor.fetchall())
+        return sorted(project_ids)
 
     def merge_tags(self, source_tag_id, target_tag_id):
         """Merges one tag into another, then deletes the source tag."""
-        try:
-            # 1. Re-link project_tag_links (ignore conflicts)
-            self.cursor.execute("""
-                UPDATE project_tag_links SET tag_id = ? WHERE tag_id = ?
-            """, (target_tag_id, source_tag_id))
-            # Clean up duplicates
+        self.merge_tags_bulk({source_tag_id: target_tag_id})
+
+    @staticmethod
+    def _resolve_tag_merges(merges):
+        """
+        Flattens {source_id or (source_ids): target_id} into {source: final
+        target}, following chains such as a -> b, b -> c. Raises ValueError
+        for cycles or a source given two targets.
+        """
+        direct = {}
+        for sources, target in merges.items():
+            if isinstance(sources, int):
+                sources = (sources,)
+            for source in sources:
+                if source == target:
+                    continue
+                if direct.get(source, target) != target:
+                    raise ValueError(f"Tag {source} is merged into more than one tag.")
+                direct[source] = target
+
+        resolved = {}
+        for source in direct:
+            target, seen = direct[source], {source}
+            while target in direct:
+                if target in seen:
+                    raise ValueError(f"Tag merges form a cycle at tag {target}.")
+                seen.add(target)
+                target = direct[target]
+            resolved[source] = target
+        return resolved
+
+    def merge_tags_bulk(self, merges):
+        """
+        Merges many tags in one transaction. `merges` maps a source tag id,
+        or a tuple of them, to the target tag id. Project and anchor links
+        are copied to the target with INSERT OR IGNORE (touching only the
+        sources' rows), then the sources are deleted, which drops their old
+        links by cascade. With per-project files, each file using the
+        sources is re-linked in a transaction of its own first. Returns the
+        number of tags merged away.
+        """
+        mapping = self._resolve_tag_merges(merges)
+        if not mapping:
+            return 0
+        project_files = self.is_project_files_enabled()
+        with self.transaction():
             self.cursor.execute("""
-                DELETE FROM project_tag_links 
-                WHERE rowid NOT IN (
-                    SELECT MIN(rowid) 
-                    FROM project_tag_links 
-                    GROUP BY project_id, tag_id
+                CREATE TEMP TABLE IF NOT EXISTS tag_merge_map (
+                    source_id INTEGER PRIMARY KEY,
+                    target_id INTEGER NOT NULL
                 )
             """)
-
-            # 2. Re-link anchor_tag_links (ignore conflicts)
-            self.cursor.execute("""
-                UPDATE anchor_tag_links SET tag_id = ? WHERE tag_id = ?
-            """, (target_tag_id, source_tag_id))
-            # Clean up duplicates
+            self.cursor.execute("DELETE FROM temp.tag_merge_map")
+            self.cursor.executemany("INSERT INTO temp.tag_merge_map (source_id, target_id) VALUES (?, ?)",
+                                    list(mapping.items()))
+            if not project_files:
+                self._relink_merged_anchors()
+
+        if project_files:
+            # The cascades from synthesis_tags cannot reach the project files
+            for _project_id in self.each_project_file(self._projects_using_tags(mapping)):
+                with self.transaction():
+                    self._relink_merged_anchors()
+                    self.cursor.execute("""
+                        DELETE FROM anchor_tag_links WHERE tag_id IN (SELECT source_id FROM temp.tag_merge_map)
+                    """)
+
+        with self.transaction():
+            # 1. Re-link projects; links the target already has are ignored
             self.cursor.execute("""
-                DELETE FROM anchor_tag_links 
-                WHERE rowid NOT IN (
-                    SELECT MIN(rowid) 
-                    FROM anchor_tag_links 
-                    GROUP BY anchor_id, tag_id
-                )
+                INSERT OR IGNORE INTO project_tag_links (project_id, tag_id)
+                SELECT ptl.project_id, m.target_id
+                FROM temp.tag_merge_map m
+                JOIN project_tag_links ptl ON ptl.tag_id = m.source_id
             """)
 
-            # 3. Delete the source tag
-            self.cursor.execute("DELETE FROM synthesis_tags WHERE id = ?", (source_tag_id,))
+            # 2. Delete the sources; their old links go by cascade
+            self.cursor.execute("DELETE FROM synthesis_tags WHERE id IN (SELECT source_id FROM temp.tag_merge_map)")
+            merged = self.cursor.rowcount
+            self.cursor.execute("DELETE FROM temp.tag_merge_map")
+        return merged
 
-            self.conn.commit()
-        except sqlite3.IntegrityError:
-            # This happens if a link already exists, safe to ignore and proceed
-            self.conn.commit()
-        except Exception as e:
-            self.conn.rollback()
-            raise
+    def _relink_merged_anchors(self):
+        """Points the anchors of the tags in temp.tag_merge_map at their targets."""
+        self.cursor.execute("""
+            INSERT OR IGNORE INTO anchor_tag_links (anchor_id, tag_id)
+            SELECT atl.anchor_id, m.target_id
+            FROM temp.tag_merge_map m
+            JOIN anchor_tag_links atl ON atl.tag_id = m.source_id
+        """)
+        # Legacy single-tag column, which would otherwise be set to NULL
+        self.cursor.execute("""
+            UPDATE synthesis_anchors
+            SET tag_id = (SELECT target_id FROM temp.tag_merge_map WHERE source_id = synthesis_anchors.tag_id)
+            WHERE tag_id IN (SELECT source_id FROM temp.tag_merge_map)
+        """)
 
     # --- Anchor Functions ---
 
@@ -242,7 +344,7 @@ class SynthesisMixin:
             JOIN anchor_tag_links atl ON a.id = atl.anchor_id
             WHERE atl.tag_id = ? AND a.project_id = ?
         """, (tag_id, project_id))
-        return self._map_rows(self.cursor.fetchall())
+        return self._fetch_compact()
 
     def get_anchors_for_tag_with_context(self, tag_id, project_id):
         """
@@ -275,7 +377,7 @@ class SynthesisMixin:
             WHERE l.tag_id = ? AND a.project_id = ?
             ORDER BY r.display_order, o.display_order, a.id
         """, (tag_id, project_id))
-        return self._map_rows(self.cursor.fetchall())
+        return self._fetch_compact()
 
     def get_anchors_and_tags_for_project(self, project_id):
         """
@@ -286,20 +388,29 @@ class SynthesisMixin:
         tags = self.get_project_tags(project_id)
         tags_dict = {tag['id']: dict(tag) for tag in tags}
 
-        # Get all anchors for the project
+        # Get all anchors and their tag links in one pass. Links come back
+        # in insertion order so 'tags'[0] is still the first tag linked.
         self.cursor.execute("""
-            SELECT * FROM synthesis_anchors WHERE project_id = ?
+            SELECT a.*, atl.tag_id AS link_tag_id
+            FROM synthesis_anchors a
+            LEFT JOIN anchor_tag_links atl ON atl.anchor_id = a.id
+            WHERE a.project_id = ?
+            ORDER BY a.id, atl.rowid
         """, (project_id,))
-        anchors_raw = self._map_rows(self.cursor.fetchall())
 
         anchors_dict = {}
-        for anchor_data in anchors_raw:
-            anchor_id = anchor_data['id']
-
-            # Get links for this anchor
-            self.cursor.execute("SELECT tag_id FROM anchor_tag_links WHERE anchor_id = ?", (anchor_id,))
-            anchor_data['tags'] = [row['tag_id'] for row in self.cursor.fetchall()]
-
+        for row in self.cursor.fetchall():
+            anchor_id = row['id']
+            anchor_data = anchors_dict.get(anchor_id)
+            if anchor_data is None:
+                anchor_data = dict(row)
+                del anchor_data['link_tag_id']
+                anchor_data['tags'] = []
+                anchors_dict[anchor_id] = anchor_data
+            if row['link_tag_id'] is not None:
+                anchor_data['tags'].append(row['link_tag_id'])
+
+        for anchor_data in anchors_dict.values():
             # Get the first tag's name for tooltip (if available)
             first_tag_id = anchor_data['tags'][0] if anchor_data['tags'] else None
             if first_tag_id and first_tag_id in tags_dict:
@@ -307,10 +418,61 @@ class SynthesisMixin:
             else:
                 anchor_data['tag_name'] = "Uncategorized"
 
-            anchors_dict[anchor_id] = anchor_data
-
         return {'tags': tags_dict, 'anchors': anchors_dict}
 
+    # --- Anchor Index (in-memory, per project) ---
+
+    # Tables get_anchors_and_tags_for_project reads
+    ANCHOR_INDEX_TABLES = ("synthesis_anchors", "anchor_tag_links", "synthesis_tags", "project_tag_links")
+
+    def get_project_anchor_index(self, project_id):
+        """
+        Returns the cached get_anchors_and_tags_for_project() result for a
+        project, plus 'by_outline': {outline_id: [anchor, ...]}.
+
+        Built on first use. Like the read cache (ReadCacheMixin), an index
+        is dropped once this connection writes to one of
+        ANCHOR_INDEX_TABLES, cascading deletes included.
+        """
+        cache = getattr(self, '_anchor_index_cache', None)
+        if cache is None:
+            cache = self._anchor_index_cache = {}
+        tracked = self._track_read_cache_tables(self.ANCHOR_INDEX_TABLES)
+        entry = cache.get(project_id)
+        if entry is not None and tracked and entry[1] == self._read_cache_stamp(self.ANCHOR_INDEX_TABLES):
+            return entry[0]
+
+        index = self.get_anchors_and_tags_for_project(project_id)
+        by_outline = {}
+        for anchor_data in index['anchors'].values():
+            if anchor_data.get('outline_id') is not None:
+                by_outline.setdefault(anchor_data['outline_id'], []).append(anchor_data)
+        index['by_outline'] = by_outline
+
+        # Don't cache rows a pending transaction might still roll back
+        if tracked and not self.conn.in_transaction:
+            cache[project_id] = (index, self._read_cache_stamp(self.ANCHOR_INDEX_TABLES))
+        else:
+            cache.pop(project_id, None)
+        return index
+
+    def get_outline_anchors(self, project_id, outline_id):
+        """Gets the anchors placed in one outline section, from the anchor index."""
+        return self.get_project_anchor_index(project_id)['by_outline'].get(outline_id, [])
+
+    def _invalidate_anchor_index(self, project_id=None):
+        """
+        Drops the cached anchor index for one project, or for all of them.
+        Only needed after writes made by another connection.
+        """
+        cache = getattr(self, '_anchor_index_cache', None)
+        if not cache:
+            return
+        if project_id is None:
+            cache.clear()
+        else:
+            cache.pop(project_id, None)
+
     def create_anchor(self, project_id, reading_id, outline_id, tag_id, unique_doc_id, selected_text, comment,
                       item_link_id=None, item_type=None, pdf_node_id=None):
         """Creates a new text or virtual anchor and links its tag."""
@@ -330,11 +492,11 @@ class SynthesisMixin:
                     INSERT INTO anchor_tag_links (anchor_id, tag_id) VALUES (?, ?)
                 """, (anchor_id, tag_id))
 
-            self.conn.commit()
+            self._commit()
             return anchor_id
         except Exception as e:
             print(f"Error in create_anchor: {e}")
-            self.conn.rollback()
+            self._rollback()
             return None
 
     def update_anchor(self, anchor_id, data):
@@ -367,26 +529,26 @@ class SynthesisMixin:
                 new_tag_id = data['tags'][0] if data.get('tags') else None
                 self.cursor.execute("UPDATE synthesis_anchors SET tag_id = ? WHERE id = ?", (new_tag_id, anchor_id))
 
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error in update_anchor: {e}")
-            self.conn.rollback()
+            self._rollback()
 
     def delete_anchor(self, anchor_id):
         """Deletes a single anchor."""
         try:
             # Links in anchor_tag_links will be deleted by CASCADE
             self.cursor.execute("DELETE FROM synthesis_anchors WHERE id = ?", (anchor_id,))
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error in delete_anchor: {e}")
-            self.conn.rollback()
+            self._rollback()
 
     def delete_anchors_by_item_link_id(self, item_link_id):
         """Deletes all virtual anchors associated with a specific item."""
         try:
             self.cursor.execute("DELETE FROM synthesis_anchors WHERE item_link_id = ?", (item_link_id,))
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error in delete_anchors_by_item_link_id: {e}")
-            self.conn.rollback()
\ No newline at end of file
+            self._rollback()
\ No newline at end of file
@@ -10,23 +10,11 @@ class TerminologyMixin:
         """
         readings_sql = "SELECT id FROM readings WHERE project_id = ?"
         self.cursor.execute(readings_sql, (project_id,))
-        readings = self.cursor.fetchall()
-        outline_map = {}
-
-        for reading in readings:
-            reading_id = reading['id']
-            outline_map[reading_id] = []
-
-            def build_flat_list(parent_id, indent_level):
-                # Use _map_rows to get list[dict]
-                items = self.get_reading_outline(reading_id, parent_id)
-                for item in items:
-                    display_text = ("  " * indent_level) + item['section_title']
-                    outline_map[reading_id].append((display_text, item['id']))
-                    # Recursive call
-                    build_flat_list(item['id'], indent_level + 1)
-
-            build_flat_list(None, 0)  # Start from root
+        outline_map = {reading['id']: [] for reading in self.cursor.fetchall()}
+
+        for item in self.get_project_outline_tree(project_id):
+            display_text = ("  " * item['depth']) + item['section_title']
+            outline_map.setdefault(item['reading_id'], []).append((display_text, item['id']))
         return outline_map
 
     def save_terminology_entry(self, project_id, terminology_id, data):
@@ -109,10 +97,10 @@ class TerminologyMixin:
                         """, pdf_data)
 
             # 5. Commit transaction
-            self.conn.commit()
+            self._commit()
 
         except Exception as e:
-            self.conn.rollback()
+            self._rollback()
             print(f"Error saving terminology entry: {e}")
             raise
 
@@ -180,15 +168,10 @@ class TerminologyMixin:
         Deletes a terminology entry. Cascade delete handles references.
         """
         self.cursor.execute("DELETE FROM project_terminology WHERE id = ?", (terminology_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_terminology_order(self, ordered_ids):
         """
         Updates the display_order for a list of terminology IDs.
         """
-        for order, term_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE project_terminology SET display_order = ? WHERE id = ?",
-                (order, term_id)
-            )
-        self.conn.commit()
\ No newline at end of file
+        self._bulk_update_order("project_terminology", ordered_ids)
\ No newline at end of file
@@ -0,0 +1,42 @@
+import zlib
+
+# Compressed values are stored as BLOBs starting with this marker; plain
+# TEXT values (and BLOBs without it) are left as they are.
+COMPRESSED_PREFIX = b"\x00RTZ1"
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 6
+
+
+def compress_text(value, min_bytes=COMPRESS_MIN_BYTES):
+    """
+    Returns value as a marker-prefixed zlib BLOB when that is smaller,
+    otherwise the value unchanged. Short texts are not worth it.
+    """
+    if not isinstance(value, str):
+        return value
+    raw = value.encode("utf-8")
+    if len(raw) < min_bytes:
+        return value
+    packed = COMPRESSED_PREFIX + zlib.compress(raw, COMPRESS_LEVEL)
+    return packed if len(packed) < len(raw) else value
+
+
+def is_compressed(value):
+    return isinstance(value, bytes) and value.startswith(COMPRESSED_PREFIX)
+
+
+def decompress_text(value):
+    """Returns the text behind a compress_text BLOB; any other value unchanged."""
+    if isinstance(value, bytes) and value.startswith(COMPRESSED_PREFIX):
+        return zlib.decompress(value[len(COMPRESSED_PREFIX):]).decode("utf-8")
+    return value
+
+
+def decompress_row(row, columns=None):
+    """dict(row) with compressed values expanded, looking only at `columns` if given."""
+    data = dict(row)
+    for key in data if columns is None else columns:
+        value = data[key]
+        if value.__class__ is bytes and value.startswith(COMPRESSED_PREFIX):
+            data[key] = zlib.decompress(value[len(COMPRESSED_PREFIX):]).decode("utf-8")
+    return data
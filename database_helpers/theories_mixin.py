@@ -105,11 +105,11 @@ class TheoriesMixin:
             # Handle tags
             self._handle_virtual_anchor_tags(project_id, reading_id, new_item_id, 'theory', data, 'theory_name')
 
-            self.conn.commit()
+            self._commit()
             return new_item_id
         except Exception as e:
             print(f"Error in add_reading_theory: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     def update_reading_theory(self, theory_id, data):
@@ -142,10 +142,10 @@ class TheoriesMixin:
             # Handle tags
             self._handle_virtual_anchor_tags(project_id, reading_id, theory_id, 'theory', data, 'theory_name')
 
-            self.conn.commit()
+            self._commit()
         except Exception as e:
             print(f"Error in update_reading_theory: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     def get_reading_theories(self, reading_id):
@@ -162,24 +162,7 @@ class TheoriesMixin:
             ORDER BY display_order, id
         """, (reading_id,))
 
-        results = self._map_rows(self.cursor.fetchall())
-        for item in results:
-            self.cursor.execute("SELECT sa.id FROM synthesis_anchors sa WHERE sa.item_link_id = ?", (item['id'],))
-            anchor_row = self.cursor.fetchone()
-
-            if anchor_row:
-                anchor_id = anchor_row['id']
-                self.cursor.execute("""
-                    SELECT t.name 
-                    FROM anchor_tag_links atl
-                    JOIN synthesis_tags t ON atl.tag_id = t.id
-                    WHERE atl.anchor_id = ?
-                """, (anchor_id,))
-                tag_names = [row['name'] for row in self.cursor.fetchall()]
-                item['synthesis_tags'] = ", ".join(tag_names)
-            else:
-                item['synthesis_tags'] = ""
-        return results
+        return self._attach_synthesis_tags(self._map_rows(self.cursor.fetchall()))
 
     def get_reading_theory_details(self, theory_id):
         """Gets full details for a single reading-level theory."""
@@ -227,13 +210,8 @@ class TheoriesMixin:
             "DELETE FROM reading_driving_questions WHERE id = ? AND type = 'theory'",
             (theory_id,)
         )
-        self.conn.commit()
+        self._commit()
 
     def update_reading_theory_order(self, ordered_ids):
         """Updates the display_order for reading-level theories."""
-        for order, theory_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE reading_driving_questions SET display_order = ? WHERE id = ? AND type = 'theory'",
-                (order, theory_id)
-            )
-        self.conn.commit()
\ No newline at end of file
+        self._bulk_update_order("reading_driving_questions", ordered_ids, "type = 'theory'")
\ No newline at end of file
@@ -39,7 +39,7 @@ class TodoMixin:
             data.get('notes_html'),
             new_order
         ))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
     def update_todo_item(self, item_id, data):
@@ -54,7 +54,7 @@ class TodoMixin:
             data.get('notes_html'),
             item_id
         ))
-        self.conn.commit()
+        self._commit()
 
     def update_todo_item_checked(self, item_id, is_checked):
         """Updates the check state of a to-do item."""
@@ -62,18 +62,13 @@ class TodoMixin:
             "UPDATE project_todo_list SET is_checked = ? WHERE id = ?",
             (int(bool(is_checked)), item_id)
         )
-        self.conn.commit()
+        self._commit()
 
     def delete_todo_item(self, item_id):
         """Deletes a to-do item."""
         self.cursor.execute("DELETE FROM project_todo_list WHERE id = ?", (item_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_todo_order(self, ordered_ids):
         """Updates the display_order for a list of to-do item IDs."""
-        for order, item_id in enumerate(ordered_ids):
-            self.cursor.execute(
-                "UPDATE project_todo_list SET display_order = ? WHERE id = ?",
-                (order, item_id)
-            )
-        self.conn.commit()
\ No newline at end of file
+        self._bulk_update_order("project_todo_list", ordered_ids)
\ No newline at end of file
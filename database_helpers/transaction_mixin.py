@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+
+
+class TransactionMixin:
+    """
+    Unit-of-work support for the mixins.
+
+    Mixin write methods end with self._commit() / self._rollback() instead
+    of touching self.conn directly. Outside a transaction these behave
+    exactly like conn.commit() / conn.rollback(). Inside a
+    `with db.transaction():` block they are deferred, so the whole block
+    commits once at the end. Blocks nest using SAVEPOINTs.
+    """
+
+    _tx_depth = 0
+    _tx_on_commit = None
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups every write in the block into one commit.
+
+        If the block raises, or a mixin inside it rolled back (most mixins
+        catch and print their own errors), the block is undone: a nested
+        block rolls back to its SAVEPOINT, the outermost block rolls back
+        the whole transaction. Callbacks registered with after_commit()
+        inside an undone block are dropped.
+        """
+        level = self._tx_depth
+        if level == 0:
+            self._tx_failed = []
+            self._tx_on_commit = []
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN")
+        else:
+            self.conn.execute(f"SAVEPOINT uow_{level}")
+        self._tx_depth = level + 1
+        self._tx_failed.append(False)
+        self._tx_on_commit.append([])
+
+        completed = False
+        try:
+            yield self
+            completed = True
+        finally:
+            failed = self._tx_failed.pop()
+            callbacks = self._tx_on_commit.pop()
+            self._tx_depth = level
+            if completed and failed:
+                print("Warning: A write inside this transaction failed; rolling the transaction back.")
+            keep = completed and not failed
+
+            if level == 0:
+                if keep:
+                    self.conn.commit()
+                    for callback in callbacks:
+                        callback()
+                else:
+                    self.conn.rollback()
+            else:
+                if not keep:
+                    self.conn.execute(f"ROLLBACK TO uow_{level}")
+                else:
+                    # Run once the outermost block commits
+                    self._tx_on_commit[-1].extend(callbacks)
+                self.conn.execute(f"RELEASE uow_{level}")
+
+    def in_transaction_block(self):
+        """True while inside a `with db.transaction():` block."""
+        return self._tx_depth > 0
+
+    def transaction_failed(self):
+        """True if a write in the innermost transaction() block has already rolled back."""
+        return self._tx_depth > 0 and self._tx_failed[-1]
+
+    def after_commit(self, callback):
+        """
+        Calls callback() once the writes made so far are committed: at the
+        end of the outermost transaction() block, or right away outside one.
+        Used to mark UI state as saved (e.g. an editor's modified flag) only
+        when the save is durable; if the enclosing block rolls back the
+        callback never runs.
+        """
+        if self._tx_depth == 0:
+            callback()
+        else:
+            self._tx_on_commit[-1].append(callback)
+
+    def _commit(self):
+        """Commits now, unless a transaction() block will commit later."""
+        if self._tx_depth == 0:
+            self.conn.commit()
+
+    def _rollback(self):
+        """Rolls back now, or marks the innermost transaction() block as failed."""
+        if self._tx_depth == 0:
+            self.conn.rollback()
+        else:
+            self._tx_failed[-1] = True
@@ -29,11 +29,25 @@ from database_helpers.pdf_nodes_mixin import PdfNodesMixin
 from database_helpers.research_mixin import ResearchMixin
 from database_helpers.annotated_bib_mixin import AnnotatedBibMixin
 from database_helpers.evidence_matrix_mixin import EvidenceMatrixMixin
+from database_helpers.connection_profile_mixin import ConnectionProfileMixin
+from database_helpers.transaction_mixin import TransactionMixin
+from database_helpers.search_mixin import SearchMixin
+from database_helpers.diagnostics_mixin import DiagnosticsMixin
+from database_helpers.read_cache_mixin import ReadCacheMixin
+from database_helpers.backup_mixin import BackupMixin
+from database_helpers.rich_text_mixin import RichTextMixin
+from database_helpers.project_clone_mixin import ProjectCloneMixin
+from database_helpers.project_files_mixin import ProjectFilesMixin
+from database_helpers.query_profiler import ProfilingConnection, query_profiling_requested
 
 class DatabaseManager(
     SchemaSetup,
     DbHelpers,
+    TransactionMixin,
+    ReadCacheMixin,
     ItemsMixin,
+    ProjectCloneMixin,
+    ProjectFilesMixin,
     ReadingsMixin,
     RubricMixin,
     OutlineMixin,
@@ -55,14 +69,45 @@ class DatabaseManager(
     ResearchMixin,
     AnnotatedBibMixin,
     EvidenceMatrixMixin,
+    SearchMixin,
+    ConnectionProfileMixin,
+    DiagnosticsMixin,
+    BackupMixin,
+    RichTextMixin,
     UtilityMixin
 ):
-    def __init__(self, db_file="reading_tracker.db"):
-        """Initialize and connect to the SQLite database."""
-        self.conn = sqlite3.connect(db_file)
+    def __init__(self, db_file="reading_tracker.db", read_only=False):
+        """
+        Initialize and connect to the SQLite database.
+
+        read_only=True opens a second, query-only connection to an existing
+        database (used by the background DbExecutor). It skips schema setup
+        and migrations, which are left to the main read-write connection.
+        """
+        self.read_only = read_only
+
+        # Opt-in SQL profiling (env var or user_settings.db_profile_queries)
+        if not read_only and query_profiling_requested(db_file):
+            self.conn = sqlite3.connect(db_file, factory=ProfilingConnection)
+            self.conn.profiler.slow_log_path = os.path.splitext(os.path.abspath(db_file))[0] + "_slow_queries.log"
+            print(f"SQL profiling enabled. Slow queries are logged to {self.conn.profiler.slow_log_path}")
+        else:
+            self.conn = sqlite3.connect(db_file)
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON")
         self.cursor = self.conn.cursor()
 
+        if read_only:
+            self.apply_connection_profile()
+            self._open_project_files()
+            self.conn.execute("PRAGMA query_only = ON")
+            return
+
         # This method is inherited from SchemaSetup
-        self.setup_database()
\ No newline at end of file
+        self.setup_database()
+
+        # WAL / synchronous / cache tuning (ConnectionProfileMixin)
+        self.apply_connection_profile()
+
+        # Per-project files, when the database uses them (ProjectFilesMixin)
+        self._open_project_files()
@@ -0,0 +1,81 @@
+# dialogs/attachment_import_dialog.py
+import os
+
+from PySide6.QtWidgets import QProgressDialog, QMessageBox
+from PySide6.QtCore import Qt, Signal, Slot
+
+from database_helpers.attachment_store import ImportCancelled
+
+
+class AttachmentImportDialog(QProgressDialog):
+    """
+    Copies files (or whole folders) into the attachment store on a
+    background thread (db.start_attachment_import) and shows byte
+    progress. The attachments are added to the reading only after every
+    file has been copied; cancelling adds none of them. Files that could
+    not be read are skipped and listed once the rest are added.
+    """
+    MAX_LISTED_FAILURES = 10
+    PROGRESS_STEPS = 1000  # QProgressDialog values are ints; byte counts may not fit
+
+    # Emitted from the import thread; Qt queues them to the GUI thread
+    stepped = Signal(object, object, str)  # bytes done, bytes total, current file name
+    importDone = Signal(object, object)  # results, error or None
+
+    # Emitted on the GUI thread once the rows are in the database
+    attachmentsAdded = Signal(int)
+
+    def __init__(self, db, reading_id, paths, parent=None):
+        super().__init__("Preparing import...", "Cancel", 0, self.PROGRESS_STEPS, parent)
+        self.db = db
+        self.reading_id = reading_id
+        self.setWindowTitle("Add Attachments")
+        self.setWindowModality(Qt.WindowModality.NonModal)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setMinimumDuration(500)
+
+        self.stepped.connect(self._on_stepped)
+        self.importDone.connect(self._on_import_done)
+        self.canceled.connect(self._on_cancel_clicked)
+
+        self.job = self.db.start_attachment_import(paths, progress=self.stepped.emit, done=self.importDone.emit)
+
+    @Slot(object, object, str)
+    def _on_stepped(self, done_bytes, total_bytes, file_name):
+        if total_bytes:
+            self.setLabelText(f"Copying {file_name}...")
+            self.setValue(int(done_bytes * self.PROGRESS_STEPS / total_bytes))
+
+    @Slot()
+    def _on_cancel_clicked(self):
+        self.setLabelText("Cancelling...")
+        self.job.cancel()
+
+    @Slot(object, object)
+    def _on_import_done(self, results, error):
+        failures = self.job.failures
+        if error is None:
+            if not results and not failures:
+                QMessageBox.information(self.parentWidget(), "Add Attachments", "No files were found to attach.")
+            elif results and self.db.finish_attachment_import(self.reading_id, results) is None:
+                QMessageBox.critical(self.parentWidget(), "Error Attaching Files",
+                                     "The files were copied but could not be added to the reading.")
+            else:
+                if results:
+                    self.attachmentsAdded.emit(len(results))
+                if failures:
+                    self._show_failures(failures, len(results))
+        elif not isinstance(error, ImportCancelled):
+            QMessageBox.critical(self.parentWidget(), "Error Attaching Files", f"Could not copy the files: {error}")
+        # Deleted only once the import thread is done emitting to us
+        self.hide()
+        self.deleteLater()
+
+    def _show_failures(self, failures, added):
+        listed = "\n".join(f"{os.path.basename(path)}: {message}"
+                           for path, message in failures[:self.MAX_LISTED_FAILURES])
+        if len(failures) > self.MAX_LISTED_FAILURES:
+            listed += f"\n...and {len(failures) - self.MAX_LISTED_FAILURES} more"
+        QMessageBox.warning(self.parentWidget(), "Some Files Were Not Attached",
+                            f"{added} file(s) attached. {len(failures)} could not be read:\n\n{listed}")
@@ -0,0 +1,52 @@
+# dialogs/backup_progress_dialog.py
+from PySide6.QtWidgets import QProgressDialog, QMessageBox
+from PySide6.QtCore import Qt, Signal, Slot
+
+from database_helpers.backup import BackupCancelled
+
+
+class BackupProgressDialog(QProgressDialog):
+    """
+    Copies the database to a file on a background thread (db.start_backup)
+    and shows page progress. Editing can continue while it runs.
+    """
+    # Emitted from the backup thread; Qt queues them to the GUI thread
+    stepped = Signal(int, int)  # copied pages, total pages
+    backupDone = Signal(str, object)  # dest_path, error or None
+
+    def __init__(self, db, dest_path, parent=None):
+        super().__init__("Backing up database...", "Cancel", 0, 100, parent)
+        self.db = db
+        self.dest_path = dest_path
+        self.setWindowTitle("Back Up Database")
+        self.setWindowModality(Qt.WindowModality.NonModal)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setMinimumDuration(0)
+
+        self.stepped.connect(self._on_stepped)
+        self.backupDone.connect(self._on_backup_done)
+        self.canceled.connect(self._on_cancel_clicked)
+
+        self.job = self.db.start_backup(dest_path, progress=self.stepped.emit, done=self.backupDone.emit)
+
+    @Slot(int, int)
+    def _on_stepped(self, copied, total):
+        if total:
+            self.setMaximum(total)
+            self.setValue(copied)
+
+    @Slot()
+    def _on_cancel_clicked(self):
+        self.setLabelText("Cancelling...")
+        self.job.cancel()
+
+    @Slot(str, object)
+    def _on_backup_done(self, dest_path, error):
+        if error is None:
+            QMessageBox.information(self.parentWidget(), "Backup Complete", f"Database backed up to:\n{dest_path}")
+        elif not isinstance(error, BackupCancelled):
+            QMessageBox.critical(self.parentWidget(), "Backup Error", f"Could not back up the database: {error}")
+        # Deleted only once the backup thread is done emitting to us
+        self.hide()
+        self.deleteLater()
@@ -40,6 +40,13 @@ except ImportError:
 
 # --- END NEW ---
 
+from utils.db_executor import DbExecutor
+
+
+def _fetch_global_graph(db):
+    """Background job: reads everything load_global_graph needs."""
+    return db.get_global_graph_data(), db.get_global_graph_settings()
+
 
 class GlobalGraphDialog(QDialog):
     """
@@ -57,6 +64,7 @@ class GlobalGraphDialog(QDialog):
         self.color_map = {}  # Stores { 'project_colors': {id: hex}, 'tag_color': hex }
         self.color_buttons = {}  # Stores { 'p_123': button, 'tag_0': button }
         self.tag_id_name_map = {}  # Map ID to Name for lookups
+        self._graph_future = None  # Pending background load
 
         self.setWindowTitle("Global Knowledge Connections")
         self.setMinimumSize(1000, 700)
@@ -255,26 +263,43 @@ class GlobalGraphDialog(QDialog):
             self.load_global_graph()  # Reload graph to apply new colors
 
     def load_global_graph(self):
+        """Fetches the graph data on the DB executor; _on_global_graph_loaded builds it."""
+        if self._graph_future:
+            self._graph_future.cancel()
+        self._graph_future = DbExecutor.for_database(self.db).submit(_fetch_global_graph)
+        self._graph_future.finished.connect(self._on_global_graph_loaded)
+        self._graph_future.failed.connect(self._on_global_graph_failed)
+
+    def done(self, result):
+        # Closed before the data arrived: nothing is left to draw into
+        if self._graph_future:
+            self._graph_future.cancel()
+            self._graph_future = None
+        self.timer.stop()
+        super().done(result)
+
+    @Slot(str)
+    def _on_global_graph_failed(self, message):
+        self._graph_future = None
+        QMessageBox.critical(self, "Database Error", f"Could not load global tags: {message}")
+
+    @Slot(object)
+    def _on_global_graph_loaded(self, result):
+        """Builds the graph from the data fetched in the background."""
+        self._graph_future = None
+        data, self.color_map = result
+
         self.timer.stop()
         self.scene.clear_graph()
         self.nodes.clear()
         self.edges.clear()
-        self.tag_id_name_map.clear()  # Clear map
-
-        try:
-            data = self.db.get_global_graph_data()
-            self.color_map = self.db.get_global_graph_settings()
 
-            # Build control panel with project list
-            self._build_control_panel(data['projects'])
-            self._update_color_buttons()
+        # Build control panel with project list
+        self._build_control_panel(data['projects'])
+        self._update_color_buttons()
 
-            # Populate tag map for double-click lookups
-            self.tag_id_name_map = {t['id']: t['name'] for t in data['tags']}
-
-        except Exception as e:
-            QMessageBox.critical(self, "Database Error", f"Could not load global tags: {e}")
-            return
+        # Populate tag map for double-click lookups
+        self.tag_id_name_map = {t['id']: t['name'] for t in data['tags']}
 
         if not data['tags'] and not data['projects']:
             label = self.scene.addSimpleText("No projects or tags found.")
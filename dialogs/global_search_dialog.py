@@ -0,0 +1,136 @@
+# dialogs/global_search_dialog.py
+import html
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox, QLabel,
+    QTextBrowser, QDialogButtonBox
+)
+from PySide6.QtCore import Qt, Signal, QTimer
+
+
+class GlobalSearchDialog(QDialog):
+    """
+    Searches notes, readings, anchors, terminology, propositions, memos
+    and PDF nodes across all projects. Clicking a result jumps to it.
+    """
+    # Signal to tell the main window to open a result at the item itself
+    openSearchResult = Signal(int, str, int, int, int)  # project_id, kind, ref_id, reading_id, outline_id
+
+    SEARCH_DELAY_MS = 250
+    RESULT_LIMIT = 100
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.results = []
+        self.setWindowTitle("Search Everything")
+        self.setMinimumSize(700, 700)
+
+        main_layout = QVBoxLayout(self)
+
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search notes, readings, tags, terms, memos...")
+        self.search_edit.setClearButtonEnabled(True)
+        search_layout.addWidget(self.search_edit, 1)
+
+        self.kind_combo = QComboBox()
+        self.kind_combo.addItem("Everything", None)
+        for kind, source in self.db.SEARCH_SOURCES.items():
+            self.kind_combo.addItem(source['label'], kind)
+        search_layout.addWidget(self.kind_combo)
+        main_layout.addLayout(search_layout)
+
+        self.status_label = QLabel("")
+        main_layout.addWidget(self.status_label)
+
+        self.text_browser = QTextBrowser()
+        self.text_browser.setOpenLinks(False)
+        self.text_browser.anchorClicked.connect(self._on_link_clicked)
+        main_layout.addWidget(self.text_browser)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        self.button_box.rejected.connect(self.reject)
+        main_layout.addWidget(self.button_box)
+
+        # Debounce typing so we search once the user pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self._run_search)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.search_edit.returnPressed.connect(self._run_search)
+        self.kind_combo.currentIndexChanged.connect(self._run_search)
+
+        if not self.db.is_search_available():
+            self.search_edit.setEnabled(False)
+            self.status_label.setText("Full-text search is not available in this SQLite build.")
+
+        self.search_edit.setFocus()
+
+    def _run_search(self):
+        """Runs the query and renders the ranked results."""
+        self.search_timer.stop()
+        self.results = []
+        text = self.search_edit.text().strip()
+        if not text:
+            self.status_label.setText("")
+            self.text_browser.clear()
+            return
+
+        kind = self.kind_combo.currentData()
+        try:
+            results = self.db.search(text, kinds=[kind] if kind else None, limit=self.RESULT_LIMIT)
+        except Exception as e:
+            self.text_browser.setHtml(f"Error searching: {e}")
+            return
+
+        if len(results) >= self.RESULT_LIMIT:
+            status = f"Showing the top {self.RESULT_LIMIT} matches."
+        else:
+            status = f"{len(results)} match(es)."
+        # The main window indexes edits while idle; say so if some are still queued
+        if self.db.pending_search_index_count():
+            status += " Your latest edits are still being indexed."
+        self.status_label.setText(status)
+        self.results = results
+
+        if not results:
+            self.text_browser.setHtml("<i>No matches found.</i>")
+            return
+
+        html_parts = []
+        for index, result in enumerate(results):
+            jumpto_link = f"result:{index}"
+
+            location = [html.escape(result['project_name'] or "Unknown Project")]
+            if result['reading_title']:
+                location.append(html.escape(result['reading_title']))
+
+            title = html.escape(result['title'] or "(Untitled)")
+            html_parts.append("<div style='margin-bottom: 10px;'>")
+            html_parts.append(f"<p style='margin: 0;'><a href='{jumpto_link}'><b>{title}</b></a> "
+                              f"<span style='color: #666;'>— {html.escape(result['label'])}</span></p>")
+            html_parts.append(f"<p style='margin: 0; color: #0055A4;'><i>{' › '.join(location)}</i></p>")
+            if result['snippet_html']:
+                html_parts.append(f"<p style='margin: 0;'>{result['snippet_html']}</p>")
+            html_parts.append("</div>")
+
+        self.text_browser.setHtml("".join(html_parts))
+
+    def _on_link_clicked(self, url):
+        """Handles clicking a 'result:<index>' link."""
+        url_str = url.toString()
+        if url_str.startswith("result:"):
+            try:
+                result = self.results[int(url_str.split(":")[1])]
+                if not result['project_id']:
+                    return
+
+                # Emit signal to open the item the hit came from
+                self.openSearchResult.emit(result['project_id'], result['kind'], result['ref_id'],
+                                           result['reading_id'] or 0, result['outline_id'] or 0)
+
+                # Close this dialog so we can see the dashboard
+                self.accept()
+            except Exception as e:
+                print(f"Error jumping: {e}")
@@ -179,9 +179,9 @@ class GlobalTagManagerDialog(QDialog):
 
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                for item in selected_items:
-                    tag_id = item.data(Qt.ItemDataRole.UserRole)
-                    self.db.delete_tag_and_anchors(tag_id)
+                tag_ids = [item.data(Qt.ItemDataRole.UserRole) for item in selected_items]
+                if self.db.delete_tags(tag_ids) is None:
+                    QMessageBox.critical(self, "Error", "Could not delete tags. No changes were made.")
                 self.load_tags()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not delete tags: {e}")
@@ -213,9 +213,8 @@ class GlobalTagManagerDialog(QDialog):
         source_items = [item for item in selected_items if item.text() != target_name]
 
         try:
-            for item in source_items:
-                source_tag_id = item.data(Qt.ItemDataRole.UserRole)
-                self.db.merge_tags(source_tag_id, target_tag_id)
+            source_tag_ids = tuple(item.data(Qt.ItemDataRole.UserRole) for item in source_items)
+            self.db.merge_tags_bulk({source_tag_ids: target_tag_id})
 
             self.load_tags()
         except Exception as e:
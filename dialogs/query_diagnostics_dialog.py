@@ -0,0 +1,191 @@
+# dialogs/query_diagnostics_dialog.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, QTableWidget, QTableWidgetItem,
+    QHeaderView, QPushButton, QLabel, QCheckBox, QFileDialog, QMessageBox, QDialogButtonBox, QApplication
+)
+from PySide6.QtCore import Qt
+
+
+class QueryDiagnosticsDialog(QDialog):
+    """
+    Shows the SQL profiler's per-statement and per-method timings and any
+    suspected N+1 query loops.
+    """
+
+    STAT_COLUMNS = [("count", "Count"), ("total_ms", "Total ms"), ("avg_ms", "Avg ms"),
+                    ("p95_ms", "p95 ms"), ("max_ms", "Max ms")]
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.setWindowTitle("Database Diagnostics")
+        self.setMinimumSize(900, 600)
+
+        main_layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setWordWrap(True)
+        main_layout.addWidget(self.summary_label)
+
+        self.tabs = QTabWidget()
+        self.statements_table = self._make_table(["Statement"] + [c[1] for c in self.STAT_COLUMNS])
+        self.callers_table = self._make_table(["Method"] + [c[1] for c in self.STAT_COLUMNS])
+        self.n_plus_one_table = self._make_table(["Statement", "Method", "Action", "Max Repeats", "Occurrences"])
+        self.tabs.addTab(self.statements_table, "Statements")
+        self.tabs.addTab(self.callers_table, "Methods")
+        self.tabs.addTab(self.n_plus_one_table, "Possible N+1")
+        main_layout.addWidget(self.tabs)
+
+        # Rich-text storage report (works with profiling off)
+        storage_layout = QHBoxLayout()
+        self.storage_label = QLabel("")
+        self.storage_label.setWordWrap(True)
+        storage_layout.addWidget(self.storage_label, 1)
+        self.btn_compact = QPushButton("Compact Rich Text")
+        self.btn_compact.clicked.connect(self._compact_rich_text)
+        storage_layout.addWidget(self.btn_compact)
+        main_layout.addLayout(storage_layout)
+        self.storage_table = self._make_table(["Column", "Rows", "Bytes", "Verbose Rows", "Savable Bytes"])
+        self.storage_table.setMaximumHeight(180)
+        main_layout.addWidget(self.storage_table)
+
+        self.compress_checkbox = QCheckBox("Store large rich text compressed (smaller file, slower loads)")
+        self.compress_checkbox.setChecked(self.db.is_text_compression_enabled())
+        self.compress_checkbox.toggled.connect(self._set_text_compression)
+        main_layout.addWidget(self.compress_checkbox)
+
+        backup_settings = self.db.get_backup_settings()
+        kept = sum(int(backup_settings[col]) for col in
+                   ('backup_keep_hourly', 'backup_keep_daily', 'backup_keep_weekly'))
+        self.snapshot_checkbox = QCheckBox(
+            f"Take hourly database snapshots (keeps up to {kept} copies in {self.db.get_backup_dir()})")
+        self.snapshot_checkbox.setChecked(bool(backup_settings['backup_enabled']))
+        self.snapshot_checkbox.toggled.connect(
+            lambda enabled: self.db.save_backup_settings({'backup_enabled': 1 if enabled else 0}))
+        main_layout.addWidget(self.snapshot_checkbox)
+
+        self.profile_checkbox = QCheckBox("Profile queries (takes effect on next start)")
+        self.profile_checkbox.setChecked(self.db.is_query_profiling_saved())
+        self.profile_checkbox.toggled.connect(self.db.save_query_profiling)
+        main_layout.addWidget(self.profile_checkbox)
+
+        button_layout = QHBoxLayout()
+        self.btn_refresh = QPushButton("Refresh")
+        self.btn_reset = QPushButton("Reset")
+        self.btn_export = QPushButton("Export JSON...")
+        button_layout.addWidget(self.btn_refresh)
+        button_layout.addWidget(self.btn_reset)
+        button_layout.addWidget(self.btn_export)
+        button_layout.addStretch(1)
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        self.button_box.rejected.connect(self.reject)
+        button_layout.addWidget(self.button_box)
+        main_layout.addLayout(button_layout)
+
+        self.btn_refresh.clicked.connect(self.load_stats)
+        self.btn_reset.clicked.connect(self._reset_stats)
+        self.btn_export.clicked.connect(self._export_json)
+
+        self.load_stats()
+
+    def _make_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        table.verticalHeader().setVisible(False)
+        return table
+
+    def _fill_table(self, table, rows, keys):
+        table.setSortingEnabled(False)
+        table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            for col_index, key in enumerate(keys):
+                value = row.get(key)
+                item = QTableWidgetItem()
+                if isinstance(value, (int, float)):
+                    item.setData(Qt.ItemDataRole.DisplayRole, value)
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                else:
+                    item.setText(str(value or ""))
+                    item.setToolTip(str(value or ""))
+                table.setItem(row_index, col_index, item)
+        table.setSortingEnabled(True)
+
+    def load_storage_report(self):
+        """Fills the rich-text size report."""
+        report = self.db.get_rich_text_size_report()
+        totals, file_info = report["totals"], report["file"]
+        self.storage_label.setText(
+            f"Database file: {file_info['bytes'] / 1024:.0f} KB ({file_info['free_bytes'] / 1024:.0f} KB free). "
+            f"Rich text: {totals['bytes'] / 1024:.0f} KB in {totals['rows']} fields; "
+            f"{totals['verbose_rows']} still verbose, compacting saves {totals['savable_bytes'] / 1024:.1f} KB.")
+        self.btn_compact.setEnabled(totals["verbose_rows"] > 0 or file_info["free_bytes"] > 0)
+        rows = [dict(entry, name=f"{entry['table']}.{entry['column']}") for entry in report["columns"]]
+        self._fill_table(self.storage_table, rows, ["name", "rows", "bytes", "verbose_rows", "savable_bytes"])
+
+    def _compact_rich_text(self):
+        rows, saved = self.db.compact_rich_text()
+        self.db.vacuum_database()
+        self.load_storage_report()
+        QMessageBox.information(self, "Compact Rich Text",
+                                f"Compacted {rows} field(s), {saved / 1024:.1f} KB of HTML removed.")
+
+    def _set_text_compression(self, enabled):
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            rows = self.db.set_text_compression(enabled, vacuum=True)
+        finally:
+            QApplication.restoreOverrideCursor()
+        self.load_storage_report()
+        QMessageBox.information(self, "Rich Text Storage",
+                                f"{'Compressed' if enabled else 'Expanded'} {rows} field(s).")
+
+    def load_stats(self):
+        """Reloads the tables from the profiler."""
+        self.load_storage_report()
+        stats = self.db.get_query_stats()
+        enabled = stats is not None
+        self.tabs.setEnabled(enabled)
+        self.btn_refresh.setEnabled(enabled)
+        self.btn_reset.setEnabled(enabled)
+        self.btn_export.setEnabled(enabled)
+
+        cache = self.db.get_read_cache_stats()
+        cache_text = (f"Read cache: {cache['hits']} hits, {cache['misses']} misses "
+                      f"({cache['hit_rate']:.0%}), {cache['size']}/{cache['max_size']} entries.")
+
+        if not enabled:
+            self.summary_label.setText(
+                "Query profiling is off. Tick the box below and restart, or start the app with "
+                "READING_TRACKER_PROFILE_SQL=1.\n" + cache_text)
+            return
+
+        total_count = sum(row["count"] for row in stats["statements"])
+        total_ms = sum(row["total_ms"] for row in stats["statements"])
+        self.summary_label.setText(
+            f"Since {stats['started_at']}: {total_count} statements, {total_ms:.1f} ms total. "
+            f"{stats['slow_query_count']} slower than {stats['slow_query_ms']:.0f} ms "
+            f"(logged to {stats['slow_query_log']}). {len(stats['n_plus_one'])} possible N+1 pattern(s).\n"
+            + cache_text)
+
+        stat_keys = [c[0] for c in self.STAT_COLUMNS]
+        self._fill_table(self.statements_table, stats["statements"], ["sql"] + stat_keys)
+        self._fill_table(self.callers_table, stats["callers"], ["caller"] + stat_keys)
+        self._fill_table(self.n_plus_one_table, stats["n_plus_one"],
+                         ["sql", "caller", "action", "max_repeats", "occurrences"])
+
+    def _reset_stats(self):
+        self.db.reset_query_stats()
+        self.load_stats()
+
+    def _export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Query Statistics", "query_stats.json",
+                                              "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            self.db.dump_query_stats(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not export statistics: {e}")
@@ -4,10 +4,11 @@ import os
 from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QStackedWidget, QWidget,
-    QLabel, QVBoxLayout
+    QLabel, QVBoxLayout, QMessageBox
 )
 # --- FIX: Import QSize ---
 from PySide6.QtCore import Qt, Slot, QUrl, QTimer, QSize
+from PySide6.QtGui import QKeySequence, QShortcut
 # --- END FIX ---
 from PySide6.QtWebEngineCore import QWebEngineProfile
 from PySide6.QtWebEngineWidgets import QWebEngineView
@@ -19,6 +20,7 @@ sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tabs')
 try:
     from database_manager import DatabaseManager
     from utils.spell_checker import GlobalSpellChecker  # <-- IMPORT NEW
+    from utils.autosave import AutosaveService
     from widgets.home_screen_widget import HomeScreenWidget
     from widgets.project_dashboard_widget import ProjectDashboardWidget
     # We only import this for the type hint in closeEvent
@@ -27,6 +29,9 @@ except ImportError as e:
     print(f"Error importing modules: {e}")
     sys.exit(1)
 
+# How long the search index may lag behind edits while the app is idle
+SEARCH_SYNC_INTERVAL_MS = 2000
+
 # --- NEW: Modern Light Theme Stylesheet ---
 MODERN_LIGHT_STYLESHEET = """
 /* General Window & Background */
@@ -319,13 +324,39 @@ class MainWindow(QMainWindow):
         # --- MODIFIED: Connect home screen's jump request (Step 3.3) ---
         self.home_screen.globalJumpRequested.connect(self.open_project_from_global)
         # --- END MODIFIED ---
+        self.home_screen.searchResultRequested.connect(self.open_search_result)
+
+        # Database diagnostics (SQL profiler stats)
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self.open_query_diagnostics)
+
+        # Rotating hourly/daily/weekly snapshots on a background thread, if switched on
+        self.db.start_backup_scheduler()
+
+        # Index edited rows for search in small batches while the app is idle,
+        # so neither saves nor searches pay for it
+        self.search_sync_timer = QTimer(self)
+        self.search_sync_timer.setSingleShot(True)
+        self.search_sync_timer.timeout.connect(self.sync_search_index)
+        self.search_sync_timer.start(0)
 
     @Slot(dict)
     def show_project_dashboard(self, project_details):
         """Switches to the project dashboard and loads its data."""
+        # With per-project files, the project's file is attached first
+        if self.db.attached_project_id not in (None, project_details.get('id')):
+            self._leave_project()
+        try:
+            self.db.attach_project(project_details.get('id'))
+        except Exception as e:
+            print(f"Error opening project file: {e}")
+            QMessageBox.critical(self, "Could Not Open Project",
+                                 f"The project's data file could not be opened:\n\n{e}")
+            return
         try:
             # 1. Load project structure (creates tabs, but doesn't load text)
-            self.project_dashboard.load_project(project_details)
+            with self.db.profile_action("Open project"):
+                self.project_dashboard.load_project(project_details)
 
             # --- NEW: Update Window Title ---
             project_name = project_details.get('name', 'Untitled Project')
@@ -345,7 +376,7 @@ class MainWindow(QMainWindow):
         """
         Saves data, then switches back to the home screen.
         """
-        self.project_dashboard.save_all_editors()
+        self._leave_project()
 
         self.stacked_widget.setCurrentIndex(0)
 
@@ -364,6 +395,39 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(0, self.home_screen.reset_splitter_sizes)
         # --- END FIX 2 ---
 
+    def _leave_project(self):
+        """
+        Saves the open project's editors and pending autosaves. With
+        per-project files, its mindmap editors are saved and closed too,
+        and its file is detached.
+        """
+        self.project_dashboard.save_all_editors()
+        if self.db.attached_project_id is None:
+            return
+        AutosaveService.flush_all()
+        self._save_open_mindmaps()
+        try:
+            self.db.detach_project()
+        except Exception as e:
+            print(f"Error closing project file: {e}")
+
+    def _save_open_mindmaps(self):
+        """Saves and closes every open Mindmap editor window."""
+        # --- FIX: Import locally inside the function ---
+        try:
+            from dialogs.mindmap_editor_window import MindmapEditorWindow
+            # Find all top-level widgets that are mindmap editors
+            for widget in QApplication.topLevelWidgets():
+                if isinstance(widget, MindmapEditorWindow):
+                    print(f"Saving open mindmap: {widget.mindmap_name}...")
+                    widget.save_mindmap(show_message=False)
+                    widget.close()  # Close it
+        except ImportError:
+            print("Could not import MindmapEditorWindow for saving.")
+        except Exception as e:
+            print(f"Error during mindmap save on close: {e}")
+        # --- END FIX ---
+
     def center_window(self):
         """Centers the main window on the screen."""
         try:
@@ -401,32 +465,88 @@ class MainWindow(QMainWindow):
 
     # --- END NEW ---
 
+    @Slot(int, str, int, int, int)
+    def open_search_result(self, project_id, kind, ref_id, reading_id, outline_id):
+        """Opens the project of a global search hit and shows the item itself."""
+        try:
+            project_details = self.db.get_item_details(project_id)
+            if not project_details:
+                print(f"Error in open_search_result: Could not find project {project_id}")
+                return
+
+            self.show_project_dashboard(project_details)
+            QTimer.singleShot(150, lambda: self.project_dashboard.open_search_result(
+                kind, ref_id, reading_id, outline_id))
+        except Exception as e:
+            print(f"Error in open_search_result: {e}")
+
+    @Slot()
+    def sync_search_index(self):
+        """Indexes one batch of edited rows; loops quickly until the queue is empty."""
+        try:
+            synced = self.db.sync_search_index(limit=self.db.SEARCH_SYNC_BATCH)
+        except Exception as e:
+            print(f"Error updating the search index: {e}")
+            synced = 0
+        self.search_sync_timer.start(0 if synced >= self.db.SEARCH_SYNC_BATCH else SEARCH_SYNC_INTERVAL_MS)
+
+    @Slot()
+    def open_query_diagnostics(self):
+        """Opens the SQL profiler statistics (Ctrl+Shift+D)."""
+        try:
+            from dialogs.query_diagnostics_dialog import QueryDiagnosticsDialog
+            dialog = QueryDiagnosticsDialog(self.db, self)
+            dialog.exec()
+        except Exception as e:
+            print(f"Error opening database diagnostics: {e}")
+
     # --- NEW: Save on Close ---
     def closeEvent(self, event):
         """Overrides the main window's close event to save all data."""
         print("Closing application, saving all data...")
 
+        # 0. Write out anything still waiting in the autosave queue. Each
+        # write gets its own savepoint, so only the ones that fail are lost.
+        AutosaveService.flush_all(isolate=True)
+        failed = AutosaveService.failed_writes()
+        if failed:
+            details = "\n".join(f"{table} #{row_id}, {column}: {error}"
+                                 for table, row_id, column, error in failed[:10])
+            if len(failed) > 10:
+                details += f"\n...and {len(failed) - 10} more"
+            reply = QMessageBox.warning(
+                self, "Unsaved Changes",
+                f"{len(failed)} edit(s) could not be saved:\n\n{details}\n\n"
+                "Close anyway and lose them?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                event.ignore()
+                return
+
         # 1. Save all editors in the main project dashboard
         if self.project_dashboard:
             self.project_dashboard.save_all_editors()
 
         # 2. Find and save any open Mindmap editor windows
-        # --- FIX: Import locally inside the function ---
+        self._save_open_mindmaps()
+
+        # With per-project files, write the open project's summary and search entries
         try:
-            from dialogs.mindmap_editor_window import MindmapEditorWindow
-            # Find all top-level widgets that are mindmap editors
-            for widget in QApplication.topLevelWidgets():
-                if isinstance(widget, MindmapEditorWindow):
-                    print(f"Saving open mindmap: {widget.mindmap_name}...")
-                    widget.save_mindmap(show_message=False)
-                    widget.close()  # Close it
-        except ImportError:
-            print("Could not import MindmapEditorWindow for saving.")
+            self.db.detach_project()
         except Exception as e:
-            print(f"Error during mindmap save on close: {e}")
-        # --- END FIX ---
+            print(f"Error closing project file: {e}")
+
+        # 3. Delete unused attachment blobs no backup snapshot needs
+        try:
+            self.db.cancel_attachment_imports()
+            self.db.gc_attachment_store()
+        except Exception as e:
+            print(f"Error cleaning up attachment files: {e}")
 
         print("Save complete. Exiting.")
+        self.search_sync_timer.stop()
+        self.db.stop_backup_scheduler()
         event.accept()  # Proceed with closing
     # --- END NEW ---
 
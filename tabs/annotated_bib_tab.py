@@ -184,13 +184,15 @@ class AnnotatedBibTab(QWidget):
             "status": status
         }
 
-        self.db.update_annotated_bib_entry(self.current_reading_id, data)
-
-        # Update list item status
+        # Skip the write when nothing differs from what was loaded/saved
         current_item = self.source_list.currentItem()
         if current_item:
-            # Update stored data
             old_data = current_item.data(Qt.ItemDataRole.UserRole + 1)
+            if all((old_data.get(key) or "") == value for key, value in data.items()):
+                return
+
+        def update_list_item():
+            # Update stored data
             old_data.update(data)
             current_item.setData(Qt.ItemDataRole.UserRole + 1, old_data)
 
@@ -204,6 +206,13 @@ class AnnotatedBibTab(QWidget):
                 icon_text = "⚪"
             current_item.setText(f"{icon_text}  {nickname}")
 
+        with self.db.transaction():
+            self.db.update_annotated_bib_entry(self.current_reading_id, data)
+            # Update list item status once committed: the stored data is
+            # what the skip check above compares against
+            if current_item:
+                self.db.after_commit(update_list_item)
+
     def export_data(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Export Annotated Bibliography", "Annotated_Bib.docx",
                                                   "Word Document (*.docx);;Text File (*.txt)")
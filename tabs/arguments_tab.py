@@ -133,12 +133,8 @@ class ArgumentsTab(QWidget):
             QMessageBox.critical(self, "Error", f"Could not update insight: {e}")
             self.load_arguments()
 
-    def _get_outline_items(self, parent_id=None):
-        items = self.db.get_reading_outline(self.reading_id, parent_id=parent_id)
-        for item in items:
-            children = self._get_outline_items(parent_id=item['id'])
-            if children: item['children'] = children
-        return items
+    def _get_outline_items(self):
+        return self.db.get_reading_outline_nested(self.reading_id)
 
     def _get_driving_questions(self):
         return self.db.get_driving_questions(self.reading_id, parent_id=True)
@@ -132,17 +132,19 @@ class AssignmentTab(QWidget):
         self.instructions_editor.set_html(instr_html or "")
         self.draft_editor.set_html(draft_html or "")
 
-    def save_editors(self):
+    def save_editors(self, counts=None):
         print("Saving assignment editors...")
-        self.instructions_editor.get_html(
+        self.instructions_editor.get_html_if_modified(
             lambda html: self.db.update_project_text_field(
                 self.project_id, 'assignment_instructions_text', html
-            ) if html is not None else None
+            ) if html is not None else None,
+            db=self.db, counts=counts
         )
-        self.draft_editor.get_html(
+        self.draft_editor.get_html_if_modified(
             lambda html: self.db.update_project_text_field(
                 self.project_id, 'assignment_draft_text', html
-            ) if html is not None else None
+            ) if html is not None else None,
+            db=self.db, counts=counts
         )
 
     def load_rubric(self):
@@ -1,7 +1,6 @@
 # tabs/attachments_tab.py
 import sys
 import os
-import shutil
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
     QPushButton, QMenu, QInputDialog, QMessageBox, QFileDialog, QLabel, QDialog
@@ -16,6 +15,12 @@ except ImportError:
     print("Error: Could not import ReorderDialog for AttachmentsTab")
     ReorderDialog = None
 
+try:
+    from dialogs.attachment_import_dialog import AttachmentImportDialog
+except ImportError:
+    print("Error: Could not import AttachmentImportDialog for AttachmentsTab")
+    AttachmentImportDialog = None
+
 
 class AttachmentsTab(QWidget):
     """
@@ -31,12 +36,6 @@ class AttachmentsTab(QWidget):
         self.db = db
         self.reading_id = reading_id
 
-        # Define project root and attachments directory
-        self.project_root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        self.attachments_dir = os.path.join(self.project_root_dir, "Attachments")
-        self.reading_attachments_dir = os.path.join(self.attachments_dir, str(self.reading_id))
-        os.makedirs(self.reading_attachments_dir, exist_ok=True)
-
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(4)
@@ -71,6 +70,10 @@ class AttachmentsTab(QWidget):
         self.list_widget.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.list_widget.customContextMenuRequested.connect(self.show_context_menu)
 
+        # Files and folders can be dropped onto the list
+        self.setAcceptDrops(True)
+        self.import_dialog = None
+
         self.load_attachments()
 
     def load_attachments(self):
@@ -126,6 +129,10 @@ class AttachmentsTab(QWidget):
         add_action.triggered.connect(self._add_attachment)
         menu.addAction(add_action)
 
+        add_folder_action = QAction("Add Folder...", self)
+        add_folder_action.triggered.connect(self._add_folder)
+        menu.addAction(add_folder_action)
+
         if item and item.data(Qt.ItemDataRole.UserRole) is not None:
             # Item-specific actions
             menu.addSeparator()
@@ -156,44 +163,77 @@ class AttachmentsTab(QWidget):
         menu.exec(self.list_widget.mapToGlobal(position))
 
     def _add_attachment(self):
-        """Opens a file dialog to select and copy an attachment."""
-        source_path, _ = QFileDialog.getOpenFileName(self, "Select File to Attach")
-        if not source_path:
+        """Opens a file dialog to select one or more files to attach."""
+        source_paths, _ = QFileDialog.getOpenFileNames(self, "Select Files to Attach")
+        if not source_paths:
             return
 
-        try:
-            original_filename = os.path.basename(source_path)
-            target_path = os.path.join(self.reading_attachments_dir, original_filename)
-
-            # Handle file conflicts
-            if os.path.exists(target_path):
-                reply = QMessageBox.question(
-                    self, "File Exists",
-                    f"'{original_filename}' already exists in this reading's attachments.\nOverwrite it?",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                    QMessageBox.StandardButton.No
-                )
-                if reply == QMessageBox.StandardButton.No:
-                    return
-
-            shutil.copy(source_path, target_path)
-
-            # Store the relative path for cross-platform/machine use
-            relative_path = os.path.join(str(self.reading_id), original_filename).replace("\\", "/")
-
-            # Add to database
-            self.db.add_attachment(self.reading_id, original_filename, relative_path)
-            self.load_attachments()
+        # Handle duplicate names
+        attached_names = {att['display_name'] for att in self.db.get_attachments(self.reading_id)}
+        duplicates = [os.path.basename(path) for path in source_paths if os.path.basename(path) in attached_names]
+        if duplicates:
+            reply = QMessageBox.question(
+                self, "File Exists",
+                f"'{duplicates[0]}' is already attached to this reading.\nAttach it again?"
+                if len(duplicates) == 1 else
+                f"{len(duplicates)} of these files are already attached to this reading.\nAttach them again?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                return
+
+        self._import_paths(source_paths)
 
+    def _add_folder(self):
+        """Attaches every file in a folder (and its subfolders)."""
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder to Attach")
+        if folder:
+            self._import_paths([folder])
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            super().dragEnterEvent(event)
+
+    def dropEvent(self, event):
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if paths:
+            event.acceptProposedAction()
+            self._import_paths(paths)
+        else:
+            super().dropEvent(event)
+
+    def _import_paths(self, paths):
+        """
+        Copies files into the attachment store on a background thread
+        (AttachmentImportDialog shows progress and can cancel). The list
+        reloads once they are attached.
+        """
+        if self.import_dialog is not None:
+            QMessageBox.information(self, "Add Attachments", "Please wait for the current import to finish.")
+            return
+        if not AttachmentImportDialog:
+            QMessageBox.critical(self, "Error", "Attachment import dialog is not available.")
+            return
+        try:
+            self.import_dialog = AttachmentImportDialog(self.db, self.reading_id, paths, self)
+            self.import_dialog.attachmentsAdded.connect(lambda _count: self.load_attachments())
+            self.import_dialog.destroyed.connect(self._on_import_dialog_closed)
         except Exception as e:
-            QMessageBox.critical(self, "Error Attaching File", f"Could not copy file: {e}")
+            self.import_dialog = None
+            QMessageBox.critical(self, "Error Attaching Files", f"Could not start the import: {e}")
+
+    def _on_import_dialog_closed(self):
+        self.import_dialog = None
 
     def _open_attachment(self, item):
         """Opens the selected attachment with the system's default program."""
         if item.data(Qt.ItemDataRole.UserRole) is None: return
 
         relative_path = item.data(Qt.ItemDataRole.UserRole + 1)
-        full_path = os.path.join(self.attachments_dir, relative_path)
+        full_path = self.db.resolve_attachment_path(relative_path)
 
         if not os.path.exists(full_path):
             QMessageBox.critical(self, "Error", f"File not found:\n{full_path}")
@@ -218,7 +258,7 @@ class AttachmentsTab(QWidget):
             QMessageBox.warning(self, "Invalid File Type", "Only PDF files can be opened in the Node Viewer.")
             return
 
-        full_path = os.path.join(self.attachments_dir, relative_path)
+        full_path = self.db.resolve_attachment_path(relative_path)
         if not os.path.exists(full_path):
             QMessageBox.critical(self, "Error", f"File not found:\n{full_path}")
             return
@@ -251,12 +291,11 @@ class AttachmentsTab(QWidget):
             return
 
         attachment_id = item.data(Qt.ItemDataRole.UserRole)
-        relative_path = item.data(Qt.ItemDataRole.UserRole + 1)
         display_name = item.text()
 
         reply = QMessageBox.question(
             self, "Delete Attachment",
-            f"Are you sure you want to delete '{display_name}'?\n\nThis will remove the file from the attachments folder.",
+            f"Are you sure you want to delete '{display_name}'?\n\nThe file is removed from the attachments folder once no other reading uses it.",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
             QMessageBox.StandardButton.No
         )
@@ -265,17 +304,10 @@ class AttachmentsTab(QWidget):
             return
 
         try:
-            # 1. Delete file from disk
-            full_path = os.path.join(self.attachments_dir, relative_path)
-            if os.path.exists(full_path):
-                os.remove(full_path)
-            else:
-                print(f"Warning: File not found for deletion, but removing from DB: {full_path}")
-
-            # 2. Delete from DB
+            # 1. Delete from DB (the file goes once nothing else uses it)
             self.db.delete_attachment(attachment_id)
 
-            # 3. Refresh list
+            # 2. Refresh list
             self.load_attachments()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not delete attachment: {e}")
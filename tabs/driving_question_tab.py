@@ -1,5 +1,6 @@
 # tabs/driving_question_tab.py
 import sys
+from collections import deque
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTreeWidget,
     QTreeWidgetItem, QMenu, QMessageBox, QDialog, QLabel, QFrame,
@@ -105,32 +106,31 @@ class DrivingQuestionTab(QWidget):
         """Reloads all questions from the database into the tree."""
         self.tree_widget.clear()
         try:
-            root_questions = self.db.get_driving_questions(self.reading_id, parent_id=None)
-            # --- FIX: Add loop protection ---
-            visited_ids = set()
+            root_questions, cycle_ids = self.db.get_driving_question_forest(self.reading_id)
+
+            # Build breadth-first from the prebuilt forest; siblings are
+            # already in display order.
+            pending = deque((self.tree_widget, q_data) for q_data in root_questions)
+            while pending:
+                parent_widget, q_data = pending.popleft()
+                item = self._add_question_to_tree(parent_widget, q_data)
+                pending.extend((item, child_data) for child_data in q_data['children'])
+
+            # --- FIX: Loop protection ---
+            for q_id in cycle_ids:
+                print(f"Error: Detected recursion loop in driving questions! Question ID: {q_id}")
+                # Add a placeholder item to show the error
+                item = QTreeWidgetItem(self.tree_widget, [f"Error: Loop detected on item {q_id}"])
+                item.setForeground(0, QColor("red"))
             # --- END FIX ---
-            for q_data in root_questions:
-                self._add_question_to_tree(self.tree_widget, q_data, visited_ids)
+
+            self.tree_widget.expandAll()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not load driving questions: {e}")
         self._update_button_states()
 
-    def _add_question_to_tree(self, parent_widget, q_data, visited_ids):
-        """Recursive helper to build the tree. Includes loop protection."""
-
-        q_id = q_data["id"]
-
-        # --- FIX: Loop protection ---
-        if q_id in visited_ids:
-            print(f"Error: Detected recursion loop in driving questions! Question ID: {q_id}")
-            # Add a placeholder item to show the error
-            item = QTreeWidgetItem(parent_widget, [f"Error: Loop detected on item {q_id}"])
-            item.setForeground(0, QColor("red"))
-            return
-
-        visited_ids.add(q_id)
-        # --- END FIX ---
-
+    def _add_question_to_tree(self, parent_widget, q_data):
+        """Adds a single question to the tree and returns its widget item."""
         # Format display text
         nickname = q_data.get("nickname", "")
         question_text = q_data.get("question_text", "No question text")
@@ -153,7 +153,9 @@ class DrivingQuestionTab(QWidget):
 
         item = QTreeWidgetItem(parent_widget, [display_text])
         item.setData(0, Qt.ItemDataRole.UserRole, q_data["id"])
-        item.setData(0, Qt.ItemDataRole.UserRole + 1, dict(q_data))  # Store full data for context menu
+        # Store full data for context menu (without the nested children)
+        item_data = {k: v for k, v in q_data.items() if k != 'children'}
+        item.setData(0, Qt.ItemDataRole.UserRole + 1, item_data)
 
         # Set font for working question
         if is_working:
@@ -162,13 +164,7 @@ class DrivingQuestionTab(QWidget):
             item.setFont(0, font)
             item.setForeground(0, QColor("#0055A4"))  # A blue color
 
-        # Recursively add children
-        child_questions = self.db.get_driving_questions(self.reading_id, parent_id=q_data["id"])
-        for child_data in child_questions:
-            # --- FIX: Pass a copy of the visited set for this branch ---
-            self._add_question_to_tree(item, child_data, visited_ids.copy())
-
-        item.setExpanded(True)
+        return item
 
     def _get_all_questions_flat(self):
         """Fetches all questions for this reading as a flat list for the parent dropdown."""
@@ -176,15 +172,9 @@ class DrivingQuestionTab(QWidget):
         return self.db.get_driving_questions(self.reading_id, parent_id=True)
         # --- END FIX ---
 
-    def _get_outline_items(self, parent_id=None):
-        """Recursively fetches outline items to build a nested list for the dialog."""
-        items = self.db.get_reading_outline(self.reading_id, parent_id=parent_id)
-        for item in items:
-            # item is already a dict
-            children = self._get_outline_items(parent_id=item['id'])
-            if children:
-                item['children'] = children
-        return items
+    def _get_outline_items(self):
+        """Fetches the outline as a nested list for the dialog."""
+        return self.db.get_reading_outline_nested(self.reading_id)
 
     def _update_button_states(self):
         """Enables/disables buttons based on selection."""
@@ -285,50 +275,10 @@ class DrivingQuestionTab(QWidget):
                 if reply == QMessageBox.StandardButton.No:
                     data["is_working_question"] = False  # Uncheck it if user cancelled
 
-            if data.get("is_working_question"):  # Check again in case user cancelled
-                # Unset all others
-                self.db.clear_all_working_questions(self.reading_id)
-
         try:
-            item_id = None
-            if question_id:
-                # Update existing
-                self.db.update_driving_question(question_id, data)
-                item_id = question_id
-            else:
-                # Add new
-                item_id = self.db.add_driving_question(self.reading_id, data)
-
-            if not item_id:
-                raise Exception("Failed to get item ID after save/update.")
-
-            # --- VIRTUAL ANCHOR FIX ---
-            # 1. Clear all existing virtual anchors for this item
-            self.db.delete_anchors_by_item_link_id(item_id)
-
-            # 2. Add new ones based on the tags
-            tags_text = data.get("synthesis_tags", "")
-            if tags_text:
-                tag_names = [tag.strip() for tag in tags_text.split(',') if tag.strip()]
-                q_text = data.get('question_text', '')[:50]
-                nickname = data.get('nickname', '')
-                summary_text = f"Driving Question: {nickname or q_text}..."
-
-                for tag_name in tag_names:
-                    tag_data = self.db.get_or_create_tag(tag_name, self.project_id)
-                    if tag_data:
-                        self.db.create_anchor(
-                            project_id=self.project_id,
-                            reading_id=self.reading_id,
-                            outline_id=data.get("outline_id"),
-                            tag_id=tag_data['id'],
-                            selected_text=summary_text,
-                            comment=f"Linked to Driving Question ID {item_id}",
-                            unique_doc_id=f"dq-{item_id}-{tag_data['id']}",  # Make unique doc_id
-                            item_link_id=item_id,
-                            pdf_node_id=data.get("pdf_node_id")  # Pass PDF node ID if present
-                        )
-            # --- END VIRTUAL ANCHOR FIX ---
+            # Working-question swap, item save and anchor rebuild commit together
+            with self.db.transaction():
+                self._save_question_data(question_id, data)
 
             self.load_questions()  # Refresh tree
         except Exception as e:
@@ -336,6 +286,52 @@ class DrivingQuestionTab(QWidget):
             import traceback
             traceback.print_exc()
 
+    def _save_question_data(self, question_id, data):
+        """Writes a question, its working flag and its virtual anchors."""
+        if data.get("is_working_question"):
+            # Unset all others
+            self.db.clear_all_working_questions(self.reading_id)
+
+        item_id = None
+        if question_id:
+            # Update existing
+            self.db.update_driving_question(question_id, data)
+            item_id = question_id
+        else:
+            # Add new
+            item_id = self.db.add_driving_question(self.reading_id, data)
+
+        if not item_id:
+            raise Exception("Failed to get item ID after save/update.")
+
+        # --- VIRTUAL ANCHOR FIX ---
+        # 1. Clear all existing virtual anchors for this item
+        self.db.delete_anchors_by_item_link_id(item_id)
+
+        # 2. Add new ones based on the tags
+        tags_text = data.get("synthesis_tags", "")
+        if tags_text:
+            tag_names = [tag.strip() for tag in tags_text.split(',') if tag.strip()]
+            q_text = data.get('question_text', '')[:50]
+            nickname = data.get('nickname', '')
+            summary_text = f"Driving Question: {nickname or q_text}..."
+
+            for tag_name in tag_names:
+                tag_data = self.db.get_or_create_tag(tag_name, self.project_id)
+                if tag_data:
+                    self.db.create_anchor(
+                        project_id=self.project_id,
+                        reading_id=self.reading_id,
+                        outline_id=data.get("outline_id"),
+                        tag_id=tag_data['id'],
+                        selected_text=summary_text,
+                        comment=f"Linked to Driving Question ID {item_id}",
+                        unique_doc_id=f"dq-{item_id}-{tag_data['id']}",  # Make unique doc_id
+                        item_link_id=item_id,
+                        pdf_node_id=data.get("pdf_node_id")  # Pass PDF node ID if present
+                    )
+        # --- END VIRTUAL ANCHOR FIX ---
+
     @Slot()
     def _add_question(self):
         """Adds a new root-level question."""
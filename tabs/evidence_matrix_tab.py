@@ -25,6 +25,8 @@ try:
 except ImportError:
     PdfLinkDialog = None
 
+from utils.autosave import AutosaveService
+
 
 class LargeTextEntryDialog(QDialog):
     """
@@ -72,6 +74,7 @@ class EvidenceMatrixTab(QWidget):
 
         self._current_theme_id = None
         self._ignore_changes = False
+        self.autosave = AutosaveService.for_database(self.db)
 
         self._setup_ui()
         self.load_themes()
@@ -206,6 +209,7 @@ class EvidenceMatrixTab(QWidget):
     # --- Theme Management ---
 
     def load_themes(self):
+        self.autosave.flush()
         self.theme_list.clear()
         themes = self.db.get_evidence_matrix_themes(self.project_id)
         for t in themes:
@@ -258,6 +262,7 @@ class EvidenceMatrixTab(QWidget):
 
         if QMessageBox.question(self, "Delete",
                                 "Delete this theme and all its evidence?") == QMessageBox.StandardButton.Yes:
+            self.autosave.discard("evidence_matrix_themes", theme_id)
             self.db.delete_evidence_matrix_theme(theme_id)
             self.load_themes()
             if self._current_theme_id == theme_id:
@@ -286,6 +291,7 @@ class EvidenceMatrixTab(QWidget):
 
         theme_id = current.data(Qt.UserRole)
         self._current_theme_id = theme_id
+        self.autosave.flush()
 
         # Load Theme Data
         # We need fetch theme details. The mixin returns all.
@@ -313,7 +319,9 @@ class EvidenceMatrixTab(QWidget):
     def _save_field_debounced(self, field, widget):
         if self._ignore_changes or not self._current_theme_id: return
         val = widget.toPlainText()
-        self.db.update_evidence_matrix_theme_field(self._current_theme_id, field, val)
+        # Written after a pause in typing, coalesced with other edits (utils/autosave.py)
+        self.autosave.put("evidence_matrix_themes", self._current_theme_id, field, val,
+                          self.db.update_evidence_matrix_theme_field)
 
     # --- PDF Linking ---
 
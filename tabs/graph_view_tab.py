@@ -32,6 +32,13 @@ except ImportError:
     print("Error: Could not import EditTagDialog for GraphViewTab")
     EditTagDialog = None
 
+from utils.db_executor import DbExecutor
+
+
+def _fetch_project_graph(db, project_id):
+    """Background job: reads everything load_graph needs."""
+    return db.get_graph_data_full(project_id), db.get_graph_settings(project_id)
+
 
 class GraphViewTab(QWidget):
     """
@@ -51,6 +58,8 @@ class GraphViewTab(QWidget):
         self.edges = []
         self.color_map = {}
         self.color_buttons = {}
+        self._graph_future = None  # Pending background load
+        self._reload_when_shown = False
 
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -193,25 +202,45 @@ class GraphViewTab(QWidget):
         self.tagDoubleClicked.emit(tag_id)
 
     def load_graph(self):
-        """Fetches data from the DB and builds the graph."""
+        """Fetches the graph data on the DB executor; _on_graph_loaded builds it."""
         if not self.db or self.project_id is None:
             return
 
+        if self._graph_future:
+            self._graph_future.cancel()
+        self._reload_when_shown = False
+        self._graph_future = DbExecutor.for_database(self.db).submit(_fetch_project_graph, self.project_id)
+        self._graph_future.finished.connect(self._on_graph_loaded)
+        self._graph_future.failed.connect(self._on_graph_load_failed)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._reload_when_shown:
+            self.load_graph()
+
+    def hideEvent(self, event):
+        # Navigated away before the data arrived: drop the load, redo it on return
+        if self._graph_future and not self._graph_future.is_done():
+            self._graph_future.cancel()
+            self._graph_future = None
+            self._reload_when_shown = True
+        super().hideEvent(event)
+
+    @Slot(str)
+    def _on_graph_load_failed(self, message):
+        self._graph_future = None
+        QMessageBox.critical(self, "Error", f"Could not load graph data: {message}")
+
+    @Slot(object)
+    def _on_graph_loaded(self, result):
+        """Builds the graph from the data fetched in the background."""
+        self._graph_future = None
+        data, self.color_map = result
+
         self.scene.clear_graph()
         self.nodes.clear()
         self.edges.clear()
-
-        try:
-            # 1. Get graph data
-            data = self.db.get_graph_data_full(self.project_id)
-            # 2. Get color settings
-            self.color_map = self.db.get_graph_settings(self.project_id)
-            # 3. Update buttons in control panel
-            self._update_color_buttons()
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not load graph data: {e}")
-            return
+        self._update_color_buttons()
 
         scene_size = 300 * math.sqrt(len(data['readings']) + len(data['tags']) + len(data.get('virtual_anchors', [])))
 
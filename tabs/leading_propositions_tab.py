@@ -184,12 +184,8 @@ class LeadingPropositionsTab(QWidget):
                 break
             parent = parent.parent()
 
-    def _get_outline_items(self, parent_id=None):
-        items = self.db.get_reading_outline(self.reading_id, parent_id=parent_id)
-        for item in items:
-            children = self._get_outline_items(parent_id=item['id'])
-            if children: item['children'] = children
-        return items
+    def _get_outline_items(self):
+        return self.db.get_reading_outline_nested(self.reading_id)
 
     @Slot()
     def _add_item(self):
@@ -127,14 +127,9 @@ class PartsOrderRelationTab(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not load parts: {e}")
 
-    def _get_outline_items(self, parent_id=None):
-        """Recursively fetches outline items to build a nested list for the dialog."""
-        items = self.db.get_reading_outline(self.reading_id, parent_id=parent_id)
-        for item in items:
-            children = self._get_outline_items(parent_id=item['id'])
-            if children:
-                item['children'] = children
-        return items
+    def _get_outline_items(self):
+        """Fetches the outline as a nested list for the dialog."""
+        return self.db.get_reading_outline_nested(self.reading_id)
 
     def _get_driving_questions(self):
         """Fetches all driving questions for this reading."""
@@ -69,6 +69,13 @@ class ProjectEditorTab(QWidget):
     def get_editor_content(self, callback):
         self.editor.get_html(callback)
 
+    def get_editor_content_if_modified(self, callback, db=None, counts=None):
+        """
+        Calls callback(html) only if the text changed since it was loaded
+        or saved (RichTextEditorTab.get_html_if_modified).
+        """
+        return self.editor.get_html_if_modified(callback, db=db, counts=counts)
+
     # MODIFIED: This method is called by the dashboard to refresh the prompt text
     def update_instructions(self):
         """Fetches the latest instructions from the DB and updates the prompt label."""
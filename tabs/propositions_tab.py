@@ -113,6 +113,15 @@ class PropositionsTab(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error Loading Propositions", f"Could not load propositions: {e}")
 
+    def select_item_by_id(self, item_id):
+        """Selects a proposition in the list by its ID."""
+        target_id = int(item_id)
+        for i in range(self.item_list.count()):
+            current_id = self.item_list.item(i).data(Qt.ItemDataRole.UserRole)
+            if current_id is not None and int(current_id) == target_id:
+                self.item_list.setCurrentRow(i)
+                return
+
     @Slot(QListWidgetItem, QListWidgetItem)
     def on_item_selected(self, current_item, previous_item):
         if current_item is None:
@@ -186,6 +186,7 @@ class ReadingNotesTab(QWidget):
         self.current_outline_id = None
         self._block_outline_save = False  # prevent save-on-switch loops
         self._is_loaded = False  # <<< guard to avoid saving blanks
+        self._saved_details = None  # details form as last loaded/saved, to skip unchanged autosaves
 
         # --- CRITICAL FIX: Recursion Guard ---
         self._is_loading = False
@@ -577,6 +578,7 @@ class ReadingNotesTab(QWidget):
             level_text = self._get_detail('level')
             level_index = self.combo_level.findText(level_text, Qt.MatchFlag.MatchStartsWith)
             self.combo_level.setCurrentIndex(level_index if level_index != -1 else 0)
+            self._saved_details = self._collect_details()
 
             # Populate Outline
             self.load_outline()
@@ -660,13 +662,13 @@ class ReadingNotesTab(QWidget):
             html = self._get_detail(field_name, default="")
             editor.set_html(html)
 
-    def save_bottom_tabs_content(self):
+    def save_bottom_tabs_content(self, counts=None):
         """Saves data from the bottom-right tabs."""
         if not self._is_loaded:
             return
 
         if UnityTab and hasattr(self, 'unity_tab'):
-            self.unity_tab.save_data()
+            self.unity_tab.save_data(counts=counts)
         if PartsOrderRelationTab and hasattr(self, 'parts_order_relation_tab'):
             self.parts_order_relation_tab.save_data()
 
@@ -696,7 +698,7 @@ class ReadingNotesTab(QWidget):
                         self.reading_id, fname, html
                     ) if html is not None else None
 
-                editor.get_html(create_callback(field_name))
+                editor.get_html_if_modified(create_callback(field_name), db=self.db, counts=counts)
                 continue
             # --- END FIX ---
 
@@ -706,7 +708,7 @@ class ReadingNotesTab(QWidget):
                         self.reading_id, fname, html
                     ) if html is not None else None
 
-                editor.get_html(create_callback(field_name))
+                editor.get_html_if_modified(create_callback(field_name), db=self.db, counts=counts)
                 continue
             if field_name == 'personal_dialogue_html' and PersonalDialogueTab and hasattr(self,
                                                                                           'personal_dialogue_tab') and editor.editor_title == "Personal Dialogue":
@@ -715,7 +717,7 @@ class ReadingNotesTab(QWidget):
                         self.reading_id, fname, html
                     ) if html is not None else None
 
-                editor.get_html(create_callback(field_name))
+                editor.get_html_if_modified(create_callback(field_name), db=self.db, counts=counts)
                 continue
 
             # --- END MODIFIED ---
@@ -725,22 +727,22 @@ class ReadingNotesTab(QWidget):
                     self.reading_id, fname, html
                 ) if html is not None else None
 
-            editor.get_html(create_callback(field_name))
+            editor.get_html_if_modified(create_callback(field_name), db=self.db, counts=counts)
 
-    def save_all(self):
-        """Called by the dashboard to save all data on this tab."""
-        if not self._is_loaded:
-            return
-        self.save_details(show_message=False)
-        self.save_current_outline_notes()
-        self.save_bottom_tabs_content()
-
-    def save_details(self, show_message=True):
-        """Saves the data from the 'Reading Details' form and notifies dashboard to rename the tab if needed."""
+    def save_all(self, counts=None):
+        """
+        Called by the dashboard to save all data on this tab. counts is the
+        save cycle's tally (RichTextEditorTab.record_save).
+        """
         if not self._is_loaded:
             return
+        self.save_details(show_message=False, counts=counts)
+        self.save_current_outline_notes(counts=counts)
+        self.save_bottom_tabs_content(counts=counts)
 
-        details = {
+    def _collect_details(self):
+        """The 'Reading Details' form as the dict update_reading_details takes."""
+        return {
             # --- MODIFIED: Use toPlainText() for QTextEdit ---
             'title': self.edit_title.toPlainText(),
             # --- END MODIFIED ---
@@ -753,8 +755,25 @@ class ReadingNotesTab(QWidget):
             'classification': self.edit_classification.text()
         }
 
+    def save_details(self, show_message=True, counts=None):
+        """Saves the data from the 'Reading Details' form and notifies dashboard to rename the tab if needed."""
+        if not self._is_loaded:
+            return
+
+        details = self._collect_details()
+        if not show_message and details == self._saved_details:
+            RichTextEditorTab.record_save(counts, False)  # Autosave with nothing changed
+            return
+
+        def mark_saved():
+            self._saved_details = details
+            RichTextEditorTab.record_save(counts, True)
+
         try:
-            self.db.update_reading_details(self.reading_id, details)
+            with self.db.transaction():
+                self.db.update_reading_details(self.reading_id, details)
+                # Not before the save cycle commits, or a rolled-back write is never retried
+                self.db.after_commit(mark_saved)
             if show_message:
                 QMessageBox.information(self, "Success", "Reading details saved.")
             self.readingTitleChanged.emit(self.reading_id, self)
@@ -762,7 +781,7 @@ class ReadingNotesTab(QWidget):
             if show_message:
                 QMessageBox.critical(self, "Error", f"Could not save details: {e}")
 
-    def save_current_outline_notes(self):
+    def save_current_outline_notes(self, counts=None):
         """Saves the notes for the currently selected outline item."""
         if self.current_outline_id is None or self._block_outline_save or not self._is_loaded:
             return
@@ -771,12 +790,13 @@ class ReadingNotesTab(QWidget):
 
         def save_callback(html):
             if html is not None:
-                try:
-                    self.db.update_outline_section_notes(section_id, html)
-                except Exception as e:
-                    print(f"DEBUG: Error saving notes for outline section {section_id}: {e}")
+                self.db.update_outline_section_notes(section_id, html)
 
-        self.notes_editor.get_html(save_callback)
+        # Caught out here so the failed write also rolls back and the notes stay modified
+        try:
+            self.notes_editor.get_html_if_modified(save_callback, db=self.db, counts=counts)
+        except Exception as e:
+            print(f"DEBUG: Error saving notes for outline section {section_id}: {e}")
 
     # --- Outline Tree Functions ---
 
@@ -791,10 +811,13 @@ class ReadingNotesTab(QWidget):
         self.outline_tree.clear()
 
         try:
-            root_items = self.db.get_reading_outline(self.reading_id, parent_id=None)
-            for item_data in root_items:
-                parent_widget = self.outline_tree
-                self._add_outline_item(parent_widget, item_data)
+            # One query returns the whole outline in pre-order, so a parent's
+            # widget always exists before its children are added.
+            tree_items = {}
+            for item_data in self.db.get_reading_outline_tree(self.reading_id, include_notes=False):
+                parent_widget = tree_items.get(item_data['parent_id'], self.outline_tree)
+                tree_items[item_data['id']] = self._add_outline_item(parent_widget, item_data)
+            self.outline_tree.expandAll()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not load reading outline: {e}")
         finally:
@@ -804,19 +827,14 @@ class ReadingNotesTab(QWidget):
                 self._is_loading = False
 
     def _add_outline_item(self, parent_widget, item_data: dict):
-        """Recursive helper to add items to the outline tree."""
+        """Adds a single outline row to the tree and returns its widget item."""
         item = QTreeWidgetItem(parent_widget, [item_data['section_title']])
         item.setData(0, Qt.ItemDataRole.UserRole, item_data['id'])
 
         # --- ENABLE INLINE EDITING ---
         item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
         # -----------------------------
-
-        children_data = self.db.get_reading_outline(self.reading_id, parent_id=item_data['id'])
-        for child_data in children_data:
-            self._add_outline_item(item, child_data)
-
-        item.setExpanded(True)
+        return item
 
     def on_outline_item_changed(self, item, column):
         """
@@ -862,9 +880,10 @@ class ReadingNotesTab(QWidget):
         if previous:
             prev_id = previous.data(0, Qt.ItemDataRole.UserRole)
             if prev_id is not None and self._is_loaded:
-                self.notes_editor.get_html(
+                self.notes_editor.get_html_if_modified(
                     lambda html, pid=prev_id: self.db.update_outline_section_notes(pid,
-                                                                                   html) if html is not None else None
+                                                                                   html) if html is not None else None,
+                    db=self.db
                 )
 
         if current:
@@ -1317,6 +1336,13 @@ class ReadingNotesTab(QWidget):
         cursor = QTextCursor(doc)
         cursor.setPosition(0)
 
+        # Look anchors up in the project's in-memory index instead of querying
+        # per character. Ids the index does not know (text pasted in from
+        # another project) are checked once each against the database, so
+        # only anchors that are really gone lose their formatting.
+        anchor_index = self.db.get_project_anchor_index(self.project_id)
+        other_anchor_exists = {}
+
         current_pos = 0
         while current_pos < doc.characterCount() - 1:
             cursor.setPosition(current_pos)
@@ -1329,7 +1355,11 @@ class ReadingNotesTab(QWidget):
 
             if anchor_id:
                 # This character is part of an anchor. Check if it still exists.
-                anchor_exists = self.db.get_anchor_by_id(anchor_id)
+                anchor_exists = anchor_id in anchor_index['anchors']
+                if not anchor_exists:
+                    if anchor_id not in other_anchor_exists:
+                        other_anchor_exists[anchor_id] = self.db.get_anchor_by_id(anchor_id) is not None
+                    anchor_exists = other_anchor_exists[anchor_id]
 
                 if not anchor_exists:
                     # This anchor is orphaned. Find its full extent.
@@ -1390,28 +1420,30 @@ class ReadingNotesTab(QWidget):
                 return
 
             try:
-                tag_data = self.db.get_or_create_tag(tag_name, self.project_id)
-                if not tag_data:
-                    raise Exception(f"Could not get or create tag '{tag_name}'")
-                tag_id = tag_data['id']
-                unique_doc_id = str(uuid.uuid4())
-
-                # --- MODIFIED: Pass pdf_node_id ---
-                anchor_id = self.db.create_anchor(
-                    project_id=self.project_id,
-                    reading_id=self.reading_id,
-                    outline_id=self.current_outline_id,
-                    tag_id=tag_id,
-                    selected_text=selected_text,
-                    comment="",  # No longer used
-                    unique_doc_id=unique_doc_id,
-                    item_link_id=None,
-                    pdf_node_id=pdf_node_id
-                )
-                # --- END MODIFICATION ---
-
-                if not anchor_id:
-                    raise Exception("Failed to create anchor in database.")
+                # Tag creation and anchor insert commit together
+                with self.db.transaction():
+                    tag_data = self.db.get_or_create_tag(tag_name, self.project_id)
+                    if not tag_data:
+                        raise Exception(f"Could not get or create tag '{tag_name}'")
+                    tag_id = tag_data['id']
+                    unique_doc_id = str(uuid.uuid4())
+
+                    # --- MODIFIED: Pass pdf_node_id ---
+                    anchor_id = self.db.create_anchor(
+                        project_id=self.project_id,
+                        reading_id=self.reading_id,
+                        outline_id=self.current_outline_id,
+                        tag_id=tag_id,
+                        selected_text=selected_text,
+                        comment="",  # No longer used
+                        unique_doc_id=unique_doc_id,
+                        item_link_id=None,
+                        pdf_node_id=pdf_node_id
+                    )
+                    # --- END MODIFICATION ---
+
+                    if not anchor_id:
+                        raise Exception("Failed to create anchor in database.")
 
                 self.notes_editor.apply_anchor_format(
                     anchor_id=anchor_id,
@@ -1454,18 +1486,20 @@ class ReadingNotesTab(QWidget):
                     QMessageBox.warning(self, "Tag Required", "An anchor must have a tag.")
                     return
 
-                tag_data = self.db.get_or_create_tag(new_tag_name, self.project_id)
-                if not tag_data:
-                    raise Exception(f"Could not get or create tag '{new_tag_name}'")
-                new_tag_id = tag_data['id']
-
-                # --- MODIFIED: Save pdf_node_id ---
-                update_data = {
-                    "comment": "",  # Cleared
-                    "tags": [new_tag_id],
-                    "pdf_node_id": new_pdf_node_id
-                }
-                self.db.update_anchor(anchor_id, update_data)
+                # Tag creation and anchor update commit together
+                with self.db.transaction():
+                    tag_data = self.db.get_or_create_tag(new_tag_name, self.project_id)
+                    if not tag_data:
+                        raise Exception(f"Could not get or create tag '{new_tag_name}'")
+                    new_tag_id = tag_data['id']
+
+                    # --- MODIFIED: Save pdf_node_id ---
+                    update_data = {
+                        "comment": "",  # Cleared
+                        "tags": [new_tag_id],
+                        "pdf_node_id": new_pdf_node_id
+                    }
+                    self.db.update_anchor(anchor_id, update_data)
                 # --- END MODIFICATION ---
 
                 self.notes_editor.find_and_update_anchor_format(
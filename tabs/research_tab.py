@@ -1,7 +1,7 @@
 # tabs/research_tab.py
 import sys
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QTreeWidget, QTreeWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QTreeWidget, QTreeWidgetItem, QTreeWidgetItemIterator,
     QStackedWidget, QLabel, QLineEdit, QTextEdit, QComboBox, QPushButton,
     QFrame, QScrollArea, QMenu, QInputDialog, QMessageBox, QListWidget, QListWidgetItem,
     QGroupBox, QFormLayout, QDialog, QDialogButtonBox
@@ -27,6 +27,8 @@ try:
 except ImportError:
     PdfLinkDialog = None
 
+from utils.autosave import AutosaveService
+
 
 # --- Custom Dialog for Large Text Input (The "Popup") ---
 class LargeTextEntryDialog(QDialog):
@@ -125,6 +127,7 @@ class ResearchTab(QWidget):
         self._current_node_id = None
         self._current_plan_id = None
         self._ignore_changes = False
+        self.autosave = AutosaveService.for_database(self.db)
 
         self._setup_ui()
         self.load_tree()
@@ -552,6 +555,7 @@ class ResearchTab(QWidget):
 
     def load_tree(self):
         """Loads the research nodes from DB into the tree."""
+        self.autosave.flush()
         self.tree.clear()
         nodes = self.db.get_research_nodes(self.project_id)
 
@@ -613,6 +617,7 @@ class ResearchTab(QWidget):
         self._load_node_details(node_id, node_type)
 
     def _load_node_details(self, node_id, node_type):
+        self.autosave.flush()
         self._ignore_changes = True
         data = self.db.get_research_node_details(node_id)
 
@@ -662,6 +667,7 @@ class ResearchTab(QWidget):
 
     def load_plans(self):
         """Loads research plans into the bottom-left list."""
+        self.autosave.flush()
         self.plan_list.clear()
         plans = self.db.get_research_plans(self.project_id)
 
@@ -743,27 +749,8 @@ class ResearchTab(QWidget):
 
         dialog = ReorderDialog(plans, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            # We need a method in DB to update plan order.
-            # Assuming db.update_research_plan_order exists or we can add it.
-            # If it doesn't exist, we might need to add it to mixin.
-            # I'll add a helper loop here if needed or assume mixin update.
-            # Let's check mixin... Ah, I need to add update_research_plan_order to mixin?
-            # Or just do manual loop here for now to be safe if mixin isn't updated in this turn.
-            # Actually, I can just execute SQL directly via self.db.cursor if mixin method missing,
-            # but best practice is mixin. Let's assume user accepts I might need to add to mixin
-            # or I can do it right here using self.db.conn/cursor if public.
-
-            # Since I can't edit mixin in this response easily without user prompt,
-            # I will implement the update loop here using the DB connection directly if possible,
-            # or try to use a generic update method.
-            # However, looking at mixin, it likely doesn't have it.
-            # I will assume `update_research_plan_order` might not exist yet.
-            # I will implement it manually here for safety.
-
             try:
-                for i, plan_id in enumerate(dialog.ordered_db_ids):
-                    self.db.cursor.execute("UPDATE research_plans SET display_order = ? WHERE id = ?", (i, plan_id))
-                self.db.conn.commit()
+                self.db.update_research_plan_order(dialog.ordered_db_ids)
                 self.load_plans()
             except Exception as e:
                 print(f"Error reordering plans: {e}")
@@ -785,6 +772,7 @@ class ResearchTab(QWidget):
 
         plan_id = current.data(Qt.UserRole)
         self._current_plan_id = plan_id
+        self.autosave.flush()
 
         # Load Plan Data
         # We need to fetch the single plan row. Using existing mixin?
@@ -828,12 +816,14 @@ class ResearchTab(QWidget):
 
     def _save_plan_field(self, field, value):
         if self._ignore_changes or not self._current_plan_id: return
+        self.autosave.flush()  # So a queued older value cannot overwrite this one
         self.db.update_research_plan_field(self._current_plan_id, field, value)
 
     def _save_plan_field_debounced(self, field, widget):
-        if self._ignore_changes: return
+        if self._ignore_changes or not self._current_plan_id: return
         val = widget.toPlainText() if hasattr(widget, 'toPlainText') else widget.text()
-        self._save_plan_field(field, val)
+        self.autosave.put("research_plans", self._current_plan_id, field, val,
+                          self.db.update_research_plan_field)
 
     def _save_plan_question(self, index):
         if self._ignore_changes or not self._current_plan_id: return
@@ -844,6 +834,7 @@ class ResearchTab(QWidget):
 
     def _save_field(self, field, value):
         if self._ignore_changes or not self._current_node_id: return
+        self.autosave.flush()  # So a queued older value cannot overwrite this one
         self.db.update_research_node_field(self._current_node_id, field, value)
 
         if field == 'title':
@@ -851,9 +842,15 @@ class ResearchTab(QWidget):
             if item: item.setText(0, value)
 
     def _save_field_debounced(self, field, widget):
-        if self._ignore_changes: return
+        if self._ignore_changes or not self._current_node_id: return
         val = widget.toPlainText() if hasattr(widget, 'toPlainText') else widget.text()
-        self._save_field(field, val)
+        # Written after a pause in typing, coalesced with other edits (utils/autosave.py)
+        self.autosave.put("research_nodes", self._current_node_id, field, val,
+                          self.db.update_research_node_field)
+
+        if field == 'title':
+            item = self.tree.currentItem()
+            if item: item.setText(0, val)
 
     def _manual_save_question(self):
         if self._current_node_id and RichTextEditorTab:
@@ -979,6 +976,7 @@ class ResearchTab(QWidget):
     def _delete_node(self, item):
         if QMessageBox.question(self, "Delete", "Delete this item and all children?") == QMessageBox.StandardButton.Yes:
             node_id = item.data(0, Qt.ItemDataRole.UserRole)
+            self.autosave.discard("research_nodes", node_id)
             self.db.delete_research_node(node_id)
             self.load_tree()
             self.detail_stack.setCurrentIndex(0)
@@ -1015,6 +1013,28 @@ class ResearchTab(QWidget):
             item.setData(Qt.ItemDataRole.UserRole + 1, m)
             self.memo_list.addItem(item)
 
+    def select_memo(self, memo_id):
+        """Selects the memo's research node in the tree, then opens the memo."""
+        memo = self.db.get_research_memo_details(memo_id)
+        if not memo:
+            return
+
+        it = QTreeWidgetItemIterator(self.tree)
+        while it.value():
+            if it.value().data(0, Qt.ItemDataRole.UserRole) == memo['node_id']:
+                self.tree.setCurrentItem(it.value())
+                break
+            it += 1
+        else:
+            return
+
+        for i in range(self.memo_list.count()):
+            item = self.memo_list.item(i)
+            if item.data(Qt.ItemDataRole.UserRole) == memo_id:
+                self.memo_list.setCurrentItem(item)
+                self._load_memo(item)
+                return
+
     def _add_memo(self):
         if not self._current_node_id: return
         self.db.add_research_memo(self._current_node_id, "New Memo", "")
@@ -13,6 +13,8 @@ from PySide6.QtGui import (
     QColor, QFont, QAction, QBrush
 )
 
+from database_helpers.rich_text import compact_qt_html, expand_qt_html
+
 _PT_SIZES = [10, 12, 14, 16, 18, 20, 24, 32]
 _FONTS = [
     "Times New Roman",
@@ -300,10 +302,57 @@ class RichTextEditorTab(QWidget):
 
     # ---- Public API ----
     def set_html(self, html):
-        self.editor.setHtml(html or "")
+        self.editor.setHtml(expand_qt_html(html or ""))
+        self.editor.document().setModified(False)
 
     def get_html(self, cb):
-        cb(self.editor.toHtml())
+        # Stored in the compact form; set_html restores Qt's inline defaults
+        cb(compact_qt_html(self.editor.toHtml()))
+
+    # --- Dirty tracking ---
+    @staticmethod
+    def record_save(counts, written):
+        """
+        Adds one field to a save cycle's {'written': n, 'skipped': n}
+        tally. The caller (save_all_editors) owns counts; None skips it.
+        """
+        if counts is not None:
+            counts["written" if written else "skipped"] += 1
+
+    def is_modified(self):
+        """True if the text changed since set_html or the last save."""
+        return self.editor.document().isModified()
+
+    def set_modified(self, modified):
+        self.editor.document().setModified(modified)
+
+    def get_html_if_modified(self, cb, db=None, counts=None):
+        """
+        Like get_html, but only serializes and calls cb when the text has
+        changed since it was loaded or last saved. Returns True if cb ran.
+
+        With db, cb runs inside db.transaction() and the text only counts
+        as saved once that commits (db.after_commit). If the write fails,
+        here or in an enclosing transaction() block, the editor stays
+        modified and the next save writes it again. Without db it counts
+        as saved as soon as cb returns. A write is added to counts (see
+        record_save) at the same point.
+        """
+        if not self.is_modified():
+            self.record_save(counts, False)
+            return False
+        if db is None:
+            self.get_html(cb)
+            self._mark_saved(counts)
+        else:
+            with db.transaction():
+                self.get_html(cb)
+                db.after_commit(lambda: self._mark_saved(counts))
+        return True
+
+    def _mark_saved(self, counts):
+        self.set_modified(False)
+        self.record_save(counts, True)
 
     def focus_editor(self):
         self.editor.setFocus()
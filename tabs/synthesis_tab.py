@@ -46,6 +46,8 @@ try:
 except ImportError:
     ViewSyntopicRulesDialog = None
 
+from utils.db_executor import DbExecutor
+
 # --- Constants ---
 DEFAULT_SYNTOPIC_RULES_HTML = """
 <h3>Syntopical Reading Guidelines</h3>
@@ -70,6 +72,8 @@ class SynthesisTab(QWidget):
         self.project_id = project_id
         self.spell_checker_service = spell_checker_service
         self.instruction_labels = {}
+        self._anchors_future = None  # Pending background anchor load
+        self._reload_anchors_when_shown = False
 
         main_layout = QHBoxLayout(self)
         self.main_splitter = QSplitter(Qt.Orientation.Vertical)
@@ -203,7 +207,7 @@ class SynthesisTab(QWidget):
             label.setText(text)
             label.setVisible(bool(text))
 
-    def save_editors(self):
+    def save_editors(self, counts=None):
         if self.project_id == -1:
             return
         if RichTextEditorTab and hasattr(self, 'notes_editor'):
@@ -212,7 +216,8 @@ class SynthesisTab(QWidget):
                     self.project_id, field_name, html
                 ) if html is not None else None
 
-            self.notes_editor.get_html(create_callback('synthesis_notes_html'))
+            self.notes_editor.get_html_if_modified(create_callback('synthesis_notes_html'), db=self.db,
+                                                  counts=counts)
 
     def load_tags_list(self):
         self.tag_list.clear()
@@ -235,15 +240,53 @@ class SynthesisTab(QWidget):
     @Slot(QListWidgetItem, QListWidgetItem)
     def on_tag_selected(self, current_item, previous_item):
         if current_item is None:
+            self._cancel_anchor_load()
             self.anchor_display.clear()
             return
         tag_id = current_item.data(Qt.ItemDataRole.UserRole)
         if tag_id is None:
+            self._cancel_anchor_load()
             self.anchor_display.clear()
             return
 
+        # Anchors for big tags take a while; fetch them on the DB executor
+        self._cancel_anchor_load()
+        self.anchor_display.setHtml("<i>Loading anchors...</i>")
+        self._anchors_future = DbExecutor.for_database(self.db).call(
+            'get_anchors_for_tag_with_context', tag_id, self.project_id
+        )
+        self._anchors_future.finished.connect(self._on_tag_anchors_loaded)
+        self._anchors_future.failed.connect(self._on_tag_anchors_failed)
+
+    def _cancel_anchor_load(self):
+        if self._anchors_future:
+            self._anchors_future.cancel()
+            self._anchors_future = None
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._reload_anchors_when_shown:
+            self._reload_anchors_when_shown = False
+            self.on_tag_selected(self.tag_list.currentItem(), None)
+
+    def hideEvent(self, event):
+        # Navigated away before the anchors arrived: drop the load, redo it on return
+        if self._anchors_future and not self._anchors_future.is_done():
+            self._cancel_anchor_load()
+            self._reload_anchors_when_shown = True
+        super().hideEvent(event)
+
+    @Slot(str)
+    def _on_tag_anchors_failed(self, message):
+        self._anchors_future = None
+        self.anchor_display.setHtml(f"<p><b>Error loading details:</b><br>{message}</p>")
+        QMessageBox.critical(self, "Error", f"Could not load anchors: {message}")
+
+    @Slot(object)
+    def _on_tag_anchors_loaded(self, anchors):
+        """Renders the anchors fetched for the selected tag."""
+        self._anchors_future = None
         try:
-            anchors = self.db.get_anchors_for_tag_with_context(tag_id, self.project_id)
             if not anchors:
                 self.anchor_display.setHtml("<i>No anchors found for this tag.</i>")
                 return
@@ -509,4 +552,11 @@ class SynthesisTab(QWidget):
         """Switches to the Terminology tab and selects the specified term."""
         if hasattr(self, 'terminology_tab') and self.terminology_tab:
             self.bottom_tab_widget.setCurrentWidget(self.terminology_tab)
-            self.terminology_tab.select_term_by_id(term_id)
\ No newline at end of file
+            self.terminology_tab.select_term_by_id(term_id)
+
+    @Slot(int)
+    def select_proposition(self, proposition_id):
+        """Switches to the Propositions tab and selects the specified proposition."""
+        if hasattr(self, 'propositions_tab') and self.propositions_tab:
+            self.bottom_tab_widget.setCurrentWidget(self.propositions_tab)
+            self.propositions_tab.select_item_by_id(proposition_id)
\ No newline at end of file
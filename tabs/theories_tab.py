@@ -95,12 +95,8 @@ class TheoriesTab(QWidget):
         item.setData(0, Qt.ItemDataRole.UserRole + 1, dict(theory_data))
         item.setExpanded(True)
 
-    def _get_outline_items(self, parent_id=None):
-        items = self.db.get_reading_outline(self.reading_id, parent_id=parent_id)
-        for item in items:
-            children = self._get_outline_items(parent_id=item['id'])
-            if children: item['children'] = children
-        return items
+    def _get_outline_items(self):
+        return self.db.get_reading_outline_nested(self.reading_id)
 
     def show_context_menu(self, position):
         menu = QMenu(self)
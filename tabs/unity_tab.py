@@ -25,6 +25,7 @@ class UnityTab(QWidget):
         self.project_id = project_id
         self.reading_id = reading_id
         self._is_loaded = False
+        self._saved_choices = None  # (kind_of_work, dq_id) as last loaded/saved
 
         if RichTextEditorTab is None:
             main_layout = QVBoxLayout(self)
@@ -124,10 +125,12 @@ class UnityTab(QWidget):
                 if index != -1:
                     self.dq_combo.setCurrentIndex(index)
 
+            self._saved_choices = (self.kind_combo.currentText(), self.dq_combo.currentData())
+
         except Exception as e:
             QMessageBox.critical(self, "Error Loading Unity", f"Could not load Unity tab data: {e}")
 
-    def save_data(self):
+    def save_data(self, counts=None):
         """Saves data from the widgets back to the database."""
         if not self._is_loaded or not hasattr(self, 'unity_editor'):
             return
@@ -136,20 +139,34 @@ class UnityTab(QWidget):
         kind_of_work = self.kind_combo.currentText()
         dq_id = self.dq_combo.currentData()
 
+        # Nothing changed since load or the last save: skip the write
+        if not self.unity_editor.is_modified() and self._saved_choices == (kind_of_work, dq_id):
+            RichTextEditorTab.record_save(counts, False)
+            return
+
         # 2. Get HTML content from the editor
         # This is an async call, so we do the DB save inside the callback
         def save_html_callback(html_content):
             if html_content is None:
                 return  # Editor might not be ready
 
-            try:
-                self.db.save_reading_unity_data(
-                    self.reading_id,
-                    html_content,
-                    kind_of_work,
-                    dq_id
-                )
-            except Exception as e:
-                print(f"Error saving Unity data: {e}")
-
-        self.unity_editor.get_html(save_html_callback)
\ No newline at end of file
+            self.db.save_reading_unity_data(
+                self.reading_id,
+                html_content,
+                kind_of_work,
+                dq_id
+            )
+
+        def mark_saved():
+            self._saved_choices = (kind_of_work, dq_id)
+            self.unity_editor.set_modified(False)
+            RichTextEditorTab.record_save(counts, True)
+
+        # Marked saved only once the write (and any enclosing save cycle)
+        # commits; a rolled-back save is retried next time.
+        try:
+            with self.db.transaction():
+                self.unity_editor.get_html(save_html_callback)
+                self.db.after_commit(mark_saved)
+        except Exception as e:
+            print(f"Error saving Unity data: {e}")
\ No newline at end of file
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# The modules import each other from the repository root (see main.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_manager import DatabaseManager  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """A fully migrated in-memory database."""
+    manager = DatabaseManager(":memory:")
+    yield manager
+    manager.conn.close()
+
+
+@pytest.fixture
+def project_id(db):
+    return db.create_item("Test Project", "project")
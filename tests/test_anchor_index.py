@@ -0,0 +1,77 @@
+import pytest
+
+
+@pytest.fixture
+def reading_id(db, project_id):
+    return db.add_reading(project_id, "Reading", "Author", "")
+
+
+@pytest.fixture
+def outline_id(db, reading_id):
+    return db.add_outline_section(reading_id, "Section")
+
+
+@pytest.fixture
+def tag_id(db, project_id):
+    return db.get_or_create_tag("Theme", project_id)["id"]
+
+
+def add_anchor(db, project_id, reading_id, outline_id, tag_id, text="quoted text"):
+    return db.create_anchor(project_id, reading_id, outline_id, tag_id, "doc-1", text, "")
+
+
+def anchor_ids(db, project_id, outline_id):
+    return [anchor["id"] for anchor in db.get_outline_anchors(project_id, outline_id)]
+
+
+def test_index_is_reused_until_something_changes(db, project_id, reading_id, outline_id, tag_id):
+    anchor_id = add_anchor(db, project_id, reading_id, outline_id, tag_id)
+    first = db.get_project_anchor_index(project_id)
+    assert db.get_project_anchor_index(project_id) is first
+    assert anchor_ids(db, project_id, outline_id) == [anchor_id]
+
+
+def test_new_anchor_is_seen(db, project_id, reading_id, outline_id, tag_id):
+    assert anchor_ids(db, project_id, outline_id) == []
+    anchor_id = add_anchor(db, project_id, reading_id, outline_id, tag_id)
+    assert anchor_ids(db, project_id, outline_id) == [anchor_id]
+
+
+def test_renamed_tag_is_seen(db, project_id, reading_id, outline_id, tag_id):
+    add_anchor(db, project_id, reading_id, outline_id, tag_id)
+    assert db.get_outline_anchors(project_id, outline_id)[0]["tag_name"] == "Theme"
+    db.rename_tag(tag_id, "Motif")
+    assert db.get_outline_anchors(project_id, outline_id)[0]["tag_name"] == "Motif"
+
+
+def test_delete_reading_drops_its_anchors(db, project_id, reading_id, outline_id, tag_id):
+    add_anchor(db, project_id, reading_id, outline_id, tag_id)
+    assert anchor_ids(db, project_id, outline_id) != []
+    db.delete_reading(reading_id)
+    assert db.get_project_anchor_index(project_id)["anchors"] == {}
+
+
+def test_delete_item_drops_the_project_index(db, project_id, reading_id, outline_id, tag_id):
+    add_anchor(db, project_id, reading_id, outline_id, tag_id)
+    assert db.get_project_anchor_index(project_id)["anchors"] != {}
+    db.delete_item(project_id)
+    assert db.get_project_anchor_index(project_id)["anchors"] == {}
+
+
+def test_raw_sql_write_is_seen(db, project_id, reading_id, outline_id, tag_id):
+    anchor_id = add_anchor(db, project_id, reading_id, outline_id, tag_id)
+    assert anchor_ids(db, project_id, outline_id) == [anchor_id]
+    db.cursor.execute("DELETE FROM synthesis_anchors WHERE id = ?", (anchor_id,))
+    db.conn.commit()
+    assert anchor_ids(db, project_id, outline_id) == []
+
+
+def test_rolled_back_transaction(db, project_id, reading_id, outline_id, tag_id):
+    assert anchor_ids(db, project_id, outline_id) == []
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            add_anchor(db, project_id, reading_id, outline_id, tag_id)
+            # Read inside the block sees the pending anchor and is not cached
+            assert len(anchor_ids(db, project_id, outline_id)) == 1
+            raise RuntimeError("abort")
+    assert anchor_ids(db, project_id, outline_id) == []
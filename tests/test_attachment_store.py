@@ -0,0 +1,198 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from database_helpers.attachment_store import (
+    INCOMING_DIR_NAME, STORE_DIR_NAME, AttachmentImportJob, ImportCancelled, copy_into_store, expand_import_sources
+)
+from database_helpers.backup import snapshot_name
+from database_manager import DatabaseManager
+
+CONTENT = b"%PDF-1.4 attachment body " * 100
+
+
+@pytest.fixture
+def store_db(tmp_path):
+    """A database file (snapshots need one) with its own Attachments folder."""
+    db = DatabaseManager(str(tmp_path / "tracker.db"))
+    db.ATTACHMENTS_DIR = str(tmp_path / "Attachments")
+    yield db
+    db.conn.close()
+
+
+@pytest.fixture
+def reading_ids(store_db):
+    project_id = store_db.create_item("Project", "project")
+    return [store_db.add_reading(project_id, f"Reading {i}", "Author", "") for i in range(2)]
+
+
+def write_file(path, content=CONTENT):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    return str(path)
+
+
+def blob_row(db, file_path):
+    return db.conn.execute("SELECT ref_count, created_at FROM attachment_blobs WHERE file_path = ?",
+                           (file_path,)).fetchone()
+
+
+def take_snapshot(db):
+    db_path = db._get_db_file_path()
+    return db.backup_database(os.path.join(db.get_backup_dir(), snapshot_name(db_path, datetime.now())))
+
+
+def test_identical_files_share_one_counted_blob(store_db, reading_ids, tmp_path):
+    first = store_db.add_attachment_file(reading_ids[0], write_file(tmp_path / "in" / "a.pdf"))
+    second = store_db.add_attachment_file(reading_ids[1], write_file(tmp_path / "in" / "copy.pdf"))
+
+    file_path = store_db.get_attachment_details(first)["file_path"]
+    assert store_db.get_attachment_details(second)["file_path"] == file_path
+    assert blob_row(store_db, file_path)[0] == 2
+    assert len(os.listdir(os.path.dirname(store_db.resolve_attachment_path(file_path)))) == 1
+
+    store_db.delete_attachment(first)
+    assert blob_row(store_db, file_path)[0] == 1
+    store_db.delete_reading(reading_ids[1])  # Cascades to its attachment row
+    assert blob_row(store_db, file_path)[0] == 0
+    assert os.path.exists(store_db.resolve_attachment_path(file_path))  # Left for the clean-ups
+
+
+def test_refcount_follows_file_path_updates_and_clones(store_db, reading_ids, tmp_path):
+    attachment_id = store_db.add_attachment_file(reading_ids[0], write_file(tmp_path / "in" / "a.pdf"))
+    other_id = store_db.add_attachment_file(reading_ids[1], write_file(tmp_path / "in" / "b.pdf", b"other"))
+    old_path = store_db.get_attachment_details(attachment_id)["file_path"]
+    new_path = store_db.get_attachment_details(other_id)["file_path"]
+
+    store_db.conn.execute("UPDATE reading_attachments SET file_path = ? WHERE id = ?", (new_path, attachment_id))
+    assert blob_row(store_db, old_path)[0] == 0
+    assert blob_row(store_db, new_path)[0] == 2
+
+    project_id = store_db.get_reading_details(reading_ids[0])["project_id"]
+    store_db.clone_project(project_id)
+    assert blob_row(store_db, new_path)[0] == 4
+
+
+def test_gc_deletes_nothing_without_snapshots(store_db, reading_ids, tmp_path):
+    attachment_id = store_db.add_attachment_file(reading_ids[0], write_file(tmp_path / "in" / "a.pdf"))
+    file_path = store_db.get_attachment_details(attachment_id)["file_path"]
+    store_db.delete_attachment(attachment_id)
+    store_db.conn.execute("UPDATE attachment_blobs SET created_at = '2000-01-01 00:00:00'")
+    store_db.conn.commit()
+
+    assert store_db.gc_attachment_store() == 0
+    assert os.path.exists(store_db.resolve_attachment_path(file_path))
+
+
+def test_gc_keeps_blobs_snapshots_use_and_blobs_newer_than_them(store_db, reading_ids, tmp_path):
+    ids = [store_db.add_attachment_file(reading_ids[0], write_file(tmp_path / "in" / f"{name}.pdf", name.encode()))
+           for name in ("unused", "in_snapshot", "recent")]
+    unused, in_snapshot, recent = (store_db.get_attachment_details(i)["file_path"] for i in ids)
+    store_db.delete_attachment(ids[0])
+    take_snapshot(store_db)
+    store_db.delete_attachment(ids[1])
+    store_db.delete_attachment(ids[2])
+    store_db.conn.execute("UPDATE attachment_blobs SET created_at = '2000-01-01 00:00:00'")
+    store_db.conn.execute("UPDATE attachment_blobs SET created_at = '2999-01-01 00:00:00' WHERE file_path = ?",
+                          (recent,))
+    store_db.conn.commit()
+
+    assert store_db.gc_attachment_store() == len(b"unused")
+    assert not os.path.exists(store_db.resolve_attachment_path(unused))
+    assert blob_row(store_db, unused) is None
+    for kept in (in_snapshot, recent):
+        assert os.path.exists(store_db.resolve_attachment_path(kept))
+        assert blob_row(store_db, kept)[0] == 0
+
+
+def test_files_are_deleted_only_after_the_commit(store_db, reading_ids, tmp_path):
+    attachment_id = store_db.add_attachment_file(reading_ids[0], write_file(tmp_path / "in" / "a.pdf"))
+    store_db.delete_attachment(attachment_id)
+    remove = store_db._remove_store_file
+    in_transaction = []
+
+    def recording_remove(full_path):
+        in_transaction.append(store_db.conn.in_transaction)
+        return remove(full_path)
+
+    store_db._remove_store_file = recording_remove
+    store_db.dedupe_attachment_files()
+    assert in_transaction == [False]
+
+
+def test_dedupe_moves_legacy_files_into_one_blob(store_db, reading_ids):
+    legacy_paths = [f"{reading_id}/notes.pdf" for reading_id in reading_ids]
+    for reading_id, legacy_path in zip(reading_ids, legacy_paths):
+        write_file(store_db.resolve_attachment_path(legacy_path))
+        store_db.add_attachment(reading_id, "notes.pdf", legacy_path)
+    stray = write_file(store_db.resolve_attachment_path("99/stray.txt"), b"stray")
+
+    moved, reclaimed = store_db.dedupe_attachment_files()
+
+    assert moved == 2
+    file_paths = {row[0] for row in store_db.conn.execute("SELECT file_path FROM reading_attachments")}
+    assert len(file_paths) == 1
+    blob_path = file_paths.pop()
+    assert blob_path.startswith("store/") and blob_row(store_db, blob_path)[0] == 2
+    with open(store_db.resolve_attachment_path(blob_path), "rb") as f:
+        assert f.read() == CONTENT
+    for path in legacy_paths:
+        assert not os.path.exists(store_db.resolve_attachment_path(path))
+    assert not os.path.exists(stray)
+    # The second legacy copy and the stray are freed; the first may live on as the blob's hard link
+    assert reclaimed >= len(CONTENT) + len(b"stray")
+
+
+def test_copy_into_store_cancel_leaves_no_partial_file(tmp_path):
+    source = write_file(tmp_path / "in" / "big.pdf", CONTENT * 10)
+    attachments_dir = str(tmp_path / "Attachments")
+    chunks = []
+
+    with pytest.raises(ImportCancelled):
+        copy_into_store(source, attachments_dir, chunk_bytes=1024, progress=chunks.append,
+                        should_cancel=lambda: len(chunks) >= 3)
+
+    assert chunks == [1024, 2048, 3072]
+    store_dir = os.path.join(attachments_dir, STORE_DIR_NAME)
+    assert [files for _root, _dirs, files in os.walk(store_dir) if files] == []
+
+
+def test_copy_into_store_stores_each_content_once(tmp_path):
+    attachments_dir = str(tmp_path / "Attachments")
+    first = copy_into_store(write_file(tmp_path / "in" / "a.PDF"), attachments_dir)
+    second = copy_into_store(write_file(tmp_path / "in" / "b.pdf"), attachments_dir)
+
+    assert first == second
+    relative_path, digest, size = first
+    assert relative_path == f"{STORE_DIR_NAME}/{digest[:2]}/{digest}.pdf"
+    assert size == len(CONTENT)
+    assert os.listdir(os.path.join(attachments_dir, STORE_DIR_NAME, INCOMING_DIR_NAME)) == []
+
+
+def test_expand_import_sources(tmp_path):
+    folder = tmp_path / "folder"
+    files = [write_file(folder / name) for name in ("b.pdf", "a.pdf", "sub/c.pdf")]
+    write_file(folder / ".hidden.pdf")
+    write_file(folder / ".git" / "d.pdf")
+    single = write_file(tmp_path / "single.pdf")
+
+    sources = expand_import_sources([str(folder), single, files[0], str(tmp_path / "missing.pdf")])
+
+    assert sources == [os.path.abspath(path) for path in (files[1], files[0], files[2], single)]
+
+
+def test_import_job_skips_unreadable_files(tmp_path):
+    sources = [write_file(tmp_path / "in" / "a.pdf"), str(tmp_path / "in" / "gone.pdf"),
+               write_file(tmp_path / "in" / "b.txt", b"text")]
+    reported = []
+    job = AttachmentImportJob(sources, str(tmp_path / "Attachments"),
+                              done=lambda results, error: reported.append((results, error)))
+    job.start()
+    job.join(5)
+
+    [(results, error)] = reported
+    assert error is None
+    assert [result["display_name"] for result in results] == ["a.pdf", "b.txt"]
+    assert [path for path, _message in job.failures] == [sources[1]]
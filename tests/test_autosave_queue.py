@@ -0,0 +1,176 @@
+import pytest
+
+from database_helpers.autosave_queue import AutosaveFlushError, AutosaveQueue
+
+
+@pytest.fixture
+def queue(db):
+    return AutosaveQueue(db)
+
+
+@pytest.fixture
+def node_ids(db, project_id):
+    return [db.add_research_node(project_id, None, "question", f"Node {i}") for i in range(2)]
+
+
+def node_field(db, node_id, field):
+    return db.conn.execute(f"SELECT {field} FROM research_nodes WHERE id = ?", (node_id,)).fetchone()[0]
+
+
+def failing_writer(db):
+    """A writer that fails the way most mixins do: print the error, then _rollback()."""
+    def writer(row_id, column, value):
+        try:
+            db.cursor.execute("UPDATE no_such_table SET x = ?", (value,))
+            db._commit()
+        except Exception as e:
+            print(f"Error: {e}")
+            db._rollback()
+    return writer
+
+
+def test_puts_for_one_field_coalesce_into_one_write(db, queue, node_ids):
+    calls = []
+
+    def writer(row_id, column, value):
+        calls.append(value)
+        db.update_research_node_field(row_id, column, value)
+
+    for text in ("d", "dr", "dra", "draft"):
+        queue.put("research_nodes", node_ids[0], "scope", text, writer)
+    queue.put("research_nodes", node_ids[1], "scope", "other", writer)
+
+    assert len(queue) == 2
+    assert queue.writes_coalesced == 3
+    assert queue.pending_value("research_nodes", node_ids[0], "scope") == "draft"
+    assert queue.flush() == 2
+    assert calls == ["draft", "other"]
+    assert node_field(db, node_ids[0], "scope") == "draft"
+    assert node_field(db, node_ids[1], "scope") == "other"
+    assert len(queue) == 0
+
+
+def test_raising_writer_rolls_back_and_keeps_the_batch(db, queue, node_ids):
+    def raising_writer(row_id, column, value):
+        raise RuntimeError("disk I/O error")
+
+    queue.put("research_nodes", node_ids[0], "scope", "kept", db.update_research_node_field)
+    queue.put("research_nodes", node_ids[1], "scope", "boom", raising_writer)
+
+    with pytest.raises(AutosaveFlushError):
+        queue.flush()
+
+    # The write that ran before the failure was undone too
+    assert node_field(db, node_ids[0], "scope") is None
+    assert not db.conn.in_transaction
+    assert len(queue) == 2
+    assert queue.pending_value("research_nodes", node_ids[0], "scope") == "kept"
+
+
+def test_mixin_rollback_requeues_the_batch(db, queue, node_ids):
+    queue.put("research_nodes", node_ids[0], "scope", "kept", db.update_research_node_field)
+    queue.put("research_nodes", node_ids[1], "scope", "fails", failing_writer(db))
+
+    with pytest.raises(AutosaveFlushError):
+        queue.flush()
+
+    assert node_field(db, node_ids[0], "scope") is None
+    assert len(queue) == 2
+
+    # Once the failing write is gone the retry commits the rest
+    queue.discard("research_nodes", node_ids[1])
+    assert queue.flush() == 1
+    assert node_field(db, node_ids[0], "scope") == "kept"
+
+
+def test_newer_value_wins_over_requeued_batch(db, queue, node_ids):
+    queue.put("research_nodes", node_ids[0], "scope", "old", db.update_research_node_field)
+    queue.put("research_nodes", node_ids[1], "scope", "fails", failing_writer(db))
+    with pytest.raises(AutosaveFlushError):
+        queue.flush()
+
+    queue.put("research_nodes", node_ids[0], "scope", "new", db.update_research_node_field)
+    queue.put("research_nodes", node_ids[1], "scope", "fixed", db.update_research_node_field)
+    assert queue.flush() == 2
+    assert node_field(db, node_ids[0], "scope") == "new"
+    assert node_field(db, node_ids[1], "scope") == "fixed"
+
+
+def test_value_put_during_failed_flush_wins(db, queue, node_ids):
+    def writer_that_sees_new_typing(row_id, column, value):
+        # Another edit arrives while the flush is running, then the write fails
+        queue.put("research_nodes", row_id, column, "typed during flush", db.update_research_node_field)
+        raise RuntimeError("database is locked")
+
+    queue.put("research_nodes", node_ids[0], "scope", "old", writer_that_sees_new_typing)
+    with pytest.raises(AutosaveFlushError):
+        queue.flush()
+
+    assert len(queue) == 1
+    assert queue.pending_value("research_nodes", node_ids[0], "scope") == "typed during flush"
+    assert queue.flush() == 1
+    assert node_field(db, node_ids[0], "scope") == "typed during flush"
+
+
+def test_discard_drops_only_that_row(db, queue, node_ids):
+    queue.put("research_nodes", node_ids[0], "scope", "a", db.update_research_node_field)
+    queue.put("research_nodes", node_ids[0], "title", "b", db.update_research_node_field)
+    queue.put("research_nodes", node_ids[1], "scope", "c", db.update_research_node_field)
+
+    queue.discard("research_nodes", node_ids[0])
+
+    assert not queue.has_pending("research_nodes", node_ids[0])
+    assert queue.has_pending("research_nodes", node_ids[1])
+    assert queue.flush() == 1
+    assert node_field(db, node_ids[0], "scope") is None
+    assert node_field(db, node_ids[1], "scope") == "c"
+
+
+def test_empty_flush_is_a_no_op(db, queue):
+    assert queue.flush() == 0
+    assert not db.conn.in_transaction
+
+
+def test_repeated_failures_isolate_the_failing_write(db, queue, node_ids):
+    queue.put("research_nodes", node_ids[0], "scope", "kept", db.update_research_node_field)
+    queue.put("research_nodes", node_ids[1], "scope", "fails", failing_writer(db))
+    for _ in range(AutosaveQueue.ISOLATE_AFTER):
+        with pytest.raises(AutosaveFlushError) as excinfo:
+            queue.flush()
+        assert excinfo.value.committed == 0
+    assert node_field(db, node_ids[0], "scope") is None
+
+    # The next flush writes each entry on its own: the good one commits
+    with pytest.raises(AutosaveFlushError) as excinfo:
+        queue.flush()
+    assert excinfo.value.committed == 1
+    assert node_field(db, node_ids[0], "scope") == "kept"
+    assert not db.conn.in_transaction
+    assert len(queue) == 1
+    assert [write[:3] for write in queue.failed_writes()] == [("research_nodes", node_ids[1], "scope")]
+
+    # Fixing the value clears the failure and ends the isolation
+    queue.put("research_nodes", node_ids[1], "scope", "fixed", db.update_research_node_field)
+    assert queue.flush() == 1
+    assert node_field(db, node_ids[1], "scope") == "fixed"
+    assert queue.failed_writes() == []
+    assert queue._failed_flushes == 0
+
+
+def test_isolated_flush_keeps_only_raising_writes(db, queue, node_ids):
+    def raising_writer(row_id, column, value):
+        raise RuntimeError("disk I/O error")
+
+    queue.put("research_nodes", node_ids[0], "scope", "boom", raising_writer)
+    queue.put("research_nodes", node_ids[1], "scope", "kept", db.update_research_node_field)
+
+    with pytest.raises(AutosaveFlushError) as excinfo:
+        queue.flush(isolate=True)
+
+    assert excinfo.value.committed == 1
+    assert node_field(db, node_ids[1], "scope") == "kept"
+    assert queue.failed_writes() == [("research_nodes", node_ids[0], "scope", "disk I/O error")]
+
+    queue.discard("research_nodes", node_ids[0])
+    assert len(queue) == 0
+    assert queue.failed_writes() == []
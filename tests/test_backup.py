@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from database_helpers import backup
+from database_helpers.backup import (BackupCancelled, BackupScheduler, backup_database_file, list_snapshots,
+                                     snapshot_name, snapshots_to_keep)
+from database_manager import DatabaseManager
+
+ROWS = 2000
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A database file of a few dozen pages, and an open connection to it."""
+    path = str(tmp_path / "source.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO notes (body) VALUES (?)", [(f"note {n} " * 10,) for n in range(ROWS)])
+    conn.commit()
+    yield path, conn
+    conn.close()
+
+
+def row_count(path):
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        return conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_copy_is_made_in_page_steps(source, tmp_path):
+    path, _conn = source
+    dest = str(tmp_path / "copy.db")
+    steps = []
+    backup_database_file(path, dest, pages=4, progress=lambda copied, total: steps.append((copied, total)),
+                         sleep=0)
+    total = steps[-1][1]
+    assert len(steps) == -(-total // 4)
+    assert steps[-1] == (total, total)
+    assert row_count(dest) == ROWS
+    assert not os.path.exists(dest + ".partial")
+
+
+def test_copy_restarts_after_a_concurrent_write(source, tmp_path):
+    path, conn = source
+    dest = str(tmp_path / "copy.db")
+    steps = []
+
+    def write_twice(copied, total):
+        steps.append(copied)
+        if len(steps) in (2, 4):
+            conn.execute("INSERT INTO notes (body) VALUES ('written during the backup')")
+            conn.commit()
+
+    backup_database_file(path, dest, pages=4, progress=write_twice, sleep=0)
+    assert any(later < earlier for earlier, later in zip(steps, steps[1:])), "the backup never restarted"
+    assert row_count(dest) == ROWS + 2
+
+
+def test_constant_writes_fall_back_to_one_step(source, tmp_path, capsys):
+    path, conn = source
+    dest = str(tmp_path / "copy.db")
+    writes = []
+
+    def keep_writing(copied, total):
+        if copied < total:
+            conn.execute("INSERT INTO notes (body) VALUES ('written during the backup')")
+            conn.commit()
+            writes.append(copied)
+
+    backup_database_file(path, dest, pages=4, progress=keep_writing, sleep=0)
+    assert "copying in one step" in capsys.readouterr().out
+    assert len(writes) > backup.BACKUP_MAX_RESTARTS
+    assert row_count(dest) == ROWS + len(writes)
+
+
+def test_cancel_keeps_the_old_copy_and_removes_the_partial_file(source, tmp_path):
+    path, _conn = source
+    dest = str(tmp_path / "copy.db")
+    backup_database_file(path, dest, sleep=0)
+    before = open(dest, "rb").read()
+
+    with pytest.raises(BackupCancelled):
+        backup_database_file(path, dest, pages=4, should_cancel=lambda: True, sleep=0)
+    assert not os.path.exists(dest + ".partial")
+    assert open(dest, "rb").read() == before
+
+
+def test_failed_first_copy_leaves_no_file(source, tmp_path):
+    path, _conn = source
+    dest = str(tmp_path / "copy.db")
+
+    def fail(copied, total):
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        backup_database_file(path, dest, pages=4, progress=fail, sleep=0)
+    assert os.listdir(tmp_path) == ["source.db"]
+
+
+def snapshots_at(*times):
+    return sorted(((when, f"{when:%Y%m%d-%H%M%S}.db") for when in times), reverse=True)
+
+
+def test_retention_keeps_the_newest_snapshot_per_hour_day_and_week():
+    now = datetime(2026, 10, 16, 12, 30)
+    times = [now - timedelta(minutes=20 * n) for n in range(24 * 3 * 7 * 5)]  # 20-minute snapshots, 5 weeks
+    snapshots = snapshots_at(*times)
+    keep = snapshots_to_keep(snapshots, hourly=24, daily=7, weekly=4)
+
+    newest_per = {}
+    for when, path in snapshots:
+        for bucket in (when.strftime("h%Y%m%d%H"), when.strftime("d%Y%m%d"), "w%d-%02d" % when.isocalendar()[:2]):
+            newest_per.setdefault(bucket, path)
+    hours = sorted({k for k in newest_per if k[0] == "h"}, reverse=True)[:24]
+    days = sorted({k for k in newest_per if k[0] == "d"}, reverse=True)[:7]
+    weeks = sorted({k for k in newest_per if k[0] == "w"}, reverse=True)[:4]
+    assert keep == {newest_per[bucket] for bucket in hours + days + weeks}
+    assert len(keep) <= 24 + 7 + 4
+
+
+def test_retention_keeps_the_newest_snapshot_with_zero_limits():
+    snapshots = snapshots_at(datetime(2026, 10, 16, 12), datetime(2026, 10, 15, 12))
+    assert snapshots_to_keep(snapshots, hourly=0, daily=0, weekly=0) == {snapshots[0][1]}
+    assert snapshots_to_keep([], hourly=24, daily=7, weekly=4) == set()
+
+
+def test_scheduler_takes_due_snapshots_and_prunes(source, tmp_path):
+    path, _conn = source
+    backup_dir = str(tmp_path / "backups")
+    scheduler = BackupScheduler(path, backup_dir, hourly=2, daily=1, weekly=1, interval=3600)
+    start = datetime(2026, 10, 16, 9, 0)
+
+    first = scheduler.run_once(now=start)
+    assert first == os.path.join(backup_dir, snapshot_name(path, start))
+    assert row_count(first) == ROWS
+    assert scheduler.run_once(now=start + timedelta(minutes=30)) is None
+
+    for hour in range(1, 4):
+        assert scheduler.run_once(now=start + timedelta(hours=hour)) is not None
+    kept = [when for when, _path in list_snapshots(path, backup_dir)]
+    assert kept == [start + timedelta(hours=3), start + timedelta(hours=2)]
+
+
+def test_scheduled_snapshots_are_off_by_default(tmp_path):
+    db = DatabaseManager(str(tmp_path / "default.db"))
+    try:
+        assert db.get_backup_settings()["backup_enabled"] == 0
+        assert db.start_backup_scheduler() is None
+        assert not os.path.exists(tmp_path / "backups")
+    finally:
+        db.conn.close()
+
+
+def test_enabling_snapshots_starts_the_scheduler(tmp_path):
+    db = DatabaseManager(str(tmp_path / "enabled.db"))
+    try:
+        db.save_backup_settings({"backup_enabled": 1})
+        scheduler = db.start_backup_scheduler()
+        assert scheduler is not None and scheduler.is_alive()
+        deadline = time.monotonic() + 10
+        while not db.list_backups() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(db.list_backups()) == 1
+
+        db.save_backup_settings({"backup_enabled": 0})
+        assert db.start_backup_scheduler() is None
+        assert not scheduler.is_alive()
+    finally:
+        db.stop_backup_scheduler()
+        db.conn.close()
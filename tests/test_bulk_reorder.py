@@ -0,0 +1,85 @@
+import statistics
+import time
+
+import pytest
+
+BENCH_SIBLINGS = 5000
+BENCH_RUNS = 5
+
+
+@pytest.fixture
+def reading_id(db, project_id):
+    return db.add_reading(project_id, "Reading", "Author", "")
+
+
+def add_sections(db, reading_id, count):
+    """`count` top-level outline sections in display order. Returns their ids."""
+    with db.transaction():
+        db.cursor.executemany(
+            "INSERT INTO reading_outline (reading_id, section_title, display_order) VALUES (?, ?, ?)",
+            [(reading_id, f"Section {n}", n) for n in range(count)])
+    return [row[0] for row in db.conn.execute(
+        "SELECT id FROM reading_outline WHERE reading_id = ? ORDER BY display_order", (reading_id,))]
+
+
+def section_order(db, reading_id):
+    return [row[0] for row in db.conn.execute(
+        "SELECT id FROM reading_outline WHERE reading_id = ? ORDER BY display_order, id", (reading_id,))]
+
+
+def test_reorder_sets_each_position(db, reading_id):
+    ids = add_sections(db, reading_id, 12)
+    shuffled = ids[6:] + ids[:6]
+    db.update_outline_section_order(shuffled)
+    assert section_order(db, reading_id) == shuffled
+    assert [row[0] for row in db.conn.execute(
+        "SELECT display_order FROM reading_outline WHERE reading_id = ? ORDER BY display_order",
+        (reading_id,))] == list(range(12))
+
+
+def test_rows_already_in_place_are_not_written(db, reading_id):
+    ids = add_sections(db, reading_id, 10)
+    moved = [ids[1], ids[0]] + ids[2:]
+    before = db.conn.total_changes
+    db.update_outline_section_order(moved)
+    assert db.conn.total_changes - before == 2
+
+
+def test_extra_where_limits_the_rows(db, reading_id):
+    db.conn.executemany("INSERT INTO reading_driving_questions (reading_id, type, question_text, display_order) "
+                        "VALUES (?, ?, ?, 0)", [(reading_id, "term", "T1"), (reading_id, "theory", "Th1"),
+                                                (reading_id, "term", "T2")])
+    db.conn.commit()
+    rows = db.conn.execute("SELECT id, type FROM reading_driving_questions ORDER BY id").fetchall()
+    db.update_reading_key_term_order([row["id"] for row in reversed(rows)])
+    orders = {row[0]: row[1] for row in db.conn.execute("SELECT id, display_order FROM reading_driving_questions")}
+    assert orders == {rows[2]["id"]: 0, rows[1]["id"]: 0, rows[0]["id"]: 2}
+
+
+def test_reorder_5000_siblings_benchmark(db, reading_id):
+    """
+    Times reversing 5,000 outline siblings with _bulk_update_order and with
+    the per-row UPDATE loop it replaced (run with -s to see the numbers).
+    """
+    ids = add_sections(db, reading_id, BENCH_SIBLINGS)
+
+    def per_row(ordered_ids):
+        for order, section_id in enumerate(ordered_ids):
+            db.cursor.execute("UPDATE reading_outline SET display_order = ? WHERE id = ?", (order, section_id))
+        db._commit()
+
+    def timed(reorder):
+        timings = []
+        order = ids
+        for _ in range(BENCH_RUNS):
+            order = order[::-1]
+            started = time.perf_counter()
+            reorder(order)
+            timings.append((time.perf_counter() - started) * 1000)
+            assert section_order(db, reading_id) == order
+        return statistics.median(timings)
+
+    bulk_ms = timed(db.update_outline_section_order)
+    loop_ms = timed(per_row)
+    print(f"\nreorder {BENCH_SIBLINGS} siblings: _bulk_update_order median {bulk_ms:.1f} ms, "
+          f"per-row loop median {loop_ms:.1f} ms")
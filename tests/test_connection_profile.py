@@ -0,0 +1,72 @@
+import io
+import statistics
+import sys
+import time
+
+import pytest
+
+from database_helpers import connection_profile_mixin
+from database_manager import DatabaseManager
+
+BENCH_COMMITS = 200
+
+
+def test_in_memory_database_uses_a_memory_journal_quietly(capsys):
+    db = DatabaseManager(":memory:")
+    try:
+        assert db.active_connection_settings["db_journal_mode"] == "MEMORY"
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0].upper() == "MEMORY"
+    finally:
+        db.conn.close()
+    assert "not available" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("profile", sorted(DatabaseManager.CONNECTION_PROFILES))
+def test_commit_latency_benchmark(tmp_path, profile):
+    """
+    Times single-row autosave commits under each connection profile
+    (run with -s to see the numbers). Needs a database file: commits to
+    :memory: cost nothing.
+    """
+    db = DatabaseManager(str(tmp_path / "profile.db"))
+    try:
+        db.save_connection_profile(profile)
+        expected = DatabaseManager.CONNECTION_PROFILES[profile]
+        settings = db.active_connection_settings
+        assert settings["db_journal_mode"] == expected["db_journal_mode"]
+        assert settings["db_synchronous"] == expected["db_synchronous"]
+
+        project_id = db.create_item("Bench", "project")
+        node_id = db.add_research_node(project_id, None, "question", "Node")
+        timings = []
+        for commit in range(BENCH_COMMITS):
+            started = time.perf_counter()
+            db.update_research_node_field(node_id, "scope", f"Scope {commit}")
+            timings.append((time.perf_counter() - started) * 1000)
+
+        assert db.conn.execute("SELECT scope FROM research_nodes WHERE id = ?",
+                               (node_id,)).fetchone()[0] == f"Scope {BENCH_COMMITS - 1}"
+        timings.sort()
+        print(f"\n{profile} ({settings['db_journal_mode']}/{settings['db_synchronous']}), "
+              f"{BENCH_COMMITS} commits: median {statistics.median(timings):.3f} ms, "
+              f"p95 {timings[int(len(timings) * 0.95)]:.3f} ms per commit")
+    finally:
+        db.conn.close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="reads /proc/mounts")
+@pytest.mark.parametrize("path, expected", [
+    ("/mnt/nas/library.db", True),
+    ("/mnt/nas", True),
+    ("/mnt/nas2/library.db", False),
+    ("/mnt/nas-backup/library.db", False),
+    ("/home/user/library.db", False),
+])
+def test_network_mounts_match_whole_path_components(db, monkeypatch, path, expected):
+    mounts = ("/dev/sda1 / ext4 rw 0 0\n"
+              "nas:/export /mnt/nas nfs4 rw 0 0\n"
+              "/dev/sdb1 /mnt/nas2 ext4 rw 0 0\n")
+    monkeypatch.setattr(connection_profile_mixin, "open", lambda *args, **kwargs: io.StringIO(mounts),
+                        raising=False)
+    monkeypatch.setattr(connection_profile_mixin.os.path, "realpath", lambda p: p)
+    assert db._is_network_path(path) is expected
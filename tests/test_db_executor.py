@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+
+from database_manager import DatabaseManager  # noqa: E402
+from utils.db_executor import DbExecutor  # noqa: E402
+
+# Counts far enough to still be running when the test cancels it
+LONG_QUERY = ("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 500000000) "
+              "SELECT count(*) FROM c")
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def executor(app, tmp_path):
+    """An executor with a worker thread (a database file, not :memory:)."""
+    db = DatabaseManager(str(tmp_path / "executor.db"))
+    executor = DbExecutor.for_database(db)
+    yield executor
+    executor.shutdown()
+    db.conn.close()
+
+
+def wait_until(app, condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def outcomes(future):
+    """Records every signal the future emits."""
+    seen = []
+    future.finished.connect(lambda result: seen.append(("finished", result)))
+    future.failed.connect(lambda message: seen.append(("failed", message)))
+    return seen
+
+
+def test_result_reaches_the_gui_thread(app, executor):
+    future = executor.submit(lambda reader: reader.conn.execute("SELECT 42").fetchone()[0])
+    seen = outcomes(future)
+    wait_until(app, future.is_done)
+    assert seen == [("finished", 42)]
+
+
+def test_cancelled_queued_job_never_runs(app, executor):
+    gate = threading.Event()
+    ran = []
+    first = executor.submit(lambda reader: gate.wait(5))
+    second = executor.submit(lambda reader: ran.append("second"))
+    seen = outcomes(second)
+
+    assert second.cancel()
+    assert not second.cancel()  # Only the first cancel counts
+    gate.set()
+    wait_until(app, first.is_done)
+    after = executor.submit(lambda reader: "after")
+    wait_until(app, after.is_done)
+
+    assert ran == [] and seen == []
+    assert second.is_cancelled() and not second.is_done()
+
+
+def test_cancel_interrupts_the_running_query(app, executor):
+    started = threading.Event()
+    errors = []
+
+    def long_job(reader):
+        started.set()
+        try:
+            return reader.conn.execute(LONG_QUERY).fetchone()[0]
+        except sqlite3.OperationalError as e:
+            errors.append(str(e))
+            raise
+
+    future = executor.submit(long_job)
+    seen = outcomes(future)
+    assert started.wait(5)
+    time.sleep(0.1)  # Let the statement start
+    assert future.cancel()
+
+    wait_until(app, lambda: errors)
+    assert errors == ["interrupted"]
+
+    # The result is dropped and the worker carries on with the next job
+    after = executor.submit(lambda reader: reader.conn.execute("SELECT 1").fetchone()[0])
+    wait_until(app, after.is_done)
+    assert after.result == 1
+    assert seen == []
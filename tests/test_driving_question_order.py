@@ -0,0 +1,49 @@
+import pytest
+
+
+@pytest.fixture
+def reading_id(db, project_id):
+    return db.add_reading(project_id, "Reading", "Author", "")
+
+
+def add_question(db, reading_id, text, parent_id=None, question_type="Inferred"):
+    return db.add_driving_question(reading_id, {
+        "question_text": text, "type": question_type, "parent_id": parent_id,
+    })
+
+
+def tree_order(db, reading_id):
+    return [(q["question_text"], q["depth"]) for q in db.get_driving_questions_tree_order(reading_id)]
+
+
+def test_tree_order_walks_roots_depth_first(db, reading_id):
+    first = add_question(db, reading_id, "first")
+    add_question(db, reading_id, "second")
+    child = add_question(db, reading_id, "child", first)
+    add_question(db, reading_id, "grandchild", child)
+
+    assert tree_order(db, reading_id) == [("first", 0), ("child", 1), ("grandchild", 2), ("second", 0)]
+
+
+def test_questions_under_a_filtered_out_parent_keep_their_subtree(db, reading_id):
+    add_question(db, reading_id, "root")
+    term = add_question(db, reading_id, "a term", question_type="term")
+    orphan = add_question(db, reading_id, "orphan", term)
+    add_question(db, reading_id, "orphan child", orphan)
+
+    assert tree_order(db, reading_id) == [("root", 0), ("orphan", 0), ("orphan child", 1)]
+
+
+def test_questions_on_and_under_a_cycle_are_appended(db, reading_id):
+    add_question(db, reading_id, "root")
+    a = add_question(db, reading_id, "cycle a")
+    b = add_question(db, reading_id, "cycle b", a)
+    add_question(db, reading_id, "under cycle", b)
+    db.cursor.execute("UPDATE reading_driving_questions SET parent_id = ? WHERE id = ?", (b, a))
+    db.conn.commit()
+
+    _roots, cycle_ids = db.get_driving_question_forest(reading_id)
+    assert set(cycle_ids) == {a, b}
+    assert sorted(tree_order(db, reading_id)) == sorted(
+        [("root", 0), ("cycle a", 0), ("cycle b", 0), ("under cycle", 0)])
+    assert len(tree_order(db, reading_id)) == len(db.get_driving_questions(reading_id, parent_id=True))
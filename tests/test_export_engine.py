@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+pytest.importorskip("bs4")
+
+from database_helpers.rich_text import (COMPACT_HTML_HEAD, QT_HTML_HEAD, compact_qt_html,  # noqa: E402
+                                        is_compact_html)
+from utils import export_engine  # noqa: E402
+from utils.export_engine import ExportCancelled, ExportEngine  # noqa: E402
+
+# A document as QTextEdit.toHtml() writes it, and as the editor saves it
+QT_DOCUMENT = (QT_HTML_HEAD + "<body style=\" font-family:'Segoe UI'; font-size:9pt;\">\n"
+               '<p style=" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px;'
+               ' -qt-block-indent:0; text-indent:0px;">Rich paragraph</p></body></html>')
+COMPACT_DOCUMENT = compact_qt_html(QT_DOCUMENT)
+COMPACT_STYLE = COMPACT_HTML_HEAD[COMPACT_HTML_HEAD.index("<style>"):]
+
+CONFIG = {"format": "txt", "components": [
+    {"key": "thesis_text", "title": "Thesis"},
+    {"key": "insights_text", "title": "Insights"},
+    {"key": "todo_list", "title": "To-Do"},
+]}
+
+
+@pytest.fixture
+def engine(db, project_id):
+    db.update_project_text_field(project_id, "thesis_text", "<p>The thesis</p>")
+    return ExportEngine(db, project_id)
+
+
+def cancel_after(polls):
+    """should_cancel that turns True on its polls-th call."""
+    calls = []
+
+    def should_cancel():
+        calls.append(1)
+        return len(calls) >= polls
+    return should_cancel
+
+
+def test_export_writes_the_file(engine, tmp_path):
+    path = str(tmp_path / "export.txt")
+    engine.export_to_file(path, CONFIG)
+    with open(path, encoding="utf-8") as f:
+        assert "The thesis" in f.read()
+    assert os.listdir(tmp_path) == ["export.txt"]
+
+
+@pytest.mark.parametrize("polls", [1, 2, len(CONFIG["components"]) + 1])
+def test_cancelled_export_leaves_the_old_file(engine, tmp_path, polls):
+    path = str(tmp_path / "export.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("previous export")
+
+    with pytest.raises(ExportCancelled):
+        engine.export_to_file(path, CONFIG, should_cancel=cancel_after(polls))
+
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "previous export"
+    assert os.listdir(tmp_path) == ["export.txt"]
+
+
+def test_cancelled_first_export_creates_no_file(engine, tmp_path):
+    with pytest.raises(ExportCancelled):
+        engine.export_to_file(str(tmp_path / "export.txt"), CONFIG, should_cancel=lambda: True)
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.fixture
+def compact_engine(db, project_id):
+    for field in ("thesis_text", "synthesis_notes_html"):
+        db.update_project_text_field(project_id, field, COMPACT_DOCUMENT)
+    reading_id = db.add_reading(project_id, "Reading", "Author", "")
+    db.update_reading_field(reading_id, "unity_html", COMPACT_DOCUMENT)
+    assert is_compact_html(db.conn.execute("SELECT thesis_text FROM items WHERE id = ?",
+                                           (project_id,)).fetchone()[0])
+    components = [{"key": "thesis_text", "title": "Thesis"},
+                  {"key": "synthesis_notes_html", "title": "Notes"},
+                  {"key": f"reading_unity_{reading_id}", "title": "Unity"}]
+    return ExportEngine(db, project_id), components
+
+
+def test_html_export_expands_compact_rich_text(compact_engine, tmp_path):
+    engine, components = compact_engine
+    path = str(tmp_path / "export.html")
+    engine.export_to_file(path, {"format": "html", "components": components})
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    assert COMPACT_STYLE not in content
+    assert content.count("Rich paragraph") == 3
+
+
+def test_docx_export_expands_compact_rich_text(compact_engine, tmp_path, monkeypatch):
+    pytest.importorskip("docx")
+    engine, components = compact_engine
+    seen = []
+    clean = export_engine.clean_html_for_docx
+    monkeypatch.setattr(export_engine, "clean_html_for_docx", lambda html: seen.append(html) or clean(html))
+
+    engine.export_to_file(str(tmp_path / "export.docx"), {"format": "docx", "components": components})
+    assert len(seen) == 3
+    assert not any(is_compact_html(html) for html in seen)
@@ -0,0 +1,127 @@
+import sqlite3
+import statistics
+import time
+
+import pytest
+
+from database_manager import DatabaseManager
+
+BENCH_RUNS = 5
+OLD_VERSION = 2
+
+
+def manager_up_to(version):
+    """A DatabaseManager class whose migrations stop at `version`."""
+    migrations = [step for step in DatabaseManager.MIGRATIONS if step[0] <= version]
+    return type("OldDatabaseManager", (DatabaseManager,),
+                {"MIGRATIONS": migrations, "SCHEMA_VERSION": migrations[-1][0]})
+
+
+def user_version(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def columns_of(db, table):
+    return {row["name"] for row in db.conn.execute(f"PRAGMA table_info({table})")}
+
+
+def open_and_close(cls, path):
+    db = cls(str(path))
+    db.conn.close()
+
+
+def test_migrations_are_numbered_in_order():
+    versions = [version for version, _ in DatabaseManager.MIGRATIONS]
+    assert versions == list(range(1, len(versions) + 1))
+    for _, method_name in DatabaseManager.MIGRATIONS:
+        assert callable(getattr(DatabaseManager, method_name))
+
+
+def test_fresh_database_is_stamped_with_the_schema_version(tmp_path):
+    path = tmp_path / "fresh.db"
+    open_and_close(DatabaseManager, path)
+    assert user_version(path) == DatabaseManager.SCHEMA_VERSION
+
+
+def test_current_database_runs_no_migration(tmp_path, capsys):
+    path = tmp_path / "current.db"
+    open_and_close(DatabaseManager, path)
+    capsys.readouterr()
+    open_and_close(DatabaseManager, path)
+    assert "Migrating schema" not in capsys.readouterr().out
+
+
+def test_old_database_is_upgraded_and_keeps_its_rows(tmp_path):
+    path = tmp_path / "old.db"
+    old = manager_up_to(OLD_VERSION)(str(path))
+    project_id = old.create_item("Old Project", "project")
+    old.conn.close()
+    assert user_version(path) == OLD_VERSION
+
+    db = DatabaseManager(str(path))
+    try:
+        assert user_version(path) == DatabaseManager.SCHEMA_VERSION
+        assert {"db_journal_mode", "db_profile_queries", "backup_enabled",
+                "db_compress_text"} <= columns_of(db, "user_settings")
+        assert db.conn.execute("SELECT name FROM sqlite_master WHERE name = 'attachment_blobs'").fetchone()
+        assert db.get_item_details(project_id)["name"] == "Old Project"
+    finally:
+        db.conn.close()
+
+
+def test_failed_step_rolls_back_and_is_retried(tmp_path):
+    path = tmp_path / "broken.db"
+    open_and_close(DatabaseManager, path)
+    next_version = DatabaseManager.SCHEMA_VERSION + 1
+
+    def broken_step(self):
+        self._add_column_if_not_exists("user_settings", "db_new_setting", "INTEGER", "0")
+        self._add_column_if_not_exists("no_such_table", "db_new_setting", "INTEGER", "0")
+
+    def fixed_step(self):
+        self._add_column_if_not_exists("user_settings", "db_new_setting", "INTEGER", "0")
+
+    def manager_with(step):
+        return type("NewerDatabaseManager", (DatabaseManager,), {
+            "MIGRATIONS": DatabaseManager.MIGRATIONS + [(next_version, "_migration_new")],
+            "SCHEMA_VERSION": next_version,
+            "_migration_new": step,
+        })
+
+    with pytest.raises(sqlite3.OperationalError):
+        manager_with(broken_step)(str(path))
+    assert user_version(path) == DatabaseManager.SCHEMA_VERSION
+    conn = sqlite3.connect(path)
+    try:
+        assert "db_new_setting" not in {row[1] for row in conn.execute("PRAGMA table_info(user_settings)")}
+    finally:
+        conn.close()
+
+    db = manager_with(fixed_step)(str(path))
+    try:
+        assert "db_new_setting" in columns_of(db, "user_settings")
+    finally:
+        db.conn.close()
+    assert user_version(path) == next_version
+
+
+@pytest.mark.parametrize("start", ["fresh", "current", f"version {OLD_VERSION}"])
+def test_startup_time_benchmark(tmp_path, start):
+    """Times opening a DatabaseManager on each kind of file (run with -s to see the numbers)."""
+    timings = []
+    for run in range(BENCH_RUNS):
+        path = tmp_path / f"startup_{run}.db"
+        if start == "current":
+            open_and_close(DatabaseManager, path)
+        elif start != "fresh":
+            open_and_close(manager_up_to(OLD_VERSION), path)
+        started = time.perf_counter()
+        open_and_close(DatabaseManager, path)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert user_version(path) == DatabaseManager.SCHEMA_VERSION
+    print(f"\nstartup on a {start} database: median {statistics.median(timings):.1f} ms, "
+          f"min {min(timings):.1f} ms, max {max(timings):.1f} ms")
@@ -0,0 +1,102 @@
+import pytest
+
+
+@pytest.fixture
+def reading_id(db, project_id):
+    return db.add_reading(project_id, "Reading", "Author", "")
+
+
+def add_section(db, reading_id, title, display_order, parent_id=None):
+    db.cursor.execute("INSERT INTO reading_outline (reading_id, parent_id, section_title, display_order) "
+                      "VALUES (?, ?, ?, ?)", (reading_id, parent_id, title, display_order))
+    db.conn.commit()
+    return db.cursor.lastrowid
+
+
+def walk(db, reading_id, parent_id=None, depth=0, path=""):
+    """Reference pre-order walk, one get_reading_outline query per node."""
+    rows = []
+    for row in db.get_reading_outline(reading_id, parent_id):
+        row_path = f"{path}/{row['id']}" if path else str(row["id"])
+        rows.append((row["id"], depth, row_path))
+        rows.extend(walk(db, reading_id, row["id"], depth + 1, row_path))
+    return rows
+
+
+def tree(rows):
+    return [(row["id"], row["depth"], row["path"]) for row in rows]
+
+
+def test_depth_and_path(db, reading_id):
+    top = add_section(db, reading_id, "Top", 0)
+    child = add_section(db, reading_id, "Child", 0, top)
+    grandchild = add_section(db, reading_id, "Grandchild", 0, child)
+    second = add_section(db, reading_id, "Second", 1)
+
+    assert tree(db.get_reading_outline_tree(reading_id)) == [
+        (top, 0, str(top)),
+        (child, 1, f"{top}/{child}"),
+        (grandchild, 2, f"{top}/{child}/{grandchild}"),
+        (second, 0, str(second)),
+    ]
+
+
+def test_siblings_follow_display_order_past_nine(db, reading_id):
+    # Inserted in reverse so id order and display order disagree
+    top_ids = [add_section(db, reading_id, f"Top {n}", n) for n in reversed(range(12))]
+    for n in reversed(range(105)):
+        add_section(db, reading_id, f"Child {n}", n, top_ids[-2])
+
+    rows = db.get_reading_outline_tree(reading_id)
+
+    assert tree(rows) == walk(db, reading_id)
+    assert [row["section_title"] for row in rows if row["depth"] == 0] == [f"Top {n}" for n in range(12)]
+    assert [row["section_title"] for row in rows if row["depth"] == 1] == [f"Child {n}" for n in range(105)]
+
+
+def test_equal_and_missing_display_orders_fall_back_to_id(db, reading_id):
+    ids = [add_section(db, reading_id, f"Tied {n}", 3) for n in range(3)]
+    unordered = add_section(db, reading_id, "No order", None)
+    first = add_section(db, reading_id, "First", 0)
+
+    rows = db.get_reading_outline_tree(reading_id)
+
+    assert tree(rows) == walk(db, reading_id)
+    assert [row["id"] for row in rows] == [unordered, first] + ids
+
+
+def test_large_ids_and_orders_keep_sorting(db, reading_id):
+    db.conn.execute("INSERT INTO reading_outline (id, reading_id, section_title, display_order) "
+                    "VALUES (123456789, ?, 'Big id', 2)", (reading_id,))
+    add_section(db, reading_id, "Low", 1)
+    add_section(db, reading_id, "High", 987654)
+    assert [row["section_title"] for row in db.get_reading_outline_tree(reading_id)] == ["Low", "Big id", "High"]
+
+
+def test_project_tree_groups_by_reading_order(db, project_id):
+    first = db.add_reading(project_id, "First", "Author", "")
+    second = db.add_reading(project_id, "Second", "Author", "")
+    db.update_reading_order([second, first])
+    sections = {}
+    for reading_id in (first, second):
+        parent = add_section(db, reading_id, "Top", 0)
+        add_section(db, reading_id, "Child", 0, parent)
+        add_section(db, reading_id, "Top 2", 1)
+        sections[reading_id] = walk(db, reading_id)
+
+    rows = db.get_project_outline_tree(project_id)
+
+    assert tree(rows) == sections[second] + sections[first]
+    assert "notes_html" not in rows[0]
+
+
+def test_nested_outline(db, reading_id):
+    top = add_section(db, reading_id, "Top", 0)
+    child = add_section(db, reading_id, "Child", 0, top)
+    leaf = add_section(db, reading_id, "Leaf", 1)
+
+    nested = db.get_reading_outline_nested(reading_id)
+
+    assert [item["id"] for item in nested] == [top, leaf]
+    assert [item["id"] for item in nested[0]["children"]] == [child]
+    assert "children" not in nested[1]
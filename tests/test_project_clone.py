@@ -0,0 +1,170 @@
+import statistics
+import time
+
+import pytest
+
+BENCH_READINGS = 100
+BENCH_RUNS = 5
+
+
+def build_project(db, readings, name="Source"):
+    """A project with `readings` readings and rows in most of the tables clone_project copies."""
+    with db.transaction():
+        cur = db.cursor
+        cur.execute("INSERT INTO items (type, name, display_order) VALUES ('project', ?, 0)", (name,))
+        project_id = cur.lastrowid
+        cur.execute("INSERT INTO synthesis_tags (name) VALUES (?)", (f"{name} tag",))
+        tag_id = cur.lastrowid
+        cur.execute("INSERT INTO project_tag_links (project_id, tag_id) VALUES (?, ?)", (project_id, tag_id))
+        cur.execute("INSERT INTO pdf_node_categories (project_id, name) VALUES (?, 'Quotes')", (project_id,))
+        category_id = cur.lastrowid
+        cur.execute("INSERT INTO project_terminology (project_id, term) VALUES (?, 'term')", (project_id,))
+        term_id = cur.lastrowid
+        cur.execute("INSERT INTO mindmaps (project_id, name) VALUES (?, 'Map')", (project_id,))
+        mindmap_id = cur.lastrowid
+        cur.executemany("""
+            INSERT INTO mindmap_nodes (mindmap_id, node_id_text, x, y, width, height, text)
+            VALUES (?, ?, 0, 0, 10, 10, 'node')
+        """, [(mindmap_id, "n1"), (mindmap_id, "n2")])
+        cur.execute("INSERT INTO mindmap_edges (mindmap_id, from_node_id_text, to_node_id_text) "
+                    "VALUES (?, 'n1', 'n2')", (mindmap_id,))
+
+        for r in range(readings):
+            cur.execute("INSERT INTO readings (project_id, title, display_order) VALUES (?, ?, ?)",
+                        (project_id, f"Reading {r}", r))
+            reading_id = cur.lastrowid
+            cur.execute("INSERT INTO reading_attachments (reading_id, display_name, file_path) "
+                        "VALUES (?, 'a.pdf', 'store/aa/a.pdf')", (reading_id,))
+            attachment_id = cur.lastrowid
+            cur.execute("""
+                INSERT INTO pdf_nodes (reading_id, attachment_id, category_id, page_number, x_pos, y_pos)
+                VALUES (?, ?, ?, 1, 0, 0)
+            """, (reading_id, attachment_id, category_id))
+            pdf_node_id = cur.lastrowid
+            question_ids = []
+            for q in range(4):
+                cur.execute("""
+                    INSERT INTO reading_driving_questions (reading_id, parent_id, type, question_text,
+                                                           display_order, pdf_node_id)
+                    VALUES (?, ?, 'question', ?, ?, ?)
+                """, (reading_id, question_ids[0] if question_ids else None, f"Q{q}", q, pdf_node_id))
+                question_ids.append(cur.lastrowid)
+            cur.execute("UPDATE readings SET unity_driving_question_id = ? WHERE id = ?",
+                        (question_ids[0], reading_id))
+            outline_ids = []
+            for o in range(6):
+                cur.execute("""
+                    INSERT INTO reading_outline (reading_id, parent_id, section_title, display_order)
+                    VALUES (?, ?, ?, ?)
+                """, (reading_id, outline_ids[0] if outline_ids else None, f"Section {o}", o))
+                outline_ids.append(cur.lastrowid)
+            cur.execute("INSERT INTO reading_arguments (reading_id, claim_text, driving_question_id, pdf_node_id) "
+                        "VALUES (?, 'claim', ?, ?)", (reading_id, question_ids[1], pdf_node_id))
+            cur.execute("INSERT INTO reading_argument_evidence (argument_id, outline_id, argument_text) "
+                        "VALUES (?, ?, 'evidence')", (cur.lastrowid, outline_ids[1]))
+            cur.execute("INSERT INTO terminology_reading_links (terminology_id, reading_id) VALUES (?, ?)",
+                        (term_id, reading_id))
+            cur.execute("""
+                INSERT INTO terminology_references (terminology_id, reading_id, outline_id, pdf_node_id)
+                VALUES (?, ?, ?, ?)
+            """, (term_id, reading_id, outline_ids[2], pdf_node_id))
+            for a in range(3):
+                cur.execute("""
+                    INSERT INTO synthesis_anchors (project_id, reading_id, outline_id, tag_id, unique_doc_id,
+                                                   selected_text, pdf_node_id)
+                    VALUES (?, ?, ?, ?, ?, 'text', ?)
+                """, (project_id, reading_id, outline_ids[a], tag_id, f"doc-{reading_id}-{a}", pdf_node_id))
+                cur.execute("INSERT INTO anchor_tag_links (anchor_id, tag_id) VALUES (?, ?)",
+                            (cur.lastrowid, tag_id))
+            # A virtual anchor for a driving question
+            cur.execute("""
+                INSERT INTO synthesis_anchors (project_id, reading_id, tag_id, unique_doc_id, item_link_id, item_type)
+                VALUES (?, ?, ?, ?, ?, 'dq')
+            """, (project_id, reading_id, tag_id, f"dq_{question_ids[2]}", question_ids[2]))
+            cur.execute("INSERT INTO anchor_tag_links (anchor_id, tag_id) VALUES (?, ?)", (cur.lastrowid, tag_id))
+
+        parent_node = None
+        for n in range(10):
+            cur.execute("INSERT INTO research_nodes (project_id, parent_id, type, title) VALUES (?, ?, 'section', ?)",
+                        (project_id, parent_node, f"Node {n}"))
+            parent_node = parent_node or cur.lastrowid
+            cur.execute("INSERT INTO research_memos (node_id, title) VALUES (?, 'memo')", (cur.lastrowid,))
+    return project_id
+
+
+def project_rows(db, project_id):
+    """{table: [row dicts]} for every row the project owns, following PROJECT_CLONE_PLAN."""
+    owned = {"items": [dict(db.conn.execute("SELECT * FROM items WHERE id = ?", (project_id,)).fetchone())]}
+    ids = {"items": {project_id}}
+    for table, owner_column, owner_table, _remap in db.PROJECT_CLONE_PLAN:
+        owner_ids = sorted(ids.get(owner_table, ()))
+        rows = []
+        for start in range(0, len(owner_ids), 500):
+            chunk = owner_ids[start:start + 500]
+            rows += [dict(row) for row in db.conn.execute(
+                f"SELECT * FROM {table} WHERE {owner_column} IN ({', '.join('?' * len(chunk))}) ORDER BY rowid",
+                chunk)]
+        owned[table] = rows
+        if rows and "id" in rows[0]:
+            ids[table] = {row["id"] for row in rows}
+    return owned, ids
+
+
+@pytest.fixture
+def source(db):
+    return build_project(db, readings=5)
+
+
+def test_clone_copies_every_row(db, source):
+    clone_id = db.clone_project(source)
+    assert clone_id not in (None, source)
+
+    source_rows, _ = project_rows(db, source)
+    clone_rows, _ = project_rows(db, clone_id)
+    counts = {table: len(rows) for table, rows in source_rows.items()}
+    assert counts == {table: len(rows) for table, rows in clone_rows.items()}
+    assert counts["readings"] == 5 and counts["synthesis_anchors"] == 20 and counts["research_memos"] == 10
+    assert db.get_item_details(clone_id)["name"] == "Source (Copy)"
+
+
+def test_clone_passes_foreign_key_check(db, source):
+    db.clone_project(source)
+    assert db.conn.execute("PRAGMA foreign_key_check").fetchall() == []
+
+
+def test_clone_refers_only_to_its_own_rows(db, source):
+    clone_id = db.clone_project(source)
+    _, source_ids = project_rows(db, source)
+    clone_rows, clone_ids = project_rows(db, clone_id)
+
+    for table, owner_column, owner_table, remap in db.PROJECT_CLONE_PLAN:
+        for row in clone_rows[table]:
+            assert row[owner_column] in clone_ids[owner_table], (table, owner_column)
+            for column, target_table in remap.items():
+                value = row[column]
+                assert value is None or value in clone_ids[target_table], (table, column)
+                assert value not in source_ids.get(target_table, ()), (table, column)
+    for anchor in clone_rows["synthesis_anchors"]:
+        if anchor["item_link_id"] is not None:
+            assert anchor["unique_doc_id"] == f"dq_{anchor['item_link_id']}"
+
+
+def test_clone_leaves_the_source_unchanged(db, source):
+    before, _ = project_rows(db, source)
+    db.clone_project(source)
+    assert project_rows(db, source)[0] == before
+
+
+def test_clone_100_reading_project_benchmark(db):
+    """Times clone_project on a 100-reading project (run with -s to see the numbers)."""
+    source_id = build_project(db, readings=BENCH_READINGS)
+    row_count = sum(len(rows) for rows in project_rows(db, source_id)[0].values())
+
+    timings = []
+    for run in range(BENCH_RUNS):
+        started = time.perf_counter()
+        clone_id = db.clone_project(source_id, f"Clone {run}")
+        timings.append((time.perf_counter() - started) * 1000)
+        assert clone_id is not None
+    print(f"\nclone_project, {BENCH_READINGS} readings ({row_count} rows): "
+          f"median {statistics.median(timings):.1f} ms, min {min(timings):.1f} ms, max {max(timings):.1f} ms")
@@ -0,0 +1,209 @@
+import os
+import sqlite3
+
+import pytest
+
+from database_helpers.backup import backup_with_project_files
+from database_helpers.project_files import project_files_dir
+from database_manager import DatabaseManager
+from test_project_clone import build_project, project_rows
+
+
+@pytest.fixture
+def split_db(tmp_path):
+    """
+    A file database with projects Alpha (3 readings) and Beta (2), split
+    into project files. Also returns Alpha's rows from before the split.
+    """
+    db = DatabaseManager(str(tmp_path / "tracker.db"))
+    alpha = build_project(db, 3, "Alpha")
+    beta = build_project(db, 2, "Beta")
+    db.sync_search_index()
+    alpha_rows = project_rows(db, alpha)[0]
+    assert db.split_into_project_files(vacuum=False) == 2
+    yield db, alpha, beta, alpha_rows
+    db.conn.close()
+
+
+def count(db, table):
+    return db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def tag_id(db, name):
+    return db.conn.execute("SELECT id FROM synthesis_tags WHERE name = ?", (name,)).fetchone()[0]
+
+
+def test_split_moves_rows_into_one_file_per_project(split_db, tmp_path):
+    db, alpha, beta, alpha_rows = split_db
+    assert db.is_project_files_enabled()
+    assert sorted(os.listdir(tmp_path / "tracker_projects")) == ["project_1.db", "project_2.db"]
+    main_tables = {row[0] for row in db.conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")}
+    assert not main_tables & set(db.PROJECT_FILE_TABLES)
+    assert count(db, "readings") == 0  # Nothing attached
+
+    with db.project_attached(alpha):
+        assert count(db, "readings") == 3
+        assert project_rows(db, alpha)[0] == alpha_rows
+    with db.project_attached(beta):
+        assert count(db, "readings") == 2
+    assert db.attached_project_id is None
+
+
+def test_ids_stay_unique_across_files(split_db):
+    db, alpha, beta, _alpha_rows = split_db
+    with db.project_attached(alpha):
+        max_alpha = db.conn.execute("SELECT MAX(id) FROM readings").fetchone()[0]
+        first = db.add_reading(alpha, "New in Alpha", "", "")
+    with db.project_attached(beta):
+        second = db.add_reading(beta, "New in Beta", "", "")
+    assert max_alpha < first < second
+
+
+def test_global_graph_reads_the_summary_without_opening_files(split_db):
+    db, alpha, beta, _alpha_rows = split_db
+    data = db.get_global_graph_data()
+    assert db.attached_project_id is None
+    assert {(row['name'], row['project_count']) for row in data['tags']} == {("Alpha tag", 1), ("Beta tag", 1)}
+    assert {(row['project_id'], row['tag_id']) for row in data['edges']} == {
+        (alpha, tag_id(db, "Alpha tag")), (beta, tag_id(db, "Beta tag"))}
+
+    # The attached project is counted live, the closed ones from project_tag_usage
+    db.attach_project(beta)
+    reading = db.conn.execute("SELECT MIN(id) FROM readings").fetchone()[0]
+    db.cursor.execute("INSERT INTO synthesis_anchors (project_id, reading_id, unique_doc_id, selected_text) "
+                      "VALUES (?, ?, 'doc-x', 'x')", (beta, reading))
+    db.cursor.execute("INSERT INTO anchor_tag_links (anchor_id, tag_id) VALUES (?, ?)",
+                      (db.cursor.lastrowid, tag_id(db, "Alpha tag")))
+    db.conn.commit()
+    counts = {row['name']: row['project_count'] for row in db.get_global_graph_data()['tags']}
+    assert counts == {"Alpha tag": 2, "Beta tag": 1}
+    db.detach_project()
+    counts = {row['name']: row['project_count'] for row in db.get_global_graph_data()['tags']}
+    assert counts == {"Alpha tag": 2, "Beta tag": 1}
+
+
+def test_global_anchors_for_tag_fan_out_to_the_files_using_it(split_db):
+    db, alpha, _beta, _alpha_rows = split_db
+    anchors = db.get_global_anchors_for_tag_name("Alpha tag")
+    assert len(anchors) == 12
+    assert {row['project_id'] for row in anchors} == {alpha}
+    assert db.attached_project_id is None
+
+
+def test_delete_and_merge_tags_reach_closed_project_files(split_db):
+    db, alpha, beta, _alpha_rows = split_db
+    db.merge_tags_bulk({tag_id(db, "Beta tag"): tag_id(db, "Alpha tag")})
+    with db.project_attached(beta):
+        assert {row[0] for row in db.conn.execute("SELECT DISTINCT tag_id FROM anchor_tag_links")} == {
+            tag_id(db, "Alpha tag")}
+    assert {row['project_count'] for row in db.get_global_graph_data()['tags']} == {2}
+
+    assert db.delete_tags([tag_id(db, "Alpha tag")]) == 15  # Every text anchor of both projects
+    assert db.get_global_graph_data()['edges'] == []
+    for project in (alpha, beta):
+        with db.project_attached(project):
+            assert count(db, "anchor_tag_links") == 0
+            assert db.conn.execute("SELECT COUNT(*) FROM synthesis_anchors WHERE tag_id IS NOT NULL").fetchone()[0] == 0
+
+
+def test_clone_gets_its_own_file_and_delete_removes_it(split_db):
+    db, alpha, _beta, _alpha_rows = split_db
+    clone = db.clone_project(alpha)
+    assert os.path.exists(db.project_file_path(clone))
+    with db.project_attached(alpha):
+        assert count(db, "readings") == 3
+    with db.project_attached(clone):
+        assert count(db, "readings") == 3
+    assert len(db.search("Section", project_id=clone)) == len(db.search("Section", project_id=alpha)) == 18
+
+    db.delete_item(clone)
+    assert not os.path.exists(db.project_file_path(clone))
+    assert db.search("Section", project_id=clone) == []
+    assert db.conn.execute("SELECT COUNT(*) FROM project_files WHERE project_id = ?", (clone,)).fetchone()[0] == 0
+
+
+def test_search_finds_rows_of_closed_projects(split_db):
+    db, alpha, _beta, _alpha_rows = split_db
+    hits = db.search("Reading 2")
+    assert hits and all(hit['reading_title'] for hit in hits)
+
+    with db.project_attached(alpha):
+        db.add_reading(alpha, "Zymurgy", "", "")
+    # Indexed when the file was detached
+    assert [hit['title'] for hit in db.search("Zymurgy")] == ["Zymurgy"]
+
+
+def test_merge_restores_a_single_file(split_db, tmp_path):
+    db, alpha, beta, alpha_rows = split_db
+    with db.project_attached(beta):
+        new_reading = db.add_reading(beta, "After split", "", "")
+    assert db.merge_project_files(vacuum=False) == 2
+    assert not db.is_project_files_enabled()
+    assert not os.path.exists(tmp_path / "tracker_projects")
+    assert count(db, "readings") == 6
+    assert project_rows(db, alpha)[0] == alpha_rows
+    assert db.conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    # New ids continue after the highest one the files used
+    assert db.add_reading(alpha, "Next", "", "") > new_reading
+
+    db.conn.close()
+    reopened = DatabaseManager(str(tmp_path / "tracker.db"))
+    try:
+        assert count(reopened, "readings") == 7
+        assert reopened.attached_project_id is None
+    finally:
+        reopened.conn.close()
+
+
+def test_reopening_finishes_a_project_left_attached(split_db, tmp_path):
+    db, _alpha, beta, _alpha_rows = split_db
+    db.attach_project(beta)
+    db.cursor.execute("INSERT INTO readings (project_id, title) VALUES (?, 'Unsynced')", (beta,))
+    db.conn.commit()
+    db.conn.close()  # As if the application had stopped
+
+    reopened = DatabaseManager(str(tmp_path / "tracker.db"))
+    try:
+        assert reopened.conn.execute("SELECT MAX(attached) FROM project_files").fetchone()[0] == 0
+        assert [hit['title'] for hit in reopened.search("Unsynced")] == ["Unsynced"]
+    finally:
+        reopened.conn.close()
+
+
+def test_read_only_connection_attaches_project_files(split_db, tmp_path):
+    db, alpha, _beta, _alpha_rows = split_db
+    reader = DatabaseManager(str(tmp_path / "tracker.db"), read_only=True)
+    try:
+        assert len(reader.get_global_anchors_for_tag_name("Alpha tag")) == 12
+        reader.attach_project(alpha)
+        assert count(reader, "readings") == 3
+        with pytest.raises(sqlite3.OperationalError):
+            reader.conn.execute("DELETE FROM readings")
+        reader.conn.rollback()
+        reader.detach_project()
+    finally:
+        reader.conn.close()
+
+
+def test_backup_copies_the_project_files(split_db, tmp_path):
+    db, alpha, _beta, alpha_rows = split_db
+    dest = str(tmp_path / "backups" / "copy.db")
+    db.backup_database(dest)
+    assert sorted(os.listdir(project_files_dir(dest))) == ["project_1.db", "project_2.db"]
+
+    copy = DatabaseManager(dest)
+    try:
+        with copy.project_attached(alpha):
+            assert project_rows(copy, alpha)[0] == alpha_rows
+    finally:
+        copy.conn.close()
+
+    # A later backup to the same path drops files of deleted projects
+    db.delete_item(alpha)
+    backup_with_project_files(db._get_db_file_path(), dest)
+    assert os.listdir(project_files_dir(dest)) == ["project_2.db"]
+
+
+def test_split_needs_a_database_file(db):
+    with pytest.raises(RuntimeError):
+        db.split_into_project_files()
@@ -0,0 +1,171 @@
+import re
+
+import pytest
+
+from database_manager import DatabaseManager
+
+PROJECTS = 20
+READINGS_PER_PROJECT = 25
+OUTLINE_PER_READING = 12
+QUESTIONS_PER_READING = 6
+ANCHORS_PER_READING = 12
+TAGS = 200
+
+# Small settings/lookup tables a full scan of is expected and cheap
+SCAN_ALLOWED = {"user_settings", "global_graph_settings", "synthesis_tags", "sqlite_master"}
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+def build_synthetic_db():
+    """A migrated in-memory database with a few thousand rows per hot table, ANALYZEd."""
+    db = DatabaseManager(":memory:")
+    ids = {}
+    with db.transaction():
+        cur = db.cursor
+        cur.executemany("INSERT INTO synthesis_tags (name) VALUES (?)", [(f"tag {t}",) for t in range(TAGS)])
+        tag_ids = [row[0] for row in cur.execute("SELECT id FROM synthesis_tags")]
+        for p in range(PROJECTS):
+            cur.execute("INSERT INTO items (type, name, display_order) VALUES ('project', ?, ?)", (f"P{p}", p))
+            project_id = cur.lastrowid
+            ids.setdefault("project_id", project_id)
+            cur.executemany("INSERT INTO project_tag_links (project_id, tag_id) VALUES (?, ?)",
+                            [(project_id, t) for t in tag_ids[p::PROJECTS // 2]])
+            for r in range(READINGS_PER_PROJECT):
+                cur.execute("INSERT INTO readings (project_id, title, display_order) VALUES (?, ?, ?)",
+                            (project_id, f"Reading {p}.{r}", r))
+                reading_id = cur.lastrowid
+                ids.setdefault("reading_id", reading_id)
+                cur.execute("INSERT INTO reading_attachments (reading_id, display_name, file_path) "
+                            "VALUES (?, 'a.pdf', 'store/aa/a.pdf')", (reading_id,))
+                attachment_id = cur.lastrowid
+                ids.setdefault("attachment_id", attachment_id)
+                question_ids = []
+                for q in range(QUESTIONS_PER_READING):
+                    cur.execute("""
+                        INSERT INTO reading_driving_questions (reading_id, parent_id, type, question_text, display_order)
+                        VALUES (?, ?, 'question', ?, ?)
+                    """, (reading_id, question_ids[0] if question_ids else None, f"Q{q}", q))
+                    question_ids.append(cur.lastrowid)
+                ids.setdefault("question_id", question_ids[-1])
+                outline_ids = []
+                for o in range(OUTLINE_PER_READING):
+                    cur.execute("""
+                        INSERT INTO reading_outline (reading_id, parent_id, section_title, display_order)
+                        VALUES (?, ?, ?, ?)
+                    """, (reading_id, outline_ids[o // 4] if o >= 4 else None, f"Section {o}", o))
+                    outline_ids.append(cur.lastrowid)
+                ids.setdefault("outline_id", outline_ids[-1])
+                cur.executemany("""
+                    INSERT INTO pdf_nodes (reading_id, attachment_id, page_number, x_pos, y_pos)
+                    VALUES (?, ?, ?, 0, 0)
+                """, [(reading_id, attachment_id, page) for page in range(4)])
+                for a in range(ANCHORS_PER_READING):
+                    tag_id = tag_ids[(p + a) % TAGS]
+                    cur.execute("""
+                        INSERT INTO synthesis_anchors (project_id, reading_id, outline_id, tag_id, unique_doc_id,
+                                                       selected_text)
+                        VALUES (?, ?, ?, ?, ?, 'text')
+                    """, (project_id, reading_id, outline_ids[a % OUTLINE_PER_READING], tag_id,
+                          f"doc-{reading_id}-{a}"))
+                    ids.setdefault("anchor_id", cur.lastrowid)
+                    cur.execute("INSERT INTO anchor_tag_links (anchor_id, tag_id) VALUES (?, ?)",
+                                (cur.lastrowid, tag_id))
+            for n in range(30):
+                cur.execute("INSERT INTO research_nodes (project_id, type, title, display_order) "
+                            "VALUES (?, 'question', ?, ?)", (project_id, f"Node {n}", n))
+                ids.setdefault("node_id", cur.lastrowid)
+        ids["tag_id"] = tag_ids[0]
+        ids["tag_name"] = "tag 0"
+    db.conn.execute("ANALYZE")
+    return db, ids
+
+
+@pytest.fixture(scope="module")
+def synthetic():
+    db, ids = build_synthetic_db()
+    yield db, ids
+    db.conn.close()
+
+
+# Filtered getters and the ids they are called with
+GETTERS = [
+    ("get_readings", ["project_id"]),
+    ("get_reading_details", ["reading_id"]),
+    ("get_item_details", ["project_id"]),
+    ("get_project_tags", ["project_id"]),
+    ("get_tags_with_counts", ["project_id"]),
+    ("get_anchors_and_tags_for_project", ["project_id"]),
+    ("get_project_anchor_index", ["project_id"]),
+    ("get_anchors_for_tag_simple", ["tag_id", "project_id"]),
+    ("get_anchors_for_tag_with_context", ["tag_id", "project_id"]),
+    ("get_anchor_details", ["anchor_id"]),
+    ("get_anchor_navigation_details", ["anchor_id"]),
+    ("get_outline_anchors", ["project_id", "outline_id"]),
+    ("get_global_anchors_for_tag_name", ["tag_name"]),
+    ("get_graph_data", ["project_id"]),
+    ("get_reading_outline", ["reading_id"]),
+    ("get_reading_outline_tree", ["reading_id"]),
+    ("get_all_outline_items", ["reading_id"]),
+    ("get_all_outline_items_for_project", ["project_id"]),
+    ("get_project_outline_tree", ["project_id"]),
+    ("get_parts_data", ["reading_id"]),
+    ("get_driving_questions_tree_order", ["reading_id"]),
+    ("get_driving_question_forest", ["reading_id"]),
+    ("get_driving_question_details", ["question_id"]),
+    ("find_current_working_question", ["reading_id"]),
+    ("get_attachments", ["reading_id"]),
+    ("get_attachment_details", ["attachment_id"]),
+    ("get_all_pdf_nodes_for_reading", ["reading_id"]),
+    ("get_all_pdf_nodes_for_attachment", ["attachment_id"]),
+    ("get_reading_arguments", ["reading_id"]),
+    ("get_reading_key_terms", ["reading_id"]),
+    ("get_reading_theories", ["reading_id"]),
+    ("get_reading_propositions", ["reading_id"]),
+    ("get_project_terminology", ["project_id"]),
+    ("get_project_propositions", ["project_id"]),
+    ("get_project_todos", ["project_id"]),
+    ("get_rubric_components", ["project_id"]),
+    ("get_mindmaps_for_project", ["project_id"]),
+    ("get_pdf_node_categories", ["project_id"]),
+    ("get_research_nodes", ["project_id"]),
+    ("get_research_memos", ["node_id"]),
+    ("get_research_pdf_links", ["node_id"]),
+    ("get_research_term_links", ["node_id"]),
+    ("get_research_plans", ["project_id"]),
+    ("get_evidence_matrix_themes", ["project_id"]),
+    ("get_annotated_bib_entries", ["project_id"]),
+    ("get_graph_settings", ["project_id"]),
+]
+
+
+def traced_selects(db, method_name, args):
+    """The SELECT statements a getter runs, with their parameters inlined."""
+    statements = []
+    db.clear_read_cache()
+    db._invalidate_anchor_index()
+    db.conn.set_trace_callback(statements.append)
+    try:
+        getattr(db, method_name)(*args)
+    finally:
+        db.conn.set_trace_callback(None)
+    return [sql for sql in statements if sql.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+
+def full_scans(db, sql):
+    tables = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    scans = []
+    for row in db.conn.execute("EXPLAIN QUERY PLAN " + sql):
+        match = FULL_SCAN.match(row[3])
+        if match and match.group(1) in tables and match.group(1) not in SCAN_ALLOWED:
+            scans.append(row[3])
+    return scans
+
+
+@pytest.mark.parametrize("method_name, arg_names", GETTERS, ids=[name for name, _ in GETTERS])
+def test_getter_uses_indexes(synthetic, method_name, arg_names):
+    db, ids = synthetic
+    statements = traced_selects(db, method_name, [ids[name] for name in arg_names])
+    assert statements, f"{method_name} ran no SELECT"
+    problems = [(sql, scans) for sql in statements for scans in [full_scans(db, sql)] if scans]
+    assert not problems, f"{method_name} falls back to a full table scan: {problems}"
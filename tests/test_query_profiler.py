@@ -0,0 +1,78 @@
+import pytest
+
+from database_helpers.query_profiler import PROFILE_ENV_VAR, QueryProfiler
+from database_manager import DatabaseManager
+
+
+@pytest.fixture
+def profiled_db(tmp_path, monkeypatch):
+    """A migrated database opened with SQL profiling on."""
+    monkeypatch.setenv(PROFILE_ENV_VAR, "1")
+    manager = DatabaseManager(str(tmp_path / "profiled.db"))
+    manager.reset_query_stats()
+    yield manager
+    manager.conn.close()
+
+
+def statement_counts(db):
+    return {row["sql"]: row["count"] for row in db.get_query_stats()["statements"]}
+
+
+def test_connection_execute_is_recorded(profiled_db):
+    profiled_db.conn.execute("SELECT 1").fetchone()
+    profiled_db.conn.execute("PRAGMA user_version").fetchone()
+    counts = statement_counts(profiled_db)
+    assert counts["SELECT 1"] == 1
+    assert counts["PRAGMA user_version"] == 1
+
+
+def test_connection_execute_keeps_the_row_factory(profiled_db):
+    row = profiled_db.conn.execute("SELECT 1 AS one").fetchone()
+    assert row["one"] == 1
+
+
+def test_executemany_and_executescript_are_recorded(profiled_db):
+    profiled_db.conn.executescript("CREATE TABLE scratch (value INTEGER);")
+    profiled_db.conn.executemany("INSERT INTO scratch (value) VALUES (?)", [(n,) for n in range(3)])
+    counts = statement_counts(profiled_db)
+    assert counts["CREATE TABLE scratch (value INTEGER);"] == 1
+    assert counts["[executemany] INSERT INTO scratch (value) VALUES (?)"] == 1
+
+
+def test_statements_are_attributed_to_the_mixin_method(profiled_db):
+    project_id = profiled_db.create_item("Project", "project")
+    profiled_db.reset_query_stats()
+    profiled_db.get_rubric_components(project_id)
+    callers = {row["caller"]: row["count"] for row in profiled_db.get_query_stats()["callers"]}
+    assert callers == {"RubricMixin.get_rubric_components": 1}
+
+
+def test_repeated_statement_in_one_action_is_flagged(profiled_db):
+    project_id = profiled_db.create_item("Project", "project")
+    threshold = QueryProfiler.N_PLUS_ONE_THRESHOLD
+    with profiled_db.profile_action("open project"):
+        for _ in range(threshold + 5):
+            profiled_db.get_rubric_components(project_id)
+    flagged = profiled_db.get_query_stats()["n_plus_one"]
+    assert len(flagged) == 1
+    assert flagged[0]["action"] == "open project"
+    assert flagged[0]["caller"] == "RubricMixin.get_rubric_components"
+    assert flagged[0]["max_repeats"] == threshold + 5
+    assert flagged[0]["occurrences"] == 1
+
+
+def test_repeats_spread_over_actions_are_not_flagged(profiled_db):
+    project_id = profiled_db.create_item("Project", "project")
+    for action in range(QueryProfiler.N_PLUS_ONE_THRESHOLD):
+        with profiled_db.profile_action(f"action {action}"):
+            profiled_db.get_rubric_components(project_id)
+    assert profiled_db.get_query_stats()["n_plus_one"] == []
+
+
+def test_slow_queries_are_logged(profiled_db):
+    profiler = profiled_db.get_query_profiler()
+    profiler.slow_query_seconds = 0.0
+    profiled_db.conn.execute("SELECT 2").fetchone()
+    with open(profiler.slow_log_path, encoding="utf-8") as log:
+        assert log.read().rstrip().endswith("SELECT 2")
+    assert profiled_db.get_query_stats()["slow_query_count"] >= 1
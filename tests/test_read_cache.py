@@ -0,0 +1,212 @@
+import pytest
+
+from database_manager import DatabaseManager
+
+EDIT_ROUNDS = 50
+
+
+@pytest.fixture
+def reading_id(db, project_id):
+    return db.add_reading(project_id, "Original Title", "Author", "orig")
+
+
+def stats_delta(db, before):
+    after = db.get_read_cache_stats()
+    return {key: after[key] - before[key] for key in ("hits", "misses", "invalidations")}
+
+
+def details_for(title):
+    return {"title": title, "author": "Author", "nickname": "orig"}
+
+
+def test_repeat_read_is_a_hit_and_returns_a_copy(db, reading_id):
+    db.clear_read_cache()  # add_reading already read the row back
+    before = db.get_read_cache_stats()
+    first = db.get_reading_details(reading_id)
+    first["title"] = "mutated by caller"
+    second = db.get_reading_details(reading_id)
+
+    assert second["title"] == "Original Title"
+    assert stats_delta(db, before) == {"hits": 1, "misses": 1, "invalidations": 0}
+
+
+def test_update_reading_details(db, reading_id, project_id):
+    assert db.get_reading_details(reading_id)["title"] == "Original Title"
+    assert db.get_readings(project_id)[0]["title"] == "Original Title"
+
+    before = db.get_read_cache_stats()
+    db.update_reading_details(reading_id, details_for("New Title"))
+
+    assert db.get_reading_details(reading_id)["title"] == "New Title"
+    assert db.get_readings(project_id)[0]["title"] == "New Title"
+    # Both readings entries were stale
+    assert stats_delta(db, before) == {"hits": 0, "misses": 2, "invalidations": 2}
+
+
+def test_update_project_text_field(db, project_id):
+    assert not db.get_item_details(project_id)["project_purpose_text"]
+
+    db.update_project_text_field(project_id, "project_purpose_text", "<p>Why</p>")
+
+    assert "Why" in db.get_item_details(project_id)["project_purpose_text"]
+
+
+def test_project_tag_link_changes(db, project_id):
+    assert db.get_project_tags(project_id) == []
+
+    tag = db.get_or_create_tag("Theme", project_id)
+    assert [t["name"] for t in db.get_project_tags(project_id)] == ["Theme"]
+
+    db.rename_tag(tag["id"], "Renamed")
+    assert [t["name"] for t in db.get_project_tags(project_id)] == ["Renamed"]
+
+    db.remove_project_tag(project_id, tag["id"])
+    assert db.get_project_tags(project_id) == []
+
+    db.add_project_tag(project_id, tag["id"])
+    assert [t["id"] for t in db.get_project_tags(project_id)] == [tag["id"]]
+
+    db.delete_tags([tag["id"]])
+    assert db.get_project_tags(project_id) == []
+
+
+def test_graph_settings_and_instructions(db, project_id):
+    default = db.get_graph_settings(project_id)["tag"]
+    db.save_graph_setting(project_id, "tag", "#123456")
+    assert db.get_graph_settings(project_id)["tag"] == "#123456" != default
+
+    instructions = db.get_or_create_instructions(project_id)
+    instructions["thesis_instr"] = "State the thesis."
+    db.update_instructions(project_id, instructions)
+    assert db.get_or_create_instructions(project_id)["thesis_instr"] == "State the thesis."
+
+
+def test_delete_reading(db, reading_id, project_id):
+    assert len(db.get_readings(project_id)) == 1
+    assert db.get_reading_details(reading_id) is not None
+
+    db.delete_reading(reading_id)
+
+    assert db.get_readings(project_id) == []
+    assert db.get_reading_details(reading_id) is None
+
+
+def test_cascading_project_delete(db, reading_id, project_id):
+    db.get_or_create_tag("Theme", project_id)
+    assert db.get_item_details(project_id) is not None
+    assert len(db.get_readings(project_id)) == 1
+    assert len(db.get_project_tags(project_id)) == 1
+
+    # Readings and tag links go through ON DELETE CASCADE
+    db.delete_item(project_id)
+
+    assert db.get_item_details(project_id) is None
+    assert db.get_readings(project_id) == []
+    assert db.get_reading_details(reading_id) is None
+    assert db.get_project_tags(project_id) == []
+
+
+def test_committed_transaction(db, reading_id):
+    db.get_reading_details(reading_id)
+    with db.transaction():
+        db.update_reading_details(reading_id, details_for("In Transaction"))
+        assert db.get_reading_details(reading_id)["title"] == "In Transaction"
+    assert db.get_reading_details(reading_id)["title"] == "In Transaction"
+
+
+def test_rolled_back_transaction(db, reading_id):
+    assert db.get_reading_details(reading_id)["title"] == "Original Title"
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.update_reading_details(reading_id, details_for("Rolled Back"))
+            # Read inside the block sees the uncommitted value and is not cached
+            assert db.get_reading_details(reading_id)["title"] == "Rolled Back"
+            raise RuntimeError("abort")
+
+    before = db.get_read_cache_stats()
+    assert db.get_reading_details(reading_id)["title"] == "Original Title"
+    assert db.get_reading_details(reading_id)["title"] == "Original Title"
+    assert stats_delta(db, before)["misses"] == 1
+    assert stats_delta(db, before)["hits"] == 1
+
+
+def test_mixin_rollback_inside_savepoint(db, reading_id):
+    db.get_reading_details(reading_id)
+    with db.transaction():
+        with db.transaction():
+            db.update_reading_details(reading_id, details_for("Undone"))
+            db._rollback()  # As a mixin does after catching an error
+        assert db.get_reading_details(reading_id)["title"] == "Original Title"
+    assert db.get_reading_details(reading_id)["title"] == "Original Title"
+
+
+def test_clear_read_cache(db, reading_id):
+    db.get_reading_details(reading_id)
+    db.clear_read_cache()
+    before = db.get_read_cache_stats()
+    db.get_reading_details(reading_id)
+    assert stats_delta(db, before) == {"hits": 0, "misses": 1, "invalidations": 0}
+
+
+def test_writes_to_other_tables_keep_entries(db, reading_id, project_id):
+    section_id = db.add_outline_section(reading_id, "Section")
+    node_id = db.add_research_node(project_id, None, "question", "Node")
+    db.get_reading_details(reading_id)
+    db.get_item_details(project_id)
+
+    before = db.get_read_cache_stats()
+    db.update_outline_section_notes(section_id, "<p>Notes</p>")
+    db.update_research_node_field(node_id, "scope", "Scope")
+    db.get_reading_details(reading_id)
+    db.get_item_details(project_id)
+    assert stats_delta(db, before) == {"hits": 2, "misses": 0, "invalidations": 0}
+
+    # A write drops only the entries of the table it touched
+    db.update_project_text_field(project_id, "thesis_text", "<p>Thesis</p>")
+    assert db.get_reading_details(reading_id)["title"] == "Original Title"
+    assert db.get_item_details(project_id)["thesis_text"] == "<p>Thesis</p>"
+    assert stats_delta(db, before) == {"hits": 3, "misses": 1, "invalidations": 1}
+
+
+def test_read_only_connection_clears_on_any_change(tmp_path):
+    writer = DatabaseManager(str(tmp_path / "cache.db"))
+    project_id = writer.create_item("Project", "project")
+    reader = DatabaseManager(str(tmp_path / "cache.db"), read_only=True)
+    try:
+        reader.get_item_details(project_id)
+        assert reader.get_item_details(project_id)["name"] == "Project"
+        assert reader.get_read_cache_stats()["hits"] == 1
+    finally:
+        reader.conn.close()
+        writer.conn.close()
+
+
+def test_editing_session_hit_rate(db, project_id):
+    """
+    The getters an open project calls while the user edits reading notes,
+    outline notes and research nodes. Run with -s to see the hit rate.
+    """
+    reading_ids = [db.add_reading(project_id, f"Reading {i}", "Author", "") for i in range(5)]
+    section_ids = [db.add_outline_section(reading_id, "Section") for reading_id in reading_ids]
+    node_id = db.add_research_node(project_id, None, "question", "Node")
+    db.clear_read_cache()
+    before = db.get_read_cache_stats()
+
+    for edit in range(EDIT_ROUNDS):
+        db.update_outline_section_notes(section_ids[edit % 5], f"<p>Notes {edit}</p>")
+        db.update_research_node_field(node_id, "scope", f"Scope {edit}")
+        if edit % 5 == 0:  # A save cycle writes a reading field now and then
+            db.update_reading_field(reading_ids[0], "gaps_html", f"<p>Gaps {edit}</p>")
+        db.get_item_details(project_id)
+        db.get_or_create_instructions(project_id)
+        db.get_graph_settings(project_id)
+        db.get_project_tags(project_id)
+        for reading_id in reading_ids:
+            db.get_reading_details(reading_id)
+
+    delta = stats_delta(db, before)
+    hit_rate = delta["hits"] / (delta["hits"] + delta["misses"])
+    print(f"\nRead cache over {EDIT_ROUNDS} edits: {delta['hits']} hits, {delta['misses']} misses "
+          f"({hit_rate:.0%}), {delta['invalidations']} stale entries dropped")
+    assert hit_rate > 0.8
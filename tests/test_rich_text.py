@@ -0,0 +1,90 @@
+import pytest
+
+from database_helpers.rich_text import (COMPACT_HTML_HEAD, QT_DEFAULT_BLOCK_STYLE, QT_HTML_HEAD, compact_qt_html,
+                                        expand_qt_html, is_compact_html)
+
+# Documents as QTextEdit.toHtml() writes them
+QT6_BODY = (
+    "<body style=\" font-family:'Segoe UI'; font-size:9pt; font-weight:400; font-style:normal;\">\n"
+    '<p style=" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0;'
+    ' text-indent:0px;">First <span style=" font-weight:700;">bold</span> line</p>\n'
+    '<p style="-qt-paragraph-type:empty; margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px;'
+    ' -qt-block-indent:0; text-indent:0px;"><br /></p>\n'
+    '<p align="center" style=" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px;'
+    ' -qt-block-indent:0; text-indent:0px;"><a href="anchor:12"><span style=" background-color:#fff3b0;">'
+    'anchored</span></a></p>\n'
+    '<ul style="margin-top: 0px; margin-bottom: 0px; margin-left: 0px; margin-right: 0px; -qt-list-indent: 1;">'
+    '<li style=" margin-top:12px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0;'
+    ' text-indent:0px;">Spaced item</li>\n'
+    '<li style=" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0;'
+    ' text-indent:0px; line-height:150%;">Tall item</li></ul></body></html>'
+)
+QT6_DOCUMENT = QT_HTML_HEAD + QT6_BODY
+
+QT5_DOCUMENT = (
+    '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN" "http://www.w3.org/TR/REC-html40/strict.dtd">\n'
+    '<html><head><meta name="qrichtext" content="1" /><style type="text/css">\n'
+    'p, li { white-space: pre-wrap; }\n'
+    "</style></head><body style=\" font-family:'MS Shell Dlg 2'; font-size:8.25pt; font-weight:400;"
+    ' font-style:normal;">\n'
+    '<p style=" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0;'
+    ' text-indent:0px;">Saved by a Qt 5 build</p></body></html>'
+)
+
+
+def test_qt6_document_round_trips():
+    compact = compact_qt_html(QT6_DOCUMENT)
+    assert is_compact_html(compact)
+    assert len(compact) < len(QT6_DOCUMENT)
+    assert expand_qt_html(compact) == QT6_DOCUMENT
+
+
+def test_default_block_style_is_stripped():
+    compact = compact_qt_html(QT6_DOCUMENT)
+    body = compact[len(COMPACT_HTML_HEAD):]
+    assert QT_DEFAULT_BLOCK_STYLE not in body
+    assert "<p>First" in body
+    assert '<p style="-qt-paragraph-type:empty;"><br /></p>' in body
+    assert '<p align="center">' in body
+    assert '<li style="line-height:150%;">Tall item' in body
+    # Non-default margins are kept as written
+    assert 'margin-top:12px' in body
+
+
+def test_qt5_document_is_left_unchanged():
+    assert compact_qt_html(QT5_DOCUMENT) == QT5_DOCUMENT
+
+
+@pytest.mark.parametrize("html", [
+    # A different style block in the head
+    QT_HTML_HEAD.replace("hr { height: 1px; border-width: 0; }\n", "") + QT6_BODY,
+    # A bare <p> would gain the default style on expansion
+    QT_HTML_HEAD + "<body><p>Bare</p></body></html>",
+    # Default style in a different position than toHtml() writes it
+    QT_HTML_HEAD + '<body><p style="line-height:150%;' + QT_DEFAULT_BLOCK_STYLE + '">x</p></body></html>',
+])
+def test_documents_that_would_not_round_trip_are_left_unchanged(html):
+    assert compact_qt_html(html) == html
+
+
+def test_other_html_is_left_unchanged():
+    for html in ("", None, "<p>plain</p>", "just text"):
+        assert compact_qt_html(html) == html
+        assert expand_qt_html(html) == html
+    compact = compact_qt_html(QT6_DOCUMENT)
+    assert compact_qt_html(compact) == compact
+
+
+def test_compacting_stored_text_skips_unknown_heads(db, project_id):
+    reading_id = db.add_reading(project_id, "Reading", "Author", "")
+    db.conn.execute("UPDATE readings SET unity_html = ?, gaps_html = ? WHERE id = ?",
+                    (QT6_DOCUMENT, QT5_DOCUMENT, reading_id))
+    db.conn.commit()
+
+    rows, saved = db.compact_rich_text()
+
+    assert rows == 1
+    assert saved == len(QT6_DOCUMENT) - len(compact_qt_html(QT6_DOCUMENT))
+    stored = db.conn.execute("SELECT unity_html, gaps_html FROM readings WHERE id = ?", (reading_id,)).fetchone()
+    assert expand_qt_html(stored["unity_html"]) == QT6_DOCUMENT
+    assert stored["gaps_html"] == QT5_DOCUMENT
@@ -0,0 +1,124 @@
+import pytest
+
+from database_helpers.text_compression import COMPRESS_MIN_BYTES, is_compressed
+
+LARGE_HTML = "<p>" + "Compressed paragraph about epistemology. " * (COMPRESS_MIN_BYTES // 10) + "</p>"
+
+
+@pytest.fixture
+def reading_id(db, project_id):
+    db.sync_search_index()  # Start from an empty queue
+    return db.add_reading(project_id, "Reading", "Author", "")
+
+
+def queued(db):
+    return {tuple(row) for row in db.conn.execute("SELECT kind, ref_id FROM search_index_queue")}
+
+
+def indexed(db, kind, ref_id):
+    return db.conn.execute("SELECT rowid, kind, ref_id, title, body FROM search_index WHERE kind = ? AND ref_id = ?",
+                           (kind, ref_id)).fetchone()
+
+
+def test_writes_queue_rows(db, reading_id):
+    assert queued(db) == {("reading", reading_id)}
+    section_id = db.add_outline_section(reading_id, "Section")
+    db.sync_search_index()
+    assert queued(db) == set()
+
+    db.update_outline_section_notes(section_id, "<p>notes</p>")
+    assert queued(db) == {("outline", section_id)}
+    db.sync_search_index()
+
+    # Only the watched columns queue on update
+    db.update_outline_section_order([section_id])
+    assert queued(db) == set()
+
+    db.delete_reading(reading_id)  # Cascades to the outline
+    assert queued(db) == {("reading", reading_id), ("outline", section_id)}
+
+
+def test_sync_indexes_and_drops_rows(db, project_id, reading_id):
+    section_id = db.add_outline_section(reading_id, "Section")
+    db.update_outline_section_notes(section_id, "<p>Some <b>bold</b> notes</p>")
+    assert db.sync_search_index() == 2
+    assert indexed(db, "outline", section_id)["body"] == "Some bold notes"
+    assert [r["ref_id"] for r in db.search("bold", project_id=project_id)] == [section_id]
+
+    db.delete_reading(reading_id)
+    assert db.sync_search_index() == 2
+    assert indexed(db, "reading", reading_id) is None
+    assert indexed(db, "outline", section_id) is None
+
+
+def test_rowid_encodes_ref_id_and_kind(db, reading_id):
+    section_id = db.add_outline_section(reading_id, "Section")
+    db.sync_search_index()
+
+    for kind, ref_id in (("reading", reading_id), ("outline", section_id)):
+        row = indexed(db, kind, ref_id)
+        code = db.SEARCH_SOURCES[kind]["code"]
+        assert row["rowid"] == ref_id * 16 + code
+        assert divmod(row["rowid"], 16) == (ref_id, code)
+    # Distinct codes below the stride: the same id never collides across kinds
+    codes = [source["code"] for source in db.SEARCH_SOURCES.values()]
+    assert len(set(codes)) == len(codes) and all(0 < code < 16 for code in codes)
+
+
+def test_reindex_replaces_the_entry(db, project_id, reading_id):
+    db.update_reading_field(reading_id, "gaps_html", "<p>first draft</p>")
+    db.sync_search_index()
+    db.update_reading_field(reading_id, "gaps_html", "<p>second draft</p>")
+    db.sync_search_index()
+
+    assert db.conn.execute("SELECT COUNT(*) FROM search_index WHERE kind = 'reading'").fetchone()[0] == 1
+    assert db.search("first", project_id=project_id) == []
+    assert [r["ref_id"] for r in db.search("second", project_id=project_id)] == [reading_id]
+
+
+def test_compressed_values_are_indexed(db, project_id, reading_id):
+    db.set_text_compression(True)
+    section_id = db.add_outline_section(reading_id, "Section")
+    db.update_outline_section_notes(section_id, LARGE_HTML)
+    db.update_reading_field(reading_id, "theories_html", LARGE_HTML)
+    assert is_compressed(db.conn.execute("SELECT notes_html FROM reading_outline WHERE id = ?",
+                                         (section_id,)).fetchone()[0])
+
+    db.sync_search_index()
+    assert indexed(db, "outline", section_id)["body"].startswith("Compressed paragraph about epistemology.")
+    results = db.search("epistemology", project_id=project_id)
+    assert {(r["kind"], r["ref_id"]) for r in results} == {("outline", section_id), ("reading", reading_id)}
+
+
+def test_search_does_not_sync(db, project_id, reading_id):
+    db.update_reading_field(reading_id, "gaps_html", "<p>pending words</p>")
+    assert db.search("pending", project_id=project_id) == []
+    assert queued(db) == {("reading", reading_id)}
+    assert db.pending_search_index_count() == 1
+
+
+def test_sync_limit_takes_one_batch(db, reading_id):
+    section_ids = [db.add_outline_section(reading_id, f"Section {n}") for n in range(5)]
+    assert db.pending_search_index_count() == 6
+
+    assert db.sync_search_index(limit=4) == 4
+    assert db.pending_search_index_count() == 2
+    assert db.sync_search_index(limit=4) == 2
+    assert db.pending_search_index_count() == 0
+    assert all(indexed(db, "outline", section_id) for section_id in section_ids)
+
+
+def test_results_name_the_item_itself(db, project_id, reading_id):
+    db.save_terminology_entry(project_id, None, {"term": "Dialectic", "meaning": "shared word"})
+    db.save_proposition_entry(project_id, None, {"display_name": "Claim", "proposition_html": "<p>shared word</p>"})
+    term_id = db.get_project_terminology(project_id)[0]["id"]
+    proposition_id = db.get_project_propositions(project_id)[0]["id"]
+    node_id = db.add_research_node(project_id, None, "question", "Question")
+    memo_id = db.add_research_memo(node_id, "Memo", "<p>shared word</p>")
+    db.sync_search_index()
+
+    results = db.search("shared", project_id=project_id)
+    assert {(r["kind"], r["ref_id"]) for r in results} == {
+        ("term", term_id), ("proposition", proposition_id), ("memo", memo_id)}
+    assert all(r["project_id"] == project_id for r in results)
+    assert db.get_research_memo_details(memo_id)["node_id"] == node_id
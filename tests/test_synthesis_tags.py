@@ -0,0 +1,207 @@
+import statistics
+import time
+
+import pytest
+
+BENCH_TERMS = 1000
+BENCH_RUNS = 5
+
+
+@pytest.fixture
+def reading_id(db, project_id):
+    return db.add_reading(project_id, "Reading", "Author", "")
+
+
+@pytest.fixture
+def outline_id(db, reading_id):
+    return db.add_outline_section(reading_id, "Section")
+
+
+@pytest.fixture
+def question_ids(db, reading_id):
+    """Driving questions for virtual anchors to point at (item_link_id)."""
+    db.conn.executemany("INSERT INTO reading_driving_questions (reading_id, type, question_text) "
+                        "VALUES (?, 'question', ?)", [(reading_id, "Q1"), (reading_id, "Q2")])
+    db.conn.commit()
+    return [row[0] for row in db.conn.execute("SELECT id FROM reading_driving_questions ORDER BY id")]
+
+
+def make_tags(db, project_id, count, prefix="Tag"):
+    """`count` tags linked to the project, made in one transaction. Returns their ids."""
+    with db.transaction():
+        ids = []
+        for n in range(count):
+            db.cursor.execute("INSERT INTO synthesis_tags (name) VALUES (?)", (f"{prefix} {n}",))
+            ids.append(db.cursor.lastrowid)
+        db.cursor.executemany("INSERT INTO project_tag_links (project_id, tag_id) VALUES (?, ?)",
+                              [(project_id, tag_id) for tag_id in ids])
+    return ids
+
+
+def add_anchor(db, project_id, reading_id, outline_id, tag_ids, item_link_id=None):
+    """An anchor linked to every tag in tag_ids; virtual if item_link_id is given."""
+    anchor_id = db.create_anchor(project_id, reading_id, None if item_link_id else outline_id, tag_ids[0],
+                                 f"doc-{tag_ids[0]}-{item_link_id}", "text", "",
+                                 item_link_id=item_link_id, item_type="dq" if item_link_id else None)
+    db.conn.executemany("INSERT INTO anchor_tag_links (anchor_id, tag_id) VALUES (?, ?)",
+                        [(anchor_id, tag_id) for tag_id in tag_ids[1:]])
+    db.conn.commit()
+    return anchor_id
+
+
+def anchor_tags(db, anchor_id):
+    return [row[0] for row in db.conn.execute(
+        "SELECT tag_id FROM anchor_tag_links WHERE anchor_id = ? ORDER BY tag_id", (anchor_id,))]
+
+
+def anchor_exists(db, anchor_id):
+    return db.conn.execute("SELECT 1 FROM synthesis_anchors WHERE id = ?", (anchor_id,)).fetchone() is not None
+
+
+def test_delete_tags_across_chunks(db, project_id, reading_id, outline_id, question_ids):
+    chunk = db._IN_CHUNK_SIZE
+    doomed = make_tags(db, project_id, chunk + 100)
+    [kept_tag] = make_tags(db, project_id, 1, prefix="Kept")
+
+    only_doomed = add_anchor(db, project_id, reading_id, outline_id, [doomed[0]])
+    spans_chunks = add_anchor(db, project_id, reading_id, outline_id, [doomed[5], doomed[chunk + 50]])
+    also_kept = add_anchor(db, project_id, reading_id, outline_id, [doomed[10], kept_tag])
+    virtual = add_anchor(db, project_id, reading_id, outline_id, [doomed[20]], item_link_id=question_ids[0])
+    virtual_late = add_anchor(db, project_id, reading_id, outline_id, [doomed[chunk + 20]],
+                              item_link_id=question_ids[1])
+
+    # Duplicates in the input are ignored
+    assert db.delete_tags(doomed + doomed[:5]) == 2
+
+    assert not anchor_exists(db, only_doomed)
+    assert not anchor_exists(db, spans_chunks)
+    assert anchor_tags(db, also_kept) == [kept_tag]
+    for anchor_id in (virtual, virtual_late):
+        assert anchor_exists(db, anchor_id)
+        assert anchor_tags(db, anchor_id) == []
+    assert [tag["id"] for tag in db.get_project_tags(project_id)] == [kept_tag]
+    assert db.conn.execute("SELECT COUNT(*) FROM synthesis_tags").fetchone()[0] == 1
+    assert db.conn.execute("PRAGMA foreign_key_check").fetchall() == []
+
+
+def test_delete_no_tags(db):
+    assert db.delete_tags([]) == 0
+
+
+def test_resolve_tag_merges_follows_chains(db):
+    assert db._resolve_tag_merges({1: 2, 2: 3, (4, 5): 3, 6: 6}) == {1: 3, 2: 3, 4: 3, 5: 3}
+
+
+@pytest.mark.parametrize("merges", [{1: 2, 2: 1}, {1: 2, 2: 3, 3: 1}, {1: 2, (1,): 3}])
+def test_resolve_tag_merges_rejects_cycles_and_conflicts(db, merges):
+    with pytest.raises(ValueError):
+        db._resolve_tag_merges(merges)
+
+
+def test_merge_collapses_duplicate_links(db, project_id, reading_id, outline_id):
+    source, target = make_tags(db, project_id, 2)
+    both = add_anchor(db, project_id, reading_id, outline_id, [source, target])
+    source_only = add_anchor(db, project_id, reading_id, outline_id, [source])
+
+    assert db.merge_tags_bulk({source: target}) == 1
+
+    assert anchor_tags(db, both) == [target]
+    assert anchor_tags(db, source_only) == [target]
+    assert db.conn.execute("SELECT tag_id FROM synthesis_anchors WHERE id = ?", (source_only,)).fetchone()[0] == target
+    assert db.conn.execute("SELECT COUNT(*) FROM project_tag_links WHERE project_id = ?",
+                           (project_id,)).fetchone()[0] == 1
+    assert [tag["id"] for tag in db.get_project_tags(project_id)] == [target]
+
+
+def test_merge_chain_lands_on_the_last_tag(db, project_id, reading_id, outline_id):
+    first, middle, last = make_tags(db, project_id, 3)
+    anchor_ids = [add_anchor(db, project_id, reading_id, outline_id, [tag_id]) for tag_id in (first, middle)]
+
+    assert db.merge_tags_bulk({first: middle, middle: last}) == 2
+
+    for anchor_id in anchor_ids:
+        assert anchor_tags(db, anchor_id) == [last]
+    assert [tag["id"] for tag in db.get_project_tags(project_id)] == [last]
+
+
+def test_merge_cycle_changes_nothing(db, project_id, reading_id, outline_id):
+    tags = make_tags(db, project_id, 2)
+    anchor_id = add_anchor(db, project_id, reading_id, outline_id, [tags[0]])
+
+    with pytest.raises(ValueError):
+        db.merge_tags_bulk({tags[0]: tags[1], tags[1]: tags[0]})
+
+    assert anchor_tags(db, anchor_id) == [tags[0]]
+    assert sorted(tag["id"] for tag in db.get_project_tags(project_id)) == tags
+
+
+def add_key_terms(db, project_id, reading_id, count, tag_ids):
+    """
+    `count` key terms; every term but each fifth gets a virtual anchor
+    tagged with up to three of tag_ids. Returns the term ids.
+    """
+    with db.transaction():
+        cur = db.cursor
+        cur.executemany("INSERT INTO reading_driving_questions (reading_id, type, question_text, display_order) "
+                        "VALUES (?, 'term', ?, ?)", [(reading_id, f"Term {n}", n) for n in range(count)])
+        term_ids = [row[0] for row in cur.execute(
+            "SELECT id FROM reading_driving_questions WHERE type = 'term' ORDER BY display_order")]
+        for n, term_id in enumerate(term_ids):
+            if n % 5 == 4:
+                continue
+            tags = [tag_ids[(n + k) % len(tag_ids)] for k in range(n % 3 + 1)]
+            cur.execute("INSERT INTO synthesis_anchors (project_id, reading_id, tag_id, unique_doc_id, "
+                        "selected_text, item_link_id, item_type) VALUES (?, ?, ?, ?, 'Term', ?, 'term')",
+                        (project_id, reading_id, tags[0], f"term-{term_id}", term_id))
+            cur.executemany("INSERT INTO anchor_tag_links (anchor_id, tag_id) VALUES (?, ?)",
+                            [(cur.lastrowid, tag_id) for tag_id in tags])
+    return term_ids
+
+
+def per_row_synthesis_tags(db, rows):
+    """The two-queries-per-row lookup _attach_synthesis_tags replaced."""
+    for row in rows:
+        anchor = db.conn.execute("SELECT id FROM synthesis_anchors WHERE item_link_id = ? ORDER BY id",
+                                 (row["id"],)).fetchone()
+        names = [] if anchor is None else [name for (name,) in db.conn.execute("""
+            SELECT t.name FROM anchor_tag_links atl JOIN synthesis_tags t ON atl.tag_id = t.id
+            WHERE atl.anchor_id = ? ORDER BY atl.tag_id
+        """, (anchor[0],))]
+        row["synthesis_tags"] = ", ".join(names)
+    return rows
+
+
+def test_key_term_tags_match_the_per_row_lookup(db, project_id, reading_id):
+    tag_ids = make_tags(db, project_id, 7)
+    add_key_terms(db, project_id, reading_id, db._IN_CHUNK_SIZE + 50, tag_ids)
+
+    terms = db.get_reading_key_terms(reading_id)
+
+    expected = per_row_synthesis_tags(db, [{k: v for k, v in term.items() if k != "synthesis_tags"}
+                                           for term in terms])
+    assert terms == expected
+    assert terms[0]["synthesis_tags"] == "Tag 0"
+    assert terms[4]["synthesis_tags"] == ""
+
+
+def test_key_term_list_1000_terms_benchmark(db, project_id, reading_id):
+    """
+    Times get_reading_key_terms on 1,000 tagged terms against the per-row
+    tag lookup it replaced (run with -s to see the numbers).
+    """
+    tag_ids = make_tags(db, project_id, 50)
+    add_key_terms(db, project_id, reading_id, BENCH_TERMS, tag_ids)
+
+    def timed(load):
+        timings = []
+        for _ in range(BENCH_RUNS):
+            started = time.perf_counter()
+            rows = load()
+            timings.append((time.perf_counter() - started) * 1000)
+        return rows, statistics.median(timings)
+
+    batched, batched_ms = timed(lambda: db.get_reading_key_terms(reading_id))
+    per_row, per_row_ms = timed(lambda: per_row_synthesis_tags(db, [
+        {k: v for k, v in term.items() if k != "synthesis_tags"} for term in batched]))
+    assert batched == per_row
+    print(f"\n{BENCH_TERMS} key terms: batched median {batched_ms:.1f} ms, per-row lookup median {per_row_ms:.1f} ms")
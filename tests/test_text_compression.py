@@ -0,0 +1,170 @@
+import os
+import random
+import statistics
+import time
+
+import pytest
+
+from database_helpers.rich_text import COMPACT_HTML_HEAD
+from database_helpers.text_compression import COMPRESS_MIN_BYTES, compress_text, decompress_text, is_compressed
+from database_manager import DatabaseManager
+
+LARGE_HTML = "<p>" + "Large rich text paragraph. " * (COMPRESS_MIN_BYTES // 10) + "</p>"
+
+BENCH_NOTES = 600
+BENCH_NOTE_BYTES = 14000
+BENCH_RUNS = 5
+
+
+@pytest.fixture
+def reading_id(db, project_id):
+    return db.add_reading(project_id, "Reading", "Author", "")
+
+
+def stored_value(db, table, column, row_id):
+    return db.conn.execute(f"SELECT {column} FROM {table} WHERE id = ?", (row_id,)).fetchone()[0]
+
+
+def test_compress_text_round_trip():
+    packed = compress_text(LARGE_HTML)
+    assert is_compressed(packed)
+    assert decompress_text(packed) == LARGE_HTML
+    assert compress_text("<p>short</p>") == "<p>short</p>"
+    assert decompress_text("<p>plain</p>") == "<p>plain</p>"
+
+
+def test_compression_is_off_by_default(db, reading_id):
+    assert not db.is_text_compression_enabled()
+    db.update_reading_field(reading_id, "key_terms_html", LARGE_HTML)
+    assert stored_value(db, "readings", "key_terms_html", reading_id) == LARGE_HTML
+
+
+@pytest.mark.parametrize("column", ["propositions_html", "key_terms_html", "arguments_html",
+                                    "theories_html", "unity_html"])
+def test_reading_fields_round_trip_when_enabled(db, reading_id, column):
+    db.set_text_compression(True)
+    db.update_reading_field(reading_id, column, LARGE_HTML)
+
+    assert is_compressed(stored_value(db, "readings", column, reading_id))
+    db.clear_read_cache()
+    assert db.get_reading_details(reading_id)[column] == LARGE_HTML
+
+
+def test_project_and_outline_fields_round_trip_when_enabled(db, project_id, reading_id):
+    db.set_text_compression(True)
+    section_id = db.add_outline_section(reading_id, "Section")
+    db.update_outline_section_notes(section_id, LARGE_HTML)
+    db.update_project_text_field(project_id, "thesis_text", LARGE_HTML)
+
+    assert is_compressed(stored_value(db, "reading_outline", "notes_html", section_id))
+    assert is_compressed(stored_value(db, "items", "thesis_text", project_id))
+    assert db.get_outline_section_notes(section_id) == LARGE_HTML
+    assert db.get_item_details(project_id)["thesis_text"] == LARGE_HTML
+
+
+def test_turning_compression_off_expands_every_column(db, project_id, reading_id):
+    db.set_text_compression(True)
+    columns = [column for table, columns in db.RICH_TEXT_COLUMNS if table == "readings" for column in columns]
+    for column in columns:
+        db.update_reading_field(reading_id, column, LARGE_HTML)
+    db.update_project_text_field(project_id, "thesis_text", LARGE_HTML)
+
+    assert db.set_text_compression(False) == len(columns) + 1
+    assert not db.is_text_compression_enabled()
+    for column in columns:
+        assert db.conn.execute(f"SELECT typeof({column}) FROM readings WHERE id = ?",
+                               (reading_id,)).fetchone()[0] == "text"
+        assert stored_value(db, "readings", column, reading_id) == LARGE_HTML
+    assert stored_value(db, "items", "thesis_text", project_id) == LARGE_HTML
+    assert db.get_rich_text_size_report()["totals"]["compressed_rows"] == 0
+
+
+def test_size_report_counts_every_updatable_reading_field(db, reading_id):
+    db.set_text_compression(True)
+    db.update_reading_field(reading_id, "theories_html", LARGE_HTML)
+    report = db.get_rich_text_size_report()
+    entry = next(e for e in report["columns"] if (e["table"], e["column"]) == ("readings", "theories_html"))
+    assert entry["compressed_rows"] == 1
+
+
+def test_only_rich_text_columns_are_expanded(db, reading_id):
+    packed = compress_text(LARGE_HTML)
+    rows = db.conn.execute("SELECT ? AS unity_html, ? AS other_blob", (packed, packed)).fetchall()
+    assert db._map_rows(rows) == [{"unity_html": LARGE_HTML, "other_blob": packed}]
+    assert db._rowdict(rows[0]) == {"unity_html": LARGE_HTML, "other_blob": packed}
+
+
+def synthetic_notes(count, size, seed=17):
+    """Compact rich-text notes of about `size` bytes, made of random words."""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 11)))
+                  for _ in range(5000)]
+    notes = []
+    for _ in range(count):
+        parts = [COMPACT_HTML_HEAD, "<body>"]
+        length = len(COMPACT_HTML_HEAD)
+        while length < size:
+            paragraph = "<p>" + " ".join(rng.choice(vocabulary) for _ in range(60)) + ".</p>\n"
+            parts.append(paragraph)
+            length += len(paragraph)
+        parts.append("</body></html>")
+        notes.append("".join(parts))
+    return notes
+
+
+def test_compression_benchmark(tmp_path):
+    """
+    Compares db_compress_text off and on over a synthetic corpus: file size
+    after VACUUM, how many notes each MB of page cache holds, and per-note
+    save and load time (run with -s to see the numbers).
+    """
+    notes = synthetic_notes(BENCH_NOTES, BENCH_NOTE_BYTES)
+    results = {}
+    for enabled in (False, True):
+        path = str(tmp_path / f"compress_{int(enabled)}.db")
+        db = DatabaseManager(path)
+        try:
+            db.set_text_compression(enabled)
+            project_id = db.create_item("Benchmark", "project")
+            reading_id = db.add_reading(project_id, "Reading", "Author", "")
+            section_ids = [db.add_outline_section(reading_id, f"Section {n}") for n in range(BENCH_NOTES)]
+
+            saves = []
+            for section_id, html in zip(section_ids, notes):
+                started = time.perf_counter()
+                db.update_outline_section_notes(section_id, html)
+                saves.append((time.perf_counter() - started) * 1000)
+
+            loads = []
+            for section_id, html in zip(section_ids, notes):
+                started = time.perf_counter()
+                loaded = db.get_outline_section_notes(section_id)
+                loads.append((time.perf_counter() - started) * 1000)
+                assert loaded == html
+
+            scans = []
+            for _ in range(BENCH_RUNS):
+                started = time.perf_counter()
+                rows = db.get_reading_outline_tree(reading_id, include_notes=True)
+                scans.append((time.perf_counter() - started) * 1000)
+            assert [row["notes_html"] for row in rows] == notes
+
+            db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            db.conn.execute("VACUUM")
+            pages = db.conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = db.conn.execute("PRAGMA page_size").fetchone()[0]
+        finally:
+            db.conn.close()
+        results[enabled] = {
+            "size": os.path.getsize(path), "pages": pages,
+            "notes_per_mb": BENCH_NOTES * 1e6 / (pages * page_size),
+            "save": statistics.median(saves), "load": statistics.median(loads),
+            "scan": statistics.median(scans),
+        }
+
+    assert results[True]["size"] < results[False]["size"]
+    print(f"\n{BENCH_NOTES} notes of ~{BENCH_NOTE_BYTES // 1000} KB:")
+    for enabled, label in ((False, "db_compress_text off"), (True, "db_compress_text on ")):
+        r = results[enabled]
+        print(f"  {label}: {r['size'] / 1e6:.2f} MB, {r['pages']} pages, {r['notes_per_mb']:.0f} notes per MB of cache; "
+              f"save median {r['save']:.3f} ms, load median {r['load']:.3f} ms, full scan median {r['scan']:.1f} ms")
@@ -0,0 +1,109 @@
+import statistics
+import time
+
+import pytest
+
+from database_manager import DatabaseManager
+
+BENCH_READINGS = 50
+BENCH_RUNS = 3
+READING_FIELDS = ["propositions_html", "unity_html", "key_terms_html", "arguments_html", "gaps_html",
+                  "theories_html", "personal_dialogue_html", "elevator_abstract_html"]
+
+
+@pytest.fixture
+def reading_id(db, project_id):
+    return db.add_reading(project_id, "Original Title", "Author", "")
+
+
+def title_of(db, reading_id):
+    return db.conn.execute("SELECT title FROM readings WHERE id = ?", (reading_id,)).fetchone()[0]
+
+
+def details_for(title):
+    return {"title": title, "author": "Author", "nickname": ""}
+
+
+def test_failed_part_only_undoes_its_savepoint(db, project_id, reading_id):
+    """The save cycle's pattern: each part in its own savepoint, errors caught per part."""
+    other_id = db.add_reading(project_id, "Other", "Author", "")
+    committed = []
+    with db.transaction():
+        db.update_reading_details(reading_id, details_for("Saved"))
+        try:
+            with db.transaction():
+                db.update_reading_details(other_id, details_for("Undone"))
+                db.after_commit(lambda: committed.append("undone part"))
+                raise RuntimeError("part failed")
+        except RuntimeError:
+            pass
+        db.after_commit(lambda: committed.append("saved part"))
+
+    assert title_of(db, reading_id) == "Saved"
+    assert title_of(db, other_id) == "Other"
+    assert committed == ["saved part"]
+
+
+def test_mixin_rollback_marks_only_its_savepoint(db, project_id, reading_id):
+    with db.transaction():
+        with db.transaction():
+            db.update_reading_details(reading_id, details_for("Undone"))
+            db._rollback()  # As a mixin does after catching an error
+        db.add_reading(project_id, "Kept", "Author", "")
+    assert title_of(db, reading_id) == "Original Title"
+    assert db.conn.execute("SELECT COUNT(*) FROM readings WHERE title = 'Kept'").fetchone()[0] == 1
+
+
+def test_outer_block_rolls_back_everything(db, reading_id):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            with db.transaction():
+                db.update_reading_details(reading_id, details_for("Undone"))
+            raise RuntimeError("abort")
+    assert title_of(db, reading_id) == "Original Title"
+
+
+def save_project(db, reading_ids, outline_ids, run):
+    """The writes one save cycle made per open reading before dirty tracking."""
+    for reading_id, outline_id in zip(reading_ids, outline_ids):
+        db.update_reading_details(reading_id, details_for(f"Reading {reading_id} run {run}"))
+        db.update_outline_section_notes(outline_id, f"<p>Notes {run}</p>")
+        for field in READING_FIELDS:
+            db.update_reading_field(reading_id, field, f"<p>{field} {run}</p>")
+
+
+def test_save_50_readings_benchmark(tmp_path):
+    """
+    Saving a project with 50 open readings, one commit per write against
+    one transaction() for the cycle. Needs a database file: commits to
+    :memory: cost nothing. Run with -s to see the numbers.
+    """
+    db = DatabaseManager(str(tmp_path / "bench.db"))
+    try:
+        project_id = db.create_item("Bench", "project")
+        reading_ids, outline_ids = [], []
+        with db.transaction():
+            for r in range(BENCH_READINGS):
+                reading_ids.append(db.add_reading(project_id, f"Reading {r}", "Author", ""))
+                outline_ids.append(db.add_outline_section(reading_ids[-1], "Section"))
+        writes = BENCH_READINGS * (2 + len(READING_FIELDS))
+
+        per_write, one_commit = [], []
+        for run in range(BENCH_RUNS):
+            started = time.perf_counter()
+            save_project(db, reading_ids, outline_ids, f"a{run}")
+            per_write.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            with db.transaction():
+                save_project(db, reading_ids, outline_ids, f"b{run}")
+            one_commit.append((time.perf_counter() - started) * 1000)
+
+        assert title_of(db, reading_ids[0]) == f"Reading {reading_ids[0]} run b{BENCH_RUNS - 1}"
+        settings = db.active_connection_settings
+        print(f"\nSave cycle, {BENCH_READINGS} readings ({writes} writes, "
+              f"{settings['db_journal_mode']}/{settings['db_synchronous']}): "
+              f"commit per write {statistics.median(per_write):.1f} ms, "
+              f"one transaction {statistics.median(one_commit):.1f} ms (medians)")
+    finally:
+        db.conn.close()
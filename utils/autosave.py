@@ -0,0 +1,94 @@
+# utils/autosave.py
+from PySide6.QtCore import QObject, QTimer, QCoreApplication, Signal, Slot
+
+from database_helpers.autosave_queue import AutosaveFlushError, AutosaveQueue
+
+
+class AutosaveService(QObject):
+    """
+    Debounced write-behind autosave shared by the tabs that save as you type.
+
+    Tabs call put() on every edit. Writes to the same (table, row, column)
+    are coalesced, and everything pending is written in one transaction
+    once typing has been idle for IDLE_MS, when keyboard focus moves to
+    another widget, or when flush() is called. The application flushes
+    synchronously before it closes.
+    """
+    IDLE_MS = 750
+    RETRY_MS = 5000
+
+    flushed = Signal(int)  # number of writes committed
+    flushFailed = Signal(str)
+
+    _instances = {}
+
+    @classmethod
+    def for_database(cls, db):
+        """Returns the shared service writing through `db`."""
+        service = cls._instances.get(id(db))
+        if service is None:
+            service = cls._instances[id(db)] = cls(db)
+        return service
+
+    @classmethod
+    def flush_all(cls, isolate=False):
+        """Flushes every service. Called before the application closes."""
+        for service in cls._instances.values():
+            service.flush(isolate)
+
+    @classmethod
+    def failed_writes(cls):
+        """[(table, row_id, column, error)] still pending after failing on their own, over every service."""
+        return [write for service in cls._instances.values() for write in service.queue.failed_writes()]
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.queue = AutosaveQueue(db)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+            if hasattr(app, "focusChanged"):
+                app.focusChanged.connect(self._on_focus_changed)
+
+    def put(self, table, row_id, column, value, writer):
+        """Queues writer(row_id, column, value) and restarts the idle timer."""
+        self.queue.put(table, row_id, column, value, writer)
+        self._timer.start(self.IDLE_MS)
+
+    def pending_value(self, table, row_id, column, default=None):
+        return self.queue.pending_value(table, row_id, column, default)
+
+    def discard(self, table, row_id):
+        self.queue.discard(table, row_id)
+
+    @Slot()
+    def flush(self, isolate=False):
+        """
+        Writes everything pending now. Returns the number of writes
+        committed. isolate=True writes each one in its own savepoint, so
+        only the ones that fail stay queued (AutosaveQueue.flush).
+        """
+        self._timer.stop()
+        try:
+            count = self.queue.flush(isolate)
+        except AutosaveFlushError as e:
+            print(f"Autosave: flush failed, {len(self.queue)} write(s) kept for retry: {e}")
+            if e.committed:
+                self.flushed.emit(e.committed)
+            self.flushFailed.emit(str(e))
+            self._timer.start(self.RETRY_MS)
+            return e.committed
+        if count:
+            self.flushed.emit(count)
+        return count
+
+    @Slot(object, object)
+    def _on_focus_changed(self, old, new):
+        if len(self.queue):
+            self.flush()
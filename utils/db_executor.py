@@ -0,0 +1,239 @@
+# utils/db_executor.py
+import itertools
+import os
+import queue
+import threading
+import traceback
+
+from PySide6.QtCore import QObject, QThread, QTimer, QCoreApplication, Signal, Slot
+
+
+class DbFuture(QObject):
+    """
+    Handle for one job submitted to a DbExecutor.
+
+    Exactly one of `finished(result)` or `failed(message)` is emitted on the
+    GUI thread when the job completes, unless cancel() was called first.
+    """
+    finished = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, executor, job_id):
+        super().__init__()
+        self._executor = executor
+        self.job_id = job_id
+        self.result = None
+        self.error = None
+        self._cancelled = False
+        self._done = False
+
+    def cancel(self):
+        """
+        Drops the result. A query that is already running on the worker
+        is interrupted. Returns False if the job had already completed.
+        """
+        if self._done or self._cancelled:
+            return False
+        self._cancelled = True
+        self._executor._cancel(self.job_id)
+        return True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def is_done(self):
+        return self._done
+
+    def _resolve(self, ok, payload):
+        if self._cancelled or self._done:
+            return
+        self._done = True
+        if ok:
+            self.result = payload
+            self.finished.emit(payload)
+        else:
+            self.error = payload
+            self.failed.emit(payload)
+
+
+class _DbWorkerThread(QThread):
+    """
+    Runs queued jobs one at a time against its own read-only
+    DatabaseManager, opened lazily inside this thread. With per-project
+    files, the project the GUI had open when the job was submitted is
+    attached for the job and detached again after it.
+    """
+    jobDone = Signal(int, bool, object)  # job_id, ok, result or error message
+
+    def __init__(self, db_file, parent=None):
+        super().__init__(parent)
+        self.db_file = db_file
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._cancelled = set()
+        self._interrupted = set()
+        self._current_job = None
+        self._reader = None
+
+    def enqueue(self, job_id, fn, args, kwargs, project_id=None):
+        self._jobs.put((job_id, fn, args, kwargs, project_id))
+
+    def cancel(self, job_id):
+        with self._lock:
+            if self._current_job == job_id:
+                # sqlite3's interrupt() is safe to call from another thread
+                self._reader.conn.interrupt()
+                self._interrupted.add(job_id)
+            else:
+                self._cancelled.add(job_id)
+
+    def stop(self):
+        self._jobs.put(None)
+
+    def run(self):
+        # Imported here so the GUI thread never touches this connection
+        from database_manager import DatabaseManager
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            job_id, fn, args, kwargs, project_id = job
+
+            with self._lock:
+                if job_id in self._cancelled:
+                    self._cancelled.discard(job_id)
+                    continue
+
+            try:
+                if self._reader is None:
+                    self._reader = DatabaseManager(self.db_file, read_only=True)
+                # The GUI connection's writes never bump this connection's
+                # change counter, so drop anything cached by the last job.
+                self._reader.clear_read_cache()
+                self._reader._invalidate_anchor_index()
+                if project_id is not None:
+                    self._reader.attach_project(project_id)
+
+                with self._lock:
+                    self._current_job = job_id
+                try:
+                    result = fn(self._reader, *args, **kwargs)
+                finally:
+                    with self._lock:
+                        self._current_job = None
+                    # Leave no project file open between jobs, so it can be deleted
+                    self._reader.detach_project()
+                with self._lock:
+                    self._interrupted.discard(job_id)
+                self.jobDone.emit(job_id, True, result)
+            except Exception as e:
+                with self._lock:
+                    interrupted = job_id in self._interrupted
+                    self._interrupted.discard(job_id)
+                if not interrupted:
+                    print(f"DbExecutor: Error in background job {job_id}: {e}")
+                    traceback.print_exc()
+                self.jobDone.emit(job_id, False, str(e))
+
+        if self._reader is not None:
+            try:
+                self._reader.conn.close()
+            except Exception:
+                pass
+            self._reader = None
+
+
+class DbExecutor(QObject):
+    """
+    Runs heavy read queries off the GUI thread.
+
+    Jobs are plain callables invoked as fn(reader_db, *args, **kwargs), where
+    reader_db is a read-only DatabaseManager owned by the worker thread.
+    They must only read from reader_db and must not touch widgets; results
+    are handed back on the GUI thread through the returned DbFuture. With
+    per-project files, reader_db has the GUI's open project attached.
+
+    In-memory databases cannot be shared with a second connection, so for
+    those the job runs on the GUI connection from the next event-loop turn.
+    """
+
+    _instances = {}
+
+    @classmethod
+    def for_database(cls, db):
+        """Returns the shared executor for the database behind `db`."""
+        path = db._get_db_file_path()
+        key = os.path.abspath(path) if path else id(db)
+        executor = cls._instances.get(key)
+        if executor is None:
+            executor = cls._instances[key] = cls(db)
+        return executor
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.db_file = db._get_db_file_path()
+        self._ids = itertools.count(1)
+        self._futures = {}
+        self._thread = None
+
+        if self.db_file:
+            self._thread = _DbWorkerThread(self.db_file)
+            self._thread.jobDone.connect(self._on_job_done)
+            self._thread.start()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def submit(self, fn, *args, **kwargs):
+        """Queues fn(reader_db, *args, **kwargs) and returns its DbFuture."""
+        job_id = next(self._ids)
+        future = DbFuture(self, job_id)
+        self._futures[job_id] = future
+
+        if self._thread is None:
+            QTimer.singleShot(0, lambda: self._run_inline(job_id, fn, args, kwargs))
+        else:
+            self._thread.enqueue(job_id, fn, args, kwargs, self.db.attached_project_id)
+        return future
+
+    def call(self, method_name, *args, **kwargs):
+        """Shortcut for submitting a single DatabaseManager getter."""
+        return self.submit(lambda db: getattr(db, method_name)(*args, **kwargs))
+
+    def _run_inline(self, job_id, fn, args, kwargs):
+        if job_id not in self._futures:
+            return
+        try:
+            result = fn(self.db, *args, **kwargs)
+        except Exception as e:
+            print(f"DbExecutor: Error in job {job_id}: {e}")
+            self._on_job_done(job_id, False, str(e))
+            return
+        self._on_job_done(job_id, True, result)
+
+    def _cancel(self, job_id):
+        self._futures.pop(job_id, None)
+        if self._thread is not None:
+            self._thread.cancel(job_id)
+
+    @Slot(int, bool, object)
+    def _on_job_done(self, job_id, ok, payload):
+        future = self._futures.pop(job_id, None)
+        if future is not None:
+            future._resolve(ok, payload)
+
+    @Slot()
+    def shutdown(self):
+        """Cancels pending jobs and stops the worker thread."""
+        for future in list(self._futures.values()):
+            future.cancel()
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread.wait(5000)
+            self._thread = None
+        for key, executor in list(self._instances.items()):
+            if executor is self:
+                del self._instances[key]
@@ -4,6 +4,8 @@ import re
 import traceback
 from bs4 import BeautifulSoup
 
+from database_helpers.rich_text import expand_qt_html
+
 try:
     from docx import Document
     from docx.shared import Inches, Pt
@@ -60,6 +62,10 @@ def clean_html_for_docx(html):
     return paragraphs
 
 
+class ExportCancelled(Exception):
+    """Raised between export sections once should_cancel() returns True."""
+
+
 class ExportEngine:
     """
     Handles fetching data and compiling it into a single file
@@ -69,7 +75,7 @@ class ExportEngine:
     def __init__(self, db, project_id):
         self.db = db
         self.project_id = project_id
-        self.project_details = self.db.get_item_details(self.project_id)
+        self.project_details = self._expand_rich_text("items", self.db.get_item_details(self.project_id))
         self.project_name = self.project_details.get('name', 'Untitled Project')
 
         # Set default font
@@ -82,52 +88,90 @@ class ExportEngine:
         self.todo_cache = None
         self.rubric_cache = None
 
-    def export_to_file(self, file_path, config):
-        """Public method to generate and save the export file."""
+        self._should_cancel = None
+
+    def export_to_file(self, file_path, config, should_cancel=None):
+        """
+        Public method to generate and save the export file.
+
+        The file is written to a temporary file that replaces file_path
+        only once it is complete. should_cancel() is polled between
+        sections; returning True aborts the export with ExportCancelled
+        and leaves any existing file_path untouched.
+        """
         file_format = config.get("format", "html")
         components = config.get("components", [])
+        self._should_cancel = should_cancel
+        tmp_path = file_path + ".partial"
 
-        if file_format == "html":
-            content = self.generate_html(components)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-        elif file_format == "txt":
-            content = self.generate_txt(components)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-        elif file_format == "docx":
-            if Document is None:
-                raise ImportError("The 'python-docx' library is required for .docx export. Please install it.")
-            doc = self.generate_docx(components)
-            doc.save(file_path)
-        else:
-            raise ValueError(f"Unsupported format: {file_format}")
+        try:
+            if file_format == "html":
+                content = self.generate_html(components)
+                self._check_cancelled()
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+            elif file_format == "txt":
+                content = self.generate_txt(components)
+                self._check_cancelled()
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+            elif file_format == "docx":
+                if Document is None:
+                    raise ImportError("The 'python-docx' library is required for .docx export. Please install it.")
+                doc = self.generate_docx(components)
+                self._check_cancelled()
+                doc.save(tmp_path)
+            else:
+                raise ValueError(f"Unsupported format: {file_format}")
+            self._check_cancelled()
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            self._should_cancel = None
+
+    def _check_cancelled(self):
+        if self._should_cancel and self._should_cancel():
+            raise ExportCancelled()
 
     # --- Data Fetchers (with Caching) ---
 
+    def _expand_rich_text(self, table, row):
+        """
+        Returns row with its compacted rich-text columns (RICH_TEXT_COLUMNS)
+        expanded back to the document the editor wrote, so no export path
+        sees the compact head.
+        """
+        if not row:
+            return row
+        row = dict(row)
+        for col in dict(self.db.RICH_TEXT_COLUMNS).get(table, []):
+            if row.get(col):
+                row[col] = expand_qt_html(row[col])
+        return row
+
     def get_readings(self):
         if self.readings_cache is None:
-            self.readings_cache = self.db.get_readings(self.project_id)
+            self.readings_cache = [self._expand_rich_text("readings", reading)
+                                   for reading in self.db.get_readings(self.project_id)]
         return self.readings_cache
 
     def get_reading_details(self, reading_id):
         """Gets just the main details for a reading."""
-        return self.db.get_reading_details(reading_id)
-
-    def get_reading_outline_data(self, reading_id, parent_id=None, indent=0):
-        """Recursively fetches the full outline with notes."""
-        items = self.db.get_reading_outline(reading_id, parent_id)
-        export_items = []
-        for item in items:
-            item_data = dict(item)
-            item_data['notes_html'] = self.db.get_outline_section_notes(item['id'])
-            item_data['indent'] = indent
-            export_items.append(item_data)
-            export_items.extend(self.get_reading_outline_data(reading_id, item['id'], indent + 1))
+        return self._expand_rich_text("readings", self.db.get_reading_details(reading_id))
+
+    def get_reading_outline_data(self, reading_id):
+        """Fetches the full outline with notes, in display order."""
+        export_items = self.db.get_reading_outline_tree(reading_id, include_notes=True)
+        for item in export_items:
+            item['notes_html'] = expand_qt_html(item.get('notes_html') or "")
+            item['indent'] = item['depth']
         return export_items
 
     def get_reading_dqs(self, reading_id):
-        return self.db.get_driving_questions(reading_id, parent_id=True)  # Get all
+        return self.db.get_driving_questions_tree_order(reading_id)  # Parents before children
 
     def get_reading_key_terms(self, reading_id):
         return self.db.get_reading_key_terms(reading_id)
@@ -168,6 +212,7 @@ class ExportEngine:
         body = f"<h1>{self.project_name}</h1>"
 
         for comp in components:
+            self._check_cancelled()
             key = comp['key']
             title = comp['title']
 
@@ -262,6 +307,7 @@ class ExportEngine:
         output += "=" * len(self.project_name) + "\n\n"
 
         for comp in components:
+            self._check_cancelled()
             key = comp['key']
             title = comp['title']
 
@@ -351,6 +397,7 @@ class ExportEngine:
         doc.add_heading(self.project_name, level=0)
 
         for comp in components:
+            self._check_cancelled()
             key = comp['key']
             title = comp['title']
 
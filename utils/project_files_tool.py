@@ -0,0 +1,66 @@
+# utils/project_files_tool.py
+"""
+Splits a reading tracker database into one file per project, or merges
+the project files back into it (see ProjectFilesMixin).
+
+    python -m utils.project_files_tool status [--db reading_tracker.db]
+    python -m utils.project_files_tool split  [--db reading_tracker.db] [--no-vacuum]
+    python -m utils.project_files_tool merge  [--db reading_tracker.db] [--vacuum]
+
+Close the application first.
+"""
+import argparse
+import os
+import sys
+
+from database_manager import DatabaseManager
+
+
+def _print_progress(done, total):
+    print(f"  {done}/{total}", end="\r" if done < total else "\n", flush=True)
+
+
+def _file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split or merge per-project database files.")
+    parser.add_argument("command", choices=["status", "split", "merge"])
+    parser.add_argument("--db", default="reading_tracker.db", help="main database file")
+    parser.add_argument("--vacuum", dest="vacuum", action="store_true", default=None,
+                        help="compact the main database afterwards (default for split)")
+    parser.add_argument("--no-vacuum", dest="vacuum", action="store_false")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Error: {args.db} does not exist.")
+        return 1
+
+    db = DatabaseManager(args.db)
+    size_before = _file_size(args.db)
+    try:
+        if args.command == "split":
+            print(f"Writing every project to {db.get_project_files_dir()} ...")
+            vacuum = True if args.vacuum is None else args.vacuum
+            db.split_into_project_files(vacuum=vacuum, progress=_print_progress)
+        elif args.command == "merge":
+            print(f"Merging the project files from {db.get_project_files_dir()} ...")
+            db.merge_project_files(vacuum=bool(args.vacuum), progress=_print_progress)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        db.conn.close()
+        return 1
+
+    project_ids = db._project_file_ids()
+    files_bytes = sum(_file_size(db.project_file_path(project_id)) for project_id in project_ids)
+    print(f"Per-project files {'enabled' if db.is_project_files_enabled() else 'disabled'}: "
+          f"{len(project_ids)} project file(s).")
+    print(f"Main database: {size_before:,} -> {_file_size(args.db):,} bytes; "
+          f"project files: {files_bytes:,} bytes.")
+    db.conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
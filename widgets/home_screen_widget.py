@@ -3,7 +3,7 @@ import sys
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QSplitter,
     QStackedWidget, QLabel, QPushButton, QHBoxLayout,
-    QMessageBox, QApplication
+    QMessageBox, QApplication, QFileDialog
 )
 from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtGui import QPixmap
@@ -28,6 +28,9 @@ class HomeScreenWidget(QWidget):
     # Signal to jump to a specific anchor (project, reading, outline)
     globalJumpRequested = Signal(int, int, int)
 
+    # Signal to open a global search hit (project, kind, ref_id, reading, outline)
+    searchResultRequested = Signal(int, str, int, int, int)
+
     def __init__(self, db_manager, spell_checker_service=None, parent=None):
         super().__init__(parent)
         self.db = db_manager
@@ -101,16 +104,70 @@ class HomeScreenWidget(QWidget):
             }
         """)
 
+        self.btn_search = QPushButton("Search Everything")
+        self.btn_search.setFont(font)
+        self.btn_search.setMinimumHeight(40)
+        self.btn_search.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_search.setStyleSheet("""
+            QPushButton {
+                background-color: #444444;
+                color: white;
+                border-radius: 5px;
+                padding: 10px;
+            }
+            QPushButton:hover {
+                background-color: #666666;
+            }
+        """)
+
+        self.btn_backup = QPushButton("Back Up Database")
+        self.btn_backup.setFont(font)
+        self.btn_backup.setMinimumHeight(40)
+        self.btn_backup.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_backup.setStyleSheet("""
+            QPushButton {
+                background-color: #444444;
+                color: white;
+                border-radius: 5px;
+                padding: 10px;
+            }
+            QPushButton:hover {
+                background-color: #666666;
+            }
+        """)
+
+        self.btn_clean_attachments = QPushButton("Clean Up Attachments")
+        self.btn_clean_attachments.setFont(font)
+        self.btn_clean_attachments.setMinimumHeight(40)
+        self.btn_clean_attachments.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_clean_attachments.setStyleSheet("""
+            QPushButton {
+                background-color: #444444;
+                color: white;
+                border-radius: 5px;
+                padding: 10px;
+            }
+            QPushButton:hover {
+                background-color: #666666;
+            }
+        """)
+
         button_layout = QHBoxLayout()
         button_layout.addStretch(1)
         button_layout.addWidget(self.btn_global_graph)
         button_layout.addWidget(self.btn_manage_tags)
+        button_layout.addWidget(self.btn_search)
+        button_layout.addWidget(self.btn_backup)
+        button_layout.addWidget(self.btn_clean_attachments)
         button_layout.addStretch(1)
         welcome_layout.addLayout(button_layout)
         welcome_layout.addStretch(1)
 
         self.btn_global_graph.clicked.connect(self.open_global_graph)
         self.btn_manage_tags.clicked.connect(self.open_global_tag_manager)
+        self.btn_search.clicked.connect(self.open_global_search)
+        self.btn_backup.clicked.connect(self.backup_database)
+        self.btn_clean_attachments.clicked.connect(self.clean_up_attachments)
 
         self.splitter.addWidget(self.welcome_widget)
         self.splitter.setSizes([400, 600])
@@ -170,3 +227,78 @@ class HomeScreenWidget(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not open global tag manager: {e}")
 
+    @Slot()
+    def open_global_search(self):
+        """
+        Imports and opens the GlobalSearchDialog.
+        """
+        try:
+            from dialogs.global_search_dialog import GlobalSearchDialog
+
+            dialog = GlobalSearchDialog(self.db, self)
+
+            # Connect the open-result signal
+            dialog.openSearchResult.connect(self.searchResultRequested.emit)
+
+            dialog.exec()
+
+        except ImportError:
+            QMessageBox.critical(self, "Error", "GlobalSearchDialog could not be loaded.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not open search: {e}")
+
+    @Slot()
+    def backup_database(self):
+        """
+        Copies the database to a chosen file in the background.
+        """
+        try:
+            from dialogs.backup_progress_dialog import BackupProgressDialog
+
+            file_path, _ = QFileDialog.getSaveFileName(
+                self, "Back Up Database", "reading_tracker_backup.db", "SQLite Database (*.db)"
+            )
+            if not file_path:
+                return
+
+            dialog = BackupProgressDialog(self.db, file_path, self)
+            dialog.show()
+
+        except ImportError:
+            QMessageBox.critical(self, "Error", "BackupProgressDialog could not be loaded.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not start the backup: {e}")
+
+    @Slot()
+    def clean_up_attachments(self):
+        """
+        Moves attachments into the shared store and deletes the attachment
+        files nothing uses any more, then reports the space reclaimed.
+        """
+        reply = QMessageBox.question(
+            self, "Clean Up Attachments",
+            "Delete attachment files that no reading uses any more?\n\n"
+            "Files still needed by a backup snapshot are kept.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            result = self.db.dedupe_attachment_files()
+        except Exception as e:
+            result = None
+            print(f"Error cleaning up attachments: {e}")
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        if result is None:
+            QMessageBox.critical(self, "Error", "Could not clean up the attachment files.")
+            return
+        moved, reclaimed = result
+        QMessageBox.information(
+            self, "Clean Up Attachments",
+            f"{reclaimed / (1024 * 1024):,.1f} MB reclaimed.\n"
+            f"{moved} attachment(s) moved into the shared store."
+        )
@@ -2,6 +2,7 @@
 import sys
 import os
 import subprocess
+import threading
 import traceback
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
@@ -9,7 +10,7 @@ from PySide6.QtWidgets import (
     QFrame, QDialog, QTreeWidgetItem, QMenuBar,
     QMessageBox, QMenu, QApplication, QFileDialog,
     QHeaderView, QStyledItemDelegate, QStyle, QStyleOptionViewItem,
-    QSizePolicy, QTextEdit, QPlainTextEdit, QLineEdit
+    QSizePolicy, QTextEdit, QPlainTextEdit, QLineEdit, QProgressDialog
 )
 from PySide6.QtCore import Qt, Signal, Slot, QTimer, QPoint, QUrl, QSize, QRectF
 from PySide6.QtGui import (
@@ -50,6 +51,22 @@ try:
 except ImportError:
     ExportEngine = None
 
+from utils.autosave import AutosaveService
+from utils.db_executor import DbExecutor
+
+
+def _export_project(db, project_id, file_path, config, should_cancel=None):
+    """
+    Background job: runs the export against the executor's read connection.
+    should_cancel() is polled between sections (ExportEngine.export_to_file).
+    """
+    try:
+        ExportEngine(db, project_id).export_to_file(file_path, config, should_cancel)
+    except ImportError as e:
+        raise RuntimeError(f"A required library is missing: {e}\n"
+                           f"Please install 'python-docx' and 'beautifulsoup4'.") from e
+    return file_path
+
 try:
     from dialogs.edit_syntopic_rules_dialog import EditSyntopicRulesDialog
 except ImportError:
@@ -166,6 +183,7 @@ class ProjectDashboardWidget(QWidget):
         self.reading_tabs = {}
         self.synthesis_tab = None
         self.graph_view_tab = None
+        self._export_future = None
         self.todo_list_tab = None
         self.assignment_tab = None
         self.research_tab = None
@@ -814,39 +832,63 @@ class ProjectDashboardWidget(QWidget):
     def save_all_editors(self):
         if self.project_id == -1:
             return
-        print("Auto-saving project data...")
+        AutosaveService.flush_all()
+        # Fields written and unchanged fields skipped this cycle, kept here
+        # rather than on the editors (RichTextEditorTab.record_save)
+        counts = {"written": 0, "skipped": 0}
+
+        # Only editors changed since they were loaded or last saved are
+        # serialized and written (RichTextEditorTab.get_html_if_modified).
+        # They count as saved only once the outer block commits, so a part
+        # that rolls back is written again on the next cycle.
+        parts = [("project editors", lambda: self._save_project_editors(counts))]
+        for tab in self.reading_tabs.values():
+            if getattr(tab, "_is_loaded", False) and hasattr(tab, 'save_all'):
+                parts.append((f"reading {tab.reading_id}", lambda tab=tab: tab.save_all(counts=counts)))
+        if hasattr(self, 'assignment_tab') and isinstance(self.assignment_tab, AssignmentTab):
+            parts.append(("assignment", lambda: self.assignment_tab.save_editors(counts=counts)))
+        if self.synthesis_tab and hasattr(self.synthesis_tab, 'save_editors'):
+            parts.append(("synthesis", lambda: self.synthesis_tab.save_editors(counts=counts)))
+        if self.annotated_bib_tab:
+            parts.append(("annotated bibliography", self.annotated_bib_tab.save_current_data))
+
+        # One commit for the whole save cycle. Each part runs in its own
+        # savepoint; an error in one part rolls back only that part.
+        try:
+            with self.db.transaction():
+                for name, save in parts:
+                    try:
+                        with self.db.transaction():
+                            save()
+                    except Exception as e:
+                        print(f"Error saving {name}: {e}")
+        except Exception as e:
+            print(f"Error committing project data: {e}")
+            return
 
+        # Writes are counted by after_commit callbacks, so only committed ones show here
+        print(f"Auto-saved project data: {counts['written']} field(s) written, "
+              f"{counts['skipped']} unchanged write(s) avoided.")
+
+    def _save_project_editors(self, counts=None):
         def save_purpose(html):
             if html is not None:
                 self.db.update_project_text_field(self.project_id, 'project_purpose_text', html)
 
-        self.purpose_text_editor.get_html(save_purpose)
+        self.purpose_text_editor.get_html_if_modified(save_purpose, db=self.db, counts=counts)
 
         def save_goals(html):
             if html is not None:
                 self.db.update_project_text_field(self.project_id, 'project_goals_text', html)
 
-        self.goals_text_editor.get_html(save_goals)
+        self.goals_text_editor.get_html_if_modified(save_goals, db=self.db, counts=counts)
 
         for tab in self.bottom_tabs:
             def cb(field):
                 return lambda html: self.db.update_project_text_field(self.project_id, field,
                                                                       html) if html is not None else None
 
-            tab.get_editor_content(cb(tab.text_field))
-
-        for tab in self.reading_tabs.values():
-            if getattr(tab, "_is_loaded", False) and hasattr(tab, 'save_all'):
-                tab.save_all()
-
-        if hasattr(self, 'assignment_tab') and isinstance(self.assignment_tab, AssignmentTab):
-            self.assignment_tab.save_editors()
-
-        if self.synthesis_tab and hasattr(self.synthesis_tab, 'save_editors'):
-            self.synthesis_tab.save_editors()
-
-        if self.annotated_bib_tab:
-            self.annotated_bib_tab.save_current_data()
+            tab.get_editor_content_if_modified(cb(tab.text_field), db=self.db, counts=counts)
 
     @Slot()
     def open_edit_instructions(self):
@@ -955,26 +997,43 @@ class ProjectDashboardWidget(QWidget):
             if not file_path:
                 return
 
-            try:
-                engine = ExportEngine(self.db, self.project_id)
-                engine.export_to_file(file_path, config)
-
-                reply = QMessageBox.information(self,
-                                                "Export Successful",
-                                                f"Project exported successfully to:\n{file_path}\n\nDo you want to open the file now?",
-                                                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                                                QMessageBox.StandardButton.Yes
-                                                )
-
-                if reply == QMessageBox.StandardButton.Yes:
-                    QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
-
-            except ImportError as e:
-                QMessageBox.critical(self, "Export Error",
-                                     f"A required library is missing: {e}\nPlease install 'python-docx' and 'beautifulsoup4'.")
-            except Exception as e:
-                QMessageBox.critical(self, "Export Error",
-                                     f"An error occurred during export: {e}\n\n{traceback.format_exc()}")
+            # Large projects take a while to export; keep the window responsive
+            progress = QProgressDialog("Exporting project...", "Cancel", 0, 0, self)
+            progress.setWindowTitle("Export")
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+            progress.setMinimumDuration(300)
+
+            # Cancel stops the export between sections as well as any
+            # running query; the file is only replaced on success.
+            cancelled = threading.Event()
+            future = DbExecutor.for_database(self.db).submit(_export_project, self.project_id, file_path, config,
+                                                             cancelled.is_set)
+            progress.canceled.connect(cancelled.set)
+            progress.canceled.connect(future.cancel)
+            progress.canceled.connect(progress.deleteLater)
+            future.finished.connect(lambda path: self._on_export_finished(progress, path))
+            future.failed.connect(lambda message: self._on_export_failed(progress, message))
+            self._export_future = future
+
+    def _on_export_finished(self, progress, file_path):
+        self._export_future = None
+        progress.reset()
+        progress.deleteLater()
+        reply = QMessageBox.information(self,
+                                        "Export Successful",
+                                        f"Project exported successfully to:\n{file_path}\n\nDo you want to open the file now?",
+                                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                        QMessageBox.StandardButton.Yes
+                                        )
+
+        if reply == QMessageBox.StandardButton.Yes:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
+
+    def _on_export_failed(self, progress, message):
+        self._export_future = None
+        progress.reset()
+        progress.deleteLater()
+        QMessageBox.critical(self, "Export Error", f"An error occurred during export: {message}")
 
     @Slot(QTreeWidgetItem, int)
     def on_reading_double_clicked(self, item, column):
@@ -1297,9 +1356,7 @@ class ProjectDashboardWidget(QWidget):
                 QMessageBox.warning(self, "Error", "Attachment file not found.")
                 return
 
-            project_root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-            attachments_dir = os.path.join(project_root_dir, "Attachments")
-            file_path = os.path.join(attachments_dir, attachment['file_path'])
+            file_path = self.db.resolve_attachment_path(attachment['file_path'])
 
             if not os.path.exists(file_path):
                 QMessageBox.warning(self, "Error", f"File not found on disk:\n{file_path}")
@@ -1335,6 +1392,25 @@ class ProjectDashboardWidget(QWidget):
             # SynthesisTab will switch its bottom tab to Terminology
             self.synthesis_tab.select_term(term_id)
 
+    @Slot(str, int, int, int)
+    def open_search_result(self, kind, ref_id, reading_id, outline_id):
+        """Shows the item a global search hit came from (see SearchMixin.SEARCH_SOURCES)."""
+        if kind == 'term':
+            self._open_term_in_synthesis(ref_id)
+        elif kind == 'proposition':
+            if self.synthesis_tab:
+                self.top_tab_widget.setCurrentWidget(self.synthesis_tab)
+                self.synthesis_tab.select_proposition(ref_id)
+        elif kind == 'memo':
+            if self.research_tab:
+                self.top_tab_widget.setCurrentWidget(self.research_tab)
+                self.research_tab.select_memo(ref_id)
+        elif kind == 'pdf_node':
+            self._jump_to_pdf_node(ref_id)
+        elif reading_id:
+            anchor_id = ref_id if kind == 'anchor' else 0
+            self.open_reading_tab(anchor_id, reading_id, outline_id)
+
     @Slot()
     def return_to_home(self):
         try: